@@ -0,0 +1,473 @@
+"""
+문서 보관함 내용(full-text) 색인
+
+견적서/발주서/내역서 xlsx 가 save_generated_document_to_archive / upload_document_to_archive
+를 통과할 때 색인 대기열(enqueue_ingest)에 넣고, 백그라운드 스레드가 여러 건을 모아
+셀 텍스트와 품목 행을 추출하여 역색인(term → document_id)을 갱신한다. (저장 응답을 막지 않음)
+
+- 서버: public.document_archive_terms (DDL: database/sql/document_archive_terms.sql)
+        검색은 RPC archive_search_document_terms 가 서버에서 term 교집합 (GROUP BY / HAVING)
+- 로컬: 오프라인/테스트용 인프로세스 색인 (DocumentContentIndex)
+
+토큰 종류
+- model: 모델 코드 (예: DAL01-2012, 접두 'DAL01' 도 함께 색인)
+- spec : 규격 (예: 75*75*2.0T, 75x75x2.0t, 75×75×2.0T → 75*75*2.0T)
+- word : 한글/영문 단어 (예: 각파이프, 평철)
+"""
+
+from __future__ import annotations
+
+import io
+import queue
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 규격: 숫자(*숫자)+ [T]  - 구분자 *, x, X, ×
+_SPEC_RE = re.compile(
+    r'(?<![\w.])(\d+(?:\.\d+)?(?:\s*[*xX×]\s*\d+(?:\.\d+)?)+)\s*([tT])?(?![\w])'
+)
+# 모델 코드: 영문 2자 이상으로 시작, 하이픈으로 이어진 영숫자
+_MODEL_RE = re.compile(r'(?<![\w-])([A-Za-z]{2,}[A-Za-z0-9]*(?:-[A-Za-z0-9]+)+)(?![\w-])')
+# 일반 단어: 한글/영문 2자 이상
+_WORD_RE = re.compile(r'[가-힣]{2,}|[A-Za-z]{2,}')
+
+MAX_TERMS_PER_DOCUMENT = 5000
+MAX_LINE_ITEMS = 500
+# PostgREST 1회 응답 최대 행 수 (서버 max-rows) - 이보다 많으면 .range() 로 나눠 읽는다
+SERVER_PAGE_SIZE = 1000
+# 백그라운드 색인 1회에 묶어 처리할 최대 문서 수
+INGEST_BATCH_SIZE = 20
+
+
+# ============================================================================
+# 토큰화
+# ============================================================================
+
+def normalize_spec(raw: str, thickness_suffix: str = "") -> str:
+    """규격 문자열 정규화: 구분자 → '*', 두께 접미사 → 'T'"""
+    parts = re.split(r'\s*[*xX×]\s*', raw.strip())
+    spec = "*".join(p for p in parts if p)
+    return spec + ("T" if thickness_suffix else "")
+
+
+def extract_terms(text) -> Set[Tuple[str, str]]:
+    """
+    텍스트에서 (kind, term) 토큰 집합 추출
+
+    Returns:
+        {("model", "DAL01-2012"), ("model", "DAL01"), ("spec", "75*75*2.0T"), ("word", "각파이프"), ...}
+    """
+    if text is None:
+        return set()
+    s = unicodedata.normalize('NFC', str(text))
+    terms: Set[Tuple[str, str]] = set()
+
+    for m in _SPEC_RE.finditer(s):
+        spec = normalize_spec(m.group(1), m.group(2) or "")
+        terms.add(("spec", spec))
+        if spec.endswith("T"):
+            # 두께 표기 없이 검색해도 찾을 수 있도록 T 없는 형태도 색인
+            terms.add(("spec", spec[:-1]))
+
+    for m in _MODEL_RE.finditer(s):
+        code = m.group(1).upper()
+        terms.add(("model", code))
+        head = code.split("-", 1)[0]
+        if len(head) >= 3:
+            terms.add(("model", head))
+
+    for m in _WORD_RE.finditer(s):
+        terms.add(("word", m.group(0).lower()))
+
+    return terms
+
+
+def query_terms(query: str) -> List[str]:
+    """검색어 → 색인 term 목록 (모든 term 을 포함하는 문서를 찾는다)"""
+    found = extract_terms(query)
+    # 모델 코드의 접두어는 본 코드와 함께 나오면 중복 조건이므로 제외
+    models = {t for k, t in found if k == "model"}
+    result = []
+    for kind, term in sorted(found):
+        if kind == "model" and any(m != term and m.startswith(term + "-") for m in models):
+            continue
+        if kind == "spec" and not term.endswith("T") and (term + "T") in {t for k, t in found if k == "spec"}:
+            # 사용자가 T 를 붙였으면 T 붙은 형태만 조건으로 사용
+            continue
+        if kind == "word" and any(term in t.lower() for k2, t in found if k2 == "model"):
+            # 모델 코드 안의 영문 조각(DAL 등)은 조건에서 제외
+            continue
+        result.append(term)
+    return result
+
+
+# ============================================================================
+# xlsx 추출
+# ============================================================================
+
+def extract_xlsx_contents(file_bytes: bytes) -> Dict:
+    """
+    xlsx 에서 셀 텍스트와 품목 행 추출
+
+    Returns:
+        {
+            "terms": {(kind, term), ...},
+            "line_items": [{"sheet": 시트명, "row": 행번호, "text": "셀1 | 셀2 | ..."}, ...]
+        }
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+    terms: Set[Tuple[str, str]] = set()
+    line_items: List[Dict] = []
+    try:
+        for ws in wb.worksheets:
+            for r_idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
+                cells = [str(v).strip() for v in row if v is not None and str(v).strip()]
+                if not cells:
+                    continue
+                row_terms: Set[Tuple[str, str]] = set()
+                for cell in cells:
+                    row_terms |= extract_terms(cell)
+                terms |= row_terms
+                # 모델/규격이 있는 행을 품목 행으로 간주
+                if len(line_items) < MAX_LINE_ITEMS and any(k in ("model", "spec") for k, _ in row_terms):
+                    line_items.append({"sheet": ws.title, "row": r_idx, "text": " | ".join(cells)})
+                if len(terms) >= MAX_TERMS_PER_DOCUMENT:
+                    break
+    finally:
+        wb.close()
+
+    return {"terms": terms, "line_items": line_items}
+
+
+# ============================================================================
+# 로컬 인프로세스 역색인
+# ============================================================================
+
+class DocumentContentIndex:
+    """term → document_id 역색인 (증분 추가/삭제)"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._doc_terms: Dict[str, Set[str]] = {}
+        self._doc_meta: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, doc: Dict, terms: Iterable[Tuple[str, str]]) -> None:
+        doc_id = str(doc.get("id") or "")
+        if not doc_id:
+            return
+        term_set = {t for _, t in terms}
+        with self._lock:
+            self.remove(doc_id)
+            self._doc_terms[doc_id] = term_set
+            self._doc_meta[doc_id] = dict(doc)
+            for term in term_set:
+                self._postings.setdefault(term, set()).add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            for term in self._doc_terms.pop(doc_id, set()):
+                ids = self._postings.get(term)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids:
+                        del self._postings[term]
+            self._doc_meta.pop(doc_id, None)
+
+    def search(self, query: str, document_type: str = "", limit: int = 50) -> List[Dict]:
+        terms = query_terms(query)
+        if not terms:
+            return []
+        with self._lock:
+            postings = sorted((self._postings.get(t, set()) for t in terms), key=len)
+            ids = set(postings[0])
+            for p in postings[1:]:
+                ids &= p
+                if not ids:
+                    break
+            docs = [self._doc_meta[d] for d in ids]
+        if document_type:
+            docs = [d for d in docs if d.get("document_type") == document_type]
+        docs.sort(key=lambda d: (str(d.get("created_at") or ""), str(d.get("id") or "")), reverse=True)
+        return docs[:limit]
+
+
+_content_indexes: Dict[str, DocumentContentIndex] = {}
+_content_indexes_lock = threading.Lock()
+
+
+def get_local_content_index(tenant_id: str) -> DocumentContentIndex:
+    """테넌트별 로컬 내용 색인 (프로세스 단위 싱글톤)"""
+    with _content_indexes_lock:
+        index = _content_indexes.get(tenant_id)
+        if index is None:
+            index = DocumentContentIndex()
+            _content_indexes[tenant_id] = index
+        return index
+
+
+# ============================================================================
+# 수집(ingestion) / 서버 검색
+# ============================================================================
+
+def ingest_document(db, tenant_id: str, doc: Dict, file_bytes: bytes) -> Tuple[bool, str]:
+    """
+    보관된 문서 1건의 내용을 색인 (로컬 + 서버 document_archive_terms)
+
+    Args:
+        db: Supabase 클라이언트 (None 이면 로컬만)
+        tenant_id: 테넌트 ID
+        doc: document_archive 행 (id, document_type, created_at ...)
+        file_bytes: xlsx 바이트
+
+    Returns:
+        (성공여부, 메시지)
+    """
+    return ingest_documents(db, tenant_id, [(doc, file_bytes)])[str(doc.get("id") or "")]
+
+
+def ingest_documents(db, tenant_id: str, items: List[Tuple[Dict, bytes]]) -> Dict[str, Tuple[bool, str]]:
+    """
+    여러 문서 내용 일괄 색인 - 서버 term 교체는 문서 수와 관계없이 삭제 1회 + 1000행 단위 insert
+
+    Args:
+        db: Supabase 클라이언트 (None 이면 로컬만)
+        tenant_id: 테넌트 ID
+        items: [(document_archive 행, xlsx 바이트)]
+
+    Returns:
+        {document_id: (성공여부, 메시지)}
+    """
+    results: Dict[str, Tuple[bool, str]] = {}
+    extracted: List[Tuple[Dict, Dict]] = []
+    for doc, file_bytes in items:
+        doc_id = str(doc.get("id") or "")
+        try:
+            contents = extract_xlsx_contents(file_bytes)
+        except Exception as e:
+            results[doc_id] = (False, f"내용 추출 실패: {e}")
+            continue
+        get_local_content_index(tenant_id).add(doc, contents["terms"])
+        results[doc_id] = (True, f"{len(contents['terms'])}개 term 색인")
+        extracted.append((doc, contents))
+
+    if db is None or not extracted:
+        return results
+
+    rows = [
+        {"tenant_id": tenant_id, "document_id": doc["id"], "term": term, "kind": kind}
+        for doc, contents in extracted
+        for kind, term in sorted(contents["terms"])
+    ]
+    try:
+        # 재색인 시 기존 term 교체 (증분 갱신)
+        db.table('document_archive_terms').delete().in_('document_id', [doc["id"] for doc, _ in extracted]).execute()
+        for i in range(0, len(rows), SERVER_PAGE_SIZE):
+            db.table('document_archive_terms').insert(rows[i:i + SERVER_PAGE_SIZE]).execute()
+        from datetime import datetime
+        indexed_at = datetime.utcnow().isoformat()
+        for doc, contents in extracted:
+            db.table('document_archive').update({
+                "line_items": contents["line_items"],
+                "content_indexed_at": indexed_at,
+            }).eq('id', doc["id"]).execute()
+    except Exception as e:
+        for doc, _ in extracted:
+            results[str(doc["id"])] = (False, f"내용 색인 저장 실패: {e}")
+    return results
+
+
+class ContentIngestQueue:
+    """
+    문서 내용 색인 대기열 (프로세스 단위)
+
+    보관 저장 경로는 enqueue 만 하고 바로 반환한다. 데몬 스레드가 대기 중인 문서를
+    최대 INGEST_BATCH_SIZE 건씩 모아 ingest_documents 로 한 번에 색인한다.
+    실패는 경고만 출력 (content_indexed_at 이 비어 있으므로 reindex_archive_contents 로 복구).
+    """
+
+    def __init__(self, batch_size: int = INGEST_BATCH_SIZE):
+        self._queue: "queue.Queue[Tuple[object, str, Dict, bytes]]" = queue.Queue()
+        self._batch_size = batch_size
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.indexed = 0
+        self.failed = 0
+
+    def enqueue(self, db, tenant_id: str, doc: Dict, file_bytes: bytes) -> None:
+        self._queue.put((db, tenant_id, dict(doc), file_bytes))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='archive-content-ingest', daemon=True)
+                self._thread.start()
+
+    def join(self) -> None:
+        """대기 중인 색인이 모두 끝날 때까지 대기 (백필/테스트용)"""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                # 같은 (클라이언트, 테넌트) 끼리 묶어서 색인
+                groups: Dict[Tuple[int, str], List] = {}
+                for db, tenant_id, doc, file_bytes in batch:
+                    groups.setdefault((id(db), tenant_id), [db, tenant_id, []])[2].append((doc, file_bytes))
+                for db, tenant_id, items in groups.values():
+                    for doc_id, (ok, msg) in ingest_documents(db, tenant_id, items).items():
+                        if ok:
+                            self.indexed += 1
+                        else:
+                            self.failed += 1
+                            print(f"[WARN] archive content ingest {doc_id}: {msg}")
+            except Exception as e:
+                self.failed += len(batch)
+                print(f"[WARN] archive content ingest failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_ingest_queue = ContentIngestQueue()
+
+
+def enqueue_ingest(db, tenant_id: str, doc: Dict, file_bytes: bytes) -> None:
+    """보관 문서 내용 색인 예약 (백그라운드 처리, 바로 반환)"""
+    _ingest_queue.enqueue(db, tenant_id, doc, file_bytes)
+
+
+def get_ingest_queue() -> ContentIngestQueue:
+    return _ingest_queue
+
+
+def _fetch_all(query_fn) -> List[Dict]:
+    """PostgREST 조회를 SERVER_PAGE_SIZE 단위 .range() 로 끝까지 읽기 (query_fn: 매 페이지 새 쿼리 생성)"""
+    rows: List[Dict] = []
+    start = 0
+    while True:
+        page = query_fn().range(start, start + SERVER_PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < SERVER_PAGE_SIZE:
+            return rows
+        start += SERVER_PAGE_SIZE
+
+
+def _server_matching_documents(db, tenant_id: str, terms: List[str], document_type: str,
+                               limit: int) -> Tuple[List[str], int]:
+    """
+    모든 term 을 포함하는 문서 ID (최신순 limit 건)와 전체 건수
+
+    RPC archive_search_document_terms 로 서버에서 교집합을 구하고, RPC 가 없으면
+    term 행을 .range() 로 끝까지 읽어 클라이언트에서 교집합 (1000행 제한으로 잘리지 않도록).
+    """
+    try:
+        res = db.rpc('archive_search_document_terms', {
+            'p_tenant_id': tenant_id,
+            'p_terms': terms,
+            'p_document_type': document_type or None,
+            'p_limit': limit,
+        }).execute()
+        rows = res.data or []
+        total = int(rows[0]['total']) if rows else 0
+        return [row['document_id'] for row in rows], total
+    except Exception as e:
+        print(f"[WARN] archive_search_document_terms RPC unavailable, intersecting on client: {e}")
+
+    hits: Dict[str, Set[str]] = {}
+    for row in _fetch_all(lambda: db.table('document_archive_terms')
+                          .select('document_id, term')
+                          .eq('tenant_id', tenant_id)
+                          .in_('term', terms)
+                          .order('document_id').order('term')):
+        hits.setdefault(row['document_id'], set()).add(row['term'])
+    doc_ids = [d for d, ts in hits.items() if len(ts) == len(set(terms))]
+    if not doc_ids:
+        return [], 0
+
+    docs: List[Dict] = []
+    for i in range(0, len(doc_ids), 200):
+        q = db.table('document_archive').select('id, created_at') \
+            .eq('tenant_id', tenant_id).in_('id', doc_ids[i:i + 200])
+        if document_type:
+            q = q.eq('document_type', document_type)
+        docs.extend(q.execute().data or [])
+    docs.sort(key=lambda d: (str(d.get("created_at") or ""), str(d.get("id") or "")), reverse=True)
+    return [d['id'] for d in docs[:limit]], len(docs)
+
+
+def search_document_contents(
+    db,
+    tenant_id: str,
+    query: str,
+    document_type: str = "",
+    limit: int = 50,
+) -> Dict:
+    """
+    문서 내용 검색: 검색어의 모든 term 을 포함하는 문서
+
+    예: "DAL01-2012" → 해당 모델이 들어간 견적서/발주서
+        "75*75*2.0T 발주서" 는 parse_search_input 으로 문서타입을 분리한 뒤 호출
+
+    Returns:
+        {"items": [...], "total": int, "next_cursor": None, "source": "server" | "local"}
+    """
+    terms = query_terms(query)
+    if not terms:
+        return {"items": [], "total": 0, "next_cursor": None, "source": "local"}
+
+    if db is not None:
+        try:
+            doc_ids, total = _server_matching_documents(db, tenant_id, terms, document_type, limit)
+            if not doc_ids:
+                return {"items": [], "total": 0, "next_cursor": None, "source": "server"}
+
+            docs = (db.table('document_archive').select('*').eq('tenant_id', tenant_id).in_('id', doc_ids)
+                      .order('created_at', desc=True).order('id', desc=True).execute().data or [])
+            return {"items": docs, "total": total, "next_cursor": None, "source": "server"}
+        except Exception as e:
+            print(f"[WARN] content search failed, using local index: {e}")
+
+    docs = get_local_content_index(tenant_id).search(query, document_type, limit=limit)
+    return {"items": docs, "total": len(docs), "total_exact": False, "next_cursor": None, "source": "local"}
+
+
+def reindex_archive_contents(db, storage_manager, tenant_id: str, only_missing: bool = True) -> Dict[str, int]:
+    """
+    기존 보관 문서 일괄 색인 (초기 도입/백필용, 문서당 1회 다운로드)
+
+    Args:
+        only_missing: True 면 content_indexed_at 이 비어 있는 문서만 색인
+
+    Returns:
+        {"indexed": n, "failed": n}
+    """
+    stats = {"indexed": 0, "failed": 0}
+
+    def query():
+        q = db.table('document_archive').select('*').eq('tenant_id', tenant_id)
+        if only_missing:
+            q = q.is_('content_indexed_at', 'null')
+        return q.order('id')
+
+    docs = _fetch_all(query)
+
+    for doc in docs:
+        ok, file_bytes = storage_manager.download_file(doc.get('storage_path', ''))
+        if not ok:
+            stats["failed"] += 1
+            continue
+        success, _ = ingest_document(db, tenant_id, doc, file_bytes)
+        stats["indexed" if success else "failed"] += 1
+    return stats
@@ -0,0 +1,325 @@
+"""
+문서 보관함(document_archive) 검색 인덱스
+
+- 서버: 정규화 컬럼(search_text) pg_trgm GIN 인덱스 + (created_at, id) 커서 페이지네이션
+  (DDL: database/sql/document_archive_search.sql)
+- 로컬: 오프라인/테스트용 인프로세스 trigram 인덱스 (ArchiveSearchIndex)
+
+두 경로 모두 검색어를 search_query_text() 로 정규화해 같은 문자열에 부분 일치시킨다.
+('ABC-123' 과 'ABC123' 은 어느 쪽에서 검색해도 같은 결과)
+
+검색 결과는 항상 아래 형태의 dict 로 반환한다.
+    {"items": [...], "total": int, "total_exact": bool, "next_cursor": str | None,
+     "source": "server" | "local"}
+로컬 인덱스는 지금까지 조회/저장한 문서만 알고 있으므로 total_exact=False (최소 건수)
+"""
+
+from __future__ import annotations
+
+import base64
+import heapq
+import json
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+ARCHIVE_PAGE_SIZE = 50
+TRIGRAM_N = 3
+
+# 검색어에서 제거할 문자 (PostgREST or 필터 구문/ILIKE 와일드카드와 충돌)
+_UNSAFE_QUERY_CHARS = re.compile(r'[,()"\\*%]')
+# 정규화 시 무시할 구분자 (공백, 언더스코어, 하이픈, 점)
+_SEPARATORS = re.compile(r'[\s_\-.]+')
+
+
+# ============================================================================
+# 정규화 / n-gram
+# ============================================================================
+
+def normalize_archive_text(text) -> str:
+    """검색용 정규화: NFC + 소문자 + 구분자 제거 ('샘플 초등_견적서' → '샘플초등견적서')"""
+    if text is None:
+        return ""
+    s = unicodedata.normalize('NFC', str(text)).lower()
+    return _SEPARATORS.sub('', s)
+
+
+def make_ngrams(text: str, n: int = TRIGRAM_N) -> Set[str]:
+    """정규화된 문자열의 n-gram 집합 (n보다 짧으면 문자열 자체)"""
+    if not text:
+        return set()
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def sanitize_archive_query(query: str) -> str:
+    """서버 필터에 안전한 검색어로 정리"""
+    return _UNSAFE_QUERY_CHARS.sub(' ', query or '').strip()
+
+
+def search_query_text(query: str) -> str:
+    """서버/로컬 공통 검색어: 안전하지 않은 문자 제거 후 정규화 (search_text 컬럼과 같은 규칙)"""
+    return normalize_archive_text(sanitize_archive_query(query))
+
+
+# ============================================================================
+# 커서 (created_at, id) 인코딩
+# ============================================================================
+
+def encode_cursor(created_at: str, doc_id: str, total: Optional[int] = None) -> str:
+    """마지막 행의 (created_at, id)와 전체 건수를 커서 문자열로 인코딩"""
+    payload = {"c": created_at or "", "i": doc_id or ""}
+    if total is not None:
+        payload["t"] = int(total)
+    raw = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict]:
+    """커서 디코딩 (잘못된 값이면 None → 첫 페이지)"""
+    if not cursor:
+        return None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        return data if isinstance(data, dict) and "c" in data and "i" in data else None
+    except Exception:
+        return None
+
+
+def _sort_key(doc: Dict) -> Tuple[str, str]:
+    return (str(doc.get("created_at") or ""), str(doc.get("id") or ""))
+
+
+# ============================================================================
+# 로컬 인프로세스 인덱스
+# ============================================================================
+
+class ArchiveSearchIndex:
+    """
+    document_archive 메타데이터용 trigram 역색인
+
+    - project_name + filename 정규화 문자열의 trigram → 문서 ID 집합
+    - document_type → 문서 ID 집합
+    - 후보 교집합 후 부분 문자열 검증 (서버 ILIKE '%q%' 와 동일한 결과)
+    """
+
+    def __init__(self, n: int = TRIGRAM_N):
+        self.n = n
+        self._docs: Dict[str, Dict] = {}
+        self._haystack: Dict[str, str] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._type_index: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc: Dict) -> None:
+        """문서 메타데이터 추가/갱신 (id 필수)"""
+        doc_id = str(doc.get("id") or "")
+        if not doc_id:
+            return
+        with self._lock:
+            if doc_id in self._docs:
+                self._remove_locked(doc_id)
+            haystack = normalize_archive_text(doc.get("project_name")) + "\x1f" + \
+                normalize_archive_text(doc.get("filename"))
+            self._docs[doc_id] = dict(doc)
+            self._haystack[doc_id] = haystack
+            for part in haystack.split("\x1f"):
+                for gram in make_ngrams(part, self.n):
+                    self._grams.setdefault(gram, set()).add(doc_id)
+            self._type_index.setdefault(str(doc.get("document_type") or ""), set()).add(doc_id)
+
+    def add_many(self, docs: Iterable[Dict]) -> None:
+        for doc in docs or []:
+            self.add(doc)
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._remove_locked(str(doc_id))
+
+    def _remove_locked(self, doc_id: str) -> None:
+        doc = self._docs.pop(doc_id, None)
+        haystack = self._haystack.pop(doc_id, "")
+        if doc is None:
+            return
+        for part in haystack.split("\x1f"):
+            for gram in make_ngrams(part, self.n):
+                ids = self._grams.get(gram)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids:
+                        del self._grams[gram]
+        ids = self._type_index.get(str(doc.get("document_type") or ""))
+        if ids is not None:
+            ids.discard(doc_id)
+
+    def _candidates(self, query_norm: str, document_type: str) -> Set[str]:
+        if document_type:
+            base = set(self._type_index.get(document_type, set()))
+        else:
+            base = None
+
+        if not query_norm:
+            return base if base is not None else set(self._docs)
+
+        # 짧은 검색어(n 미만)는 gram 색인으로 좁힐 수 없으므로 정규화 문자열을 직접 확인
+        if len(query_norm) < self.n:
+            pool = base if base is not None else self._docs.keys()
+            return {d for d in pool if query_norm in self._haystack.get(d, "")}
+
+        grams = sorted(make_ngrams(query_norm, self.n),
+                       key=lambda g: len(self._grams.get(g, ())))
+        result: Optional[Set[str]] = base
+        for gram in grams:
+            ids = self._grams.get(gram)
+            if not ids:
+                return set()
+            result = set(ids) if result is None else (result & ids)
+            if not result:
+                return set()
+        if result is None:
+            return set()
+        return {d for d in result if query_norm in self._haystack.get(d, "")}
+
+    def search(
+        self,
+        query: str = "",
+        document_type: str = "",
+        limit: int = ARCHIVE_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Dict:
+        """
+        로컬 인덱스 검색
+
+        Args:
+            query: 프로젝트명/파일명 부분 검색어
+            document_type: 문서타입 필터 (quotation/po/bom, 빈 값이면 전체)
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor
+
+        Returns:
+            {"items", "total", "next_cursor", "source"}
+        """
+        q = search_query_text(query)
+        after = decode_cursor(cursor)
+        with self._lock:
+            ids = self._candidates(q, document_type or "")
+            total = len(ids)
+            keyed = ((_sort_key(self._docs[d]), d) for d in ids)
+            if after is not None:
+                bound = (after["c"], after["i"])
+                keyed = (kd for kd in keyed if kd[0] < bound)
+            top = heapq.nlargest(limit + 1, keyed)
+            items = [dict(self._docs[d]) for _, d in top[:limit]]
+
+        next_cursor = None
+        if len(top) > limit and items:
+            last = items[-1]
+            next_cursor = encode_cursor(last.get("created_at"), last.get("id"), total)
+        return {"items": items, "total": total, "total_exact": False, "next_cursor": next_cursor,
+                "source": "local"}
+
+
+_local_indexes: Dict[str, ArchiveSearchIndex] = {}
+_local_indexes_lock = threading.Lock()
+
+
+def get_local_archive_index(tenant_id: str) -> ArchiveSearchIndex:
+    """테넌트별 로컬 인덱스 (프로세스 단위 싱글톤)"""
+    with _local_indexes_lock:
+        index = _local_indexes.get(tenant_id)
+        if index is None:
+            index = ArchiveSearchIndex()
+            _local_indexes[tenant_id] = index
+        return index
+
+
+# ============================================================================
+# 서버 검색 (Supabase / PostgREST)
+# ============================================================================
+
+def search_archive_server(
+    db,
+    tenant_id: str,
+    query: str = "",
+    document_type: str = "",
+    limit: int = ARCHIVE_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Dict:
+    """
+    document_archive 서버 검색 (trigram 인덱스 + keyset 페이지네이션)
+
+    - 검색어는 정규화 컬럼 search_text (프로젝트명 + 파일명, 로컬 인덱스와 같은 규칙) 에 부분 일치
+    - 첫 페이지에서만 count='exact' 로 전체 건수를 구하고 커서에 실어 보낸다.
+    - 다음 페이지는 (created_at, id) < 커서 조건으로 OFFSET 없이 이어서 조회한다.
+    """
+    q = search_query_text(query)
+    after = decode_cursor(cursor)
+
+    if after is None:
+        req = db.table('document_archive').select('*', count='exact')
+    else:
+        req = db.table('document_archive').select('*')
+    req = req.eq('tenant_id', tenant_id)
+
+    if document_type:
+        req = req.eq('document_type', document_type)
+
+    # 검색어 조건과 커서 조건은 모두 OR 묶음이라 하나의 or 필터 안에서 AND 로 결합
+    text_cond = f"search_text.like.*{q}*" if q else ""
+    cursor_cond = ""
+    if after is not None:
+        c, i = after["c"], after["i"]
+        cursor_cond = f'created_at.lt."{c}",and(created_at.eq."{c}",id.lt."{i}")'
+    if text_cond and cursor_cond:
+        req = req.or_(f"and({text_cond},or({cursor_cond}))")
+    elif cursor_cond:
+        req = req.or_(cursor_cond)
+    elif text_cond:
+        req = req.like('search_text', f"%{q}%")
+
+    res = (req.order('created_at', desc=True)
+              .order('id', desc=True)
+              .limit(limit + 1)
+              .execute())
+    rows = res.data or []
+
+    if after is None:
+        total = res.count if getattr(res, 'count', None) is not None else len(rows)
+    else:
+        total = int(after.get("t", len(rows)))
+
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last.get("created_at"), last.get("id"), total)
+    return {"items": items, "total": total, "total_exact": True, "next_cursor": next_cursor, "source": "server"}
+
+
+def search_archive(
+    db,
+    tenant_id: str,
+    query: str = "",
+    document_type: str = "",
+    limit: int = ARCHIVE_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Dict:
+    """
+    보관함 검색: 서버 우선, 실패(오프라인 등) 시 로컬 인덱스로 대체
+
+    서버 결과는 로컬 인덱스에 누적되어 이후 오프라인 검색에 사용된다.
+    """
+    local = get_local_archive_index(tenant_id)
+    if db is not None:
+        try:
+            page = search_archive_server(db, tenant_id, query, document_type, limit, cursor)
+            local.add_many(page["items"])
+            return page
+        except Exception as e:
+            print(f"[WARN] archive server search failed, using local index: {e}")
+    return local.search(query, document_type, limit, cursor)
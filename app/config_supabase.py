@@ -19,6 +19,18 @@ SUPABASE_DEMO_KEY = os.getenv("SUPABASE_DEMO_KEY", None)
 # DB 모드 선택
 USE_SUPABASE = True  # True: Supabase 사용, False: SQLite 사용 (롤백용)
 
+# 오프라인 우선 모드 (공장 태블릿) - 로컬 SQLite 복제본에서 읽고 쓰고 Supabase 와 백그라운드 동기화
+WIP_OFFLINE_MODE = os.getenv("WIP_OFFLINE_MODE", "0") == "1"
+WIP_OFFLINE_DB_PATH = os.getenv("WIP_OFFLINE_DB_PATH", "wip_offline_replica.db")
+WIP_OFFLINE_TENANT = os.getenv("WIP_OFFLINE_TENANT", None)  # 복제 대상 고객사 (None 이면 전체)
+
+# 납기 경고 요약 메일 (백그라운드 스캐너) - 수신자가 없으면 경고 레벨만 저장
+WIP_ALERT_RECIPIENTS = [addr.strip() for addr in os.getenv("WIP_ALERT_RECIPIENTS", "").split(",") if addr.strip()]
+WIP_SMTP_HOST = os.getenv("WIP_SMTP_HOST", "smtp.naver.com")
+WIP_SMTP_PORT = int(os.getenv("WIP_SMTP_PORT", "587"))
+WIP_SMTP_USER = os.getenv("WIP_SMTP_USER", None)
+WIP_SMTP_PASSWORD = os.getenv("WIP_SMTP_PASSWORD", None)
+
 # 연결 타임아웃 설정
 SUPABASE_TIMEOUT = 10  # 10초 타임아웃
 
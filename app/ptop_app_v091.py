@@ -8,8 +8,6 @@ from datetime import datetime
 from datetime import date, timedelta
 import os
 import io
-import re
-from difflib import SequenceMatcher
 import shutil
 import os
 from pathlib import Path
@@ -616,29 +614,17 @@ DEFAULT_SPAN_WIDTH_M = 2.0
 def parse_width_m_from_standard(std: str, fallback=DEFAULT_SPAN_WIDTH_M):
     """
     model_standard에서 폭 정보를 m로 변환해 추출.
+    (규격 문자열별 파싱 결과는 utils.dimension_index 에서 캐시 - 모델 검색 색인과 공유)
     """
     if not std:
         return fallback
-    s = str(std)
-    m = re.search(r'[Ww\uFF37\ubc15]?\s*[-_×x]?\s*(\d{3,5})', s)
-    if m:
-        try:
-            mm = float(m.group(1))
-            if mm > 10:
-                return round(mm/1000.0, 3)
-            return mm
-        except:
-            pass
-    m2 = re.search(r'(\d{3,5})', s)
-    if m2:
-        try:
-            mm = float(m2.group(1))
-            if mm > 10:
-                return round(mm/1000.0, 3)
-            return mm
-        except:
-            pass
-    return fallback
+    from utils.dimension_index import legacy_width_mm
+    mm = legacy_width_mm(str(std))
+    if mm is None:
+        return fallback
+    if mm > 10:
+        return round(mm/1000.0, 3)
+    return mm
 
 PIPE_STANDARD_LENGTH_M = 6.0
 
@@ -817,6 +803,18 @@ class UnifiedQuotationSystem:
                 if inventory_map:
                     data['inventory'].rename(columns=inventory_map, inplace=True)
 
+            # 자재 검색 대상: 주자재 + 부자재 ('구분' 컬럼으로 구분)
+            from utils.model_search_index import build_material_frame, catalog_version
+            data['materials'] = build_material_frame(data['main_materials'], data['sub_materials'])
+
+            # 카탈로그 버전은 로드할 때 1회만 계산 (조회/검색 때마다 전체 해시하지 않음)
+            from utils.model_search_index import MATERIAL_SEARCH_COLUMNS
+            data['catalog_versions'] = {
+                'models': catalog_version(data['models']),
+                'materials': catalog_version(data['materials'], MATERIAL_SEARCH_COLUMNS),
+                'pricing': catalog_version(data['pricing'], list(data['pricing'].columns)),
+            }
+
             # BOM은 특정 모델에 대해서만 조회하므로 빈 DF로 초기화
             data['bom'] = pd.DataFrame()
             data['bom1'] = pd.DataFrame(columns=['model_id','material_name','standard','unit','quantity','category','notes'])
@@ -834,7 +832,9 @@ class UnifiedQuotationSystem:
                 'inventory': pd.DataFrame(),
                 'main_materials': pd.DataFrame(),
                 'sub_materials': pd.DataFrame(),
-                'bom1': pd.DataFrame()
+                'materials': pd.DataFrame(),
+                'bom1': pd.DataFrame(),
+                'catalog_versions': {}
             }
 
     def save_to_bom1_sheet(self, material_data):
@@ -865,35 +865,74 @@ class UnifiedQuotationSystem:
         """BOM 데이터 로드 (Supabase - 더 이상 BOM1 시트 사용 안함)"""
         return pd.DataFrame(columns=['model_id', 'material_name', 'standard', 'quantity', 'unit', 'category', 'notes'])
     
-    def search_model_price(self, model_name):
-        """모델 단가 검색"""
+    def _get_price_lookup(self):
+        """
+        모델명 → 단가행 조회표 (단가표 버전이 같으면 재사용, 버전은 load_data 에서 계산해 둔 값)
+
+        Returns:
+            (중복 제거된 pricing_df, {모델명: 행 위치}) 또는 (None, {})
+        """
         data = self.load_data()
         if not data:
-            return None
+            return None, {}
 
         pricing_df = data.get('pricing')
         if pricing_df is None or len(pricing_df) == 0:
             if st.session_state.get("_DBG", False):
                 st.warning("[DEBUG] pricing_df is empty or missing")
-            return None
+            return None, {}
 
         if '모델명' not in pricing_df.columns:
             if st.session_state.get("_DBG", False):
                 st.warning(f"[DEBUG] pricing_df columns: {list(pricing_df.columns)} — '모델명' 컬럼 없음")
+            return None, {}
+
+        version = data.get('catalog_versions', {}).get('pricing')
+        cached = getattr(self, '_price_lookup', None)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1], cached[2]
+
+        # 같은 모델명이 여러 행이면 첫 행 사용 (기존 exact_match.iloc[0] 과 동일)
+        names = pricing_df['모델명'].astype(str).str.strip()
+        first = ~names.duplicated(keep='first')
+        unique_df = pricing_df[first.values].reset_index(drop=True)
+        positions = {name: pos for pos, name in enumerate(names[first.values])}
+        self._price_lookup = (version, unique_df, positions)
+        return unique_df, positions
+
+    def search_model_price(self, model_name):
+        """모델 단가 검색"""
+        pricing_df, positions = self._get_price_lookup()
+        if pricing_df is None:
             return None
 
         model_clean = str(model_name).strip()
-        col = pricing_df['모델명'].astype(str).str.strip()
-        exact_match = pricing_df[col == model_clean]
-
-        if not exact_match.empty:
-            return exact_match.iloc[0]
+        pos = positions.get(model_clean)
+        if pos is not None:
+            return pricing_df.iloc[pos]
 
         if st.session_state.get("_DBG", False):
             st.warning(f"[DEBUG] price_miss(find_model_price): model={model_clean} | available_cols={list(pricing_df.columns)} | rows={len(pricing_df)}")
 
         return None
 
+    def search_model_prices(self, model_names):
+        """
+        여러 모델 단가 일괄 검색 (검색 결과 페이지용)
+
+        Args:
+            model_names: 모델명 목록
+
+        Returns:
+            {모델명: 단가행(Series) 또는 None}
+        """
+        pricing_df, positions = self._get_price_lookup()
+        result = {}
+        for name in model_names:
+            pos = positions.get(str(name).strip())
+            result[name] = pricing_df.iloc[pos] if pos is not None else None
+        return result
+
     def generate_quotation(self, site_info, items, contract_type="관급"):
         """견적서 생성"""
         quotation_items = []
@@ -1797,10 +1836,9 @@ class UnifiedQuotationSystem:
                 )
                 if search_query:
                     data = self.load_data()
-                    if 'material_search_system' not in st.session_state:
-                        st.session_state.material_search_system = EnhancedModelSearch(data['models'])
-                    search_system = st.session_state.material_search_system
-                    results = search_system.search_models(search_query)
+                    search_system = get_shared_model_search(
+                        data['models'], self.tenant_id, data.get('catalog_versions', {}).get('models'))
+                    results = incremental_search(search_system.index, search_query, 'material_model')
 
                     if not results.empty:
                         st.write(f"🔍 검색 결과: {len(results)}개 모델")
@@ -1810,6 +1848,7 @@ class UnifiedQuotationSystem:
                         st.markdown(f"**모델 선택 ({show_n}/{len(results)}개 표시):**")
 
                         selected_models = []
+                        page_prices = self.search_model_prices(results['model_name'].iloc[:show_n].tolist())
                         for idx in range(show_n):
                             row = results.iloc[idx]
                             c1, c2, c3 = st.columns([1, 3, 2])
@@ -1819,7 +1858,7 @@ class UnifiedQuotationSystem:
                                 st.write(f"**{row['model_name']}**")
                                 st.caption(f"{row['category']} | {row['model_standard']}")
                             with c3:
-                                price = self.search_model_price(row['model_name'])
+                                price = page_prices.get(row['model_name'])
                                 if price is not None:
                                     _ = st.success(f"💰 {int(price['단가']):,}원/{price['단위']}")
                                 else:
@@ -1864,37 +1903,45 @@ class UnifiedQuotationSystem:
                             st.session_state.current_selected_models = []
 
                 st.markdown("---")
-                st.subheader("🔎 부자재 검색 추가 (행별 경간당 수량 입력)")
+                st.subheader("🔎 자재 검색 추가 (주자재/부자재, 행별 경간당 수량 입력)")
                 search_material = st.text_input(
-                    "부자재 검색", 
-                    placeholder="예: 볼트, 너트, 실리콘, M12, Ø10 등",
+                    "자재 검색", 
+                    placeholder="예: 볼트, 너트, 실리콘, M12, Ø10, 각파이프, 50*50 등",
                     key="search_submaterial"
                 )
                 if search_material:
                     data = self.load_data()
-                    sub_df = data['sub_materials'].copy()
+                    materials_df = data.get('materials', pd.DataFrame())
 
-                    if sub_df.empty or '품목' not in sub_df.columns:
-                        st.warning("부자재 데이터가 없습니다.")
+                    if materials_df.empty or '품목' not in materials_df.columns:
+                        st.warning("자재 데이터가 없습니다.")
                     else:
-                        mask_item = sub_df['품목'].astype(str).str.contains(search_material, case=False, na=False)
-                        mask_spec = sub_df['규격'].astype(str).str.contains(search_material, case=False, na=False) if '규격' in sub_df.columns else False
-                        search_results = sub_df[mask_item | mask_spec]
+                        # 품목/규격 색인 검색 (초성 'ㅂㅌ', 입력 중 음절, 'x'/'*' 규격 표기 모두 지원)
+                        search_results = incremental_search(
+                            get_material_search_index(
+                                materials_df, self.tenant_id, data.get('catalog_versions', {}).get('materials')),
+                            search_material,
+                            'material', max_results=100,
+                        )
 
                         if not search_results.empty:
                             st.write(f"🔍 '{search_material}' 검색 결과: {len(search_results)}개")
                             for idx, (_, row) in enumerate(search_results.iterrows()):
                                 material_name = str(row.get('품목', ''))
                                 spec_display = str(row.get('규격', ''))
-                                unit_display = str(row.get('단위', 'EA'))
+                                unit_display = row.get('단위')
+                                unit_display = 'EA' if pd.isna(unit_display) or not str(unit_display).strip() else str(unit_display)
                                 unit_price = float(row.get('단가', 0) or 0)
+                                group_display = str(row.get('구분', ''))
 
                                 col1, col2, col3, col4 = st.columns([3, 4, 3, 2])
                                 with col1:
                                     st.write(f"**{material_name}**")
-                                    st.caption(f"규격: {spec_display}")
+                                    st.caption(f"{group_display} | 규격: {spec_display}")
                                 with col2:
-                                    st.caption(f"단위: {unit_display} | 단가: {int(unit_price):,}원")
+                                    pipe_length = row.get('파이프길이(m)')
+                                    length_display = f" | 길이: {pipe_length}m" if pd.notna(pipe_length) else ""
+                                    st.caption(f"단위: {unit_display} | 단가: {int(unit_price):,}원{length_display}")
                                 with col3:
                                     qty = st.number_input(
                                         "경간당 수량",
@@ -1917,7 +1964,7 @@ class UnifiedQuotationSystem:
                                                     'unit_price': unit_price,
                                                     'category': 'MANUAL',
                                                     'quantity': qty,
-                                                    'notes': '부자재검색추가',
+                                                    'notes': f"{group_display or '부자재'}검색추가",
                                                     'source': 'MANUAL'
                                                 })
                                             st.success(f"✅ '{material_name}' (규격: {spec_display}) 이/가 선택된 모델 세트에 추가되었습니다.")
@@ -2769,11 +2816,9 @@ class UnifiedQuotationSystem:
 
         if search_query:
             data = self.load_data()
-            if 'quote_search_system' not in st.session_state:
-                st.session_state.quote_search_system = EnhancedModelSearch(data['models'])
-
-            search_system = st.session_state.quote_search_system
-            results = search_system.search_models(search_query)
+            search_system = get_shared_model_search(
+                data['models'], self.tenant_id, data.get('catalog_versions', {}).get('models'))
+            results = incremental_search(search_system.index, search_query, 'quote_model')
 
             if not results.empty:
                 st.write(f"🔍 **검색 결과: {len(results)}개 모델**")
@@ -2784,6 +2829,7 @@ class UnifiedQuotationSystem:
                 show_n = min(st.session_state.quote_display_count, len(results))
                 st.caption(f"모델 선택 ({show_n}/{len(results)}개 표시):")
 
+                page_prices = self.search_model_prices(results['model_name'].iloc[:show_n].tolist())
                 for idx in range(show_n):
                     row = results.iloc[idx]
 
@@ -2799,7 +2845,7 @@ class UnifiedQuotationSystem:
 
                         if checkbox_value != is_selected:
                             if checkbox_value:
-                                price_info = self.search_model_price(row['model_name'])
+                                price_info = page_prices.get(row['model_name'])
 
                                 if price_info is not None:
                                     unit_display = price_info.get('단위', 'EA')
@@ -2831,7 +2877,7 @@ class UnifiedQuotationSystem:
                         st.caption(f"{row['category']} | {row['model_standard']}")
 
                     with col3:
-                        price = self.search_model_price(row['model_name'])
+                        price = page_prices.get(row['model_name'])
                         if price is not None:
                             unit_display = price.get('단위', 'EA')
                             if unit_display == '㎡':
@@ -3063,11 +3109,18 @@ class UnifiedQuotationSystem:
 
 # 기존 검색 시스템 클래스들 유지
 class EnhancedModelSearch:
-    """고급 모델 검색 시스템"""
+    """고급 모델 검색 시스템 (ModelSearchIndex 역색인 기반)"""
     
     def __init__(self, models_df):
+        from utils.model_search_index import ModelSearchIndex, SEARCH_COLUMNS
         self.models_df = models_df
-        self.search_columns = ['model_name', 'category', 'model_standard', '식별번호', 'description']
+        self.search_columns = list(SEARCH_COLUMNS)
+        # 카탈로그 버전당 1회 색인 (정규화 문자열 + bigram posting)
+        self.index = ModelSearchIndex(models_df, self.search_columns)
+
+    @property
+    def catalog_version(self):
+        return self.index.version
 
     def _ukey(self, scope, *parts):
         import re
@@ -3075,191 +3128,107 @@ class EnhancedModelSearch:
         return "v091_search_" + scope + "_" + "_".join(norm)
     
     def search_models(self, query, max_results=50):
-        """통합 검색 함수"""
-        if not query or not query.strip():
-            return self.models_df.head(20)
-        
-        query = query.strip()
-        search_results = []
-        
-        if query.isdigit():
-            results = self._search_by_identifier(query)
-            search_results.extend(results)
-        
-        dimension_results = self._search_by_dimensions(query)
-        search_results.extend(dimension_results)
-        
-        for column in self.search_columns:
-            if column in self.models_df.columns:
-                column_results = self._search_in_column(query, column)
-                search_results.extend(column_results)
-        
-        unique_results = self._remove_duplicates_and_score(search_results, query)
-        
-        sorted_results = sorted(unique_results, key=lambda x: x['relevance_score'], reverse=True)
-        
-        if sorted_results:
-            result_df = pd.DataFrame([item['model'] for item in sorted_results[:max_results]])
-            return result_df
-        else:
-            return pd.DataFrame()
-    
-    def _search_by_identifier(self, query):
-        """식별번호 검색"""
-        results = []
-        
-        if '식별번호' in self.models_df.columns:
-            mask = self.models_df['식별번호'].astype(str).str.contains(query, case=False, na=False)
-            matched = self.models_df[mask]
-            
-            for _, row in matched.iterrows():
-                results.append({
-                    'model': row.to_dict(),
-                    'match_type': 'identifier',
-                    'match_column': '식별번호',
-                    'match_value': str(row['식별번호'])
-                })
-        
-        return results
-    
-    def _search_by_dimensions(self, query):
-        """치수 기반 검색"""
-        results = []
-
-        patterns = [
-            r'w(\d+)', r'width(\d+)', r'폭(\d+)',
-            r'h(\d+)', r'height(\d+)', r'높이(\d+)',
-            r'(\d+)w', r'(\d+)h'
-        ]
-
-        # 쿼리 정규화: x 를 * 로 변환
-        normalized_query = self._normalize_search_string(query)
-        query_lower = normalized_query.lower()
-        extracted_numbers = []
-
-        for pattern in patterns:
-            matches = re.findall(pattern, query_lower)
-            extracted_numbers.extend(matches)
-
-        if query.isdigit() and int(query) >= 1000:
-            extracted_numbers.append(query)
-
-        if extracted_numbers and 'model_standard' in self.models_df.columns:
-            for number in extracted_numbers:
-                # DB 값도 정규화하여 비교 (* 로 통일)
-                mask = self.models_df['model_standard'].astype(str).apply(
-                    lambda x: number in self._normalize_search_string(x)
-                )
-                matched = self.models_df[mask]
-
-                for _, row in matched.iterrows():
-                    results.append({
-                        'model': row.to_dict(),
-                        'match_type': 'dimension',
-                        'match_column': 'model_standard',
-                        'match_value': row['model_standard']
-                    })
-
-        return results
+        """통합 검색 함수 (식별번호/치수/부분일치 → 관련도순)"""
+        return self.index.search(query, max_results=max_results)
     
     def _normalize_search_string(self, s: str) -> str:
         """검색 문자열 정규화: x 와 * 를 모두 * 로 통일"""
-        if not isinstance(s, str):
-            return str(s)
-        # x, X 를 * 로 변환 (DB 표준 형식에 맞춤)
-        return s.replace('x', '*').replace('X', '*').lower()
+        from utils.model_search_index import normalize_search_string
+        return normalize_search_string(s)
 
-    def _search_in_column(self, query, column):
-        """특정 컬럼에서 부분 검색 (정규화된 문자열 비교)"""
-        results = []
 
-        try:
-            # 검색 쿼리 정규화
-            normalized_query = self._normalize_search_string(query)
+@st.cache_resource(show_spinner=False)
+def _model_search_registry():
+    """프로세스 공용 모델 검색 색인 레지스트리 (테넌트 × 카탈로그 버전)"""
+    from utils.shared_index import SharedIndexRegistry
+    from utils.model_search_index import catalog_version
+    return SharedIndexRegistry(EnhancedModelSearch, version_fn=catalog_version, name="model_search")
 
-            # DB 값도 정규화하여 비교
-            mask = self.models_df[column].astype(str).apply(
-                lambda x: normalized_query in self._normalize_search_string(x)
-            )
-            matched = self.models_df[mask]
-
-            for _, row in matched.iterrows():
-                results.append({
-                    'model': row.to_dict(),
-                    'match_type': 'partial',
-                    'match_column': column,
-                    'match_value': str(row[column])
-                })
-        except Exception:
-            pass
 
-        return results
-    
-    def _remove_duplicates_and_score(self, search_results, query):
-        """중복 제거 및 관련도 점수 계산"""
-        unique_models = {}
-        
-        for result in search_results:
-            model = result['model']
-            model_id = model.get('model_id', '') or model.get('model_name', '')
-            
-            if model_id not in unique_models:
-                relevance_score = self._calculate_relevance_score(result, query)
-                
-                unique_models[model_id] = {
-                    'model': model,
-                    'relevance_score': relevance_score,
-                    'match_info': [result]
-                }
-            else:
-                unique_models[model_id]['match_info'].append(result)
-                new_score = self._calculate_relevance_score(result, query)
-                if new_score > unique_models[model_id]['relevance_score']:
-                    unique_models[model_id]['relevance_score'] = new_score
-        
-        return list(unique_models.values())
-    
-    def _calculate_relevance_score(self, result, query):
-        """관련도 점수 계산"""
-        score = 0
-        query_lower = query.lower()
-        
-        type_scores = {
-            'identifier': 100,
-            'dimension': 80,
-            'partial': 50
-        }
-        
-        score += type_scores.get(result['match_type'], 0)
-        
-        column_weights = {
-            'model_name': 30,
-            'category': 20,
-            'model_standard': 25,
-            '식별번호': 35,
-            'description': 10
-        }
-        
-        score += column_weights.get(result['match_column'], 0)
-        
-        match_value = str(result['match_value']).lower()
-        similarity = SequenceMatcher(None, query_lower, match_value).ratio()
-        score += similarity * 50
-        
-        if query_lower in match_value or match_value in query_lower:
-            score += 20
-        
-        return score
+@st.cache_resource(show_spinner=False)
+def _material_search_registry():
+    """프로세스 공용 자재 검색 색인 레지스트리 (테넌트 × 카탈로그 버전)"""
+    from utils.shared_index import SharedIndexRegistry
+    from utils.model_search_index import build_material_index, catalog_version, MATERIAL_SEARCH_COLUMNS
+    return SharedIndexRegistry(
+        build_material_index,
+        version_fn=lambda df: catalog_version(df, MATERIAL_SEARCH_COLUMNS),
+        name="material_search",
+    )
+
+
+def get_shared_model_search(models_df, tenant_id=None, version=None):
+    """
+    공유 모델 검색 시스템 - 세션마다 만들지 않고 테넌트별 1개를 함께 사용
+
+    카탈로그가 바뀌면 백그라운드에서 재색인되고, 완성 전까지는 이전 색인으로 검색한다.
+
+    Args:
+        models_df: 현재 모델 카탈로그
+        tenant_id: 테넌트 ID (None 이면 현재 세션 테넌트)
+        version: load_data()['catalog_versions']['models'] (None 이면 여기서 해시 - 재실행마다 비용 발생)
+
+    Returns:
+        EnhancedModelSearch (읽기 전용)
+    """
+    tenant = tenant_id or get_tenant_from_params()
+    lease = _model_search_registry().acquire(
+        tenant, models_df, version=version, current=st.session_state.get('_model_search_lease')
+    )
+    st.session_state['_model_search_lease'] = lease
+    return lease.index
+
+
+def incremental_search(index, query, scope, max_results=50):
+    """
+    세션별 증분 검색 - 이전 검색어를 이어 쓴 경우 그 결과 안에서만 다시 계산
+
+    공유 색인은 그대로 두고, 최근 검색어 결과 캐시만 세션에 보관한다.
+
+    Args:
+        index: ModelSearchIndex (공유, 읽기 전용)
+        query: 검색어
+        scope: 검색 화면 구분 (화면마다 캐시 분리)
+        max_results: 최대 결과 수
+
+    Returns:
+        검색 결과 DataFrame
+    """
+    from utils.model_search_index import IncrementalSearch
+
+    key = f'_incremental_search_{scope}'
+    searcher = st.session_state.get(key)
+    if searcher is None or searcher.index is not index:
+        searcher = IncrementalSearch(index)
+        st.session_state[key] = searcher
+    return searcher.search(query, max_results=max_results)
+
+
+def get_material_search_index(materials_df, tenant_id=None, version=None):
+    """
+    자재(품목/규격) 검색 색인 - 테넌트별 공유, 카탈로그 버전이 같으면 재사용
+
+    Args:
+        materials_df: load_data()['materials'] (build_material_frame() 결과 - 주자재 + 부자재)
+        tenant_id: 테넌트 ID (None 이면 현재 세션 테넌트)
+        version: load_data()['catalog_versions']['materials'] (None 이면 여기서 해시)
+
+    Returns:
+        ModelSearchIndex (초성·자모 검색 포함)
+    """
+    tenant = tenant_id or get_tenant_from_params()
+    lease = _material_search_registry().acquire(
+        tenant, materials_df, version=version, current=st.session_state.get('_material_search_lease')
+    )
+    st.session_state['_material_search_lease'] = lease
+    return lease.index
 
 
 # 검색 인터페이스 함수들
-def create_enhanced_search_interface(models_df, quotation_system, bom_df):
-    """고급 검색 인터페이스"""
-    
-    if 'unified_search_system' not in st.session_state:
-        st.session_state.unified_search_system = EnhancedModelSearch(models_df)
+def create_enhanced_search_interface(models_df, quotation_system, bom_df, catalog_version=None):
+    """고급 검색 인터페이스 (catalog_version: load_data()['catalog_versions']['models'])"""
     
-    search_system = st.session_state.unified_search_system
+    search_system = get_shared_model_search(models_df, getattr(quotation_system, 'tenant_id', None), catalog_version)
     
     col1, col2 = st.columns([3, 1])
     
@@ -3267,7 +3236,7 @@ def create_enhanced_search_interface(models_df, quotation_system, bom_df):
         search_query = st.text_input(
             "통합 모델 검색",
             placeholder="모델명, 카테고리, 치수(W2000, H1200), 식별번호 등 입력",
-            help="예: '디자인형', 'DAL', '2000', '24614649', 'W2000×H1200'",
+            help="예: '디자인형', 'ㄷㅈㅇ', 'DAL', '2000', '24614649', 'W2000×H1200', '디자인 2000'",
             key="unified_search"
         )
     
@@ -3277,11 +3246,14 @@ def create_enhanced_search_interface(models_df, quotation_system, bom_df):
     if search_query or search_button:
         if search_query:
             with st.spinner("검색 중..."):
-                search_results = search_system.search_models(search_query)
+                search_results = incremental_search(search_system.index, search_query, 'unified')
                 
                 if not search_results.empty:
                     st.success(f"검색 결과: {len(search_results)}개 모델 발견")
-                    display_unified_search_results(search_results, search_query, quotation_system, bom_df)
+                    display_unified_search_results(
+                        search_results, search_query, quotation_system, bom_df,
+                        catalog_version=search_system.catalog_version,
+                    )
                 else:
                     st.warning("검색 결과가 없습니다. 다른 키워드로 시도해보세요.")
                     show_unified_search_tips()
@@ -3289,11 +3261,57 @@ def create_enhanced_search_interface(models_df, quotation_system, bom_df):
             st.info("검색어를 입력해주세요.")
     else:
         st.subheader("전체 모델 목록 (처음 20개)")
-        display_unified_search_results(models_df.head(20), "", quotation_system, bom_df)
+        display_unified_search_results(
+            models_df.head(20), "", quotation_system, bom_df,
+            catalog_version=search_system.catalog_version,
+        )
+
+def get_search_page_bom(quotation_system, model_ids, version):
+    """
+    검색 결과 페이지의 주요 자재(BOM) - 페이지 단위 1회 일괄 조회 후 재사용
+
+    Args:
+        quotation_system: UnifiedQuotationSystem
+        model_ids: 현재 페이지의 모델 ID 목록
+        version: 카탈로그 버전 (바뀌면 캐시 폐기)
+
+    Returns:
+        {model_id: BOM DataFrame}
+    """
+    engine = quotation_system.engine
+    page_key = (getattr(engine, 'tenant', None), version, tuple(str(m) for m in model_ids))
+    cache = st.session_state.setdefault('_search_page_bom', {})
+    if cache.get('version') != version:
+        cache.clear()
+        cache['version'] = version
+    if page_key not in cache:
+        bom = engine.get_bom_batch(list(page_key[2]))
+        grouped = {}
+        if not bom.empty and 'model_id' in bom.columns:
+            for model_id, rows in bom.groupby(bom['model_id'].astype(str), sort=False):
+                grouped[model_id] = rows
+        cache[page_key] = grouped
+    return cache[page_key]
+
+
+def display_unified_search_results(results_df, search_query, quotation_system, bom_df, catalog_version=None):
+    """
+    검색 결과 표시
+
+    단가는 페이지 전체를 한 번에 조회하고, 주요 자재는 카드에서 펼칠 때
+    페이지 전체 BOM 을 1회 일괄 조회한다 (카드마다 조회하지 않음).
+    """
+    if results_df is None or results_df.empty:
+        return
+
+    if catalog_version is None:
+        from utils.model_search_index import catalog_version as _catalog_version
+        catalog_version = _catalog_version(results_df)
+
+    prices = quotation_system.search_model_prices(results_df['model_name'].tolist())
+    page_ids = results_df['model_id'].astype(str).tolist()
+    key_prefix = "q" if search_query else "all"
 
-def display_unified_search_results(results_df, search_query, quotation_system, bom_df):
-    """검색 결과 표시"""
-    
     for idx, (_, model) in enumerate(results_df.iterrows()):
         with st.expander(f"{model['model_name']} - {model['model_standard']}", expanded=False):
             col1, col2 = st.columns(2)
@@ -3308,17 +3326,21 @@ def display_unified_search_results(results_df, search_query, quotation_system, b
                     st.write(f"**식별번호:** {model['식별번호']}")
                 st.write(f"**설명:** {model['description']}")
             
-            price_info = quotation_system.search_model_price(model['model_name'])
+            price_info = prices.get(model['model_name'])
             if price_info is not None:
                 st.success(f"💰 단가: {price_info['단가']:,}원/{price_info['단위']}")
             else:
                 st.warning("단가 정보 없음")
             
-            model_bom = quotation_system.engine.get_bom(model['model_id'])
-            if not model_bom.empty:
-                st.write("**주요 자재:**")
-                for _, bom_item in model_bom.head(3).iterrows():
-                    st.write(f"- {bom_item['material_name']}: {bom_item['quantity']}{bom_item['unit']}")
+            if st.checkbox("📦 주요 자재 보기", key=f"unified_bom_{key_prefix}_{idx}_{model['model_id']}"):
+                page_bom = get_search_page_bom(quotation_system, page_ids, catalog_version)
+                model_bom = page_bom.get(str(model['model_id']))
+                if model_bom is not None and not model_bom.empty:
+                    st.write("**주요 자재:**")
+                    for _, bom_item in model_bom.head(3).iterrows():
+                        st.write(f"- {bom_item['material_name']}: {bom_item['quantity']}{bom_item['unit']}")
+                else:
+                    st.caption("등록된 BOM 없음")
             
             if search_query:
                 highlight_unified_matches(model, search_query)
@@ -3348,7 +3370,9 @@ def show_unified_search_tips():
     **검색 방법:**
     - **모델명**: `DAL`, `DHART`, `DHWS`, `DST` 등
     - **카테고리**: `디자인형` 입력시 디자인형울타리 전체 검색
+    - **초성**: `ㄷㅈㅇ` → 디자인형, `ㅂㄹㄷ` → 볼라드
     - **치수**: `2000`, `1200`, `W2000`, `H1500` 등
+    - **치수 범위**: `W1800-2200`, `H>=1200`, `폭1800~2200 H>=1200`
     - **식별번호**: `24614649`, `25320309` 등 8자리 숫자
     - **복합 검색**: `DAL 2000` (DAL 시리즈 중 2000 폭)
     """)
@@ -3362,65 +3386,138 @@ def parse_search_input(search_input: str) -> tuple[str, str]:
     """
     사용자 입력을 파싱하여 프로젝트명과 문서타입 분리
 
-    입력: "샘플 견적서"
-    출력: ("샘플", "quotation")
+    입력: "샘플 견적서" / "견적서 샘플" / "샘플 po"
+    출력: ("샘플", "quotation") / ("샘플", "quotation") / ("샘플", "po")
 
-    지원 문서타입:
-    - "견적서" → "quotation"
-    - "발주서" → "po"
-    - "내역서" → "bom"
+    지원 문서타입 (앞/뒤 어느 위치든 인식):
+    - "견적서", "견적", "quotation" → "quotation"
+    - "발주서", "발주", "po" → "po"
+    - "내역서", "내역", "bom" → "bom"
     """
-    search_lower = search_input.lower().strip()
+    text = (search_input or "").strip()
 
-    # 문서타입 매핑
+    # 문서타입 매핑 (긴 단어 우선)
     doc_type_map = {
         "견적서": "quotation",
         "발주서": "po",
         "내역서": "bom",
+        "견적": "quotation",
+        "발주": "po",
+        "내역": "bom",
+        "quotation": "quotation",
+        "po": "po",
+        "bom": "bom",
     }
 
-    # 마지막 단어가 문서타입인지 확인
-    for korean_type, english_type in doc_type_map.items():
+    # 1) 공백으로 분리된 단어 중 문서타입 단어 (첫/마지막 단어)
+    tokens = text.split()
+    if len(tokens) > 1:
+        for pos in (-1, 0):
+            word = tokens[pos].lower()
+            if word in doc_type_map:
+                rest = tokens[:pos] if pos == -1 else tokens[1:]
+                return " ".join(rest).strip(), doc_type_map[word]
+
+    # 2) 붙여 쓴 경우: 마지막 단어가 문서타입 (예: "샘플견적서")
+    search_lower = text.lower()
+    for korean_type in ("견적서", "발주서", "내역서"):
         if search_lower.endswith(korean_type):
-            project_name = search_input[:-(len(korean_type))].strip()
-            return project_name, english_type
+            return text[:-(len(korean_type))].strip(), doc_type_map[korean_type]
+
+    # 3) 문서타입 단어만 입력한 경우: 해당 타입 전체
+    if search_lower in doc_type_map:
+        return "", doc_type_map[search_lower]
 
     # 문서타입을 찾지 못한 경우 전체를 프로젝트명으로 처리
-    return search_input.strip(), ""
+    return text, ""
+
+
+def search_documents_page(
+    db,
+    tenant_id: str,
+    project_name: str,
+    document_type: str,
+    limit: int = 50,
+    cursor: str = None,
+) -> dict:
+    """
+    문서 보관함 페이지 검색 (trigram 인덱스 + 커서 페이지네이션)
+
+    Args:
+        db: Supabase 클라이언트 (None 이면 로컬 인덱스만 사용)
+        tenant_id: 테넌트 ID
+        project_name: 프로젝트명/파일명 부분 검색어
+        document_type: 문서타입 (quotation/po/bom, 빈 값이면 전체)
+        limit: 페이지 크기
+        cursor: 이전 페이지 결과의 next_cursor
 
+    Returns:
+        {"items": [...], "total": 전체건수, "total_exact": 로컬 결과면 False (최소 건수),
+         "next_cursor": 다음페이지커서 또는 None, "source": "server"/"local"}
+    """
+    try:
+        from app.archive_search import search_archive
+        return search_archive(db, tenant_id, project_name, document_type, limit=limit, cursor=cursor)
+    except Exception as e:
+        st.error(f"검색 중 오류 발생: {e}")
+        return {"items": [], "total": 0, "next_cursor": None, "source": "server"}
 
-def search_documents(db, tenant_id: str, project_name: str, document_type: str) -> list:
+
+def search_documents(db, tenant_id: str, project_name: str, document_type: str, limit: int = 50) -> list:
     """
-    DB에서 문서 검색
+    DB에서 문서 검색 (첫 페이지만 반환, 이어보기는 search_documents_page 사용)
 
     Args:
         db: DatabaseManager 인스턴스
         tenant_id: 테넌트 ID
         project_name: 프로젝트명 (부분 검색)
         document_type: 문서타입 (quotation/po/bom)
+        limit: 최대 건수
 
     Returns:
-        검색 결과 (딕셔너리 리스트)
+        검색 결과 (딕셔너리 리스트, 생성 날짜 역순)
+    """
+    return search_documents_page(db, tenant_id, project_name, document_type, limit=limit)["items"]
+
+
+def _index_archived_document(tenant_id: str, archive_data: dict, db=None, file_bytes: bytes = None) -> None:
+    """
+    보관 직후 검색 인덱스에 반영 (실패해도 저장 흐름에는 영향 없음)
+
+    - 파일명/프로젝트명: 로컬 trigram 인덱스
+    - 문서 내용(file_bytes 가 있을 때): 셀 텍스트/품목 행 → document_archive_terms
+      (백그라운드 대기열에서 모아서 색인 - 저장 응답을 기다리게 하지 않음)
     """
     try:
-        query = db.table('document_archive').select('*').eq('tenant_id', tenant_id)
+        from app.archive_search import get_local_archive_index
+        get_local_archive_index(tenant_id).add(archive_data)
+    except Exception as e:
+        print(f"[WARN] archive index update failed: {e}")
 
-        # 프로젝트명 검색 (부분 일치)
-        if project_name:
-            query = query.ilike('project_name', f'%{project_name}%')
+    if file_bytes:
+        try:
+            from app.archive_content_index import enqueue_ingest
+            enqueue_ingest(db, tenant_id, archive_data, file_bytes)
+        except Exception as e:
+            print(f"[WARN] archive content ingest failed: {e}")
 
-        # 문서타입 필터 (정확 일치)
-        if document_type:
-            query = query.eq('document_type', document_type)
 
-        # 생성 날짜 역순 정렬
-        query = query.order('created_at', desc=True)
+def search_document_contents(db, tenant_id: str, query: str, document_type: str = "", limit: int = 50) -> dict:
+    """
+    문서 내용 검색 (모델 코드, 규격, 자재명)
+
+    예: "DAL01-2012" → 해당 모델이 포함된 견적서/발주서
+        "75*75*2.0T" → 해당 규격 파이프를 발주한 발주서
 
-        result = query.execute()
-        return result.data or []
+    Returns:
+        {"items": [...], "total": 건수, "next_cursor": None, "source": "server"/"local"}
+    """
+    try:
+        from app.archive_content_index import search_document_contents as _search_contents
+        return _search_contents(db, tenant_id, query, document_type, limit=limit)
     except Exception as e:
-        st.error(f"검색 중 오류 발생: {e}")
-        return []
+        st.error(f"내용 검색 중 오류 발생: {e}")
+        return {"items": [], "total": 0, "next_cursor": None, "source": "server"}
 
 
 def generate_document_filename(db, project_name: str, document_type_korean: str) -> str:
@@ -3569,6 +3666,7 @@ def upload_document_to_archive(
             storage_manager.delete_file(storage_path)
             return False, "DB 저장 실패"
 
+        _index_archived_document(tenant_id, archive_data, db=db, file_bytes=file_bytes)
         return True, f"✅ {filename} 업로드 완료"
     except Exception as e:
         return False, f"업로드 중 오류: {str(e)}"
@@ -3595,6 +3693,14 @@ def delete_document_from_archive(
         response = db.table('document_archive').delete().eq('id', document_id).execute()
 
         if response.data:
+            try:
+                from app.archive_search import get_local_archive_index
+                from app.archive_content_index import get_local_content_index
+                for row in response.data:
+                    get_local_archive_index(row.get('tenant_id', '')).remove(document_id)
+                    get_local_content_index(row.get('tenant_id', '')).remove(document_id)
+            except Exception:
+                pass
             return True, "✅ 문서가 삭제되었습니다"
         else:
             return False, "DB 삭제 실패"
@@ -3688,6 +3794,7 @@ def save_generated_document_to_archive(
             error_msg = getattr(response, 'error', 'Unknown error')
             return False, f"DB 저장 실패: {error_msg}"
 
+        _index_archived_document(tenant_id, archive_data, db=db, file_bytes=file_bytes)
         return True, f"✅ {filename} 저장 완료"
 
     except Exception as e:
@@ -3794,7 +3901,8 @@ def main(mode="pilot"):
     with tab4:
         st.header("🔍 모델 조회")
         
-        create_enhanced_search_interface(data['models'], qs, data['bom'])
+        create_enhanced_search_interface(data['models'], qs, data['bom'],
+                                         data.get('catalog_versions', {}).get('models'))
 
     with tab5:
         st.header("📦 재고 현황")
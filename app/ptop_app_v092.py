@@ -30,7 +30,8 @@ from app.ptop_app_v091 import (
     calculate_span_count_from_total_length,
     # 문서 관리 함수
     parse_search_input,
-    search_documents,
+    search_documents_page,
+    search_document_contents,
     validate_filename,
     upload_document_to_archive,
     delete_document_from_archive,
@@ -624,15 +625,31 @@ def _render_document_management(db, tenant_id: str):
     )
 
     search_col1, search_col2 = st.columns([3, 1])
+    with search_col1:
+        search_scope = st.radio(
+            "검색 대상",
+            ["프로젝트/파일명", "문서 내용"],
+            horizontal=True,
+            help="문서 내용: 모델 코드(DAL01-2012), 규격(75*75*2.0T), 자재명으로 검색",
+            key="doc_search_scope",
+        )
     with search_col2:
         search_button = st.button("🔍 검색", use_container_width=True, key="doc_search_btn")
 
-    # 검색 버튼 클릭 시 결과를 session state에 저장
+    # 검색 버튼 클릭 시 첫 페이지를 session state에 저장 (커서로 이어보기)
     if search_button and search_input.strip():
         project_name, document_type = parse_search_input(search_input)
-        if project_name:
-            results = search_documents(db, tenant_id, project_name, document_type)
-            st.session_state.doc_search_results = results
+        if project_name or document_type:
+            if search_scope == "문서 내용" and project_name:
+                page = search_document_contents(db, tenant_id, project_name, document_type)
+            else:
+                page = search_documents_page(db, tenant_id, project_name, document_type)
+            st.session_state.doc_search_query = (project_name, document_type)
+            st.session_state.doc_search_results = page["items"]
+            st.session_state.doc_search_total = page["total"]
+            st.session_state.doc_search_total_exact = page.get("total_exact", True)
+            st.session_state.doc_search_cursor = page["next_cursor"]
+            st.session_state.doc_search_source = page.get("source", "server")
             st.session_state.doc_last_search = search_input
         else:
             st.session_state.doc_search_results = None
@@ -649,7 +666,23 @@ def _render_document_management(db, tenant_id: str):
         if not results:
             st.info("검색 결과가 없습니다.")
         else:
-            st.success(f"✅ {len(results)}개의 파일을 찾았습니다.")
+            total = st.session_state.get("doc_search_total", len(results))
+            at_least = "" if st.session_state.get("doc_search_total_exact", True) else " 이상"
+            st.success(f"✅ {total:,}개{at_least}의 파일을 찾았습니다. (표시 {len(results):,}개)")
+            if st.session_state.get("doc_search_source") == "local":
+                st.caption("⚠️ 서버 연결 실패 - 로컬 인덱스 결과입니다. (이 기기에서 조회/저장한 문서만 포함)")
+
+            # 다음 페이지 (keyset 커서)
+            if st.session_state.get("doc_search_cursor"):
+                if st.button("⬇️ 더 보기", key="doc_search_more"):
+                    project_name, document_type = st.session_state.get("doc_search_query", ("", ""))
+                    page = search_documents_page(
+                        db, tenant_id, project_name, document_type,
+                        cursor=st.session_state.doc_search_cursor,
+                    )
+                    st.session_state.doc_search_results = results + page["items"]
+                    st.session_state.doc_search_cursor = page["next_cursor"]
+                    st.rerun()
 
             result_data = []
             doc_metadata = {}
@@ -871,7 +904,8 @@ def main(mode: str = "pilot"):
             st.error(f"발주서 생성 오류: {e}")
     elif view == "🔍 모델 조회":
         st.header("🔍 모델 조회")
-        create_enhanced_search_interface(data.get('models', pd.DataFrame()), qs, data.get('bom', pd.DataFrame()))
+        create_enhanced_search_interface(data.get('models', pd.DataFrame()), qs, data.get('bom', pd.DataFrame()),
+                                         data.get('catalog_versions', {}).get('models'))
     elif view == "📦 재고 현황":
         _render_inventory(data)
     elif view == "🧩 BOM 편집":
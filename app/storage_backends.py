@@ -0,0 +1,297 @@
+# storage_backends.py
+# StorageManager 저장소 백엔드
+# - SupabaseStorageBackend: Supabase Storage (대용량 파일은 TUS 재개 가능 분할 업로드, 스트리밍 다운로드)
+# - LocalStorageBackend  : 로컬 파일시스템 (온프레미스/네트워크 없는 테스트용)
+#
+# 백엔드 선택: PTOP_STORAGE_BACKEND=supabase(기본) | local
+#             PTOP_LOCAL_STORAGE_DIR=로컬 저장 루트 (local 백엔드)
+
+from __future__ import annotations
+
+import base64
+import io
+import os
+import shutil
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+DataSource = Union[bytes, bytearray, BinaryIO]
+
+CHUNK_SIZE = 6 * 1024 * 1024              # Supabase 재개 업로드 청크 크기 (6MB 고정)
+RESUMABLE_THRESHOLD = 6 * 1024 * 1024     # 이 크기를 넘으면 분할 업로드
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_RETRIES = 3
+
+
+def _as_stream(data: DataSource) -> Tuple[BinaryIO, Optional[int]]:
+    """bytes 또는 파일 객체 → (파일 객체, 전체 크기 또는 None)"""
+    if isinstance(data, (bytes, bytearray)):
+        return io.BytesIO(data), len(data)
+    size = None
+    try:
+        pos = data.tell()
+        data.seek(0, os.SEEK_END)
+        size = data.tell() - pos
+        data.seek(pos)
+    except Exception:
+        pass
+    return data, size
+
+
+class StorageBackend(ABC):
+    """저장소 백엔드 인터페이스 (목록 항목은 Supabase list 형식과 동일, 추상 메서드를 모두 구현해야 생성 가능)"""
+
+    name = "base"
+
+    @abstractmethod
+    def upload(self, path: str, data: DataSource, content_type: str, upsert: bool = False) -> None:
+        ...
+
+    @abstractmethod
+    def download_to(self, path: str, fileobj: BinaryIO) -> int:
+        """파일 내용을 fileobj 에 스트리밍으로 기록하고 바이트 수 반환"""
+
+    def download(self, path: str) -> bytes:
+        buf = io.BytesIO()
+        self.download_to(path, buf)
+        return buf.getvalue()
+
+    @abstractmethod
+    def remove(self, paths: List[str]) -> None:
+        ...
+
+    @abstractmethod
+    def list(self, prefix: str) -> List[dict]:
+        """
+        폴더 목록
+
+        Returns:
+            [{"name": 파일명, "updated_at": ISO 시각, "metadata": {"size": n, "eTag": "..."}}, ...]
+        """
+
+    def public_url(self, path: str) -> str:
+        return ""
+
+
+# ============================================================================
+# 로컬 파일시스템
+# ============================================================================
+
+class LocalStorageBackend(StorageBackend):
+    """로컬 디렉토리를 버킷처럼 사용 (root/bucket/path)"""
+
+    name = "local"
+
+    def __init__(self, root: str, bucket: str):
+        self.base = os.path.abspath(os.path.join(root, bucket))
+        os.makedirs(self.base, exist_ok=True)
+
+    def _full(self, path: str) -> str:
+        full = os.path.abspath(os.path.join(self.base, path.lstrip("/")))
+        if not (full == self.base or full.startswith(self.base + os.sep)):
+            raise ValueError(f"잘못된 저장 경로: {path}")
+        return full
+
+    def upload(self, path: str, data: DataSource, content_type: str, upsert: bool = False) -> None:
+        full = self._full(path)
+        if os.path.exists(full) and not upsert:
+            raise FileExistsError(f"이미 존재하는 파일: {path}")
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        stream, _ = _as_stream(data)
+        tmp = full + ".part"
+        with open(tmp, "wb") as f:
+            shutil.copyfileobj(stream, f, DOWNLOAD_CHUNK_SIZE)
+        os.replace(tmp, full)
+
+    def download_to(self, path: str, fileobj: BinaryIO) -> int:
+        total = 0
+        with open(self._full(path), "rb") as f:
+            while True:
+                chunk = f.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                fileobj.write(chunk)
+                total += len(chunk)
+        return total
+
+    def remove(self, paths: List[str]) -> None:
+        for path in paths:
+            try:
+                os.remove(self._full(path))
+            except FileNotFoundError:
+                pass
+
+    def list(self, prefix: str) -> List[dict]:
+        folder = self._full(prefix)
+        if not os.path.isdir(folder):
+            return []
+        items = []
+        for name in sorted(os.listdir(folder)):
+            if name.endswith(".part"):
+                continue
+            full = os.path.join(folder, name)
+            st_ = os.stat(full)
+            if os.path.isdir(full):
+                items.append({"name": name, "id": None, "metadata": None})
+                continue
+            updated = datetime.fromtimestamp(st_.st_mtime, tz=timezone.utc).isoformat()
+            items.append({
+                "name": name,
+                "id": name,
+                "updated_at": updated,
+                "metadata": {"size": st_.st_size, "eTag": f"{st_.st_mtime_ns:x}-{st_.st_size:x}"},
+            })
+        return items
+
+    def public_url(self, path: str) -> str:
+        return "file://" + self._full(path)
+
+
+# ============================================================================
+# Supabase Storage
+# ============================================================================
+
+class SupabaseStorageBackend(StorageBackend):
+    """
+    Supabase Storage 백엔드
+
+    - 작은 파일: bucket.upload (기존 방식)
+    - 큰 파일  : TUS 재개 업로드 (/storage/v1/upload/resumable, 6MB 청크)
+                 실패한 청크는 HEAD 로 서버 오프셋을 확인 후 이어서 전송
+    - 다운로드 : /storage/v1/object/authenticated 스트리밍 (청크 단위로 fileobj 에 기록)
+    """
+
+    name = "supabase"
+
+    def __init__(self, url: str, key: str, bucket: str):
+        if not url or not key:
+            raise RuntimeError("Supabase 접속정보가 없습니다. SUPABASE_URL / SUPABASE_KEY 설정 확인")
+        from supabase import create_client
+
+        self.url = url.rstrip("/")
+        self.key = key
+        self.bucket_name = bucket
+        self.client = create_client(url, key)
+        # (path, size) → 진행 중인 재개 업로드 URL (같은 프로세스 내 재시도 시 이어 올리기)
+        self._resume_urls: Dict[Tuple[str, int], str] = {}
+
+    @property
+    def bucket(self):
+        return self.client.storage.from_(self.bucket_name)
+
+    def _headers(self, extra: Optional[dict] = None) -> dict:
+        headers = {"Authorization": f"Bearer {self.key}", "apikey": self.key}
+        if extra:
+            headers.update(extra)
+        return headers
+
+    def upload(self, path: str, data: DataSource, content_type: str, upsert: bool = False) -> None:
+        stream, size = _as_stream(data)
+        if size is not None and size <= RESUMABLE_THRESHOLD:
+            options = {"content-type": content_type}
+            if upsert:
+                options["upsert"] = "true"
+            self.bucket.upload(path=path, file=stream.read(), file_options=options)
+            return
+        if size is None:
+            # 크기를 알 수 없는 스트림은 임시 파일로 흘려 크기 확정 (메모리 버퍼링 없음)
+            import tempfile
+            spool = tempfile.TemporaryFile()
+            shutil.copyfileobj(stream, spool, DOWNLOAD_CHUNK_SIZE)
+            size = spool.tell()
+            spool.seek(0)
+            stream = spool
+        self._upload_resumable(path, stream, size, content_type, upsert)
+
+    def _upload_resumable(self, path: str, stream: BinaryIO, size: int, content_type: str, upsert: bool) -> None:
+        import httpx
+
+        def b64(v: str) -> str:
+            return base64.b64encode(v.encode("utf-8")).decode("ascii")
+
+        endpoint = f"{self.url}/storage/v1/upload/resumable"
+        start = stream.tell()
+        with httpx.Client(timeout=120) as http:
+            upload_url = self._resume_urls.get((path, size))
+            if upload_url is None:
+                resp = http.post(endpoint, headers=self._headers({
+                    "Tus-Resumable": "1.0.0",
+                    "Upload-Length": str(size),
+                    "Upload-Metadata": ",".join([
+                        f"bucketName {b64(self.bucket_name)}",
+                        f"objectName {b64(path)}",
+                        f"contentType {b64(content_type)}",
+                        f"cacheControl {b64('3600')}",
+                    ]),
+                    "x-upsert": "true" if upsert else "false",
+                }))
+                resp.raise_for_status()
+                upload_url = resp.headers["Location"]
+                if upload_url.startswith("/"):
+                    upload_url = self.url + upload_url
+                self._resume_urls[(path, size)] = upload_url
+
+            offset = self._server_offset(http, upload_url)
+            retries = 0
+            while offset < size:
+                stream.seek(start + offset)
+                chunk = stream.read(CHUNK_SIZE)
+                try:
+                    resp = http.patch(upload_url, content=chunk, headers=self._headers({
+                        "Tus-Resumable": "1.0.0",
+                        "Upload-Offset": str(offset),
+                        "Content-Type": "application/offset+octet-stream",
+                    }))
+                    resp.raise_for_status()
+                    offset = int(resp.headers.get("Upload-Offset", offset + len(chunk)))
+                    retries = 0
+                except Exception:
+                    retries += 1
+                    if retries > MAX_CHUNK_RETRIES:
+                        raise
+                    time.sleep(min(2 ** retries, 10))
+                    # 서버가 실제로 받은 위치부터 재전송
+                    offset = self._server_offset(http, upload_url)
+
+        self._resume_urls.pop((path, size), None)
+
+    def _server_offset(self, http, upload_url: str) -> int:
+        resp = http.head(upload_url, headers=self._headers({"Tus-Resumable": "1.0.0"}))
+        resp.raise_for_status()
+        return int(resp.headers.get("Upload-Offset", 0))
+
+    def download_to(self, path: str, fileobj: BinaryIO) -> int:
+        import httpx
+        from urllib.parse import quote
+
+        total = 0
+        url = f"{self.url}/storage/v1/object/authenticated/{self.bucket_name}/{quote(path)}"
+        with httpx.stream("GET", url, headers=self._headers(), timeout=120) as resp:
+            resp.raise_for_status()
+            for chunk in resp.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                fileobj.write(chunk)
+                total += len(chunk)
+        return total
+
+    def download(self, path: str) -> bytes:
+        return self.bucket.download(path)
+
+    def remove(self, paths: List[str]) -> None:
+        self.bucket.remove(paths)
+
+    def list(self, prefix: str) -> List[dict]:
+        return self.bucket.list(prefix) or []
+
+    def public_url(self, path: str) -> str:
+        return self.bucket.get_public_url(path)
+
+
+def create_storage_backend(bucket: str, url: str = "", key: str = "") -> StorageBackend:
+    """환경변수 PTOP_STORAGE_BACKEND 에 따라 백엔드 생성"""
+    kind = (os.getenv("PTOP_STORAGE_BACKEND") or "supabase").strip().lower()
+    if kind == "local":
+        root = os.getenv("PTOP_LOCAL_STORAGE_DIR") or os.path.join(os.getcwd(), "local_storage")
+        return LocalStorageBackend(root, bucket)
+    return SupabaseStorageBackend(url, key, bucket)
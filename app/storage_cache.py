@@ -0,0 +1,245 @@
+# storage_cache.py
+# StorageManager 다운로드용 로컬 디스크 캐시 (LRU, 용량 제한)
+# - 저장 경로(storage_path) → 내용 해시(sha256) 매핑, 본문은 해시 이름의 blob 파일로 저장
+#   (같은 내용의 템플릿/문서는 blob 1개를 공유)
+# - 일정 시간이 지난 항목은 Storage 목록의 eTag/크기/수정시각으로 재검증
+# - 목록(list) 결과는 짧은 TTL 로 메모리 캐시
+# - 적중/실패 카운터 (stats)
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "aegis_storage_cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024     # 512MB
+DEFAULT_REVALIDATE_AFTER = 300            # 5분 이내 항목은 재검증 없이 사용
+DEFAULT_LIST_TTL = 30                     # 목록 캐시 30초
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_fingerprint(entry: Optional[dict]) -> Optional[str]:
+    """
+    Storage 목록 항목 → 변경 감지용 지문 (eTag 우선, 없으면 크기+수정시각)
+
+    entry 예: {"name": "...", "updated_at": "...", "metadata": {"eTag": "...", "size": 123}}
+    """
+    if not entry:
+        return None
+    meta = entry.get("metadata") or {}
+    etag = meta.get("eTag") or meta.get("etag")
+    if etag:
+        return str(etag)
+    size = meta.get("size") or meta.get("contentLength")
+    updated = entry.get("updated_at") or meta.get("lastModified")
+    if size is None and updated is None:
+        return None
+    return f"{size}:{updated}"
+
+
+class StorageDiskCache:
+    """용량 제한 LRU 디스크 캐시"""
+
+    INDEX_FILE = "index.json"
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        revalidate_after: float = DEFAULT_REVALIDATE_AFTER,
+        list_ttl: float = DEFAULT_LIST_TTL,
+    ):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.max_bytes = int(max_bytes)
+        self.revalidate_after = revalidate_after
+        self.list_ttl = list_ttl
+        self._lock = threading.RLock()
+        # storage_path → {"hash", "size", "fingerprint", "validated_at"}  (앞쪽이 가장 오래 안 쓴 항목)
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lists: Dict[str, Tuple[float, List[dict]]] = {}
+        self.counters = {
+            "hits": 0, "misses": 0, "revalidated": 0, "stale": 0,
+            "evictions": 0, "list_hits": 0, "list_misses": 0,
+        }
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._load_index()
+
+    # ------------------------------------------------------------------
+    # 인덱스 영속화
+    # ------------------------------------------------------------------
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    def _load_index(self) -> None:
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for path, entry in data.get("entries", []):
+                if os.path.exists(self._blob_path(entry["hash"])):
+                    self._entries[path] = entry
+        except Exception:
+            self._entries = OrderedDict()
+
+    def _save_index(self) -> None:
+        tmp = self._index_path() + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"entries": list(self._entries.items())}, f, ensure_ascii=False)
+            os.replace(tmp, self._index_path())
+        except Exception as e:
+            print(f"[WARN] storage cache index save failed: {e}")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest)
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+    def get(self, storage_path: str, revalidate: Optional[Callable[[str], Optional[str]]] = None) -> Optional[bytes]:
+        """
+        캐시 조회
+
+        Args:
+            storage_path: Storage 내 경로
+            revalidate: 재검증 함수 (storage_path → 현재 지문). 재검증 주기가 지난 항목에만 호출
+
+        Returns:
+            파일 바이트 (없거나 변경되었으면 None)
+        """
+        with self._lock:
+            entry = self._entries.get(storage_path)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+
+            if revalidate is not None and time.time() - entry.get("validated_at", 0) > self.revalidate_after:
+                current = revalidate(storage_path)
+                if current is not None and entry.get("fingerprint") not in (None, current):
+                    self.counters["stale"] += 1
+                    self.counters["misses"] += 1
+                    self._drop(storage_path)
+                    self._save_index()
+                    return None
+                entry["validated_at"] = time.time()
+                if current is not None:
+                    entry["fingerprint"] = current
+                self.counters["revalidated"] += 1
+
+            try:
+                with open(self._blob_path(entry["hash"]), "rb") as f:
+                    data = f.read()
+            except OSError:
+                data = None
+            if data is None or content_hash(data) != entry["hash"]:
+                # blob 손상/삭제 → 미스 처리
+                self.counters["misses"] += 1
+                self._drop(storage_path)
+                self._save_index()
+                return None
+
+            self._entries.move_to_end(storage_path)
+            self.counters["hits"] += 1
+            return data
+
+    def put(self, storage_path: str, data: bytes, fingerprint: Optional[str] = None) -> None:
+        """다운로드/업로드한 파일 저장 후 용량 초과분 LRU 제거"""
+        if data is None or len(data) > self.max_bytes:
+            return
+        digest = content_hash(data)
+        with self._lock:
+            blob = self._blob_path(digest)
+            if not os.path.exists(blob):
+                tmp = blob + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, blob)
+            self._drop(storage_path, keep_blob=digest)
+            self._entries[storage_path] = {
+                "hash": digest,
+                "size": len(data),
+                "fingerprint": fingerprint,
+                "validated_at": time.time(),
+            }
+            self._evict()
+            self._save_index()
+
+    def invalidate(self, storage_path: str) -> None:
+        """경로 항목 제거 (덮어쓰기/삭제 후) + 상위 폴더 목록 캐시 제거"""
+        with self._lock:
+            self._drop(storage_path)
+            self._save_index()
+            self.invalidate_list(storage_path.rsplit("/", 1)[0] if "/" in storage_path else "")
+
+    def _drop(self, storage_path: str, keep_blob: Optional[str] = None) -> None:
+        entry = self._entries.pop(storage_path, None)
+        if entry is None or entry["hash"] == keep_blob:
+            return
+        # 다른 경로가 같은 blob 을 쓰지 않으면 삭제
+        if not any(e["hash"] == entry["hash"] for e in self._entries.values()):
+            try:
+                os.remove(self._blob_path(entry["hash"]))
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        # 같은 blob 을 여러 경로가 공유할 수 있으므로 고유 blob 기준으로 용량 계산
+        def total_bytes() -> int:
+            return sum({e["hash"]: e["size"] for e in self._entries.values()}.values())
+
+        total = total_bytes()
+        while total > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.counters["evictions"] += 1
+            total = total_bytes()
+
+    # ------------------------------------------------------------------
+    # 목록 캐시 (TTL)
+    # ------------------------------------------------------------------
+    def get_list(self, prefix: str) -> Optional[List[dict]]:
+        with self._lock:
+            item = self._lists.get(prefix)
+            if item is not None and item[0] > time.time():
+                self.counters["list_hits"] += 1
+                return item[1]
+            self.counters["list_misses"] += 1
+            return None
+
+    def put_list(self, prefix: str, files: List[dict]) -> None:
+        with self._lock:
+            self._lists[prefix] = (time.time() + self.list_ttl, list(files or []))
+
+    def invalidate_list(self, prefix: str) -> None:
+        with self._lock:
+            self._lists.pop(prefix, None)
+
+    # ------------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "entries": len(self._entries),
+                "bytes": sum({e["hash"]: e["size"] for e in self._entries.values()}.values()),
+                "max_bytes": self.max_bytes,
+                "hit_ratio": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in list(self._entries):
+                self._drop(path)
+            self._lists.clear()
+            self._save_index()
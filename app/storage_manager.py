@@ -15,6 +15,19 @@ except Exception:
     SUPABASE_KEY = os.getenv("SUPABASE_KEY") or os.getenv("SUPABASE_ANON_KEY") or ""
     SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or ""
 
+try:
+    from app.storage_cache import StorageDiskCache, file_fingerprint, DEFAULT_CACHE_DIR
+    from app.storage_backends import StorageBackend, create_storage_backend
+except Exception:
+    from storage_cache import StorageDiskCache, file_fingerprint, DEFAULT_CACHE_DIR
+    from storage_backends import StorageBackend, create_storage_backend
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# 다운로드 캐시 설정 (PTOP_STORAGE_CACHE_MB=0 이면 비활성)
+STORAGE_CACHE_DIR = os.getenv("PTOP_STORAGE_CACHE_DIR") or DEFAULT_CACHE_DIR
+STORAGE_CACHE_MB = int(os.getenv("PTOP_STORAGE_CACHE_MB") or 512)
+
 
 def sanitize_storage_key(key: str) -> str:
     """
@@ -35,23 +48,44 @@ def sanitize_storage_key(key: str) -> str:
     return result.replace("__", "_")
 
 
-class StorageManager:
-    """Supabase Storage를 통해 PTOP 문서 파일 관리"""
+def build_storage_path(tenant_id: str, document_type: str, document_id: str, filename: str) -> str:
+    """Storage 경로: {tenant}/{type}/{문서ID}/{파일명} (한글 제거하여 ASCII만 사용)"""
+    return f"{tenant_id}/{document_type}/{sanitize_storage_key(document_id)}/{sanitize_storage_key(filename)}"
 
-    BUCKET_NAME = 'ptop-files'
 
-    def __init__(self):
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            raise RuntimeError("Supabase 접속정보가 없습니다. SUPABASE_URL / SUPABASE_KEY 설정 확인")
+class StorageManager:
+    """PTOP 문서 파일 관리 (기본: Supabase Storage, 백엔드 교체 가능)"""
 
-        from supabase import create_client
+    BUCKET_NAME = 'ptop-files'
 
-        # Storage 작업에는 Service Role 키 사용 (RLS 우회)
-        # Service Role 키가 없으면 일반 키 사용
-        if SUPABASE_SERVICE_ROLE_KEY:
-            self.supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-        else:
-            self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        """
+        Args:
+            backend: 저장소 백엔드. None 이면 PTOP_STORAGE_BACKEND 환경변수로 결정
+                     (supabase 기본, local = 로컬 파일시스템)
+        """
+        if backend is None:
+            # Storage 작업에는 Service Role 키 사용 (RLS 우회)
+            # Service Role 키가 없으면 일반 키 사용
+            backend = create_storage_backend(
+                self.BUCKET_NAME,
+                url=SUPABASE_URL,
+                key=SUPABASE_SERVICE_ROLE_KEY or SUPABASE_KEY,
+            )
+        self.backend = backend
+        # 기존 코드 호환: Supabase 백엔드일 때만 클라이언트 노출
+        self.supabase = getattr(backend, "client", None)
+
+        # 로컬 디스크 캐시 (인기 템플릿/최근 문서 재다운로드 시 로컬 응답)
+        self.cache = None
+        if STORAGE_CACHE_MB > 0:
+            try:
+                self.cache = StorageDiskCache(
+                    cache_dir=os.path.join(STORAGE_CACHE_DIR, self.BUCKET_NAME),
+                    max_bytes=STORAGE_CACHE_MB * 1024 * 1024,
+                )
+            except Exception as e:
+                print(f"[WARN] storage cache disabled: {e}")
 
     def upload_file(self, tenant_id: str, document_type: str, document_id: str, file_bytes: bytes, filename: str):
         """
@@ -68,21 +102,42 @@ class StorageManager:
             (성공여부, 저장경로 또는 에러메시지)
         """
         try:
-            # Storage 경로: 한글 제거하여 ASCII만 사용
-            sanitized_doc_id = sanitize_storage_key(document_id)
-            sanitized_filename = sanitize_storage_key(filename)
-            storage_path = f"{tenant_id}/{document_type}/{sanitized_doc_id}/{sanitized_filename}"
+            storage_path = build_storage_path(tenant_id, document_type, document_id, filename)
 
-            bucket = self.supabase.storage.from_(self.BUCKET_NAME)
-
-            # 파일 업로드
             # 파일명에 버전이 포함되므로 항상 고유한 파일이 저장됨
-            bucket.upload(
-                path=storage_path,
-                file=file_bytes,
-                file_options={"content-type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"}
-            )
+            self.backend.upload(storage_path, file_bytes, XLSX_CONTENT_TYPE)
+
+            if self.cache is not None:
+                # 방금 올린 파일은 곧바로 미리보기/다운로드되는 경우가 많아 캐시에 적재
+                self.cache.invalidate(storage_path)
+                self.cache.put(storage_path, file_bytes)
+
+            return True, storage_path
+        except Exception as e:
+            return False, str(e)
+
+    def upload_stream(
+        self,
+        tenant_id: str,
+        document_type: str,
+        document_id: str,
+        fileobj,
+        filename: str,
+        content_type: str = "application/octet-stream",
+    ):
+        """
+        대용량 파일(도면, ZIP 묶음 등) 스트림 업로드 - 메모리에 전체를 올리지 않음
+
+        Supabase 백엔드는 6MB 초과 시 재개 가능한 분할 업로드를 사용한다.
 
+        Returns:
+            (성공여부, 저장경로 또는 에러메시지)
+        """
+        try:
+            storage_path = build_storage_path(tenant_id, document_type, document_id, filename)
+            self.backend.upload(storage_path, fileobj, content_type)
+            if self.cache is not None:
+                self.cache.invalidate(storage_path)
             return True, storage_path
         except Exception as e:
             return False, str(e)
@@ -98,9 +153,7 @@ class StorageManager:
             공개 다운로드 URL
         """
         try:
-            bucket = self.supabase.storage.from_(self.BUCKET_NAME)
-            url = bucket.get_public_url(storage_path)
-            return url
+            return self.backend.public_url(storage_path)
         except Exception:
             return ""
 
@@ -114,13 +167,66 @@ class StorageManager:
         Returns:
             (성공여부, 파일 바이트)
         """
+        if self.cache is not None:
+            cached = self.cache.get(storage_path, revalidate=self._current_fingerprint)
+            if cached is not None:
+                return True, cached
+
         try:
-            bucket = self.supabase.storage.from_(self.BUCKET_NAME)
-            file_bytes = bucket.download(storage_path)
+            file_bytes = self.backend.download(storage_path)
+            if self.cache is not None:
+                self.cache.put(storage_path, file_bytes, self._current_fingerprint(storage_path))
             return True, file_bytes
         except Exception as e:
             return False, str(e).encode()
 
+    def download_to(self, storage_path: str, fileobj):
+        """
+        Storage 파일을 file-like 객체로 스트리밍 다운로드 (전체를 bytes 로 버퍼링하지 않음)
+
+        Args:
+            storage_path: Storage 내 경로
+            fileobj: 쓰기 가능한 바이너리 파일 객체
+
+        Returns:
+            (성공여부, 받은 바이트 수 또는 에러메시지)
+        """
+        if self.cache is not None:
+            cached = self.cache.get(storage_path, revalidate=self._current_fingerprint)
+            if cached is not None:
+                fileobj.write(cached)
+                return True, len(cached)
+        try:
+            return True, self.backend.download_to(storage_path, fileobj)
+        except Exception as e:
+            return False, str(e)
+
+    def _list_path(self, path: str) -> List[dict]:
+        """폴더 목록 조회 (짧은 TTL 캐시 경유)"""
+        if self.cache is not None:
+            cached = self.cache.get_list(path)
+            if cached is not None:
+                return cached
+        files = self.backend.list(path)
+        if self.cache is not None:
+            self.cache.put_list(path, files)
+        return files
+
+    def _current_fingerprint(self, storage_path: str) -> Optional[str]:
+        """Storage 목록 기준 현재 파일 지문 (eTag/크기/수정시각, 조회 실패 시 None)"""
+        folder, _, name = storage_path.rpartition("/")
+        try:
+            for entry in self._list_path(folder):
+                if entry.get("name") == name:
+                    return file_fingerprint(entry)
+        except Exception:
+            pass
+        return None
+
+    def cache_stats(self) -> dict:
+        """다운로드/목록 캐시 적중·실패 통계"""
+        return self.cache.stats() if self.cache is not None else {}
+
     def delete_file(self, storage_path: str) -> bool:
         """
         Storage에서 파일 삭제
@@ -132,8 +238,9 @@ class StorageManager:
             성공여부
         """
         try:
-            bucket = self.supabase.storage.from_(self.BUCKET_NAME)
-            bucket.remove([storage_path])
+            self.backend.remove([storage_path])
+            if self.cache is not None:
+                self.cache.invalidate(storage_path)
             return True
         except Exception:
             return False
@@ -153,9 +260,7 @@ class StorageManager:
         try:
             sanitized_doc_id = sanitize_storage_key(document_id)
             path = f"{tenant_id}/{document_type}/{sanitized_doc_id}"
-            bucket = self.supabase.storage.from_(self.BUCKET_NAME)
-            files = bucket.list(path)
-            return files or []
+            return list(self._list_path(path))
         except Exception:
             return []
 
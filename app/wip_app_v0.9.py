@@ -4,19 +4,99 @@
 
 import streamlit as st
 import pandas as pd
-import sqlite3
 from datetime import datetime, date, timedelta
 import os
 from contextlib import contextmanager
 import time
 
+try:
+    from app.wip_cache import tagged_cache, scope_tag, invalidate_tags
+    from app.wip_change_feed import get_change_feed, REALTIME_TABLES
+    from app.wip_sqlite import SQLitePool
+    from app.wip_dashboard import DashboardSnapshot, SNAPSHOT_FIELDS, ORDER_FIELDS, start_midnight_job
+    from app.wip_offline import OfflineSync
+    from app.wip_deadline_scanner import DeadlineScanner, WARNING_COLUMNS, warning_levels, start_scanner_job
+except Exception:
+    from wip_cache import tagged_cache, scope_tag, invalidate_tags
+    from wip_change_feed import get_change_feed, REALTIME_TABLES
+    from wip_sqlite import SQLitePool
+    from wip_dashboard import DashboardSnapshot, SNAPSHOT_FIELDS, ORDER_FIELDS, start_midnight_job
+    from wip_offline import OfflineSync
+    from wip_deadline_scanner import DeadlineScanner, WARNING_COLUMNS, warning_levels, start_scanner_job
+
 # ✅ 데이터베이스 매니저 캐시로 성능 개선
 @st.cache_resource(show_spinner=False)
 def get_db_manager():
     """데이터베이스 매니저 (캐싱됨)"""
     print("🚀 데이터베이스 매니저를 초기화합니다...")
+    if OFFLINE_SYNC:
+        # 오프라인 우선 모드: 로컬 복제본 파일을 SQLite 모드로 사용
+        return DatabaseManager(WIP_OFFLINE_DB_PATH)
     return DatabaseManager()
 
+# 실시간 변경 반영: 세션이 변경 피드 버전을 확인하는 주기 (초) - 메모리 값 비교만, DB 조회 없음
+LIVE_CHECK_SECONDS = 3
+
+@st.cache_resource(show_spinner=False)
+def get_live_feed():
+    """변경 피드 (프로세스당 1개) - Supabase Realtime 구독, 없으면 로컬 pub/sub"""
+    feed = get_change_feed()
+    feed.set_applier(get_db_manager().apply_change)
+    if USE_SUPABASE:
+        feed.start_realtime(SUPABASE_URL, SUPABASE_KEY, REALTIME_TABLES)
+    return feed
+
+@st.cache_resource(show_spinner=False)
+def get_offline_sync():
+    """오프라인 복제본 동기화 워커 (프로세스당 1개) - 오프라인 우선 모드가 아니면 None"""
+    if not OFFLINE_SYNC:
+        return None
+    feed = get_live_feed()
+    sync = OfflineSync(
+        get_db_manager()._pool,
+        lambda: create_client(SUPABASE_URL, SUPABASE_KEY),
+        customer_id=WIP_OFFLINE_TENANT,
+        # 원격 변경은 로컬 버스로 → 캐시 무효화 + 해당 고객사 화면 재실행
+        notify=lambda table, change_type, record: feed.bus.publish(table, change_type, record, source='offline-sync'),
+    )
+    sync.start()
+    return sync
+
+@st.cache_resource(show_spinner=False)
+def get_dashboard_job():
+    """대시보드 스냅샷 자정 재계산 작업 (프로세스당 1개) - 지연/이번주 마감/임박은 날짜 기준"""
+    return start_midnight_job(get_db_manager().recompute_dashboard_snapshots)
+
+@st.cache_resource(show_spinner=False)
+def get_deadline_scanner():
+    """납기 경고 스캐너 (프로세스당 1개) - 주기 실행, 경고 레벨 저장 + 고객사별 요약 메일"""
+    db = get_db_manager()
+    scanner = DeadlineScanner(db.load_deadline_inputs, db.save_deadline_warnings, send_deadline_digests)
+    start_scanner_job(scanner.run)
+    return scanner
+
+def send_deadline_digests(digests):
+    """
+    납기 경고 요약 메일 발송 - SMTP 연결 1회로 고객사별 메일 전부 전송
+
+    Args:
+        digests: [(customer_id, 제목, HTML)]
+
+    Returns:
+        발송 성공 여부 (수신자/SMTP 설정이 없으면 False → 알림 상태 유지, 다음 스캔에서 재시도)
+    """
+    if not (WIP_ALERT_RECIPIENTS and WIP_SMTP_USER):
+        return False
+    try:
+        from utils.email_service import EmailConfig, OutgoingEmail, send_email_batch
+    except Exception as e:
+        print(f"[WARN] 메일 모듈을 불러오지 못했습니다: {e}")
+        return False
+    config = EmailConfig(host=WIP_SMTP_HOST, port=WIP_SMTP_PORT, user=WIP_SMTP_USER,
+                         password=WIP_SMTP_PASSWORD, from_name="WIP 납기 알림")
+    emails = [OutgoingEmail(WIP_ALERT_RECIPIENTS, subject, body) for _, subject, body in digests]
+    return send_email_batch(config, emails) == len(emails)
+
 # 성능 모니터링 데코레이터만 유지
 def monitor_performance(func):
     def wrapper(*args, **kwargs):
@@ -41,9 +121,22 @@ from config_supabase import (
     SUPABASE_URL, 
     SUPABASE_KEY, 
     USE_SUPABASE,
-    PROCESS_STAGES
+    PROCESS_STAGES,
+    WIP_OFFLINE_MODE,
+    WIP_OFFLINE_DB_PATH,
+    WIP_OFFLINE_TENANT,
+    WIP_ALERT_RECIPIENTS,
+    WIP_SMTP_HOST,
+    WIP_SMTP_PORT,
+    WIP_SMTP_USER,
+    WIP_SMTP_PASSWORD
 )
 
+# 오프라인 우선 모드: 앱의 데이터 경로는 로컬 복제본(SQLite 분기) - Supabase 와는 OfflineSync 워커만 통신
+OFFLINE_SYNC = USE_SUPABASE and WIP_OFFLINE_MODE
+if OFFLINE_SYNC:
+    USE_SUPABASE = False
+
 try:
     from supabase import create_client, Client
     SUPABASE_AVAILABLE = True
@@ -72,6 +165,235 @@ if __name__ == "__main__":
 # 데이터베이스 유틸리티
 # ============================================================================
 
+def _customer_tags(customer_id, *entities):
+    """고객사 범위 캐시 태그 (customer_id 가 없으면 엔티티 전체 조회 태그)"""
+    return [scope_tag(entity, customer=customer_id) for entity in entities]
+
+
+def _project_stat_tags(customer_id=None, **_):
+    """매출 통계 캐시 태그 - 프로젝트(완료/금액) 변경 시 무효화"""
+    return _customer_tags(customer_id, 'projects')
+
+
+# 공정 이벤트 조회 컬럼
+EVENT_COLUMNS = ['event_id', 'order_id', 'stage', 'progress', 'planned_date', 'done_date',
+                 'vendor', 'note', 'created_at']
+# 발주/공정 최신 상태 프로젝션 (process_events 쓰기 시 갱신, 읽기는 기본 키 조회)
+ORDER_STAGE_COLUMNS = ['order_id', 'stage', 'status', 'progress', 'planned_date', 'done_date',
+                       'vendor', 'event_id', 'updated_at']
+# 이벤트 이력 조회 시 .in_('order_id', ...) 1회에 넣는 발주 수 (URL 길이 제한)
+EVENT_ORDER_BATCH = 200
+# order_stage_state 가 서버에 없을 때 이벤트 이력 경로로 읽고 다시 확인할 때까지의 시간 (초)
+STAGE_STATE_RETRY_SECONDS = 300
+
+# process_events 이력 → order_stage_state 재구성 ((order_id, stage) 별 created_at, event_id 최신 1건)
+ORDER_STAGE_STATE_REBUILD_SQL = """
+    INSERT OR REPLACE INTO order_stage_state
+        (order_id, stage, status, progress, planned_date, done_date, vendor, event_id, updated_at)
+    SELECT order_id, stage,
+           CASE WHEN COALESCE(progress, 0) >= 100 OR COALESCE(done_date, '') <> '' THEN '완료' ELSE '진행중' END,
+           COALESCE(progress, 0), planned_date, done_date, vendor, event_id, created_at
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY order_id, stage ORDER BY created_at DESC, event_id DESC
+        ) AS rn
+        FROM process_events
+        WHERE order_id IN (SELECT order_id FROM orders)
+    )
+    WHERE rn = 1
+"""
+
+# SQLite 마이그레이션 (PRAGMA user_version 기준, 순서대로 1회 적용)
+SQLITE_MIGRATIONS = [
+    (1, "조회 인덱스 추가 (공정 이벤트 최신값, 고객사별 납기, 프로젝트 상태/납기)", [
+        "CREATE INDEX IF NOT EXISTS idx_events_order_stage_created ON process_events(order_id, stage, created_at DESC, event_id DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_customer_due ON orders(customer_id, due_date)",
+        "CREATE INDEX IF NOT EXISTS idx_projects_status_due ON projects(status, final_due_date)",
+        "ANALYZE",
+    ]),
+    (2, "발주/공정 최신 상태(order_stage_state) 백필", [
+        ORDER_STAGE_STATE_REBUILD_SQL,
+    ]),
+    (3, "발주 공정코드/담당 공정 컬럼 추가 (값은 backfill_order_stages 에서 채움)", [
+        "ALTER TABLE orders ADD COLUMN process_code TEXT",
+        "ALTER TABLE orders ADD COLUMN stage TEXT",
+        "CREATE INDEX IF NOT EXISTS idx_orders_project_stage ON orders(project_id, stage)",
+    ]),
+]
+
+# 동적 UPDATE 허용 컬럼 (컬럼명은 파라미터로 바인딩할 수 없어 화이트리스트로 제한)
+ORDER_UPDATE_COLUMNS = {
+    'customer_id', 'project_id', 'project', 'vendor', 'order_date', 'due_date',
+    'status', 'memo', 'current_stage', 'process_code', 'stage'
+}
+VENDOR_UPDATE_COLUMNS = {'vendor_name', 'contact', 'process_types', 'memo'}
+
+
+def _checked_columns(values, allowed, table):
+    """UPDATE 대상 컬럼 검증 - 허용되지 않은 컬럼이면 ValueError"""
+    unknown = sorted(set(values) - allowed)
+    if unknown:
+        raise ValueError(f"{table}: 수정할 수 없는 컬럼 {unknown}")
+    return sorted(values)
+
+
+def _stage_state_rows(rows):
+    """
+    기록된 이벤트 행 → order_stage_state 행 ((order_id, stage) 별 최신 1건)
+
+    Args:
+        rows: process_events 행 목록 (event_id, created_at 포함)
+
+    Returns:
+        ORDER_STAGE_COLUMNS 키를 가진 dict 목록
+    """
+    states = {}
+    for row in sorted(rows, key=lambda r: (str(r.get('created_at') or ''), int(r.get('event_id') or 0))):
+        if row.get('event_id') is None:
+            continue
+        done = (row.get('progress') or 0) >= 100 or row.get('done_date') not in (None, '')
+        states[(row['order_id'], row['stage'])] = {
+            'order_id': row['order_id'],
+            'stage': row['stage'],
+            'status': '완료' if done else '진행중',
+            'progress': row.get('progress') or 0,
+            'planned_date': row.get('planned_date'),
+            'done_date': row.get('done_date'),
+            'vendor': row.get('vendor'),
+            'event_id': row['event_id'],
+            'updated_at': row.get('created_at'),
+        }
+    return list(states.values())
+
+
+def _merge_stage_done(orders, states):
+    """
+    발주 (order_id, stage) ⋈ 공정 최신 상태 → done 컬럼 추가
+
+    Args:
+        orders: order_id, stage 컬럼을 가진 발주 DataFrame
+        states: get_latest_events_for_orders 결과
+
+    Returns:
+        orders + done (담당 공정이 없거나 완료 상태가 아니면 False)
+    """
+    if states is None or states.empty:
+        return orders.assign(done=False)
+    # 키는 object 로 비교하고 공정이 없는(NaN) 행은 양쪽 모두 제외 - NaN 끼리 매칭되어 발주가 중복되지 않도록
+    done = states.loc[(states['status'] == '완료') & states['stage'].notna(), ['order_id', 'stage']]
+    done_keys = pd.MultiIndex.from_frame(done.astype(object))
+    order_keys = pd.MultiIndex.from_frame(orders[['order_id', 'stage']].astype(object))
+    return orders.assign(done=order_keys.isin(done_keys) & orders['stage'].notna().to_numpy())
+
+
+# 페이지 테이블 (서버 정렬/페이지) - 정렬 컬럼명은 화이트리스트로 제한
+TABLE_PAGE_SIZE = 20
+PROJECT_SORT_OPTIONS = {
+    '최종납기일': 'final_due_date',
+    '프로젝트명': 'project_name',
+    '계약금액': 'contract_amount',
+    '설치완료일': 'installation_completed_date',
+    '등록일': 'created_at',
+}
+ORDER_SORT_OPTIONS = {
+    '프로젝트': 'project',
+    '납기일': 'due_date',
+    '발주일': 'order_date',
+    '발주번호': 'order_id',
+    '업체': 'vendor',
+}
+PROJECT_DATE_COLUMNS = {'final_due_date', 'installation_completed_date'}
+
+
+def _filter_date_range(filters):
+    """
+    프로젝트 필터의 기간 → [시작, 끝) ISO 날짜 문자열
+
+    Returns:
+        (start, end) - 기간 필터가 없으면 (None, None)
+    """
+    year, month = filters.get('year'), filters.get('month')
+    if not year:
+        return None, None
+    if filters.get('date_col') not in PROJECT_DATE_COLUMNS:
+        raise ValueError(f"projects: 기간 필터 컬럼 오류 {filters.get('date_col')!r}")
+    if month:
+        start, end = date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+    else:
+        start, end = date(year, 1, 1), date(year + 1, 1, 1)
+    return start.isoformat(), end.isoformat()
+
+
+def _project_filter_sql(filters, alias=''):
+    """프로젝트 필터 → SQLite WHERE 조건/파라미터 (apply_filters_to_projects 와 같은 규칙)"""
+    prefix = f"{alias}." if alias else ''
+    conditions, params = [], []
+    start, end = _filter_date_range(filters)
+    if start:
+        conditions.append(f"{prefix}{filters['date_col']} >= ? AND {prefix}{filters['date_col']} < ?")
+        params.extend([start, end])
+    for key in ('status', 'contract_type'):
+        if filters.get(key):
+            conditions.append(f"{prefix}{key} = ?")
+            params.append(filters[key])
+    return conditions, params
+
+
+def _has_project_filters(filters):
+    """프로젝트 필터에 실제 조건(기간/상태/관급·사급)이 있는지"""
+    start, _ = _filter_date_range(filters)
+    return bool(start or filters.get('status') or filters.get('contract_type'))
+
+
+def _apply_project_filters(query, filters, prefix=''):
+    """프로젝트 필터 → PostgREST 쿼리 (prefix: 임베드 조인이면 'projects.')"""
+    start, end = _filter_date_range(filters)
+    if start:
+        query = query.gte(f"{prefix}{filters['date_col']}", start).lt(f"{prefix}{filters['date_col']}", end)
+    for key in ('status', 'contract_type'):
+        if filters.get(key):
+            query = query.eq(f"{prefix}{key}", filters[key])
+    return query
+
+
+def _format_dates(values, fmt='%Y-%m-%d'):
+    """날짜 컬럼 표시 문자열 (벡터화) - 날짜로 읽히지 않는 값은 그대로, 빈 값은 ''"""
+    values = pd.Series(values)
+    parsed = pd.to_datetime(values, errors='coerce')
+    raw = values.where(values.notna(), '').astype(str)
+    return parsed.dt.strftime(fmt).where(parsed.notna(), raw)
+
+
+def _is_missing_rpc(error):
+    """
+    서버 함수가 배포되지 않아 PostgREST 가 찾지 못한 오류인지 (PGRST202 / 404)
+
+    이 경우에만 클라이언트 대체 경로로 넘어간다. 시간 초과/네트워크 오류는 서버에서 이미
+    반영됐을 수 있으므로 대체 경로로 다시 쓰면 중복 기록이 된다.
+    """
+    code = str(getattr(error, 'code', '') or '')
+    text = str(error)
+    return code in ('PGRST202', '404') or 'PGRST202' in text or 'Could not find the function' in text
+
+
+def _is_missing_relation(error):
+    """테이블이 배포되지 않아 PostgREST 가 찾지 못한 오류인지 (PGRST205 / 42P01)"""
+    code = str(getattr(error, 'code', '') or '')
+    text = str(error)
+    return (code in ('PGRST205', '42P01') or 'PGRST205' in text or '42P01' in text
+            or 'Could not find the table' in text or ('relation' in text and 'does not exist' in text))
+
+
+def _max_order_number(order_ids, prefix):
+    """'ORD-코드-공정-NN' 목록에서 가장 큰 일련번호 (없으면 0)"""
+    numbers = [0]
+    for order_id in order_ids:
+        suffix = str(order_id)[len(prefix):]
+        if suffix.isdigit():
+            numbers.append(int(suffix))
+    return max(numbers)
+
+
 class DatabaseManager:
     """데이터베이스 관리 클래스 - SQLite/Supabase Hybrid"""
     
@@ -82,6 +404,9 @@ class DatabaseManager:
         Args:
             db_path: SQLite DB 파일 경로
         """
+        # order_stage_state 미배포 감지 시 이 시각까지 이벤트 이력 경로 사용
+        _self._stage_state_retry_at = 0.0
+
         # 🆕 Supabase 모드 확인
         if USE_SUPABASE:
             if not SUPABASE_AVAILABLE:
@@ -103,24 +428,24 @@ class DatabaseManager:
                 _self.db_path = db_path
             
             print(f"🗄️ 데이터베이스 경로: {_self.db_path}")
+
+            # 연결 풀 (WAL, busy_timeout, 문장 캐시)
+            _self._pool = SQLitePool(_self.db_path)
             
             # 데이터베이스 초기화
             _self.initialize_database()
             print("✅ SQLite 모드로 실행 중")
             
     @contextmanager
-    def get_connection(_self):
-        """데이터베이스 연결 컨텍스트 매니저"""
-        conn = sqlite3.connect(_self.db_path)
-        conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
-        try:
+    def get_connection(_self, immediate=False):
+        """
+        데이터베이스 연결 컨텍스트 매니저 (풀에서 재사용, 블록 종료 시 commit / 예외 시 rollback)
+
+        Args:
+            immediate: 가장 바깥 트랜잭션을 BEGIN IMMEDIATE 로 시작 (쓰기 잠금 후 읽기)
+        """
+        with _self._pool.connection(immediate=immediate) as conn:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
     
     def initialize_database(_self):
         """데이터베이스 및 테이블 초기화 - v0.5 프로젝트 중심 구조"""
@@ -218,6 +543,49 @@ class DatabaseManager:
                     FOREIGN KEY (order_id) REFERENCES orders(order_id) ON DELETE CASCADE
                 )
             """)
+
+            # 6. 발주번호 시퀀스 (프로젝트/공정별 마지막 일련번호)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS order_id_sequences (
+                    project_id TEXT NOT NULL,
+                    process_code TEXT NOT NULL,
+                    last_value INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (project_id, process_code)
+                )
+            """)
+
+            # 7. 발주/공정 최신 상태 (process_events 쓰기와 같은 트랜잭션에서 갱신되는 프로젝션)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS order_stage_state (
+                    order_id TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT '진행중',
+                    progress INTEGER DEFAULT 0,
+                    planned_date DATE,
+                    done_date DATE,
+                    vendor TEXT,
+                    event_id INTEGER NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (order_id, stage),
+                    FOREIGN KEY (order_id) REFERENCES orders(order_id) ON DELETE CASCADE
+                )
+            """)
+            
+            # 8. 납기 경고 (백그라운드 스캐너가 저장, 화면은 읽기만)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS deadline_warnings (
+                    entity_type TEXT NOT NULL,
+                    entity_id TEXT NOT NULL,
+                    customer_id TEXT,
+                    name TEXT,
+                    due_date DATE,
+                    level TEXT NOT NULL,
+                    d_day TEXT,
+                    notified_level TEXT NOT NULL DEFAULT 'normal',
+                    scanned_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (entity_type, entity_id)
+                )
+            """)
             
             # 인덱스 생성
             cursor.execute("""
@@ -247,9 +615,13 @@ class DatabaseManager:
             
             conn.commit()
             print("✅ 데이터베이스 초기화 완료 (v2.2)")
-    
-            # v0.5: 기본 업체 자동 등록 (최초 1회만)
-            _self._init_default_vendors()
+
+        # 스키마 마이그레이션 (인덱스 등)
+        _self._pool.migrate(SQLITE_MIGRATIONS)
+        _self.backfill_order_stages()
+
+        # v0.5: 기본 업체 자동 등록 (최초 1회만)
+        _self._init_default_vendors()
 
     def _init_default_vendors(_self):
         """기본 업체 자동 등록 (v0.5) - Supabase/SQLite 분기"""
@@ -288,9 +660,378 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 # ... 기존 코드 그대로 ...
     # ========================================================================
+    # 캐시 무효화 (태그 기반) - 쓰기 후 바뀐 범위만 무효화
+    # ========================================================================
+    def invalidate_order_cache(_self, order_id, events=False, customer_id=None, project_id=None, emit='UPDATE'):
+        """
+        발주 관련 캐시 무효화
+
+        Args:
+            order_id: 발주 ID
+            events: 공정 이벤트도 바뀌었는지
+            customer_id, project_id: 모르면 발주에서 조회 (조회 실패 시 엔티티 전체 무효화)
+            emit: 변경 피드로 알릴 변경 유형 (INSERT/UPDATE/DELETE, None 이면 알리지 않음)
+
+        Returns:
+            customer_id (알 수 없으면 None)
+        """
+        if customer_id is None or project_id is None:
+            try:
+                order = _self.get_order_by_id(order_id)
+            except Exception:
+                order = None
+            if order is not None:
+                customer_id = customer_id or order.get('customer_id')
+                project_id = project_id or order.get('project_id')
+
+        tags = []
+        for entity in ['orders'] + (['events'] if events else []):
+            tags.append(scope_tag(entity, order=order_id))
+            tags.append(scope_tag(entity, customer=customer_id) if customer_id else entity)
+            if project_id:
+                tags.append(scope_tag(entity, project=project_id))
+        invalidate_tags(*tags)
+        _self._touch_dashboards(order_ids=[order_id])
+
+        if emit:
+            _self._emit_change('orders', emit, {
+                'order_id': order_id, 'customer_id': customer_id, 'project_id': project_id
+            })
+        return customer_id
+
+    def invalidate_project_cache(_self, project_id, customer_id=None, cascade=False, emit='UPDATE'):
+        """
+        프로젝트 관련 캐시 무효화
+
+        Args:
+            project_id: 프로젝트 ID
+            customer_id: 모르면 프로젝트에서 조회 (조회 실패 시 엔티티 전체 무효화)
+            cascade: 소속 발주/이벤트도 바뀌었는지 (생성/삭제)
+            emit: 변경 피드로 알릴 변경 유형 (INSERT/UPDATE/DELETE, None 이면 알리지 않음)
+
+        Returns:
+            customer_id (알 수 없으면 None)
+        """
+        if customer_id is None:
+            try:
+                project = _self.get_project_by_id(project_id)
+            except Exception:
+                project = None
+            if project is not None:
+                customer_id = project.get('customer_id')
+
+        tags = []
+        for entity in ['projects'] + (['orders', 'events'] if cascade else []):
+            tags.append(scope_tag(entity, project=project_id))
+            tags.append(scope_tag(entity, customer=customer_id) if customer_id else entity)
+        invalidate_tags(*tags)
+        # 생성/삭제는 소속 발주 ID 를 모르므로 해당 고객사 스냅샷 전체 재계산
+        _self._touch_dashboards(project_ids=[project_id], customer_id=customer_id, reload=cascade)
+
+        if emit:
+            _self._emit_change('projects', emit, {
+                'project_id': project_id, 'customer_id': customer_id, 'cascade': cascade
+            })
+        return customer_id
+
+    # ========================================================================
+    # 변경 피드 (Realtime / 로컬 pub/sub) - 다른 세션 화면 실시간 반영
+    # ========================================================================
+    def _emit_change(_self, table, change_type, record):
+        """이 프로세스의 쓰기 알림 (Realtime 미연결 시 로컬 버스로 전달)"""
+        try:
+            get_change_feed().emit(table, change_type, record)
+        except Exception as e:
+            print(f"[WARN] change emit failed ({table}): {e}")
+
+    def apply_change(_self, change):
+        """
+        변경 피드 한 건을 캐시에 반영 (Realtime 또는 로컬 버스에서 호출, 백그라운드 스레드 가능)
+
+        - process_events: 해당 발주 범위 캐시 무효화
+        - orders / projects: 해당 발주/프로젝트/고객사 범위 캐시만 무효화
+        - RESYNC(연결 끊김 등): 전체 무효화
+
+        Args:
+            change: {'table', 'type', 'record', 'old_record'}
+
+        Returns:
+            영향받은 customer_id 집합 (알 수 없으면 None → 모든 화면 갱신)
+        """
+        table = change.get('table')
+        change_type = change.get('type')
+        record = change.get('record') or {}
+        row = record or change.get('old_record') or {}
+
+        if table == 'process_events':
+            order_id = row.get('order_id')
+            if not order_id:
+                # DELETE 는 기본 키만 오는 경우가 있음 → 범위를 알 수 없어 전체 무효화
+                invalidate_tags('events', 'orders')
+                _self._touch_dashboards(reload=True)
+                return None
+            order = _self.get_order_by_id(order_id)
+            customer_id = order.get('customer_id') if order is not None else None
+            _self.invalidate_order_cache(order_id, events=True, customer_id=customer_id, emit=None)
+            return {customer_id} if customer_id else None
+
+        if table == 'orders':
+            order_id = row.get('order_id')
+            if not order_id:
+                invalidate_tags('orders', 'events')
+                _self._touch_dashboards(reload=True)
+                return None
+            customer_id = _self.invalidate_order_cache(
+                order_id, events=change_type == 'DELETE',
+                customer_id=row.get('customer_id'), project_id=row.get('project_id'), emit=None
+            )
+            return {customer_id} if customer_id else None
+
+        if table == 'projects':
+            project_id = row.get('project_id')
+            if not project_id:
+                invalidate_tags('projects')
+                _self._touch_dashboards(reload=True)
+                return None
+            customer_id = _self.invalidate_project_cache(
+                project_id, customer_id=row.get('customer_id'),
+                cascade=bool(row.get('cascade')) or change_type == 'DELETE', emit=None
+            )
+            return {customer_id} if customer_id else None
+
+        # RESYNC 등
+        invalidate_tags('customers', 'vendors', 'projects', 'orders', 'order_items', 'events')
+        _self._touch_dashboards(reload=True)
+        return None
+
+    # ========================================================================
+    # 대시보드 스냅샷 (고객사별 카드 1행, 변경분만 반영)
+    # ========================================================================
+    def get_dashboard_snapshot(_self, customer_id=None):
+        """
+        대시보드 카드 스냅샷 (고객사별, 프로세스 공용)
+
+        Args:
+            customer_id: 고객사 ID (None 이면 전체)
+
+        Returns:
+            DashboardSnapshot (row() 로 카드 1행 조회)
+        """
+        snapshots = _self.__dict__.setdefault('_dashboard_snapshots', {})
+        snapshot = snapshots.get(customer_id)
+        if snapshot is None:
+            snapshot = snapshots.setdefault(customer_id, DashboardSnapshot(_self.fetch_dashboard_rows, customer_id))
+        return snapshot
+
+    def _touch_dashboards(_self, order_ids=(), project_ids=(), customer_id=None, reload=False):
+        """쓰기 후 스냅샷에 변경 ID 기록 (조회는 다음 카드 렌더링 때 한 번에)"""
+        for snapshot_customer, snapshot in list(_self.__dict__.get('_dashboard_snapshots', {}).items()):
+            if reload:
+                if customer_id is None or snapshot_customer in (None, customer_id):
+                    snapshot.mark_reload()
+                continue
+            snapshot.mark_orders(order_ids)
+            snapshot.mark_projects(project_ids)
+
+    def recompute_dashboard_snapshots(_self):
+        """모든 스냅샷 전체 재계산 (자정 날짜 변경 작업)"""
+        for snapshot in list(_self.__dict__.get('_dashboard_snapshots', {}).values()):
+            try:
+                snapshot.reload()
+            except Exception as e:
+                print(f"[WARN] 대시보드 스냅샷 재계산 실패 ({snapshot.customer_id}): {e}")
+
+    def fetch_dashboard_rows(_self, customer_id=None, order_ids=None, project_ids=None, with_names=False):
+        """
+        대시보드 스냅샷 입력 조회 - Supabase/SQLite 분기
+
+        발주 완료 = PROGRESS_STAGES 전 공정 완료 (get_orders_with_progress 의 progress_pct >= 100 과 동일)
+
+        Args:
+            customer_id: 고객사 ID (None 이면 전체)
+            order_ids, project_ids: None 이면 전체, 목록이면 해당 ID 만 (빈 목록이면 조회 안 함)
+            with_names: True 면 customer_id / 프로젝트명 컬럼 포함 (납기 경고 스캐너용)
+
+        Returns:
+            (발주 DataFrame [order_id, due_date, done (+ customer_id, project)],
+             프로젝트 DataFrame [project_id, final_due_date, status (+ customer_id, project_name)])
+        """
+        order_names = ['customer_id', 'project'] if with_names else []
+        project_names = ['customer_id', 'project_name'] if with_names else []
+        orders = pd.DataFrame(columns=['order_id', 'due_date', 'done'] + order_names)
+        projects = pd.DataFrame(columns=['project_id', 'final_due_date', 'status'] + project_names)
+        load_orders = order_ids is None or len(order_ids) > 0
+        load_projects = project_ids is None or len(project_ids) > 0
+
+        if USE_SUPABASE:
+            # Supabase 버전 - 전체 조회(납기 스캐너)는 1000행 제한이 있으므로 페이지 조회
+            if load_orders:
+                def order_query():
+                    query = _self.supabase.table('orders').select(','.join(['order_id', 'due_date'] + order_names))
+                    if customer_id:
+                        query = query.eq('customer_id', customer_id)
+                    if order_ids:
+                        query = query.in_('order_id', list(order_ids))
+                    return query.order('order_id')
+                rows = _self._fetch_all_rows(order_query)
+                if rows:
+                    if order_ids is None:
+                        states = _self.get_latest_events_for_orders(customer_id)
+                    else:
+                        states = _self.get_latest_events_for_orders(order_ids=list(order_ids))
+                    done = states[(states['status'] == '완료') & states['stage'].isin(PROGRESS_STAGES)]
+                    done_counts = done.groupby('order_id').size()
+                    orders = pd.DataFrame(rows)
+                    orders['done'] = orders['order_id'].map(done_counts).fillna(0) >= len(PROGRESS_STAGES)
+
+            if load_projects:
+                def project_query():
+                    query = _self.supabase.table('projects').select(','.join(['project_id', 'final_due_date', 'status'] + project_names))
+                    if customer_id:
+                        query = query.eq('customer_id', customer_id)
+                    if project_ids:
+                        query = query.in_('project_id', list(project_ids))
+                    return query.order('project_id')
+                rows = _self._fetch_all_rows(project_query)
+                if rows:
+                    projects = pd.DataFrame(rows)
+
+        else:
+            # SQLite 버전 - 발주별 완료 공정 수는 order_stage_state 기본 키 조회
+            with _self.get_connection() as conn:
+                if load_orders:
+                    conditions, params = [], list(PROGRESS_STAGES) + [len(PROGRESS_STAGES)]
+                    if customer_id:
+                        conditions.append("o.customer_id = ?")
+                        params.append(customer_id)
+                    if order_ids:
+                        conditions.append(f"o.order_id IN ({', '.join('?' * len(order_ids))})")
+                        params.extend(order_ids)
+                    query = f"""
+                        SELECT o.order_id, o.due_date,{''.join(f' o.{c},' for c in order_names)}
+                               (SELECT COUNT(*) FROM order_stage_state s
+                                WHERE s.order_id = o.order_id AND s.status = '완료'
+                                  AND s.stage IN ({', '.join('?' * len(PROGRESS_STAGES))})) = ? AS done
+                        FROM orders o
+                    """
+                    if conditions:
+                        query += " WHERE " + " AND ".join(conditions)
+                    orders = pd.read_sql_query(query, conn, params=params)
+
+                if load_projects:
+                    conditions, params = [], []
+                    if customer_id:
+                        conditions.append("customer_id = ?")
+                        params.append(customer_id)
+                    if project_ids:
+                        conditions.append(f"project_id IN ({', '.join('?' * len(project_ids))})")
+                        params.extend(project_ids)
+                    query = f"SELECT {', '.join(['project_id', 'final_due_date', 'status'] + project_names)} FROM projects"
+                    if conditions:
+                        query += " WHERE " + " AND ".join(conditions)
+                    projects = pd.read_sql_query(query, conn, params=params)
+
+        return orders, projects
+
+    # ========================================================================
+    # 납기 경고 (백그라운드 스캐너)
+    # ========================================================================
+    @tagged_cache(ttl=600, tags=lambda entity_type=None, customer_id=None, entity_ids=None: ['deadline_warnings'])
+    def get_deadline_warnings(_self, entity_type=None, customer_id=None, entity_ids=None):
+        """
+        저장된 납기 경고 조회 - Supabase/SQLite 분기
+
+        Args:
+            entity_type: 'project' / 'order' (None 이면 전체)
+            customer_id: 고객사 ID (None 이면 전체)
+            entity_ids: 조회할 ID 튜플 (None 이면 전체 - 화면 한 페이지 조회용)
+
+        Returns:
+            DataFrame [WARNING_COLUMNS]
+        """
+        if entity_ids is not None and not entity_ids:
+            return pd.DataFrame(columns=WARNING_COLUMNS)
+
+        if USE_SUPABASE:
+            # Supabase 버전 - 1000행 제한이 있으므로 기본 키 순서로 페이지 조회 (ID 는 묶음 단위 in_)
+            def fetch(ids):
+                def query():
+                    q = _self.supabase.table('deadline_warnings').select(','.join(WARNING_COLUMNS))
+                    if entity_type:
+                        q = q.eq('entity_type', entity_type)
+                    if customer_id:
+                        q = q.eq('customer_id', customer_id)
+                    if ids is not None:
+                        q = q.in_('entity_id', ids)
+                    return q.order('entity_type').order('entity_id')
+                return _self._fetch_all_rows(query)
+
+            if entity_ids is None:
+                rows = fetch(None)
+            else:
+                ids = list(entity_ids)
+                rows = [row for start in range(0, len(ids), EVENT_ORDER_BATCH)
+                        for row in fetch(ids[start:start + EVENT_ORDER_BATCH])]
+            return pd.DataFrame(rows, columns=WARNING_COLUMNS)
+
+        else:
+            # SQLite 버전
+            with _self.get_connection() as conn:
+                conditions, params = [], []
+                if entity_type:
+                    conditions.append("entity_type = ?")
+                    params.append(entity_type)
+                if customer_id:
+                    conditions.append("customer_id = ?")
+                    params.append(customer_id)
+                if entity_ids is not None:
+                    conditions.append(f"entity_id IN ({', '.join('?' * len(entity_ids))})")
+                    params.extend(entity_ids)
+                query = f"SELECT {', '.join(WARNING_COLUMNS)} FROM deadline_warnings"
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                return pd.read_sql_query(query, conn, params=params)
+
+    def load_deadline_inputs(_self):
+        """납기 경고 스캐너 입력 - (프로젝트, 발주, 이전 경고) 전체 고객사 1회 조회"""
+        orders, projects = _self.fetch_dashboard_rows(with_names=True)
+        return projects, orders, _self.get_deadline_warnings()
+
+    # mutation: do not cache
+    def save_deadline_warnings(_self, warnings, scanned_at):
+        """
+        납기 경고 저장 - 이번 스캔 행 upsert + 이번 스캔에 없는 행(완료/삭제) 삭제
+
+        Args:
+            warnings: DataFrame [WARNING_COLUMNS]
+            scanned_at: 이번 스캔 시각 (모든 행 동일)
+        """
+        rows = warnings[WARNING_COLUMNS].astype(object).where(warnings[WARNING_COLUMNS].notna(), None)\
+            .to_dict('records')
+        if USE_SUPABASE:
+            # Supabase 버전 - 500행씩 upsert 후 이전 스캔 행 삭제
+            for start in range(0, len(rows), 500):
+                _self.supabase.table('deadline_warnings')\
+                    .upsert(rows[start:start + 500], on_conflict='entity_type,entity_id').execute()
+            _self.supabase.table('deadline_warnings').delete().neq('scanned_at', scanned_at).execute()
+
+        else:
+            # SQLite 버전 - 단일 트랜잭션
+            with _self.get_connection() as conn:
+                conn.executemany(f"""
+                    INSERT INTO deadline_warnings ({', '.join(WARNING_COLUMNS)})
+                    VALUES ({', '.join('?' * len(WARNING_COLUMNS))})
+                    ON CONFLICT(entity_type, entity_id) DO UPDATE SET
+                        {', '.join(f"{c} = excluded.{c}" for c in WARNING_COLUMNS[2:])}
+                """, [[row[c] for c in WARNING_COLUMNS] for row in rows])
+                conn.execute("DELETE FROM deadline_warnings WHERE scanned_at <> ?", (scanned_at,))
+
+        invalidate_tags('deadline_warnings')
+
+    # ========================================================================
     # CRUD - 고객사 (Customers)
     # ========================================================================
-    @st.cache_data(ttl=600) 
+    @tagged_cache(ttl=600, tags=lambda: [scope_tag('customers')])
     def get_customers(_self):
         """모든 고객사 조회 - Supabase/SQLite 분기"""
         
@@ -313,7 +1054,8 @@ class DatabaseManager:
                 INSERT INTO customers (customer_id, customer_name, contact)
                 VALUES (?, ?, ?)
             """, (customer_id, customer_name, contact))
-            return True
+        invalidate_tags('customers')
+        return True
     
     def get_customer_by_id(_self, customer_id):
         """특정 고객사 조회 - Supabase/SQLite 분기"""
@@ -339,7 +1081,7 @@ class DatabaseManager:
     # ========================================================================
     # CRUD - 업체 (Vendors) - v0.5 신규
     # ========================================================================
-    @st.cache_data(ttl=600)    
+    @tagged_cache(ttl=600, tags=lambda process_type=None: [scope_tag('vendors')])
     def get_vendors(_self, process_type=None):
         """업체 목록 조회 - Supabase/SQLite 분기"""
         
@@ -378,7 +1120,8 @@ class DatabaseManager:
                 INSERT INTO vendors (vendor_id, vendor_name, contact, process_types, memo)
                 VALUES (?, ?, ?, ?, ?)
             """, (vendor_id, vendor_name, contact, process_types, memo))
-            return True
+        invalidate_tags('vendors')
+        return True
     
     def get_vendor_by_id(_self, vendor_id):
         """특정 업체 조회 - Supabase/SQLite 분기"""
@@ -403,23 +1146,27 @@ class DatabaseManager:
     
     def update_vendor(_self, vendor_id, **kwargs):
         """업체 정보 수정 - Supabase/SQLite 분기"""
+        columns = _checked_columns(kwargs, VENDOR_UPDATE_COLUMNS, 'vendors')
         
         if USE_SUPABASE:
             # Supabase 버전
             response = _self.supabase.table('vendors').update(kwargs).eq('vendor_id', vendor_id).execute()
-            return len(response.data) > 0
+            updated = len(response.data) > 0
         
         else:
             # SQLite 버전
             with _self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
-                values = list(kwargs.values()) + [vendor_id]
+                set_clause = ", ".join([f"{key} = ?" for key in columns])
+                values = [kwargs[key] for key in columns] + [vendor_id]
                 
                 query = f"UPDATE vendors SET {set_clause} WHERE vendor_id = ?"
                 cursor.execute(query, values)
-                return cursor.rowcount > 0
+                updated = cursor.rowcount > 0
+
+        invalidate_tags('vendors')
+        return updated
     
     def delete_vendor(_self, vendor_id):
         """업체 삭제 - Supabase/SQLite 분기"""
@@ -427,19 +1174,22 @@ class DatabaseManager:
         if USE_SUPABASE:
             # Supabase 버전
             response = _self.supabase.table('vendors').delete().eq('vendor_id', vendor_id).execute()
-            return len(response.data) > 0
+            deleted = len(response.data) > 0
         
         else:
             # SQLite 버전
             with _self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM vendors WHERE vendor_id = ?", (vendor_id,))
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
+
+        invalidate_tags('vendors')
+        return deleted
 
     # ========================================================================
     # CRUD - 발주 (Orders)
     # ========================================================================
-    @st.cache_data(ttl=3600)  # 1시간 캐시 (성능 개선)
+    @tagged_cache(ttl=3600, tags=lambda customer_id=None: [scope_tag('orders', customer=customer_id)])  # 1시간 캐시 (성능 개선)
     def get_orders(_self, customer_id=None):
         """발주 목록 조회 - Supabase/SQLite 분기"""
         
@@ -459,7 +1209,7 @@ class DatabaseManager:
                 if col in df.columns:
                     df[col] = pd.to_datetime(df[col], errors='coerce').dt.date
             
-            return df
+            return _with_order_stage(df)
         
         else:
             # SQLite 버전
@@ -480,11 +1230,17 @@ class DatabaseManager:
                     if col in df.columns:
                         df[col] = pd.to_datetime(df[col], errors='coerce').dt.date
                 
-                return df
+                return _with_order_stage(df)
     
     def add_order(_self, order_id, customer_id, project, vendor, 
-            order_date, due_date, status="진행중", memo="", project_id=None):
-        """발주 추가 - Supabase/SQLite 분기"""
+            order_date, due_date, status="진행중", memo="", project_id=None, process_code=None):
+        """
+        발주 추가 - Supabase/SQLite 분기
+
+        process_code 를 생략하면 발주번호에서 추출하고, 담당 공정(stage)도 함께 저장한다.
+        """
+        process_code = process_code or _order_process_code(order_id)
+        stage = PROCESS_TYPE_STAGES.get(process_code)
         
         if USE_SUPABASE:
             # Supabase 버전
@@ -497,11 +1253,21 @@ class DatabaseManager:
                 'order_date': str(order_date) if order_date else None,
                 'due_date': str(due_date) if due_date else None,
                 'status': status,
-                'memo': memo
+                'memo': memo,
+                'process_code': process_code,
+                'stage': stage
             }
-            _self.supabase.table('orders').insert(data).execute()
+            try:
+                _self.supabase.table('orders').insert(data).execute()
+            except Exception as e:
+                if 'process_code' not in str(e) and 'stage' not in str(e):
+                    raise
+                # wip_order_process_code.sql 적용 전: 컬럼 없이 저장 (조회 시 발주번호로 보완)
+                print(f"[WARN] orders.process_code/stage 컬럼 없음, 제외하고 저장: {e}")
+                data.pop('process_code')
+                data.pop('stage')
+                _self.supabase.table('orders').insert(data).execute()
             print(f"[DB] 발주 추가 성공: {order_id}")
-            return True
         
         else:
             # SQLite 버전
@@ -509,32 +1275,75 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO orders 
-                    (order_id, customer_id, project_id, project, vendor, order_date, due_date, status, memo)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (order_id, customer_id, project_id, project, vendor, order_date, due_date, status, memo))
+                    (order_id, customer_id, project_id, project, vendor, order_date, due_date, status, memo,
+                     process_code, stage)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (order_id, customer_id, project_id, project, vendor, order_date, due_date, status, memo,
+                      process_code, stage))
                 print(f"[DB] 발주 추가 성공: {order_id}")
-                return True
+
+        _self.invalidate_order_cache(order_id, customer_id=customer_id, project_id=project_id, emit='INSERT')
+        return True
     
+    # mutation: do not cache
+    def backfill_order_stages(_self):
+        """
+        process_code/stage 가 비어 있는 발주를 발주번호로 채움 (SQLite, 초기화 시 1회)
+
+        Supabase 는 database/sql/wip_order_process_code.sql 에서 백필한다.
+
+        Returns:
+            갱신한 발주 수
+        """
+        with _self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT order_id FROM orders WHERE process_code IS NULL")
+            updates = []
+            for (order_id,) in cursor.fetchall():
+                process_code = _order_process_code(order_id)
+                if process_code:
+                    updates.append((process_code, PROCESS_TYPE_STAGES[process_code], order_id))
+            cursor.executemany("UPDATE orders SET process_code = ?, stage = ? WHERE order_id = ?", updates)
+
+        if updates:
+            print(f"✅ 발주 공정코드 백필: {len(updates)}건")
+            invalidate_tags('orders')
+        return len(updates)
+
     def update_order(_self, order_id, **kwargs):
         """발주 수정"""
+        columns = _checked_columns(kwargs, ORDER_UPDATE_COLUMNS, 'orders')
         with _self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # 동적 UPDATE 쿼리 생성
-            set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
+            # 동적 UPDATE 쿼리 생성 (컬럼 순서 고정 → 같은 컬럼 조합은 같은 문장으로 캐시)
+            set_clause = ", ".join([f"{key} = ?" for key in columns])
             set_clause += ", updated_at = CURRENT_TIMESTAMP"
-            values = list(kwargs.values()) + [order_id]
+            values = [kwargs[key] for key in columns] + [order_id]
             
             query = f"UPDATE orders SET {set_clause} WHERE order_id = ?"
             cursor.execute(query, values)
-            return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+        _self.invalidate_order_cache(order_id)
+        return updated
     def delete_order(_self, order_id):
         """발주 삭제 (연관된 items, events도 자동 삭제)"""
+        order = _self.get_order_by_id(order_id)
         with _self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM orders WHERE order_id = ?", (order_id,))
-            return cursor.rowcount > 0
-    @st.cache_data(ttl=3600)  # 1시간 캐시
+            deleted = cursor.rowcount > 0
+            cursor.execute("DELETE FROM order_stage_state WHERE order_id = ?", (order_id,))
+        if deleted:
+            _self.invalidate_order_cache(
+                order_id, events=True,
+                customer_id=order.get('customer_id') if order is not None else None,
+                project_id=order.get('project_id') if order is not None else None,
+                emit='DELETE'
+            )
+            invalidate_tags(scope_tag('order_items', order=order_id))
+        return deleted
+    @tagged_cache(ttl=3600, tags=lambda order_id: [scope_tag('orders', order=order_id)])  # 1시간 캐시
     def get_order_by_id(_self, order_id):
         """특정 발주 조회 - Supabase/SQLite 분기"""
         
@@ -568,7 +1377,7 @@ class DatabaseManager:
     # ========================================================================
     # CRUD - 발주 품목 (Order Items)
     # ========================================================================
-    @st.cache_data(ttl=3600)  # 1시간 캐시
+    @tagged_cache(ttl=3600, tags=lambda order_id: [scope_tag('order_items', order=order_id)])  # 1시간 캐시
     def get_order_items(_self, order_id):
         """특정 발주의 품목 조회"""
         with _self.get_connection() as conn:
@@ -587,19 +1396,23 @@ class DatabaseManager:
                 INSERT INTO order_items (order_id, item_name, spec, quantity)
                 VALUES (?, ?, ?, ?)
             """, (order_id, item_name, spec, quantity))
-            return True
+        invalidate_tags(scope_tag('order_items', order=order_id))
+        return True
     
     def delete_order_item(_self, item_id):
         """발주 품목 삭제"""
         with _self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM order_items WHERE item_id = ?", (item_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+        # item_id 만으로는 발주를 알 수 없어 품목 캐시 전체 무효화
+        invalidate_tags('order_items')
+        return deleted
     
     # ========================================================================
     # CRUD - 공정 이벤트 (Process Events)
     # ========================================================================
-    @st.cache_data(ttl=600)  # 10분 캐시
+    @tagged_cache(ttl=600, tags=lambda order_id=None: [scope_tag('events', order=order_id)])  # 10분 캐시
     def get_process_events(_self, order_id=None):
         """공정 이벤트 조회 - Supabase/SQLite 분기"""
         
@@ -646,168 +1459,604 @@ class DatabaseManager:
                         df[col] = pd.to_datetime(df[col], errors='coerce').dt.date
                 
                 return df
+    def count_process_events(_self, customer_id=None):
+        """
+        공정 이벤트 건수 - Supabase/SQLite 분기 (서버 COUNT, 행은 가져오지 않음)
+
+        Args:
+            customer_id: 고객사 ID (None 이면 전체)
+
+        Returns:
+            이벤트 수
+        """
+        if USE_SUPABASE:
+            # Supabase 버전 - count='exact' 로 건수만 (고객사 필터는 orders 조인)
+            select = 'event_id,orders!inner(customer_id)' if customer_id else 'event_id'
+            query = _self.supabase.table('process_events').select(select, count='exact')
+            if customer_id:
+                query = query.eq('orders.customer_id', customer_id)
+            return int(query.limit(1).execute().count or 0)
+
+        else:
+            # SQLite 버전
+            with _self.get_connection() as conn:
+                query, params = "SELECT COUNT(*) FROM process_events", []
+                if customer_id:
+                    query += " WHERE order_id IN (SELECT order_id FROM orders WHERE customer_id = ?)"
+                    params.append(customer_id)
+                return conn.execute(query, params).fetchone()[0]
+
     # mutation: do not cache
     def add_process_event(_self, order_id, stage, progress=0, 
                         planned_date=None, done_date=None, vendor=None, note=""):
-        """공정 이벤트 추가 - Supabase/SQLite 분기"""
-        
+        """공정 이벤트 추가 - 이벤트 기록 + 발주 상태 갱신을 한 번에 (add_process_events 1건)"""
+        return _self.add_process_events([{
+            'order_id': order_id,
+            'stage': stage,
+            'progress': progress,
+            'planned_date': planned_date,
+            'done_date': done_date,
+            'vendor': vendor,
+            'note': note,
+        }])
+
+    # mutation: do not cache
+    def add_process_events(_self, events):
+        """
+        공정 이벤트 일괄 기록 - Supabase/SQLite 분기
+
+        여러 발주/프로젝트의 공정 변경을 한 번에 기록하고 발주 상태도 함께 갱신한다.
+        (완료 이벤트 → current_stage=공정, status='완료' / 미완료 → status='진행중',
+         같은 발주가 여러 번 나오면 목록 순서상 마지막 이벤트 기준)
+
+        발주/공정 최신 상태(order_stage_state)도 같은 트랜잭션에서 갱신한다.
+
+        Supabase: wip_record_process_events RPC 1회 (한 트랜잭션, database/sql/wip_process_events.sql)
+        SQLite: 연결 1개 / 트랜잭션 1개
+
+        Args:
+            events: [{'order_id', 'stage', 'progress', 'planned_date', 'done_date', 'vendor', 'note'}, ...]
+
+        Returns:
+            성공 여부
+        """
+        events = [e for e in (events or []) if e.get('order_id') and e.get('stage')]
+        if not events:
+            return True
+
+        def is_done(event):
+            return (event.get('progress') or 0) >= 100 or event.get('done_date') not in (None, '')
+
         if USE_SUPABASE:
             # Supabase 버전 - 성능 최적화
-            data = {
-                'order_id': order_id,
-                'stage': stage,
-                'progress': progress,
-                'planned_date': str(planned_date) if planned_date else None,
-                'done_date': str(done_date) if done_date else None,
-                'vendor': vendor,
-                'note': note,
+            payload = [{
+                'order_id': e['order_id'],
+                'stage': e['stage'],
+                'progress': e.get('progress') or 0,
+                'planned_date': str(e['planned_date']) if e.get('planned_date') else None,
+                'done_date': str(e['done_date']) if e.get('done_date') else None,
+                'vendor': e.get('vendor'),
+                'note': e.get('note') or '',
                 'created_at': datetime.utcnow().isoformat()
-            }
-            
-            # ⚡ 성능 최적화: 단일 API 호출로 병합
-            try:
-                # 이벤트 추가
-                _self.supabase.table('process_events').insert(data).execute()
-
-                # 완료 처리일 때만 현재 공정 단계 갱신 및 상태 업데이트
-                if progress >= 100 or done_date:
-                    _self.supabase.table('orders').update({
-                        'current_stage': stage,
-                        'status': '완료'
-                    }).eq('order_id', order_id).execute()
-                else:
-                    # 해제(미완료 전환) 시 상태를 진행중으로 되돌림
-                    _self.supabase.table('orders').update({
-                        'status': '진행중'
-                    }).eq('order_id', order_id).execute()
+            } for e in events]
 
-                return True
-                
+            try:
+                try:
+                    # ⚡ 이벤트 기록 + 발주 상태 갱신을 서버 트랜잭션 1회로
+                    inserted = _self.supabase.rpc('wip_record_process_events', {'p_events': payload}).execute().data or []
+                except Exception as e:
+                    # 함수 미배포일 때만 대체 (그 외 오류는 서버 반영 여부를 알 수 없어 다시 쓰지 않음)
+                    if not _is_missing_rpc(e):
+                        raise
+                    print(f"[WARN] wip_record_process_events RPC 없음, 일괄 insert/update 로 대체: {e}")
+                    inserted = _self.supabase.table('process_events').insert(payload).execute().data or []
+
+                    # 발주별 마지막 이벤트 기준으로 상태를 묶어서 갱신 (상태/공정 조합당 1회)
+                    final = {}
+                    for row in payload:
+                        final[row['order_id']] = row
+                    groups = {}
+                    for order_id, row in final.items():
+                        key = (row['stage'], True) if is_done(row) else (None, False)
+                        groups.setdefault(key, []).append(order_id)
+                    for (stage, done), order_ids in groups.items():
+                        update = {'current_stage': stage, 'status': '완료'} if done else {'status': '진행중'}
+                        _self.supabase.table('orders').update(update).in_('order_id', order_ids).execute()
+
+                    # 발주/공정 최신 상태 (RPC 와 달리 별도 요청, 더 최신 상태는 덮어쓰지 않음)
+                    _self._upsert_stage_states(_stage_state_rows(inserted))
             except Exception as e:
-                print(f"⚠️ 이벤트 추가 실패 ({order_id}, {stage}): {e}")
+                print(f"⚠️ 이벤트 추가 실패 ({len(events)}건): {e}")
                 return False
-        
+
+            rows = inserted or payload
+
         else:
-            # SQLite 버전
+            # SQLite 버전 - 단일 트랜잭션
             with _self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO process_events 
-                    (order_id, stage, progress, planned_date, done_date, vendor, note)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (order_id, stage, progress, planned_date, done_date, vendor, note))
-                # 완료 처리일 때만 현재 공정 단계 갱신
-                if progress >= 100 or (done_date is not None):
-                    cursor.execute("""
-                        UPDATE orders 
-                        SET current_stage = ?,
-                            status = '완료',
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE order_id = ?
-                    """, (stage, order_id))
-                else:
-                    # 해제 시 진행중으로 되돌림
+                event_ids = []
+                for e in events:
                     cursor.execute("""
-                        UPDATE orders
-                        SET status = '진행중',
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE order_id = ?
-                    """, (order_id,))
+                        INSERT INTO process_events 
+                        (order_id, stage, progress, planned_date, done_date, vendor, note)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (e['order_id'], e['stage'], e.get('progress') or 0, e.get('planned_date'),
+                          e.get('done_date'), e.get('vendor'), e.get('note') or ''))
+                    event_ids.append(cursor.lastrowid)
+
+                # 완료 처리일 때만 현재 공정 단계 갱신, 해제 시 진행중으로 되돌림 (목록 순서대로 적용)
+                cursor.executemany("""
+                    UPDATE orders 
+                    SET current_stage = CASE WHEN ? THEN ? ELSE current_stage END,
+                        status = CASE WHEN ? THEN '완료' ELSE '진행중' END,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE order_id = ?
+                """, [(is_done(e), e['stage'], is_done(e), e['order_id']) for e in events])
 
-                return True
-    @st.cache_data(ttl=600)  # 10분 캐시
+                placeholders = ', '.join('?' * len(event_ids))
+                cursor.execute(
+                    f"SELECT {', '.join(EVENT_COLUMNS)} FROM process_events WHERE event_id IN ({placeholders})",
+                    event_ids
+                )
+                rows = [dict(row) for row in cursor.fetchall()]
+
+                # 발주/공정 최신 상태 갱신 (이미 더 최신 상태가 있으면 유지)
+                cursor.executemany(f"""
+                    INSERT INTO order_stage_state ({', '.join(ORDER_STAGE_COLUMNS)})
+                    VALUES ({', '.join('?' * len(ORDER_STAGE_COLUMNS))})
+                    ON CONFLICT(order_id, stage) DO UPDATE SET
+                        status = excluded.status,
+                        progress = excluded.progress,
+                        planned_date = excluded.planned_date,
+                        done_date = excluded.done_date,
+                        vendor = excluded.vendor,
+                        event_id = excluded.event_id,
+                        updated_at = excluded.updated_at
+                    WHERE (excluded.updated_at, excluded.event_id)
+                        > (order_stage_state.updated_at, order_stage_state.event_id)
+                """, [tuple(state[c] for c in ORDER_STAGE_COLUMNS) for state in _stage_state_rows(rows)])
+
+        for order_id in dict.fromkeys(e['order_id'] for e in events):
+            _self.invalidate_order_cache(order_id, events=True, emit=None)
+        for row in rows:
+            _self._emit_change('process_events', 'INSERT', row)
+        return True
+    def _upsert_stage_states(_self, states):
+        """
+        order_stage_state 갱신 (RPC 미배포 시 대체 경로) - 기존 행보다 새로울 때만
+
+        (updated_at, event_id) 가 더 큰 행만 조건부 UPDATE 로 덮어쓰고, 행이 없으면
+        INSERT ... ON CONFLICT DO NOTHING. 늦게 도착한 이전 이벤트가 최신 상태를 되돌리지 않는다.
+        테이블이 없으면 경고만 출력 (읽기는 이벤트 이력 경로로 대체됨).
+
+        Args:
+            states: _stage_state_rows 결과
+        """
+        table = 'order_stage_state'
+        try:
+            for state in states:
+                ts, event_id = state['updated_at'], int(state['event_id'])
+                for _ in range(2):
+                    updated = _self.supabase.table(table).update(state)\
+                        .eq('order_id', state['order_id']).eq('stage', state['stage'])\
+                        .or_(f'updated_at.lt."{ts}",and(updated_at.eq."{ts}",event_id.lt.{event_id})')\
+                        .execute().data
+                    if updated:
+                        break
+                    inserted = _self.supabase.table(table)\
+                        .upsert(state, on_conflict='order_id,stage', ignore_duplicates=True).execute().data
+                    if inserted:
+                        break
+                    # 같은 순간 다른 요청이 먼저 넣은 행 - 조건부 UPDATE 한 번 더 (더 최신이면 아무것도 안 함)
+        except Exception as e:
+            if not _is_missing_relation(e):
+                raise
+            print(f"[WARN] order_stage_state 없음, 최신 상태 갱신 생략: {e}")
+
+    @tagged_cache(ttl=600, tags=lambda order_id: [scope_tag('events', order=order_id)])  # 10분 캐시
     def get_latest_events_by_stage(_self, order_id):
-        """발주별 각 공정의 최신 이벤트 조회 - Supabase/SQLite 분기"""
-        
+        """발주별 각 공정의 최신 이벤트 조회 (order_stage_state 기본 키 조회)"""
+        return _self.get_latest_events_for_orders(order_id=order_id)
+
+    def get_latest_events_for_orders(_self, customer_id=None, project_id=None, order_id=None, order_ids=None):
+        """
+        발주의 공정별 최신 상태 일괄 조회 - Supabase/SQLite 분기
+
+        이벤트 이력을 정렬/중복제거하지 않고 쓰기 시 갱신되는 order_stage_state 를 그대로 읽는다.
+        서버에 order_stage_state 가 아직 없으면 이벤트 이력(_latest_events_from_log)으로 계산한다.
+
+        Args:
+            customer_id: 고객사 ID (None 이면 전체)
+            project_id: 프로젝트 ID (None 이면 전체)
+            order_id: 발주 ID (None 이면 전체)
+            order_ids: 발주 ID 목록 (None 이면 전체, 페이지 단위 조회용)
+
+        Returns:
+            DataFrame [order_id, stage, status, progress, planned_date, done_date, vendor, event_id,
+                       updated_at, created_at] (created_at = updated_at, 기존 최신 이벤트 형식 호환)
+        """
+        columns = ORDER_STAGE_COLUMNS
+
         if USE_SUPABASE:
-            # Supabase 버전
-            response = _self.supabase.table('process_events')\
-                .select('*')\
-                .eq('order_id', order_id)\
-                .order('created_at', desc=True)\
-                .execute()
-            
-            if not response.data:
-                return pd.DataFrame()
-            
-            df = pd.DataFrame(response.data)
-            
-            # 각 공정(process_stage)별로 최신 이벤트만 추출
-            # stage 컬럼이 있는지 확인하고 그룹화
-            # created_at 기준 정렬 후 공정별 최신 1건만 유지
+            # Supabase 버전 - 고객사/프로젝트 필터는 orders 조인(!inner)으로 서버에서 처리
+            def fetch_all(customer_filter):
+                order_filters = {key: value for key, value in
+                                 (('customer_id', customer_filter), ('project_id', project_id)) if value}
+                select = ','.join(columns)
+                if order_filters:
+                    select += f",orders!inner({','.join(order_filters)})"
+                rows = []
+                page_size = 1000  # PostgREST 기본 최대 행 수
+                start = 0
+                while True:
+                    query = _self.supabase.table('order_stage_state').select(select)
+                    if order_id:
+                        query = query.eq('order_id', order_id)
+                    if order_ids is not None:
+                        query = query.in_('order_id', list(order_ids))
+                    for key, value in order_filters.items():
+                        query = query.eq(f'orders.{key}', value)
+                    response = query.order('order_id').order('stage').range(start, start + page_size - 1).execute()
+                    batch = response.data or []
+                    rows.extend(batch)
+                    if len(batch) < page_size:
+                        break
+                    start += page_size
+                return rows
+
+            if time.time() < _self._stage_state_retry_at:
+                return _self._latest_events_from_log(customer_id, project_id, order_id, order_ids)
             try:
-                if 'created_at' in df.columns:
-                    df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
-                sort_cols = []
-                if 'created_at' in df.columns:
-                    sort_cols.append('created_at')
-                if 'event_id' in df.columns:
-                    sort_cols.append('event_id')
-                if sort_cols:
-                    df = df.sort_values(sort_cols, ascending=[False]*len(sort_cols))
-            except Exception:
-                pass
+                try:
+                    rows = fetch_all(customer_id)
+                except Exception as e:
+                    if not customer_id or _is_missing_relation(e):
+                        raise
+                    # 조인 필터가 안 되면 고객사 필터 없이 조회 (다른 고객사 발주는 계산 시 무시됨)
+                    print(f"[WARN] order_stage_state customer filter failed, fetching all: {e}")
+                    rows = fetch_all(None)
+            except Exception as e:
+                if not _is_missing_relation(e):
+                    raise
+                print(f"[WARN] order_stage_state 없음 (wip_order_stage_state.sql 미적용), 이벤트 이력으로 계산: {e}")
+                _self._stage_state_retry_at = time.time() + STAGE_STATE_RETRY_SECONDS
+                return _self._latest_events_from_log(customer_id, project_id, order_id, order_ids)
+            df = pd.DataFrame(rows)
+            if 'orders' in df.columns:
+                df = df.drop(columns=['orders'])
 
-            if 'stage' in df.columns:
-                latest_events = df.drop_duplicates(subset='stage', keep='first')
-            elif 'process_stage' in df.columns:
-                latest_events = df.drop_duplicates(subset='process_stage', keep='first')
+        else:
+            # SQLite 버전 - 기본 키 (order_id, stage) / 발주 인덱스 조회
+            with _self.get_connection() as conn:
+                conditions, params = [], []
+                if order_id:
+                    conditions.append("order_id = ?")
+                    params.append(order_id)
+                if order_ids is not None:
+                    conditions.append(f"order_id IN ({', '.join('?' * len(order_ids))})" if order_ids else "0")
+                    params.extend(order_ids)
+                if customer_id:
+                    conditions.append("order_id IN (SELECT order_id FROM orders WHERE customer_id = ?)")
+                    params.append(customer_id)
+                if project_id:
+                    conditions.append("order_id IN (SELECT order_id FROM orders WHERE project_id = ?)")
+                    params.append(project_id)
+                query = f"SELECT {', '.join(columns)} FROM order_stage_state"
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                df = pd.read_sql_query(query, conn, params=params)
+
+        if df.empty:
+            return pd.DataFrame(columns=columns + ['created_at'])
+
+        for col in ['planned_date', 'done_date']:
+            df[col] = pd.to_datetime(df[col], errors='coerce').dt.date
+        df['updated_at'] = pd.to_datetime(df['updated_at'], errors='coerce')
+        df['created_at'] = df['updated_at']
+        return df
+
+    def _latest_events_from_log(_self, customer_id=None, project_id=None, order_id=None, order_ids=None):
+        """
+        process_events 이력에서 발주의 공정별 최신 상태 계산 - Supabase/SQLite 분기
+
+        order_stage_state 를 쓸 수 없을 때의 대체 경로. 대상 발주를 먼저 정하고 이벤트는
+        order_id 로 서버에서 걸러 (.in_ 배치) 요청한 발주의 이벤트만 받는다.
+
+        Args:
+            get_latest_events_for_orders 와 같음
+
+        Returns:
+            get_latest_events_for_orders 와 같은 형식의 DataFrame
+        """
+        columns = ['order_id', 'stage', 'progress', 'planned_date', 'done_date', 'vendor', 'event_id', 'created_at']
+
+        if USE_SUPABASE:
+            # Supabase 버전 - 대상 발주 ID 결정 (필터가 하나도 없으면 전체 이력)
+            ids = None
+            order_filters = {key: value for key, value in
+                             (('customer_id', customer_id), ('project_id', project_id)) if value}
+            if order_filters:
+                def order_query():
+                    query = _self.supabase.table('orders').select('order_id')
+                    for key, value in order_filters.items():
+                        query = query.eq(key, value)
+                    return query.order('order_id')
+                ids = [row['order_id'] for row in _self._fetch_all_rows(order_query)]
+            if order_ids is not None:
+                allowed = None if ids is None else set(ids)
+                ids = [o for o in order_ids if allowed is None or o in allowed]
+            if order_id:
+                ids = [order_id] if ids is None or order_id in ids else []
+
+            select = ','.join(columns)
+            if ids is None:
+                rows = _self._fetch_all_rows(
+                    lambda: _self.supabase.table('process_events').select(select).order('event_id'))
             else:
-                latest_events = df
-            
-            # 날짜 변환
-            for col in ['planned_date', 'done_date']:
-                if col in latest_events.columns:
-                    latest_events[col] = pd.to_datetime(latest_events[col], errors='coerce').dt.date
-            if 'created_at' in latest_events.columns:
-                latest_events['created_at'] = pd.to_datetime(latest_events['created_at'])
-            
-            return latest_events
-        
+                rows = []
+                for start in range(0, len(ids), EVENT_ORDER_BATCH):
+                    batch = ids[start:start + EVENT_ORDER_BATCH]
+                    rows.extend(_self._fetch_all_rows(
+                        lambda: _self.supabase.table('process_events').select(select)
+                        .in_('order_id', batch).order('event_id')))
+            df = pd.DataFrame(rows, columns=columns)
+
+        else:
+            # SQLite 버전
+            with _self.get_connection() as conn:
+                conditions, params = [], []
+                if order_id:
+                    conditions.append("order_id = ?")
+                    params.append(order_id)
+                if order_ids is not None:
+                    conditions.append(f"order_id IN ({', '.join('?' * len(order_ids))})" if order_ids else "0")
+                    params.extend(order_ids)
+                if customer_id:
+                    conditions.append("order_id IN (SELECT order_id FROM orders WHERE customer_id = ?)")
+                    params.append(customer_id)
+                if project_id:
+                    conditions.append("order_id IN (SELECT order_id FROM orders WHERE project_id = ?)")
+                    params.append(project_id)
+                query = f"SELECT {', '.join(columns)} FROM process_events"
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                df = pd.read_sql_query(query, conn, params=params)
+
+        if df.empty:
+            return pd.DataFrame(columns=ORDER_STAGE_COLUMNS + ['created_at'])
+
+        # (order_id, stage) 별 최신 1건: created_at, event_id 내림차순 정렬 후 첫 행
+        df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
+        df = df.sort_values(['created_at', 'event_id'], ascending=False, kind='mergesort')
+        df = df.drop_duplicates(subset=['order_id', 'stage'], keep='first').reset_index(drop=True)
+
+        df['progress'] = pd.to_numeric(df['progress'], errors='coerce').fillna(0)
+        done = (df['progress'] >= 100) | (df['done_date'].notna() & (df['done_date'].astype(str).str.strip() != ''))
+        df['status'] = done.map({True: '완료', False: '진행중'})
+        for col in ['planned_date', 'done_date']:
+            df[col] = pd.to_datetime(df[col], errors='coerce').dt.date
+        df['updated_at'] = df['created_at']
+        return df[ORDER_STAGE_COLUMNS + ['created_at']]
+
+    def _fetch_all_rows(_self, query_fn, page_size=1000):
+        """
+        PostgREST 조회를 page_size 단위 .range() 로 끝까지 읽기
+
+        Args:
+            query_fn: 매 페이지 새 쿼리를 만드는 함수 (정렬 포함)
+            page_size: PostgREST 기본 최대 행 수
+
+        Returns:
+            행(dict) 목록
+        """
+        rows = []
+        start = 0
+        while True:
+            batch = query_fn().range(start, start + page_size - 1).execute().data or []
+            rows.extend(batch)
+            if len(batch) < page_size:
+                return rows
+            start += page_size
+
+    # mutation: do not cache
+    def rebuild_order_stage_state(_self):
+        """
+        발주/공정 최신 상태(order_stage_state)를 process_events 이력으로 재구성 - Supabase/SQLite 분기
+
+        백필이나 이벤트 이력을 직접 수정한 뒤 복구용 (평소에는 add_process_events 가 갱신)
+
+        Returns:
+            재구성된 (발주, 공정) 행 수
+        """
+        if USE_SUPABASE:
+            count = _self.supabase.rpc('wip_rebuild_order_stage_state', {}).execute().data or 0
+        else:
+            with _self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM order_stage_state")
+                cursor.execute(ORDER_STAGE_STATE_REBUILD_SQL)
+                count = cursor.rowcount
+
+        invalidate_tags('events')
+        _self._touch_dashboards(reload=True)
+        print(f"✅ 공정 상태 재구성 완료: {count}건")
+        return int(count)
+
+    # ========================================================================
+    # CRUD - 프로젝트 (Projects)
+    # ========================================================================
+    @tagged_cache(ttl=600, tags=lambda customer_id=None, **_: [scope_tag('projects', customer=customer_id)])
+    def get_projects_page(_self, customer_id=None, filters=None, sort_by='final_due_date', descending=False,
+                          page=1, page_size=TABLE_PAGE_SIZE):
+        """
+        프로젝트 목록 한 페이지 조회 (필터/정렬/페이지를 서버에서 처리) - Supabase/SQLite 분기
+
+        Args:
+            customer_id: 고객사 ID (None 이면 전체)
+            filters: WIPManager.get_project_filters() 결과 (None 이면 필터 없음)
+            sort_by: 정렬 컬럼 (PROJECT_SORT_OPTIONS 값)
+            descending: 내림차순 여부
+            page: 페이지 번호 (1부터)
+            page_size: 페이지당 행 수 (None 이면 전체)
+
+        Returns:
+            (페이지 DataFrame, 필터 적용 전체 건수)
+        """
+        if sort_by not in PROJECT_SORT_OPTIONS.values():
+            raise ValueError(f"projects: 정렬할 수 없는 컬럼 {sort_by!r}")
+        filters = filters or {}
+        offset = (max(int(page), 1) - 1) * page_size if page_size else 0
+
+        if USE_SUPABASE:
+            # Supabase 버전 - count='exact' 로 전체 건수를 같은 요청에서 받음
+            query = _self.supabase.table('projects').select('*', count='exact')
+            if customer_id:
+                query = query.eq('customer_id', customer_id)
+            query = _apply_project_filters(query, filters)
+            query = query.order(sort_by, desc=descending).order('project_id')
+            if page_size:
+                query = query.range(offset, offset + page_size - 1)
+            response = query.execute()
+            df = pd.DataFrame(response.data or [])
+            total = response.count if response.count is not None else len(df)
+
+        else:
+            # SQLite 버전
+            with _self.get_connection() as conn:
+                conditions, params = _project_filter_sql(filters)
+                if customer_id:
+                    conditions.insert(0, "customer_id = ?")
+                    params.insert(0, customer_id)
+                where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+                total = conn.execute(f"SELECT COUNT(*) FROM projects{where}", params).fetchone()[0]
+                query = f"SELECT * FROM projects{where} ORDER BY {sort_by} {'DESC' if descending else 'ASC'}, project_id"
+                if page_size:
+                    query += " LIMIT ? OFFSET ?"
+                    params = params + [page_size, offset]
+                df = pd.read_sql_query(query, conn, params=params)
+
+        if not df.empty and 'final_due_date' in df.columns:
+            df['final_due_date'] = pd.to_datetime(df['final_due_date'], errors='coerce').dt.date
+        return df, int(total)
+
+    @tagged_cache(ttl=600, tags=lambda project_ids: [scope_tag(entity, project=project_id)
+                                                     for project_id in project_ids for entity in ('orders', 'events')])
+    def get_project_order_rollup(_self, project_ids):
+        """
+        프로젝트별 발주 수 / 담당 공정 완료 발주 수 (지정한 프로젝트만) - Supabase/SQLite 분기
+
+        Args:
+            project_ids: 프로젝트 ID 목록 (보통 한 페이지)
+
+        Returns:
+            DataFrame [project_id, order_count, completed]
+        """
+        columns = ['project_id', 'order_count', 'completed']
+        project_ids = list(project_ids)
+        if not project_ids:
+            return pd.DataFrame(columns=columns)
+
+        if USE_SUPABASE:
+            # Supabase 버전 - 발주 1회 + 공정 상태 1회 조회 후 조인
+            response = _self.supabase.table('orders').select('order_id,project_id,process_code,stage')\
+                .in_('project_id', project_ids).execute()
+            orders = pd.DataFrame(response.data or [], columns=['order_id', 'project_id', 'process_code', 'stage'])
+            if orders.empty:
+                return pd.DataFrame(columns=columns)
+            orders = _with_order_stage(orders)
+            states = _self.get_latest_events_for_orders(order_ids=orders['order_id'].tolist())
+            orders = _merge_stage_done(orders[['order_id', 'project_id', 'stage']], states)
+            rollup = orders.groupby('project_id').agg(order_count=('order_id', 'size'), completed=('done', 'sum'))
+            return rollup.reset_index()
+
+        else:
+            # SQLite 버전 - (project_id, stage) 인덱스 + order_stage_state 기본 키 조인
+            with _self.get_connection() as conn:
+                query = f"""
+                    SELECT o.project_id,
+                           COUNT(*) AS order_count,
+                           SUM(CASE WHEN s.status = '완료' THEN 1 ELSE 0 END) AS completed
+                    FROM orders o
+                    LEFT JOIN order_stage_state s ON s.order_id = o.order_id AND s.stage = o.stage
+                    WHERE o.project_id IN ({', '.join('?' * len(project_ids))})
+                    GROUP BY o.project_id
+                """
+                return pd.read_sql_query(query, conn, params=project_ids)
+
+    @tagged_cache(ttl=600, tags=lambda customer_id=None, **_: [scope_tag('orders', customer=customer_id),
+                                                              scope_tag('projects', customer=customer_id)])
+    def get_orders_page(_self, customer_id=None, filters=None, sort_by='project', descending=False,
+                        page=1, page_size=TABLE_PAGE_SIZE):
+        """
+        발주 목록 한 페이지 조회 (프로젝트 필터/정렬/페이지를 서버에서 처리) - Supabase/SQLite 분기
+
+        Args:
+            customer_id: 고객사 ID (None 이면 전체)
+            filters: 소속 프로젝트 필터 (WIPManager.get_project_filters(), None 이면 필터 없음)
+            sort_by: 정렬 컬럼 (ORDER_SORT_OPTIONS 값, 동순위는 발주일/발주번호 순)
+            descending: 내림차순 여부
+            page: 페이지 번호 (1부터)
+            page_size: 페이지당 행 수
+
+        Returns:
+            (페이지 DataFrame - orders 컬럼 + contract_type, 필터 적용 전체 건수)
+        """
+        if sort_by not in ORDER_SORT_OPTIONS.values():
+            raise ValueError(f"orders: 정렬할 수 없는 컬럼 {sort_by!r}")
+        filters = filters or {}
+        offset = (max(int(page), 1) - 1) * page_size
+
+        if USE_SUPABASE:
+            # Supabase 버전 - 관급/사급은 projects 임베드로, 프로젝트 필터가 있을 때만 !inner 로 걸러냄
+            # (필터가 없으면 SQLite 의 LEFT JOIN 처럼 프로젝트 없는 발주도 포함)
+            inner = _has_project_filters(filters)
+
+            def fetch(join):
+                select = '*'
+                if join:
+                    select = '*,projects!inner(contract_type)' if inner else '*,projects(contract_type)'
+                query = _self.supabase.table('orders').select(select, count='exact')
+                if customer_id:
+                    query = query.eq('customer_id', customer_id)
+                if join and inner:
+                    query = _apply_project_filters(query, filters, prefix='projects.')
+                query = query.order(sort_by, desc=descending).order('order_date').order('order_id')
+                return query.range(offset, offset + page_size - 1).execute()
+
+            try:
+                response = fetch(True)
+            except Exception as e:
+                # FK 관계가 없어 조인이 안 되면 프로젝트 필터 없이 조회
+                print(f"[WARN] orders-projects join failed, fetching without project filters: {e}")
+                response = fetch(False)
+            df = pd.DataFrame(response.data or [])
+            total = response.count if response.count is not None else len(df)
+            if 'projects' in df.columns:
+                df['contract_type'] = df['projects'].map(lambda p: (p or {}).get('contract_type'))
+                df = df.drop(columns=['projects'])
+
         else:
             # SQLite 버전
             with _self.get_connection() as conn:
-                query = """
-                    SELECT * FROM process_events
-                    WHERE order_id = ?
-                    ORDER BY created_at DESC, event_id DESC
-                """
-                df = pd.read_sql_query(query, conn, params=(order_id,))
-                
-                if df.empty:
-                    return df
-                
-                # 각 공정(stage)별로 최신 이벤트만 추출
-                latest_events = df.groupby('stage').first().reset_index()
-                
-                # 날짜 변환
-                for col in ['planned_date', 'done_date']:
-                    if col in latest_events.columns:
-                        latest_events[col] = pd.to_datetime(latest_events[col], errors='coerce').dt.date
-                if 'created_at' in latest_events.columns:
-                    latest_events['created_at'] = pd.to_datetime(latest_events['created_at'], errors='coerce')
-                # 정렬 안정화: 동일 타임스탬프 시 event_id 기준으로 최신 선택
-                try:
-                    base_df = df.copy() if 'df' in locals() else latest_events
-                    if 'created_at' in base_df.columns:
-                        base_df['created_at'] = pd.to_datetime(base_df['created_at'], errors='coerce')
-                    sort_cols = []
-                    if 'created_at' in base_df.columns:
-                        sort_cols.append('created_at')
-                    if 'event_id' in base_df.columns:
-                        sort_cols.append('event_id')
-                    if sort_cols:
-                        base_df = base_df.sort_values(sort_cols, ascending=[False]*len(sort_cols))
-                    if 'stage' in base_df.columns:
-                        latest_events = base_df.drop_duplicates(subset='stage', keep='first')
-                except Exception:
-                    pass
-                
-                return latest_events
-    # ========================================================================
-    # CRUD - 프로젝트 (Projects)
-    # ========================================================================
-    @st.cache_data(ttl=3600)  # 1시간 캐시    
+                conditions, params = _project_filter_sql(filters, alias='p')
+                if customer_id:
+                    conditions.insert(0, "o.customer_id = ?")
+                    params.insert(0, customer_id)
+                where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+                base = " FROM orders o LEFT JOIN projects p ON p.project_id = o.project_id" + where
+                total = conn.execute("SELECT COUNT(*)" + base, params).fetchone()[0]
+                query = (f"SELECT o.*, p.contract_type AS contract_type{base} "
+                         f"ORDER BY o.{sort_by} {'DESC' if descending else 'ASC'}, o.order_date, o.order_id "
+                         f"LIMIT ? OFFSET ?")
+                df = pd.read_sql_query(query, conn, params=params + [page_size, offset])
+
+        for col in ['order_date', 'due_date']:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col], errors='coerce').dt.date
+        return _with_order_stage(df), int(total)
+
+    @tagged_cache(ttl=3600, tags=lambda customer_id=None: [scope_tag('projects', customer=customer_id)])  # 1시간 캐시
     def get_projects(_self, customer_id=None):
         """프로젝트 목록 조회 - Supabase/SQLite 분기"""
         
@@ -841,6 +2090,36 @@ class DatabaseManager:
                     df['final_due_date'] = pd.to_datetime(df['final_due_date'], errors='coerce').dt.date
                 
                 return df
+
+    @tagged_cache(ttl=600, tags=lambda customer_id=None: [scope_tag('projects', customer=customer_id)])
+    def get_project_options(_self, customer_id=None):
+        """
+        프로젝트 선택 목록용 경량 조회 (페이지와 무관하게 전체) - Supabase/SQLite 분기
+
+        Args:
+            customer_id: 고객사 ID (None 이면 전체)
+
+        Returns:
+            project_id, project_name, contract_amount DataFrame (프로젝트명 순)
+        """
+        columns = ['project_id', 'project_name', 'contract_amount']
+        if USE_SUPABASE:
+            def query():
+                q = _self.supabase.table('projects').select(','.join(columns))
+                if customer_id:
+                    q = q.eq('customer_id', customer_id)
+                return q.order('project_name').order('project_id')
+            return pd.DataFrame(_self._fetch_all_rows(query), columns=columns)
+
+        else:
+            # SQLite 버전
+            with _self.get_connection() as conn:
+                query = f"SELECT {', '.join(columns)} FROM projects"
+                params = ()
+                if customer_id:
+                    query += " WHERE customer_id = ?"
+                    params = (customer_id,)
+                return pd.read_sql_query(query + " ORDER BY project_name, project_id", conn, params=params)
     
     def add_project(_self, project_id, project_name, customer_id, final_due_date,
                     status="진행중", memo="", contract_type="관급", contract_amount=0):
@@ -859,7 +2138,6 @@ class DatabaseManager:
                 'contract_amount': contract_amount
             }
             _self.supabase.table('projects').insert(data).execute()
-            return True
         
         else:
             # SQLite 버전
@@ -870,8 +2148,10 @@ class DatabaseManager:
                     (project_id, project_name, customer_id, final_due_date, status, memo, contract_type, contract_amount)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """, (project_id, project_name, customer_id, final_due_date, status, memo, contract_type, contract_amount))
-                return True
-    @st.cache_data(ttl=3600)  # 1시간 캐시
+
+        _self.invalidate_project_cache(project_id, customer_id=customer_id, emit='INSERT')
+        return True
+    @tagged_cache(ttl=3600, tags=lambda project_id: [scope_tag('projects', project=project_id)])  # 1시간 캐시
     def get_project_by_id(_self, project_id):
         """특정 프로젝트 조회 - Supabase/SQLite 분기"""
         
@@ -900,7 +2180,7 @@ class DatabaseManager:
                         df['final_due_date'] = pd.to_datetime(df['final_due_date'], errors='coerce').dt.date
                     return df.iloc[0]
                 return None
-    @st.cache_data(ttl=3600)  # 1시간 캐시
+    @tagged_cache(ttl=3600, tags=lambda project_name, customer_id=None: [scope_tag('projects', customer=customer_id)])  # 1시간 캐시
     def get_project_by_name(_self, project_name, customer_id=None):
         """프로젝트명으로 조회 - Supabase/SQLite 분기"""
         
@@ -945,65 +2225,151 @@ class DatabaseManager:
         Returns:
             ORD-고덕초01-LASER-01
         """
+        order_ids = _self.generate_order_ids(project_id, vendor_type, 1)
+        return order_ids[0] if order_ids else None
+
+    def generate_order_ids(_self, project_id, vendor_type, count=1):
+        """
+        발주번호 일괄 생성 (프로젝트/공정별 시퀀스에서 count 개 원자적 할당)
+
+        Args:
+            project_id: PRJ-고덕초01
+            vendor_type: LASER, BAND, PAINT 등
+            count: 생성할 개수
+
+        Returns:
+            ['ORD-고덕초01-LASER-01', ...] (프로젝트가 없으면 [])
+        """
         # 프로젝트 정보 가져오기
         project = _self.get_project_by_id(project_id)
         if project is None:
-            return None
+            return []
         
         # 프로젝트 이니셜 추출 (PRJ-고덕초01 → 고덕초01)
         project_code = project_id.replace("PRJ-", "")
-        
+        numbers = _self.allocate_order_numbers(project_id, vendor_type, count)
+        return [f"ORD-{project_code}-{vendor_type}-{n:02d}" for n in numbers]
+
+    def allocate_order_numbers(_self, project_id, vendor_type, count=1):
+        """
+        (프로젝트, 공정) 발주 일련번호 할당 - Supabase/SQLite 분기
+
+        order_id_sequences 행 하나를 잠그고 증가시키므로 동시에 발주를 만들어도 번호가 겹치지 않는다.
+        시퀀스가 처음 쓰일 때만 기존 발주번호의 최댓값으로 시작값을 맞춘다.
+
+        Args:
+            project_id: 프로젝트 ID
+            vendor_type: 공정 코드 (LASER, BAND ...)
+            count: 할당 개수
+
+        Returns:
+            할당된 번호 목록 (오름차순)
+        """
+        count = max(int(count or 0), 0)
+        if count == 0:
+            return []
+        project_code = project_id.replace("PRJ-", "")
+        prefix = f"ORD-{project_code}-{vendor_type}-"
+
         if USE_SUPABASE:
-            # Supabase 버전
-            response = _self.supabase.table('orders')\
-                .select('order_id')\
-                .eq('project_id', project_id)\
-                .like('order_id', f'ORD-{project_code}-{vendor_type}-%')\
-                .execute()
-            
-            count = len(response.data)
-            next_num = count + 1
-            
-            order_id = f"ORD-{project_code}-{vendor_type}-{next_num:02d}"
-            return order_id
-        
+            # Supabase 버전 - 서버 함수 (database/sql/wip_order_sequences.sql)
+            try:
+                response = _self.supabase.rpc('wip_allocate_order_numbers', {
+                    'p_project_id': project_id,
+                    'p_process_code': vendor_type,
+                    'p_count': count,
+                }).execute()
+                last_value = response.data
+                if isinstance(last_value, list):
+                    last_value = last_value[0] if last_value else None
+                if isinstance(last_value, dict):
+                    last_value = next(iter(last_value.values()), None)
+                last_value = int(last_value)
+                return list(range(last_value - count + 1, last_value + 1))
+            except Exception as e:
+                # 서버 함수 미배포 시에만: 기존 번호 최댓값 기준 (동시성 보장 없음)
+                # 그 외 오류는 서버에서 이미 증가했을 수 있으므로 그대로 실패
+                if not _is_missing_rpc(e):
+                    raise
+                print(f"[WARN] wip_allocate_order_numbers RPC 없음, 최댓값 기준으로 대체: {e}")
+                response = _self.supabase.table('orders')\
+                    .select('order_id')\
+                    .eq('project_id', project_id)\
+                    .like('order_id', f'{prefix}%')\
+                    .execute()
+                current = _max_order_number([row['order_id'] for row in response.data], prefix)
+                return list(range(current + 1, current + count + 1))
+
         else:
-            # SQLite 버전
-            with _self.get_connection() as conn:
+            # SQLite 버전 - 가장 바깥 트랜잭션은 BEGIN IMMEDIATE, 중첩 호출이면 증가(쓰기)를 먼저
+            # 실행해 쓰기 잠금을 잡은 뒤 읽는다 (바깥이 읽기만 한 트랜잭션이어도 번호가 겹치지 않음)
+            with _self.get_connection(immediate=True) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT COUNT(*) FROM orders 
-                    WHERE project_id = ? AND order_id LIKE ?
-                """, (project_id, f"ORD-{project_code}-{vendor_type}-%"))
-                
-                count = cursor.fetchone()[0]
-                next_num = count + 1
-                
-                order_id = f"ORD-{project_code}-{vendor_type}-{next_num:02d}"
-                return order_id
+                    UPDATE order_id_sequences SET last_value = last_value + ?
+                    WHERE project_id = ? AND process_code = ?
+                """, (count, project_id, vendor_type))
+
+                if cursor.rowcount:
+                    cursor.execute("""
+                        SELECT last_value FROM order_id_sequences
+                        WHERE project_id = ? AND process_code = ?
+                    """, (project_id, vendor_type))
+                    current = cursor.fetchone()[0] - count
+                else:
+                    # 최초 1회만 기존 발주번호로 시작값 맞춤
+                    cursor.execute("""
+                        SELECT order_id FROM orders
+                        WHERE project_id = ? AND order_id LIKE ?
+                    """, (project_id, f"{prefix}%"))
+                    current = _max_order_number([r[0] for r in cursor.fetchall()], prefix)
+                    cursor.execute("""
+                        INSERT INTO order_id_sequences (project_id, process_code, last_value)
+                        VALUES (?, ?, ?)
+                    """, (project_id, vendor_type, current + count))
+                return list(range(current + 1, current + count + 1))
         
     # ==================== 통계 함수 (v0.5) ====================
-    @st.cache_data(ttl=600)  # 10분 캐시
+    @tagged_cache(ttl=600, tags=_project_stat_tags)  # 10분 캐시
     def get_sales_statistics(_self, year=None, month=None, customer_id=None):
-        """매출 통계 조회 - Supabase/SQLite 분기"""
+        """매출 통계 조회 - Supabase/SQLite 분기 (연/월/계약유형별 집계)"""
         
         if USE_SUPABASE:
-            # Supabase 버전
-            query = _self.supabase.table('projects')\
-                .select('final_due_date, contract_type, contract_amount')\
-                .eq('status', '완료')
-            
-            # 🆕 업체별 필터링 추가
-            if customer_id:
-                query = query.eq('customer_id', customer_id)
-            
-            response = query.execute()
+            # Supabase 버전 - 서버 집계 함수 (database/sql/wip_sales_statistics.sql)
+            try:
+                response = _self.supabase.rpc('wip_sales_statistics', {
+                    'p_year': int(year) if year else None,
+                    'p_month': int(month) if month else None,
+                    'p_customer_id': customer_id or None,
+                }).execute()
+                return [{
+                    'year': row['year'],
+                    'month': row['month'],
+                    'contract_type': row['contract_type'],
+                    'project_count': row['project_count'],
+                    'total_amount': row['total_amount'] or 0,
+                    'avg_amount': row['avg_amount'] or 0
+                } for row in (response.data or [])]
+            except Exception as e:
+                # 서버 함수 미배포 시에만 클라이언트 집계 (그 외 오류는 전체 행을 받는 대체 경로로 넘기지 않음)
+                if not _is_missing_rpc(e):
+                    raise
+                print(f"[WARN] wip_sales_statistics RPC 없음, 클라이언트 집계로 대체: {e}")
+
+            def query():
+                q = _self.supabase.table('projects')\
+                    .select('final_due_date, contract_type, contract_amount')\
+                    .eq('status', '완료')
+                if customer_id:
+                    q = q.eq('customer_id', customer_id)
+                return q.order('project_id')
+            rows = _self._fetch_all_rows(query)
             
-            if not response.data:
+            if not rows:
                 return []
             
             import pandas as pd
-            df = pd.DataFrame(response.data)
+            df = pd.DataFrame(rows)
             df['final_due_date'] = pd.to_datetime(df['final_due_date'])
             df['year'] = df['final_due_date'].dt.strftime('%Y')
             df['month'] = df['final_due_date'].dt.strftime('%m')
@@ -1046,10 +2412,16 @@ class DatabaseManager:
                 """
                 
                 conditions = []
+                params = []
                 if year:
-                    conditions.append(f"AND strftime('%Y', final_due_date) = '{year}'")
+                    conditions.append("AND strftime('%Y', final_due_date) = ?")
+                    params.append(str(year))
                 if month:
-                    conditions.append(f"AND strftime('%m', final_due_date) = '{month:02d}'")
+                    conditions.append("AND strftime('%m', final_due_date) = ?")
+                    params.append(f"{int(month):02d}")
+                if customer_id:
+                    conditions.append("AND customer_id = ?")
+                    params.append(customer_id)
                 
                 if conditions:
                     query += " " + " ".join(conditions)
@@ -1059,7 +2431,7 @@ class DatabaseManager:
                     ORDER BY year DESC, month DESC
                 """
                 
-                cursor.execute(query)
+                cursor.execute(query, params)
                 rows = cursor.fetchall()
                 
                 results = []
@@ -1074,33 +2446,48 @@ class DatabaseManager:
                     })
                 
                 return results
-    @st.cache_data(ttl=600)  # 10분 캐시
+    @tagged_cache(ttl=600, tags=_project_stat_tags)  # 10분 캐시
     def get_monthly_sales_trend(_self, months=12, customer_id=None):
         """월별 매출 추이 - Supabase/SQLite 분기"""
         
         if USE_SUPABASE:
-            # Supabase 버전
+            # Supabase 버전 - 서버 집계 함수 (database/sql/wip_sales_statistics.sql)
+            try:
+                response = _self.supabase.rpc('wip_monthly_sales_trend', {
+                    'p_months': int(months),
+                    'p_customer_id': customer_id or None,
+                }).execute()
+                return [{
+                    'month': row['month'],
+                    'contract_type': row['contract_type'],
+                    'total_amount': row['total_amount'] or 0
+                } for row in (response.data or [])]
+            except Exception as e:
+                # 서버 함수 미배포 시에만 클라이언트 집계 (그 외 오류는 전체 행을 받는 대체 경로로 넘기지 않음)
+                if not _is_missing_rpc(e):
+                    raise
+                print(f"[WARN] wip_monthly_sales_trend RPC 없음, 클라이언트 집계로 대체: {e}")
+
             from datetime import datetime, timedelta
             
             # 12개월 전 날짜 계산
             start_date = (datetime.now() - timedelta(days=months*30)).strftime('%Y-%m-%d')
             
-            query = _self.supabase.table('projects')\
-                .select('final_due_date, contract_type, contract_amount')\
-                .eq('status', '완료')\
-                .gte('final_due_date', start_date)
-            
-            # 🆕 업체별 필터링 추가
-            if customer_id:
-                query = query.eq('customer_id', customer_id)
-            
-            response = query.execute()
+            def query():
+                q = _self.supabase.table('projects')\
+                    .select('final_due_date, contract_type, contract_amount')\
+                    .eq('status', '완료')\
+                    .gte('final_due_date', start_date)
+                if customer_id:
+                    q = q.eq('customer_id', customer_id)
+                return q.order('project_id')
+            rows = _self._fetch_all_rows(query)
             
-            if not response.data:
+            if not rows:
                 return []
             
             import pandas as pd
-            df = pd.DataFrame(response.data)
+            df = pd.DataFrame(rows)
             df['final_due_date'] = pd.to_datetime(df['final_due_date'])
             df['month'] = df['final_due_date'].dt.strftime('%Y-%m')
             
@@ -1159,27 +2546,42 @@ class DatabaseManager:
                     })
                 
                 return results
-    @st.cache_data(ttl=600)  # 10분 캐시
+    @tagged_cache(ttl=600, tags=_project_stat_tags)  # 10분 캐시
     def get_contract_type_ratio(_self, year=None, customer_id=None):
         """관급/사급 비율 - Supabase/SQLite 분기"""
         
         if USE_SUPABASE:
-            # Supabase 버전
-            query = _self.supabase.table('projects')\
-                .select('final_due_date, contract_type, contract_amount')\
-                .eq('status', '완료')
-            
-            # 🆕 업체별 필터링 추가
-            if customer_id:
-                query = query.eq('customer_id', customer_id)
-            
-            response = query.execute()
+            # Supabase 버전 - 서버 집계 함수 (database/sql/wip_sales_statistics.sql)
+            try:
+                response = _self.supabase.rpc('wip_contract_type_ratio', {
+                    'p_year': int(year) if year else None,
+                    'p_customer_id': customer_id or None,
+                }).execute()
+                return [{
+                    'contract_type': row['contract_type'],
+                    'count': row['count'],
+                    'total_amount': row['total_amount'] or 0
+                } for row in (response.data or [])]
+            except Exception as e:
+                # 서버 함수 미배포 시에만 클라이언트 집계 (그 외 오류는 전체 행을 받는 대체 경로로 넘기지 않음)
+                if not _is_missing_rpc(e):
+                    raise
+                print(f"[WARN] wip_contract_type_ratio RPC 없음, 클라이언트 집계로 대체: {e}")
+
+            def query():
+                q = _self.supabase.table('projects')\
+                    .select('final_due_date, contract_type, contract_amount')\
+                    .eq('status', '완료')
+                if customer_id:
+                    q = q.eq('customer_id', customer_id)
+                return q.order('project_id')
+            rows = _self._fetch_all_rows(query)
             
-            if not response.data:
+            if not rows:
                 return []
             
             import pandas as pd
-            df = pd.DataFrame(response.data)
+            df = pd.DataFrame(rows)
             
             # 연도 필터
             if year:
@@ -1212,20 +2614,19 @@ class DatabaseManager:
                 """
                 
                 conditions = []
+                params = []
                 if year:
-                    conditions.append(f"AND strftime('%Y', final_due_date) = '{year}'")
+                    conditions.append("AND strftime('%Y', final_due_date) = ?")
+                    params.append(str(year))
                 if customer_id:
                     conditions.append("AND customer_id = ?")
+                    params.append(customer_id)
                 
                 if conditions:
                     query += " " + " ".join(conditions)
                 
                 query += " GROUP BY contract_type"
                 
-                params = []
-                if customer_id:
-                    params.append(customer_id)
-                
                 cursor.execute(query, params)
                 rows = cursor.fetchall()
                 
@@ -1238,28 +2639,47 @@ class DatabaseManager:
                     })
                 
                 return results
-    @st.cache_data(ttl=600)  # 10분 캐시
+    @tagged_cache(ttl=600, tags=_project_stat_tags)  # 10분 캐시
     def get_top_projects_by_amount(_self, limit=10, year=None, customer_id=None):
         """계약금액 상위 프로젝트 - Supabase/SQLite 분기"""
         
         if USE_SUPABASE:
-            # Supabase 버전
-            query = _self.supabase.table('projects')\
-                .select('project_id, project_name, contract_type, contract_amount, final_due_date, installation_completed_date')\
-                .eq('status', '완료')\
-                .gt('contract_amount', 0)
-            
-            # 🆕 업체별 필터링 추가
-            if customer_id:
-                query = query.eq('customer_id', customer_id)
-            
-            response = query.execute()
+            # Supabase 버전 - 서버 집계 함수 (database/sql/wip_sales_statistics.sql)
+            try:
+                response = _self.supabase.rpc('wip_top_projects_by_amount', {
+                    'p_limit': int(limit),
+                    'p_year': int(year) if year else None,
+                    'p_customer_id': customer_id or None,
+                }).execute()
+                return [{
+                    'project_id': row['project_id'],
+                    'project_name': row['project_name'],
+                    'contract_type': row['contract_type'],
+                    'contract_amount': row['contract_amount'],
+                    'final_due_date': row['final_due_date'],
+                    'installation_completed_date': row.get('installation_completed_date')
+                } for row in (response.data or [])]
+            except Exception as e:
+                # 서버 함수 미배포 시에만 클라이언트 집계 (그 외 오류는 전체 행을 받는 대체 경로로 넘기지 않음)
+                if not _is_missing_rpc(e):
+                    raise
+                print(f"[WARN] wip_top_projects_by_amount RPC 없음, 클라이언트 집계로 대체: {e}")
+
+            def query():
+                q = _self.supabase.table('projects')\
+                    .select('project_id, project_name, contract_type, contract_amount, final_due_date, installation_completed_date')\
+                    .eq('status', '완료')\
+                    .gt('contract_amount', 0)
+                if customer_id:
+                    q = q.eq('customer_id', customer_id)
+                return q.order('project_id')
+            rows = _self._fetch_all_rows(query)
             
-            if not response.data:
+            if not rows:
                 return []
             
             import pandas as pd
-            df = pd.DataFrame(response.data)
+            df = pd.DataFrame(rows)
             
             # 연도 필터
             if year:
@@ -1301,10 +2721,13 @@ class DatabaseManager:
                 """
                 
                 conditions = []
+                params = []
                 if year:
-                    conditions.append(f"AND strftime('%Y', final_due_date) = '{year}'")
+                    conditions.append("AND strftime('%Y', final_due_date) = ?")
+                    params.append(str(year))
                 if customer_id:
                     conditions.append("AND customer_id = ?")
+                    params.append(customer_id)
                 
                 if conditions:
                     query += " " + " ".join(conditions)
@@ -1314,9 +2737,7 @@ class DatabaseManager:
                     LIMIT ?
                 """
                 
-                params = [limit]
-                if customer_id:
-                    params.append(customer_id)
+                params.append(int(limit))
                 
                 cursor.execute(query, params)
                 rows = cursor.fetchall()
@@ -1338,12 +2759,77 @@ class DatabaseManager:
 # 비즈니스 로직 클래스
 # ============================================================================
 
+# 발주번호 공정코드(ORD-{프로젝트코드}-{공정코드}-{순번}) → 담당 공정
+PROCESS_TYPE_STAGES = {
+    'CUT': '절단/절곡',
+    'PLASER': 'P레이저',
+    'LASER': '레이저(판재)',
+    'BAND': '벤딩',
+    'PAINT': '페인트',
+    'STICKER': '스티커',
+    'RECEIVING': '입고'
+}
+# 발주 진행률 계산 공정 (전 공정 완료 = 진행률 100%)
+PROGRESS_STAGES = ["절단/절곡", "레이저", "벤딩", "페인트", "스티커", "입고"]
+
+# 발주 DataFrame 범주형 컬럼
+PROCESS_CODE_DTYPE = pd.CategoricalDtype(list(PROCESS_TYPE_STAGES))
+STAGE_DTYPE = pd.CategoricalDtype(list(PROCESS_TYPE_STAGES.values()))
+
+
+def _order_process_code(order_id):
+    """
+    발주번호에서 공정코드 추출 (발주 저장/백필용 - 조회 시에는 orders.process_code 사용)
+
+    세 번째 토큰이 공정코드가 아니면 (프로젝트 코드에 '-' 포함) 뒤에서 두 번째 토큰을 확인한다.
+
+    Returns:
+        PROCESS_TYPE_STAGES 의 키 또는 None
+    """
+    parts = str(order_id or '').split('-')
+    for candidate in (parts[2:3] + parts[-2:-1]) if len(parts) >= 3 else []:
+        if candidate in PROCESS_TYPE_STAGES:
+            return candidate
+    return None
+
+
+def _with_order_stage(orders):
+    """
+    발주 DataFrame 의 process_code / stage 를 범주형으로 정리
+
+    컬럼이 없거나 비어 있는 행(마이그레이션 전 데이터)은 발주번호로 채운다.
+    """
+    if 'order_id' not in orders.columns:
+        return orders
+    codes = orders['process_code'].astype(object) if 'process_code' in orders.columns \
+        else pd.Series(None, index=orders.index, dtype=object)
+    missing = codes.isna()
+    if missing.any():
+        codes = codes.copy()
+        codes[missing] = orders.loc[missing, 'order_id'].map(_order_process_code)
+    stages = orders['stage'].astype(object) if 'stage' in orders.columns \
+        else pd.Series(None, index=orders.index, dtype=object)
+    stages = stages.where(stages.notna(), codes.map(PROCESS_TYPE_STAGES))
+    orders['process_code'] = codes.astype(PROCESS_CODE_DTYPE)
+    orders['stage'] = stages.astype(STAGE_DTYPE)
+    return orders
+
+# 프로젝트 완료 판정 사유 코드
+COMPLETION_REASONS = {
+    'NOT_FOUND': '프로젝트를 찾을 수 없습니다',
+    'NO_ORDERS': '발주 내역이 없습니다',
+    'ORDERS_INCOMPLETE': '모든 발주가 완료되지 않았습니다',
+    'NO_INSTALL_DATE': '설치완료일이 입력되지 않았습니다',
+    'DOCUMENTS_MISSING': '세금계산서 또는 거래명세서가 발행되지 않았습니다',
+    'COMPLETED': '완료 조건을 모두 충족했습니다',
+}
+
 class WIPManager:
     """WIP 현황 관리 비즈니스 로직"""
     
     def __init__(_self, db_manager):
         _self.db = db_manager
-        _self.stages = ["절단/절곡", "레이저", "벤딩", "페인트", "스티커", "입고"]
+        _self.stages = list(PROGRESS_STAGES)
         _self.stage_colors = {
             "절단/절곡": "#FF6B6B",
             "P레이저": "#45B7D1",
@@ -1354,60 +2840,77 @@ class WIPManager:
             "입고": "#6C5CE7"
         }
     
+    def compute_progress(_self, order_ids, latest_events):
+        """
+        발주별 진행률 일괄 계산 (벡터화)
+
+        공정별 최신 이벤트를 (발주 × 공정) 상태 행렬로 펼친 뒤 NumPy 로
+        완료 수 / 진행률 / 현재 공정을 구한다. 규칙은 calculate_order_progress 와 동일:
+        - 완료: done_date 가 있거나 progress >= 100
+        - 현재 공정: 첫 '진행중' 공정 → (없으면) 완료가 있을 때 첫 '대기' 공정
+        - 전 공정 완료 시 '완료', 이벤트 없음 '미시작'
+
+        Args:
+            order_ids: 발주 ID 목록
+            latest_events: (order_id, stage) 별 최신 이벤트 DataFrame
+
+        Returns:
+            DataFrame [order_id, progress_pct, current_stage, stage_status]
+        """
+        import numpy as np
+
+        order_index = pd.Index(order_ids)
+        n_orders, n_stages = len(order_index), len(_self.stages)
+
+        # 0 = 대기, 1 = 진행중, 2 = 완료
+        status = np.zeros((n_orders, n_stages), dtype=np.int8)
+        if latest_events is not None and not latest_events.empty:
+            rows = order_index.get_indexer(latest_events['order_id'])
+            cols = pd.Index(_self.stages).get_indexer(latest_events['stage'])
+            valid = (rows >= 0) & (cols >= 0)
+            done = latest_events['done_date'].notna().to_numpy() if 'done_date' in latest_events.columns \
+                else np.zeros(len(latest_events), dtype=bool)
+            if 'progress' in latest_events.columns:
+                progress = pd.to_numeric(latest_events['progress'], errors='coerce').fillna(0).to_numpy()
+                done = done | (progress >= 100)
+            status[rows[valid], cols[valid]] = np.where(done[valid], 2, 1)
+
+        completed = (status == 2).sum(axis=1)
+        progress_pct = (completed / n_stages * 100).astype(int)
+
+        stage_names = np.array(_self.stages, dtype=object)
+        in_progress = status == 1
+        waiting = status == 0
+        current = np.full(n_orders, '미시작', dtype=object)
+        has_waiting_next = (~in_progress.any(axis=1)) & (completed > 0) & waiting.any(axis=1)
+        current[has_waiting_next] = stage_names[waiting.argmax(axis=1)[has_waiting_next]]
+        has_in_progress = in_progress.any(axis=1)
+        current[has_in_progress] = stage_names[in_progress.argmax(axis=1)[has_in_progress]]
+        current[completed == n_stages] = '완료'
+
+        labels = np.array(['대기', '진행중', '완료'], dtype=object)[status]
+        stage_status = [dict(zip(_self.stages, row)) for row in labels.tolist()]
+
+        return pd.DataFrame({
+            'order_id': order_index,
+            'progress_pct': progress_pct,
+            'current_stage': current,
+            'stage_status': stage_status,
+        })
+
     def calculate_order_progress(_self, order_id):
         """발주의 진행률 계산"""
         events = _self.db.get_latest_events_by_stage(order_id)
-        
-        if events.empty:
-            return {
-                'progress_pct': 0,
-                'current_stage': '미시작',
-                'stage_status': {stage: '대기' for stage in _self.stages}
-            }
-        
-        stage_status = {}
-        completed_count = 0
-        current_stage = '미시작'
-        
-        for stage in _self.stages:
-            stage_events = events[events['stage'] == stage]
-            
-            if stage_events.empty:
-                stage_status[stage] = '대기'
-            else:
-                event = stage_events.iloc[0]
-                # 완료 조건 수정: done_date만 체크
-                if pd.notna(event.get('done_date')):
-                    stage_status[stage] = '완료'
-                    completed_count += 1
-                elif event.get('progress', 0) >= 100:
-                    stage_status[stage] = '완료'
-                    completed_count += 1
-                else:
-                    stage_status[stage] = '진행중'
-                    if current_stage == '미시작':
-                        current_stage = stage
-        
-        # 모든 단계 완료 체크
-        if completed_count == len(_self.stages):
-            current_stage = '완료'
-        elif current_stage == '미시작' and completed_count > 0:
-            # 다음 대기 단계 찾기
-            for stage in _self.stages:
-                if stage_status[stage] == '대기':
-                    current_stage = stage
-                    break
-        
-        progress_pct = int((completed_count / len(_self.stages)) * 100)
-        
+        row = _self.compute_progress([order_id], events).iloc[0]
         return {
-            'progress_pct': progress_pct,
-            'current_stage': current_stage,
-            'stage_status': stage_status
+            'progress_pct': int(row['progress_pct']),
+            'current_stage': row['current_stage'],
+            'stage_status': row['stage_status']
         }
-    @st.cache_data(ttl=3600)  # 1시간 캐시
+
+    @tagged_cache(ttl=3600, tags=lambda customer_id=None: _customer_tags(customer_id, 'orders', 'events'))  # 1시간 캐시
     def get_orders_with_progress(_self, customer_id=None):
-        """진행률이 포함된 발주 목록 조회"""
+        """진행률이 포함된 발주 목록 조회 (발주 1회 + 이벤트 1회 조회)"""
         orders = _self.db.get_orders(customer_id)
         
         if orders.empty:
@@ -1417,16 +2920,9 @@ class WIPManager:
         if 'current_stage' not in orders.columns:
             orders['current_stage'] = '미시작'
         
-        # 각 발주의 진행률 계산
-        progress_data = []
-        for _, order in orders.iterrows():
-            progress_info = _self.calculate_order_progress(order['order_id'])
-            progress_data.append({
-                'order_id': order['order_id'],
-                **progress_info
-            })
-        
-        progress_df = pd.DataFrame(progress_data)
+        # 전체 발주의 공정별 최신 이벤트를 한 번에 조회해 일괄 계산
+        latest_events = _self.db.get_latest_events_for_orders(customer_id)
+        progress_df = _self.compute_progress(orders['order_id'].drop_duplicates().tolist(), latest_events)
         
         # 원본 데이터와 병합
         result = orders.merge(progress_df, on='order_id', how='left', suffixes=('_db', '_calc'))
@@ -1441,49 +2937,24 @@ class WIPManager:
         result['current_stage'] = result['current_stage'].fillna('미시작')
         
         return result
-    @st.cache_data
+    def get_dashboard_snapshot(_self, customer_id=None):
+        """
+        대시보드 카드 스냅샷 1행 (발주/프로젝트 카운터, 변경분만 갱신)
+
+        Returns:
+            {'total', 'wip', 'completed', 'overdue', 'thisweek_due',
+             'projects_total', 'projects_wip', 'projects_urgent', 'projects_completed', 'as_of', ...}
+        """
+        try:
+            return _self.db.get_dashboard_snapshot(customer_id).row()
+        except Exception as e:
+            print(f"[WARN] 대시보드 스냅샷 조회 실패: {e}")
+            return dict.fromkeys(SNAPSHOT_FIELDS, 0)
+
     def get_dashboard_stats(_self, customer_id=None):
-        """대시보드 통계 계산"""
-        orders = _self.get_orders_with_progress(customer_id)
-        
-        if orders.empty:
-            return {
-                'total': 0,
-                'wip': 0,
-                'completed': 0,
-                'overdue': 0,
-                'thisweek_due': 0
-            }
-        
-        today = date.today()
-        week_end = today + timedelta(days=7)
-        
-        total = len(orders)
-        completed = len(orders[orders['progress_pct'] >= 100])
-        wip = total - completed
-        
-        # 지연 계산
-        overdue = len(orders[
-            (orders['due_date'].notna()) &
-            (orders['due_date'] < today) &
-            (orders['progress_pct'] < 100)
-        ])
-        
-        # 이번주 완료 예정
-        thisweek_due = len(orders[
-            (orders['due_date'].notna()) &
-            (orders['due_date'] >= today) &
-            (orders['due_date'] <= week_end) &
-            (orders['progress_pct'] < 100)
-        ])
-        
-        return {
-            'total': total,
-            'wip': wip,
-            'completed': completed,
-            'overdue': overdue,
-            'thisweek_due': thisweek_due
-        }
+        """대시보드 통계 (발주 기준) - 스냅샷 1행에서 조회"""
+        snapshot = _self.get_dashboard_snapshot(customer_id)
+        return {field: int(snapshot[field]) for field in ORDER_FIELDS}
     
     def is_order_delayed(_self, order):
         """발주 지연 여부 확인"""
@@ -1675,7 +3146,7 @@ class WIPManager:
         
         print("✅ 샘플 데이터 생성 완료")
         return True
-    @st.cache_data(ttl=3600)  # 1시간 캐시
+    @tagged_cache(ttl=3600, tags=lambda customer_id=None: _customer_tags(customer_id, 'projects', 'orders', 'events'))  # 1시간 캐시
     def get_projects_with_orders(_self, customer_id=None):
         """프로젝트별 발주 현황 집계 (최적화: 배치 프로세스 이벤트 로드)"""
         projects = _self.db.get_projects(customer_id)
@@ -1684,57 +3155,21 @@ class WIPManager:
             return pd.DataFrame()
 
         result = []
-        # ⚡ 최적화: 모든 프로세스 이벤트를 한 번에 로드
-        all_events = _self.db.get_process_events()  # order_id별로 필터링되지 않음
-
-        # fetch orders once to avoid repeated cached calls
+        # ⚡ 최적화: 발주(담당 공정) ⋈ 공정 최신 상태 → 프로젝트별 발주 수/완료 수 집계
         orders_all = _self.db.get_orders()
-        for _, project in projects.iterrows():
-            project_orders = orders_all[orders_all['project_id'] == project['project_id']]
-
-            if not project_orders.empty:
-                total_orders = len(project_orders)
-                completed_orders = 0
-
-                for _, order in project_orders.iterrows():
-                    order_parts = order['order_id'].split('-')
-                    if len(order_parts) >= 3:
-                        process_type = order_parts[2]
-
-                        process_map = {
-                            'CUT': '절단/절곡',
-                            'PLASER': 'P레이저',
-                            'LASER': '레이저(판재)',
-                            'BAND': '벤딩',
-                            'PAINT': '페인트',
-                            'STICKER': '스티커',
-                            'RECEIVING': '입고'
-                        }
-
-                        target_stage = process_map.get(process_type)
+        orders = orders_all[orders_all['project_id'].isin(projects['project_id'])][['order_id', 'project_id', 'stage']] \
+            if not orders_all.empty else pd.DataFrame(columns=['order_id', 'project_id', 'stage'])
+        orders = _merge_stage_done(orders, _self.db.get_latest_events_for_orders(customer_id))
+        rollup = orders.groupby('project_id').agg(order_count=('order_id', 'size'), completed=('done', 'sum'))
+        rollup = rollup.reindex(projects['project_id'].drop_duplicates(), fill_value=0)
+        rollup['total_progress'] = (rollup['completed'] * 100 // rollup['order_count'].where(rollup['order_count'] > 0, 1))
 
-                        if target_stage:
-                            # ⚡ 최적화: 메모리 필터링 (DB 쿼리 없음)
-                            events = all_events[all_events['order_id'] == order['order_id']]
+        # 납기 경고는 스캐너가 저장한 레벨을 한 번에 읽음 (행마다 계산하지 않음)
+        levels, d_days = _self.get_warning_levels('project', projects['project_id'], projects['final_due_date'],
+                                                  customer_id)
 
-                            # 빈 DataFrame 체크
-                            if events.empty:
-                                continue
-
-                            stage_events = events[events['stage'] == target_stage]
-
-                            if not stage_events.empty:
-                                latest_event = stage_events.iloc[0]
-                                is_done = pd.notna(latest_event.get('done_date')) or latest_event.get('progress', 0) >= 100
-
-                                if is_done:
-                                    completed_orders += 1
-
-                total_progress = int((completed_orders / total_orders) * 100) if total_orders > 0 else 0
-            else:
-                total_progress = 0
-
-            warning_level, d_day = _self.get_project_warning_level(project['final_due_date'])
+        for (_, project), warning_level, d_day in zip(projects.iterrows(), levels, d_days):
+            counts = rollup.loc[project['project_id']]
 
             result.append({
                 'project_id': project['project_id'],
@@ -1748,8 +3183,8 @@ class WIPManager:
                 'tax_invoice_issued': project.get('tax_invoice_issued', False),
                 'trade_statement_issued': project.get('trade_statement_issued', False),
                 'status': project['status'],
-                'order_count': len(project_orders),
-                'total_progress': int(total_progress),
+                'order_count': int(counts['order_count']),
+                'total_progress': int(counts['total_progress']),
                 'warning_level': warning_level,
                 'd_day': d_day
             })
@@ -1779,6 +3214,7 @@ class WIPManager:
                     update_data['installation_completed_date'] = str(update_data['installation_completed_date']) if update_data['installation_completed_date'] else None
                 
                 _self.db.supabase.table('projects').update(update_data).eq('project_id', project_id).execute()
+                _self.db.invalidate_project_cache(project_id)
                 return True
             else:
                 with _self.db.get_connection() as conn:
@@ -1803,7 +3239,10 @@ class WIPManager:
                         query = f"UPDATE projects SET {', '.join(updates)} WHERE project_id = ?"
                         params.append(project_id)
                         cursor.execute(query, params)
-                        return True
+                    else:
+                        return False
+                _self.db.invalidate_project_cache(project_id)
+                return True
         
         return False
     
@@ -1819,6 +3258,7 @@ class WIPManager:
             
             if update_data:
                 _self.db.supabase.table('projects').update(update_data).eq('project_id', project_id).execute()
+                _self.db.invalidate_project_cache(project_id)
                 return True
             return False
         
@@ -1841,10 +3281,11 @@ class WIPManager:
                     query = f"UPDATE projects SET {', '.join(updates)} WHERE project_id = ?"
                     params.append(project_id)
                     cursor.execute(query, params)
-                    return True
-                
-                return False
-    @st.cache_data(ttl=3600)  # 1시간 캐시
+                else:
+                    return False
+            _self.db.invalidate_project_cache(project_id)
+            return True
+    @tagged_cache(ttl=3600, tags=lambda project_id: [scope_tag(e, project=project_id) for e in ('projects', 'orders', 'events')])  # 1시간 캐시
     def get_project_completion_status(_self, project_id):
         """프로젝트 완료 조건 체크 (관급/사급 구분)"""
         project = _self.db.get_project_by_id(project_id)
@@ -1857,46 +3298,10 @@ class WIPManager:
         if project_orders.empty:
             return {'completed': False, 'reason': '발주 내역이 없습니다'}
         
-        # 각 발주의 담당 공정 완료 확인
-        all_completed = True
-        for _, order in project_orders.iterrows():
-            order_parts = order['order_id'].split('-')
-            if len(order_parts) >= 3:
-                process_type = order_parts[2]
-                
-                process_map = {
-                    'CUT': '절단/절곡',
-                    'PLASER': 'P레이저',
-                    'LASER': '레이저(판재)',
-                    'BAND': '벤딩',
-                    'PAINT': '페인트',
-                    'STICKER': '스티커',
-                    'RECEIVING': '입고'
-                }
-                
-                target_stage = process_map.get(process_type)
-                
-                if target_stage:
-                    events = _self.db.get_process_events(order['order_id'])
-
-                    # 빈 DataFrame 체크
-                    if events.empty:
-                        all_completed = False
-                        break
-
-                    # 'stage' 또는 'process_stage' 컬럼명 확인
-                    if 'stage' in events.columns:
-                        stage_events = events[events['stage'] == target_stage]
-                    elif 'process_stage' in events.columns:
-                        stage_events = events[events['process_stage'] == target_stage]
-                    else:
-                        # 컬럼이 없으면 미완료로 처리
-                        all_completed = False
-                        break
-                    
-                    if stage_events.empty or (pd.isna(stage_events.iloc[0]['done_date']) and stage_events.iloc[0]['progress'] < 100):
-                        all_completed = False
-                        break
+        # 각 발주의 담당 공정 완료 확인 (프로젝트 발주의 최신 상태 1회 조회 후 조인)
+        targeted = project_orders.loc[project_orders['stage'].notna(), ['order_id', 'stage']]
+        targeted = _merge_stage_done(targeted, _self.db.get_latest_events_for_orders(project_id=project_id))
+        all_completed = bool(targeted['done'].all())
         
         if not all_completed:
             return {'completed': False, 'reason': '모든 발주가 완료되지 않았습니다'}
@@ -1945,6 +3350,7 @@ class WIPManager:
                         "UPDATE projects SET status = '완료' WHERE project_id = ?",
                         (project_id,)
                     )
+            _self.db.invalidate_project_cache(project_id)
             return True
         else:
             # 완료 조건 미충족 → 진행중으로 변경 (완료였던 경우만)
@@ -1970,9 +3376,163 @@ class WIPManager:
                             "UPDATE projects SET status = '진행중' WHERE project_id = ?",
                             (project_id,)
                         )
+                _self.db.invalidate_project_cache(project_id)
                 return True
         
         return False
+    def evaluate_project_completion(_self, project_ids=None):
+        """
+        여러 프로젝트 완료 조건 일괄 판정 (프로젝트·발주·이벤트 각 1회 조회)
+
+        판정 규칙은 get_project_completion_status 와 동일하며, 발주별 이벤트 조회 대신
+        공정별 최신 이벤트를 한 번에 가져와 (발주, 담당 공정) 으로 조인한다.
+
+        Args:
+            project_ids: 판정할 프로젝트 ID 목록 (None 이면 전체)
+
+        Returns:
+            DataFrame [project_id, completed, reason_code, reason, status]
+        """
+        import numpy as np
+
+        projects = _self.db.get_projects()
+        if project_ids is not None:
+            wanted = pd.Index(pd.unique(pd.Series(list(project_ids), dtype=object)))
+        elif not projects.empty:
+            wanted = pd.Index(projects['project_id'].drop_duplicates())
+        else:
+            wanted = pd.Index([])
+        if len(wanted) == 0:
+            return pd.DataFrame(columns=['project_id', 'completed', 'reason_code', 'reason', 'status'])
+
+        if projects.empty:
+            projects = pd.DataFrame(columns=['project_id'])
+        found = wanted.isin(projects['project_id'])
+        projects = projects.drop_duplicates('project_id').set_index('project_id').reindex(wanted)
+
+        # 담당 공정이 있는 발주별 완료 여부
+        orders = _self.db.get_orders()
+        if orders.empty:
+            orders = pd.DataFrame(columns=['order_id', 'project_id'])
+        if 'stage' not in orders.columns:
+            orders = orders.assign(stage=pd.Series(dtype=STAGE_DTYPE))
+        orders = orders[orders['project_id'].isin(wanted)][['order_id', 'project_id', 'stage']]
+
+        targeted = orders[orders['stage'].notna()]
+        latest = _self.db.get_latest_events_for_orders() if not targeted.empty else None
+        targeted = _merge_stage_done(targeted, latest)
+
+        order_count = orders.groupby('project_id').size().reindex(wanted, fill_value=0).to_numpy()
+        pending = (~targeted['done'].astype(bool)).groupby(targeted['project_id']).sum() \
+            .reindex(wanted, fill_value=0).to_numpy()
+
+        def column(name, default=None):
+            if name in projects.columns:
+                return projects[name]
+            return pd.Series(default, index=projects.index, dtype=object)
+
+        install = column('installation_completed_date')
+        has_install = (install.notna() & (install.astype(str) != '')).to_numpy()
+        is_private = (column('contract_type').fillna('관급') == '사급').to_numpy()
+        tax = column('tax_invoice_issued', False).fillna(False).astype(bool).to_numpy()
+        trade = column('trade_statement_issued', False).fillna(False).astype(bool).to_numpy()
+
+        # 앞선 조건이 우선 (np.select 는 첫 번째로 참인 조건 선택)
+        reason_code = np.select(
+            [~found, order_count == 0, pending > 0, ~has_install, is_private & ~(tax & trade)],
+            ['NOT_FOUND', 'NO_ORDERS', 'ORDERS_INCOMPLETE', 'NO_INSTALL_DATE', 'DOCUMENTS_MISSING'],
+            default='COMPLETED',
+        )
+
+        return pd.DataFrame({
+            'project_id': wanted,
+            'completed': reason_code == 'COMPLETED',
+            'reason_code': reason_code,
+            'reason': pd.Series(reason_code).map(COMPLETION_REASONS).to_numpy(),
+            'status': column('status').to_numpy(),
+        })
+
+    def auto_update_project_statuses(_self, project_ids=None):
+        """
+        프로젝트 상태 일괄 자동 업데이트 - Supabase/SQLite 분기
+
+        evaluate_project_completion 결과로 완료 충족 → '완료',
+        '완료' 였는데 미충족 → '진행중' 으로 한 번에 갱신 (상태별 UPDATE 1회)
+
+        Args:
+            project_ids: 대상 프로젝트 ID 목록 (None 이면 전체)
+
+        Returns:
+            {'completed': [완료로 바뀐 ID], 'reopened': [진행중으로 되돌린 ID]}
+        """
+        evaluation = _self.evaluate_project_completion(project_ids)
+        if evaluation.empty:
+            return {'completed': [], 'reopened': []}
+
+        found = evaluation['reason_code'] != 'NOT_FOUND'
+        to_complete = evaluation[evaluation['completed'] & (evaluation['status'] != '완료')]['project_id'].tolist()
+        to_reopen = evaluation[found & ~evaluation['completed'] & (evaluation['status'] == '완료')]['project_id'].tolist()
+
+        for new_status, ids in (('완료', to_complete), ('진행중', to_reopen)):
+            if not ids:
+                continue
+            if USE_SUPABASE:
+                _self.db.supabase.table('projects').update({
+                    'status': new_status
+                }).in_('project_id', ids).execute()
+            else:
+                with _self.db.get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.executemany(
+                        "UPDATE projects SET status = ? WHERE project_id = ?",
+                        [(new_status, pid) for pid in ids]
+                    )
+
+        for project_id in to_complete + to_reopen:
+            _self.db.invalidate_project_cache(project_id)
+
+        return {'completed': to_complete, 'reopened': to_reopen}
+
+    def get_warning_levels(_self, entity_type, entity_ids, due_dates, customer_id=None):
+        """
+        납기 경고 레벨 (스캐너가 저장한 값 우선)
+
+        저장된 행은 오늘 스캔했고 납기일이 같을 때만 사용하고, 나머지(스캔 이후 등록/수정,
+        완료 건 등)는 같은 규칙으로 바로 계산한다.
+
+        Args:
+            entity_type: 'project' / 'order'
+            entity_ids: ID 목록 (due_dates 와 같은 순서)
+            due_dates: 납기일 목록
+            customer_id: 고객사 ID (None 이면 전체)
+
+        Returns:
+            (warning_level ndarray, d_day ndarray)
+        """
+        import numpy as np
+
+        level, d_day = warning_levels(due_dates)
+        # 한 페이지 분량이면 해당 ID 만, 그보다 많으면 고객사 범위 전체를 읽는다
+        lookup_ids = tuple(dict.fromkeys(entity_ids))
+        try:
+            stored = _self.db.get_deadline_warnings(
+                entity_type, customer_id,
+                entity_ids=lookup_ids if len(lookup_ids) <= EVENT_ORDER_BATCH else None)
+        except Exception as e:
+            print(f"[WARN] 납기 경고 조회 실패, 즉시 계산 사용: {e}")
+            return level, d_day
+        if stored.empty:
+            return level, d_day
+
+        stored = stored[stored['scanned_at'].astype(str).str[:10] == date.today().isoformat()]\
+            .drop_duplicates('entity_id').set_index('entity_id')
+        ids = pd.Series(list(entity_ids))
+        due = pd.to_datetime(pd.Series(list(due_dates)), errors='coerce').dt.strftime('%Y-%m-%d')
+        valid = (ids.map(stored['due_date']).to_numpy() == due.to_numpy()) & ids.isin(stored.index).to_numpy()
+        level = np.where(valid, ids.map(stored['level']).to_numpy(), level)
+        d_day = np.where(valid, ids.map(stored['d_day']).to_numpy(), d_day)
+        return level, d_day
+
     @st.cache_data(ttl=3600)  # 1시간 캐시
     def get_project_warning_level(_self, final_due_date):
         """프로젝트 납기 경고 레벨 반환"""
@@ -1997,108 +3557,180 @@ class WIPManager:
         else:
             return "normal", f"D-{days_left}"
     
-    def apply_filters_to_projects(_self, projects_df):
-        """프로젝트에 필터 적용"""
-        if projects_df.empty:
-            return projects_df
-        
-        filtered = projects_df.copy()
-        
-        # 1. 기간 필터
+    def get_project_filters(_self):
+        """
+        사이드바 필터(session_state) → 프로젝트 필터 dict
+
+        apply_filters_to_projects 와 서버 페이지 조회(get_projects_page / get_orders_page)가 같이 쓴다.
+
+        Returns:
+            {'date_col', 'year', 'month', 'status', 'contract_type'} (없는 조건은 None)
+        """
         period_type = st.session_state.get('period_type', '전체')
-        date_criteria = st.session_state.get('date_criteria', '납기일')
-        
-        # 기준 컬럼 선택
-        date_criteria = st.session_state.get('date_criteria', '최종납기일')
-        if date_criteria == '최종납기일':
+        if st.session_state.get('date_criteria', '최종납기일') == '최종납기일':
             date_col = 'final_due_date'
         else:  # 설치완료일
             date_col = 'installation_completed_date'
-        
-        if period_type == '년도' and date_col in filtered.columns:
+
+        year = month = None
+        if period_type == '년도':
             year = st.session_state.get('filter_year')
-            if year:
-                filtered = filtered[
-                    pd.to_datetime(filtered[date_col], errors='coerce').dt.year == year
-                ]
-        elif period_type == '월별' and date_col in filtered.columns:
+        elif period_type == '월별':
             year = st.session_state.get('filter_year_month')
             month = st.session_state.get('filter_month')
-            if year and month:
-                filtered = filtered[
-                    (pd.to_datetime(filtered[date_col], errors='coerce').dt.year == year) &
-                    (pd.to_datetime(filtered[date_col], errors='coerce').dt.month == month)
-                ]
-        
-        # 2. 상태 필터
-        status_filter = st.session_state.get('status_filter', '진행중')
-        if status_filter != '전체' and 'status' in filtered.columns:
-            filtered = filtered[filtered['status'] == status_filter]
+            if not (year and month):
+                year = month = None
 
-        # 3. 관급/사급 필터
+        status_filter = st.session_state.get('status_filter', '진행중')
         project_type_filter = st.session_state.get('project_type_filter', '전체')
-        if project_type_filter != '전체' and 'contract_type' in filtered.columns:
-            filtered = filtered[filtered['contract_type'] == project_type_filter]
+        return {
+            'date_col': date_col,
+            'year': year,
+            'month': month,
+            'status': None if status_filter == '전체' else status_filter,
+            'contract_type': None if project_type_filter == '전체' else project_type_filter,
+        }
 
-        return filtered
+    def apply_filters_to_projects(_self, projects_df, filters=None):
+        """프로젝트에 필터 적용 (이미 조회한 DataFrame 용 - 목록 화면은 get_projects_page 로 서버에서 필터)"""
+        if projects_df.empty:
+            return projects_df
+
+        filters = filters or _self.get_project_filters()
+        mask = pd.Series(True, index=projects_df.index)
+
+        # 1. 기간 필터
+        date_col = filters['date_col']
+        if filters.get('year') and date_col in projects_df.columns:
+            dates = pd.to_datetime(projects_df[date_col], errors='coerce')
+            mask &= dates.dt.year == filters['year']
+            if filters.get('month'):
+                mask &= dates.dt.month == filters['month']
+
+        # 2. 상태 / 3. 관급·사급 필터
+        for key in ('status', 'contract_type'):
+            if filters.get(key) and key in projects_df.columns:
+                mask &= projects_df[key] == filters[key]
+
+        return projects_df[mask].copy()
+
+    def get_projects_page(_self, customer_id=None, filters=None, sort_by='final_due_date', descending=False,
+                          page=1, page_size=TABLE_PAGE_SIZE):
+        """
+        프로젝트 현황 한 페이지 (필터/정렬/페이지는 서버, 발주 집계는 해당 페이지 프로젝트만)
+
+        Returns:
+            (DataFrame - get_projects_with_orders 와 같은 컬럼, 필터 적용 전체 건수)
+        """
+        projects, total = _self.db.get_projects_page(customer_id, filters, sort_by, descending, page, page_size)
+        if projects.empty:
+            return pd.DataFrame(), total
+
+        rollup = _self.db.get_project_order_rollup(projects['project_id'].tolist())
+        projects = projects.merge(rollup, on='project_id', how='left')
+        projects['order_count'] = projects['order_count'].fillna(0).astype(int)
+        completed = projects.pop('completed').fillna(0).astype(int)
+        projects['total_progress'] = (completed * 100 // projects['order_count'].where(projects['order_count'] > 0, 1)).astype(int)
+        projects['warning_level'], projects['d_day'] = _self.get_warning_levels(
+            'project', projects['project_id'], projects['final_due_date'], customer_id)
+        for col, default in (('contract_type', '관급'), ('contract_amount', 0),
+                             ('tax_invoice_issued', False), ('trade_statement_issued', False)):
+            if col not in projects.columns:
+                projects[col] = default
+        return projects, total
+
+    def get_orders_page(_self, customer_id=None, filters=None, sort_by='project', descending=False,
+                        page=1, page_size=TABLE_PAGE_SIZE):
+        """
+        발주 현황 한 페이지 (진행률/스티커 상태는 해당 페이지 발주만 계산)
+
+        Returns:
+            (DataFrame - orders 컬럼 + contract_type, progress_pct, current_stage, sticker_status,
+             warning_level, d_day, 전체 건수)
+        """
+        import numpy as np
+
+        orders, total = _self.db.get_orders_page(customer_id, filters, sort_by, descending, page, page_size)
+        if orders.empty:
+            return orders, total
+
+        order_ids = orders['order_id'].tolist()
+        states = _self.db.get_latest_events_for_orders(order_ids=order_ids)
+        progress = _self.compute_progress(order_ids, states).drop(columns=['stage_status'])
+        orders = orders.drop(columns=['current_stage'], errors='ignore').merge(progress, on='order_id', how='left')
+
+        sticker = states.loc[states['stage'] == '스티커'].drop_duplicates('order_id').set_index('order_id')['status']
+        orders['sticker_status'] = orders['order_id'].map(sticker).map({'완료': '✅', '진행중': '⚪'}).fillna('-')
+        orders['contract_type'] = orders['contract_type'].fillna('관급') if 'contract_type' in orders.columns else '관급'
+        levels, d_days = _self.get_warning_levels('order', orders['order_id'], orders['due_date'], customer_id)
+        finished = (orders['progress_pct'] >= 100).to_numpy()
+        orders['warning_level'] = np.where(finished, 'normal', levels)
+        orders['d_day'] = np.where(finished, '', d_days)
+        return orders, total
     
-    def render_orders_table_improved(_self, orders_df):
-        """발주 현황 테이블 - 스티커 + 관급/사급 수정 가능"""
-        if orders_df.empty:
-            st.info("📋 발주 데이터가 없습니다.")
-            return None
-        
+    def get_table_state(_self, key, sort_options):
+        """
+        페이지 테이블 상태 (session_state 의 {key}_sort / {key}_desc / {key}_page)
+
+        Returns:
+            (정렬 컬럼, 내림차순 여부, 페이지 번호)
+        """
+        sort_label = st.session_state.get(f'{key}_sort')
+        if sort_label not in sort_options:
+            sort_label = next(iter(sort_options))
+        return (sort_options[sort_label],
+                bool(st.session_state.get(f'{key}_desc', False)),
+                max(int(st.session_state.get(f'{key}_page', 1) or 1), 1))
+
+    def render_table_pager(_self, key, total, sort_options, page_size=TABLE_PAGE_SIZE):
+        """페이지 테이블 정렬/페이지 컨트롤 (값은 session_state 로 다음 실행의 get_table_state 에 반영)"""
+        last_page = max((total - 1) // page_size + 1, 1)
+        col1, col2, col3, col4 = st.columns([2, 1, 1, 2])
+        with col1:
+            st.selectbox("정렬", list(sort_options), key=f'{key}_sort', label_visibility="collapsed")
+        with col2:
+            st.checkbox("내림차순", key=f'{key}_desc')
+        with col3:
+            if st.session_state.get(f'{key}_page', 1) > last_page:
+                st.session_state[f'{key}_page'] = last_page
+            st.number_input("페이지", min_value=1, max_value=last_page, step=1,
+                            key=f'{key}_page', label_visibility="collapsed")
+        with col4:
+            st.caption(f"총 {total}건 · {last_page}페이지")
+
+    def render_orders_table_improved(_self, customer_id=None):
+        """발주 현황 테이블 - 스티커 + 관급/사급 수정 가능 (서버 페이지 단위 조회/렌더링)"""
         st.subheader("📋 발주 현황")
         
         try:
-            # 표시용 데이터프레임 준비
-            display_df = orders_df.copy()
-            
-            # 프로젝트 정보 가져오기 (관급/사급 표시용)
-            display_df['관급/사급'] = display_df['project_id'].apply(
-                lambda pid: _self.db.get_project_by_id(pid).get('contract_type', '관급') 
-                if pid and _self.db.get_project_by_id(pid) is not None else '관급'
-            )
-            
-            # 스티커 공정 상태 확인
-            def get_sticker_status(order_id):
-                events = _self.db.get_latest_events_by_stage(order_id)
-                sticker_events = events[events['stage'] == '스티커']
-                
-                if sticker_events.empty:
-                    return '-'
-                else:
-                    event = sticker_events.iloc[0]
-                    if pd.notna(event['done_date']) or event['progress'] >= 100:
-                        return '✅'
-                    else:
-                        return '⚪'
-            
-            display_df['스티커'] = display_df['order_id'].apply(get_sticker_status)
-            
-            # 발주일 포맷팅
-            if 'order_date' in display_df.columns:
-                display_df['발주일'] = display_df['order_date'].apply(
-                    lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) and hasattr(x, 'strftime') 
-                    else str(x) if pd.notna(x) else ''
-                )
-            
-            # 납기일 포맷팅
-            if 'due_date' in display_df.columns:
-                display_df['납기일'] = display_df['due_date'].apply(
-                    lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) and hasattr(x, 'strftime')
-                    else str(x) if pd.notna(x) else ''
-                )
-            
-            # 컬럼 선택
-            display_columns = [
-                'project', 'order_id', 'vendor', '관급/사급', '발주일', '납기일',
-                'progress_pct', '스티커', 'current_stage', 'status'
-            ]
-            
-            # 존재하는 컬럼만 선택
-            display_columns = [col for col in display_columns if col in display_df.columns]
-            display_df = display_df[display_columns]
+            sort_by, descending, page = _self.get_table_state('orders_table', ORDER_SORT_OPTIONS)
+            orders_df, total = _self.get_orders_page(customer_id, _self.get_project_filters(),
+                                                     sort_by, descending, page)
+            if total == 0:
+                st.info("📋 발주 데이터가 없습니다.")
+                return None
+            last_page = (total - 1) // TABLE_PAGE_SIZE + 1
+            if page > last_page:
+                # 필터 변경 등으로 범위를 벗어난 페이지 → 마지막 페이지
+                st.session_state['orders_table_page'] = last_page
+                orders_df, total = _self.get_orders_page(customer_id, _self.get_project_filters(),
+                                                         sort_by, descending, last_page)
+            _self.render_table_pager('orders_table', total, ORDER_SORT_OPTIONS)
+            
+            # 표시용 데이터프레임 준비 (현재 페이지 행만, 벡터화 포맷)
+            display_df = pd.DataFrame({
+                'project': orders_df['project'],
+                'order_id': orders_df['order_id'],
+                'vendor': orders_df['vendor'],
+                '관급/사급': orders_df['contract_type'],
+                '발주일': _format_dates(orders_df['order_date']),
+                '납기일': _format_dates(orders_df['due_date']),
+                '납기상태': WIPInterface.project_status_icons(orders_df).where(orders_df['d_day'] != '', '-'),
+                'progress_pct': orders_df['progress_pct'],
+                '스티커': orders_df['sticker_status'],
+                'current_stage': orders_df['current_stage'],
+                'status': orders_df['status'],
+            })
             
             # 컬럼명 한글화
             display_df = display_df.rename(columns={
@@ -2110,16 +3742,12 @@ class WIPManager:
                 'status': '상태'
             })
             
-            # 프로젝트별로 정렬
-            if '프로젝트' in display_df.columns:
-                display_df = display_df.sort_values(['프로젝트', '발주일'])
-            
             # 편집 가능한 테이블
             edited_df = st.data_editor(
                 display_df,
                 use_container_width=True,
                 hide_index=True,
-                disabled=['발주번호', '진행률(%)', '현재단계', '프로젝트', '업체', '발주일', '납기일', '스티커'],
+                disabled=['발주번호', '진행률(%)', '현재단계', '프로젝트', '업체', '발주일', '납기일', '납기상태', '스티커'],
                 column_config={
                     "진행률(%)": st.column_config.ProgressColumn(
                         "진행률",
@@ -2145,29 +3773,20 @@ class WIPManager:
             with col1:
                 if st.button("💾 변경사항 저장", use_container_width=True):
                     try:
-                        # 변경된 관급/사급 업데이트
-                        for idx, row in edited_df.iterrows():
-                            order_id = row['발주번호']
-                            new_contract = row['관급/사급']
-                            new_status = row['상태']
-                            
-                            # 해당 발주의 프로젝트 ID 찾기
-                            original_order = orders_df[orders_df['order_id'] == order_id].iloc[0]
-                            project_id = original_order['project_id']
-                            
-                            # 프로젝트의 관급/사급 업데이트
-                            with _self.db.get_connection() as conn:
-                                cursor = conn.cursor()
-                                cursor.execute(
-                                    "UPDATE projects SET contract_type = ? WHERE project_id = ?",
-                                    (new_contract, project_id)
-                                )
-                                
-                                # 발주 상태도 업데이트
-                                cursor.execute(
-                                    "UPDATE orders SET status = ? WHERE order_id = ?",
-                                    (new_status, order_id)
-                                )
+                        # 바뀐 행만 저장
+                        contract_changed = (edited_df['관급/사급'] != display_df['관급/사급']).to_numpy()
+                        status_changed = (edited_df['상태'] != display_df['상태']).to_numpy()
+                        project_ids = orders_df['project_id'].to_numpy()
+                        
+                        # 프로젝트의 관급/사급 업데이트
+                        contracts = dict(zip(project_ids[contract_changed], edited_df['관급/사급'].to_numpy()[contract_changed]))
+                        if contracts:
+                            _self.update_project_contract_types(contracts)
+                        
+                        # 발주 상태도 업데이트
+                        for order_id, new_status in zip(edited_df['발주번호'].to_numpy()[status_changed],
+                                                        edited_df['상태'].to_numpy()[status_changed]):
+                            _self.db.update_order(order_id, status=new_status)
                         
                         st.success("✅ 변경사항이 저장되었습니다!")
                         st.rerun()
@@ -2190,6 +3809,7 @@ class WIPManager:
                 _self.db.supabase.table('projects').update({
                     'project_name': project_name
                 }).eq('project_id', project_id).execute()
+                _self.db.invalidate_project_cache(project_id)
                 return True
             else:
                 with _self.db.get_connection() as conn:
@@ -2199,12 +3819,34 @@ class WIPManager:
                         SET project_name = ?
                         WHERE project_id = ?
                     """, (project_name, project_id))
-                    return True
+                _self.db.invalidate_project_cache(project_id)
+                return True
         except Exception as e:
             import streamlit as st
             st.error(f"프로젝트명 업데이트 실패: {e}")
             return False
 
+    def update_project_contract_types(_self, contracts):
+        """
+        프로젝트 관급/사급 일괄 업데이트 - Supabase/SQLite 분기
+
+        Args:
+            contracts: {project_id: '관급' | '사급'}
+        """
+        if USE_SUPABASE:
+            for project_id, contract in contracts.items():
+                _self.db.supabase.table('projects').update({
+                    'contract_type': contract
+                }).eq('project_id', project_id).execute()
+        else:
+            with _self.db.get_connection() as conn:
+                conn.executemany(
+                    "UPDATE projects SET contract_type = ? WHERE project_id = ?",
+                    [(contract, project_id) for project_id, contract in contracts.items()]
+                )
+        for project_id in contracts:
+            _self.db.invalidate_project_cache(project_id)
+
     def update_project_amount(_self, project_id, amount):
         """프로젝트 계약금액 업데이트 - Supabase/SQLite 분기"""
         try:
@@ -2212,6 +3854,7 @@ class WIPManager:
                 _self.db.supabase.table('projects').update({
                     'contract_amount': amount
                 }).eq('project_id', project_id).execute()
+                _self.db.invalidate_project_cache(project_id)
                 return True
             else:
                 with _self.db.get_connection() as conn:
@@ -2221,7 +3864,8 @@ class WIPManager:
                         SET contract_amount = ?
                         WHERE project_id = ?
                     """, (amount, project_id))
-                    return True
+                _self.db.invalidate_project_cache(project_id)
+                return True
         except Exception as e:
             import streamlit as st
             st.error(f"금액 업데이트 실패: {e}")
@@ -2238,26 +3882,13 @@ class WIPInterface:
         _self.db = wip_manager.db
     
     def render_dashboard_cards(_self, customer_id=None):
-        """대시보드 KPI 카드 - 프로젝트 기준"""
-        # 프로젝트 통계 계산
-        projects_df = _self.wip.get_projects_with_orders(customer_id)
-        
-        if projects_df.empty:
-            total = wip = urgent = completed = 0
-        else:
-            total = len(projects_df)
-            
-            # 완료
-            completed = len(projects_df[projects_df['status'] == '완료'])
-            
-            # 진행중 (완료 아닌 것)
-            wip = total - completed
-            
-            # 임박 (D-7 이내, overdue + urgent 합산)
-            urgent = len(projects_df[
-                (projects_df['warning_level'] == 'overdue') | 
-                (projects_df['warning_level'] == 'urgent')
-            ])
+        """대시보드 KPI 카드 - 프로젝트 기준 (고객사 스냅샷 1행)"""
+        snapshot = _self.wip.get_dashboard_snapshot(customer_id)
+        total = snapshot['projects_total']
+        completed = snapshot['projects_completed']
+        wip = snapshot['projects_wip']
+        # 임박 (D-7 이내, overdue + urgent 합산)
+        urgent = snapshot['projects_urgent']
         
         # 작은 글자로 표시
         col1, col2, col3, col4 = st.columns(4)
@@ -2682,37 +4313,18 @@ class WIPInterface:
         
         # 공정별 상태를 dict로 저장 (버튼 생성용)
         stage_buttons = {}
+
+        # 프로젝트 발주의 공정별 최신 상태 (1회 조회)
+        project_states = _self.db.get_latest_events_for_orders(project_id=project_id)
         
         for stage in stages:
             # 해당 공정의 발주 찾기
             stage_orders = []
             stage_data = []  # 버튼 생성용 데이터
 
-            for _, order in project_orders.iterrows():
-                # order_id에서 공정 타입 추출 (예: ORD-고덕초01-BAND-01 → BAND)
-                order_parts = order['order_id'].split('-')
-                if len(order_parts) < 3:
-                    continue
-                
-                process_type = order_parts[2]
-                
-                process_map = {
-                    'CUT': '절단/절곡',
-                    'PLASER': 'P레이저',
-                    'LASER': '레이저(판재)',
-                    'BAND': '벤딩',
-                    'PAINT': '페인트',
-                    'STICKER': '스티커',
-                    'RECEIVING': '입고'
-                }
-                
-                target_stage = process_map.get(process_type)
-                
-                # 현재 순회 중인 공정과 일치하지 않으면 스킵
-                if target_stage != stage:
-                    continue
-                
-                events = _self.db.get_latest_events_by_stage(order['order_id'])
+            # 담당 공정(orders.stage)이 현재 공정인 발주만
+            for _, order in project_orders[project_orders['stage'] == stage].iterrows():
+                events = project_states[project_states['order_id'] == order['order_id']]
                 
                 # 이벤트가 없으면 자동 생성
                 if events.empty:
@@ -2727,7 +4339,8 @@ class WIPInterface:
                             note='기존 발주 마이그레이션'
                         )
                         # 다시 조회
-                        events = _self.db.get_latest_events_by_stage(order['order_id'])
+                        project_states = _self.db.get_latest_events_for_orders(project_id=project_id)
+                        events = project_states[project_states['order_id'] == order['order_id']]
                     except Exception as e:
                         print(f"이벤트 생성 실패: {e}")
                         continue
@@ -2879,33 +4492,23 @@ class WIPInterface:
 
                         with st.spinner("변경사항 저장 중..."):
                             try:
-                                # 모든 변경사항을 한 번에 저장
-                                for edit_key, edit_data in batch_edits.items():
-                                    stage = edit_key.split('_')[0]
-
-                                    _self.db.add_process_event(
-                                        order_id=edit_data['order_id'],
-                                        stage=stage,
-                                        progress=100 if edit_data.get('is_done', False) else 0,
-                                        done_date=date_module.today() if edit_data.get('is_done', False) else None,
-                                        vendor=edit_data.get('vendor', ''),
-                                        note=f"일괄 업데이트: {'완료' if edit_data.get('is_done', False) else '진행중'}"
-                                    )
+                                # 모든 변경사항을 한 번에 저장 (요청 1회 / 트랜잭션 1개)
+                                events = [{
+                                    'order_id': edit_data['order_id'],
+                                    'stage': edit_key.split('_')[0],
+                                    'progress': 100 if edit_data.get('is_done', False) else 0,
+                                    'done_date': date_module.today() if edit_data.get('is_done', False) else None,
+                                    'vendor': edit_data.get('vendor', ''),
+                                    'note': f"일괄 업데이트: {'완료' if edit_data.get('is_done', False) else '진행중'}"
+                                } for edit_key, edit_data in batch_edits.items()]
+
+                                if not _self.db.add_process_events(events):
+                                    raise RuntimeError("공정 이벤트 일괄 저장 실패")
 
                                 # ✅ 프로젝트 상태 자동 업데이트 (진행률 100% → 완료 여부 자동 판단)
+                                # 캐시는 add_process_events 가 해당 발주/프로젝트/고객사 태그만 무효화
                                 _self.wip.auto_update_project_status(project_id)
 
-                                # ✅ 캐시 초기화 (한 번만)
-                                try:
-                                    _self.db.get_process_events.clear()
-                                    _self.db.get_latest_events_by_stage.clear()
-                                    _self.db.get_orders.clear()
-                                    _self.wip.get_orders_with_progress.clear()
-                                    _self.wip.get_dashboard_stats.clear()
-                                    _self.wip.get_projects_with_orders.clear()
-                                except Exception:
-                                    pass
-
                                 st.success(f"✅ {len(batch_edits)}개 항목 저장 완료!")
                                 st.session_state[batch_edit_key] = {}  # 초기화
                                 st.rerun()
@@ -3037,38 +4640,51 @@ class WIPInterface:
             'contract_type': contract_type
         }
     
+    def fetch_projects_page(_self, key, customer_id=None):
+        """
+        테이블 key 의 정렬/페이지 상태로 프로젝트 한 페이지 조회
+
+        필터 변경 등으로 페이지가 범위를 벗어나면 마지막 페이지로 맞춰 다시 조회한다.
+
+        Returns:
+            (페이지 DataFrame, 전체 건수)
+        """
+        filters = _self.wip.get_project_filters()
+        sort_by, descending, page = _self.wip.get_table_state(key, PROJECT_SORT_OPTIONS)
+        projects_df, total = _self.wip.get_projects_page(customer_id, filters, sort_by, descending, page)
+        last_page = max((total - 1) // TABLE_PAGE_SIZE + 1, 1)
+        if page > last_page:
+            st.session_state[f'{key}_page'] = last_page
+            projects_df, total = _self.wip.get_projects_page(customer_id, filters, sort_by, descending, last_page)
+        return projects_df, total
+
+    @staticmethod
+    def project_status_icons(projects_df):
+        """납기상태 표시 (warning_level → 아이콘 + D-day, 벡터화)"""
+        icons = projects_df['warning_level'].map({'overdue': '🔴', 'urgent': '🟠', 'warning': '🟡'}).fillna('✅')
+        return icons + ' ' + projects_df['d_day'].astype(str)
+
     def render_project_summary_with_toggle(_self, customer_id=None):
         """프로젝트 요약 + 토글 발주 상세 통합 (컴팩트)"""
         st.markdown("#### 📊 프로젝트 현황")
         
-        projects_df = _self.wip.get_projects_with_orders(customer_id)
-        
-        # 필터 적용
-        if not projects_df.empty:
-            projects_df = _self.wip.apply_filters_to_projects(projects_df)
+        # 필터/정렬/페이지는 서버에서 - 현재 페이지 프로젝트만 렌더링
+        projects_df, total = _self.fetch_projects_page('project_summary', customer_id)
         
         if projects_df.empty:
             st.info("📋 프로젝트가 없습니다.")
             return
+        _self.wip.render_table_pager('project_summary', total, PROJECT_SORT_OPTIONS)
+        projects_df['status_icon'] = _self.project_status_icons(projects_df)
         
         # 프로젝트별로 렌더링
-        for idx, project in projects_df.iterrows():
+        for project in projects_df.to_dict('records'):
             # 프로젝트 헤더 (컴팩트)
             col1, col2, col3, col4, col5 = st.columns([3, 1.2, 1.2, 0.8, 0.8])
             
             with col1:
                 # 프로젝트명 + 납기상태
-                status_icon = ""
-                if project['warning_level'] == 'overdue':
-                    status_icon = f"🔴 {project['d_day']}"
-                elif project['warning_level'] == 'urgent':
-                    status_icon = f"🟠 {project['d_day']}"
-                elif project['warning_level'] == 'warning':
-                    status_icon = f"🟡 {project['d_day']}"
-                else:
-                    status_icon = f"✅ {project['d_day']}"
-                
-                st.markdown(f"**{project['project_name']}** {status_icon}")
+                st.markdown(f"**{project['project_name']}** {project['status_icon']}")
             
             with col2:
                 due_date = project['final_due_date'].strftime('%m/%d') if pd.notna(project['final_due_date']) else '-'
@@ -3104,19 +4720,11 @@ class WIPInterface:
                                     trade_statement=edited_data['trade']
                                 )
 
-                            # ✅ 캐시 초기화 및 데이터 일관성 보장
+                            # ✅ 데이터 일관성 보장 (캐시는 위 업데이트가 해당 프로젝트 태그만 무효화)
                             import time
                             time.sleep(0.5)  # Supabase 데이터 반영 대기
-                            try:
-                                _self.db.get_projects.clear()
-                                _self.db.get_project_by_id.clear()
-                                _self.wip.get_project_completion_status.clear()
-                                _self.wip.get_projects_with_orders.clear()
-                                _self.wip.get_dashboard_stats.clear()
-                            except Exception:
-                                pass
-
-                            # 프로젝트 상태 자동 업데이트 (캐시 초기화 후)
+
+                            # 프로젝트 상태 자동 업데이트 (캐시 무효화 후)
                             _self.wip.auto_update_project_status(project['project_id'])
 
                             st.success("✅ 저장!")
@@ -3177,13 +4785,10 @@ class WIPInterface:
             st.markdown("---")
 
     def render_project_summary_table_simple(_self, customer_id=None):
-        """프로젝트 요약 테이블 - 한눈에 보기"""
+        """프로젝트 요약 테이블 - 한눈에 보기 (서버 페이지 단위, 벡터화 포맷)"""
+        import numpy as np
         
-        projects_df = _self.wip.get_projects_with_orders(customer_id)
-        
-        # 필터 적용
-        if not projects_df.empty:
-            projects_df = _self.wip.apply_filters_to_projects(projects_df)
+        projects_df, total = _self.fetch_projects_page('project_table', customer_id)
         
         if projects_df.empty:
             st.info("📋 프로젝트가 없습니다.")
@@ -3192,54 +4797,26 @@ class WIPInterface:
             if st.button("➕ 신규 프로젝트 생성", use_container_width=True):
                 _self.show_new_project_modal()
             return
-        
-        # 표시용 데이터 준비
-        display_data = []
-        
-        for _, project in projects_df.iterrows():
-            # 납기 상태
-            warning_level = project['warning_level']
-            d_day = project['d_day']
-            
-            if warning_level == 'overdue':
-                status_icon = f"🔴 {d_day}"
-            elif warning_level == 'urgent':
-                status_icon = f"🟠 {d_day}"
-            elif warning_level == 'warning':
-                status_icon = f"🟡 {d_day}"
-            else:
-                status_icon = f"✅ {d_day}"
-            
-            # 설치 정보
-            install_date = project.get('installation_completed_date')
-            if pd.notna(install_date) and install_date != '':
-                if isinstance(install_date, str):
-                    install_date_str = install_date
-                elif hasattr(install_date, 'strftime'):
-                    install_date_str = install_date.strftime('%Y-%m-%d')
-                else:
-                    install_date_str = str(install_date)
-            else:
-                install_date_str = ''
-            
-            staff = project.get('installation_staff_count')
-            staff_str = f"{int(staff)}명" if pd.notna(staff) else ''
-            
-            days = project.get('installation_days')
-            days_str = f"{int(days)}일" if pd.notna(days) else ''
-            
-            display_data.append({
-                '프로젝트명': project['project_name'],
-                '관급/사급': project.get('contract_type', '관급'),
-                '최종납기일': project['final_due_date'].strftime('%Y-%m-%d') if pd.notna(project['final_due_date']) else '',
-                '납기상태': status_icon,
-                '발주건수': f"{project['order_count']}건",
-                '진행률': project['total_progress'],
-                '설치완료일': install_date_str,
-                '인원': staff_str,
-                '일수': days_str,
-                '상태': project['status']
-            })
+        _self.wip.render_table_pager('project_table', total, PROJECT_SORT_OPTIONS)
+        
+        # 표시용 데이터 준비 (현재 페이지 행만)
+        empty = pd.Series(np.nan, index=projects_df.index)
+        staff = pd.to_numeric(projects_df.get('installation_staff_count', empty), errors='coerce')
+        days = pd.to_numeric(projects_df.get('installation_days', empty), errors='coerce')
+        install_dates = projects_df.get('installation_completed_date', empty)
+        
+        display_data = {
+            '프로젝트명': projects_df['project_name'],
+            '관급/사급': projects_df['contract_type'].fillna('관급'),
+            '최종납기일': _format_dates(projects_df['final_due_date']),
+            '납기상태': _self.project_status_icons(projects_df),
+            '발주건수': projects_df['order_count'].astype(str) + '건',
+            '진행률': projects_df['total_progress'],
+            '설치완료일': _format_dates(install_dates),
+            '인원': np.where(staff.notna(), staff.fillna(0).astype(int).astype(str) + '명', ''),
+            '일수': np.where(days.notna(), days.fillna(0).astype(int).astype(str) + '일', ''),
+            '상태': projects_df['status']
+        }
         
         summary_df = pd.DataFrame(display_data)
         
@@ -3283,6 +4860,7 @@ class WIPInterface:
                             if USE_SUPABASE:
                                 # 1. 연관된 발주의 이벤트 먼저 삭제
                                 orders_response = _self.db.supabase.table('orders').select('order_id').eq('project_id', project_id).execute()
+                                deleted_order_ids = [order['order_id'] for order in orders_response.data]
                                 for order in orders_response.data:
                                     _self.db.supabase.table('process_events').delete().eq('order_id', order['order_id']).execute()
                                 
@@ -3294,16 +4872,18 @@ class WIPInterface:
                             else:
                                 with _self.db.get_connection() as conn:
                                     cursor = conn.cursor()
+                                    cursor.execute("SELECT order_id FROM orders WHERE project_id = ?", (project_id,))
+                                    deleted_order_ids = [row[0] for row in cursor.fetchall()]
+                                    cursor.execute(
+                                        "DELETE FROM order_stage_state WHERE order_id IN (SELECT order_id FROM orders WHERE project_id = ?)",
+                                        (project_id,)
+                                    )
                                     cursor.execute("DELETE FROM projects WHERE project_id = ?", (project_id,))
 
-                            # ✅ 캐시 초기화 추가
-                            try:
-                                _self.db.get_projects.clear()
-                                _self.db.get_orders.clear()
-                                _self.db.get_process_events.clear()
-                                _self.wip.get_projects_with_orders.clear()
-                            except Exception:
-                                pass
+                            # ✅ 해당 프로젝트/고객사 범위 캐시만 무효화
+                            _self.db.invalidate_project_cache(project_id, customer_id=customer_id, cascade=True, emit='DELETE')
+                            for order_id in deleted_order_ids:
+                                _self.db.invalidate_order_cache(order_id, events=True, customer_id=customer_id, project_id=project_id, emit='DELETE')
                             
                             st.success(f"프로젝트 '{selected_to_delete}' 삭제 완료!")
                             st.rerun()
@@ -3313,19 +4893,8 @@ class WIPInterface:
         
         st.markdown("---")
         
-        # 프로젝트 데이터 가져오기
-        projects_df = _self.wip.get_projects_with_orders(customer_id)
-        
-        if projects_df.empty:
-            st.info("등록된 프로젝트가 없습니다. 신규 프로젝트를 생성해주세요.")
-            return
-        
-        # 필터 적용
-        filtered_df = _self.wip.apply_filters_to_projects(projects_df)
-        
-        if filtered_df.empty:
-            st.warning("필터 조건에 맞는 프로젝트가 없습니다.")
-            return
+        # 수정 대상은 페이지와 무관하게 전체 프로젝트 (id/이름/금액만 조회)
+        filtered_df = _self.db.get_project_options(customer_id)
 
         # 프로젝트 선택
         project_to_update = st.selectbox(
@@ -3354,14 +4923,6 @@ class WIPInterface:
             if st.button("💾 프로젝트명 수정", use_container_width=True, key="btn_update_name"):
                 if new_name and new_name != current_name:
                     if _self.wip.update_project_name(project_to_update, new_name):
-                        # ✅ 캐시 초기화 추가
-                        try:
-                            _self.db.get_projects.clear()
-                            _self.wip.get_projects_with_orders.clear()
-                            _self.wip.get_dashboard_stats.clear()
-                        except Exception:
-                            pass
-
                         st.success("✅ 프로젝트명이 수정되었습니다!")
                         st.rerun()
                 else:
@@ -3392,14 +4953,6 @@ class WIPInterface:
             st.write("")  # 정렬용
             if st.button("💾 금액 수정", use_container_width=True, key="btn_update_amount"):
                 if _self.wip.update_project_amount(project_to_update, new_amount):
-                    # ✅ 캐시 초기화 추가
-                    try:
-                        _self.db.get_projects.clear()
-                        _self.wip.get_projects_with_orders.clear()
-                        _self.db.get_top_projects_by_amount.clear()
-                    except Exception:
-                        pass
-
                     st.success("✅ 계약금액이 수정되었습니다!")
                     st.rerun()
 
@@ -3431,11 +4984,6 @@ class WIPInterface:
                     try:
                         _self.db.add_customer(customer_id, customer_name, "")
                         st.success(f"고객사 '{customer_name}' 생성 완료!")
-                        # ✅ 캐시 초기화 추가
-                        try:
-                            _self.db.get_customers.clear()
-                        except Exception:
-                            pass
                         st.rerun()
                     except Exception as e:
                         st.error(f"고객사 생성 실패: {e}")
@@ -3573,6 +5121,7 @@ class WIPInterface:
                             '입고': '준비완료'
                         }
 
+                        initial_events = []
                         for process_short, process_full in process_list:
                             # 공정별 기본 업체 선택
                             default_vendor = default_vendor_map.get(process_full, '작업없음')
@@ -3595,31 +5144,28 @@ class WIPInterface:
                                         memo=f'{process_full} 공정'
                                     )
                                     
-                                    # 공정 이벤트 추가 (대기 상태)
-                                    _self.db.add_process_event(
-                                        order_id=order_id,
-                                        stage=process_full,
-                                        progress=0,
-                                        done_date=None,
-                                        vendor=default_vendor,
-                                        note='프로젝트 생성 시 자동 생성'
-                                    )
+                                    # 공정 이벤트 (대기 상태) - 아래에서 한 번에 기록
+                                    initial_events.append({
+                                        'order_id': order_id,
+                                        'stage': process_full,
+                                        'progress': 0,
+                                        'done_date': None,
+                                        'vendor': default_vendor,
+                                        'note': '프로젝트 생성 시 자동 생성'
+                                    })
                                 except Exception as e:
                                     print(f"기본 발주 생성 실패 ({process_short}): {e}")
 
+                        try:
+                            _self.db.add_process_events(initial_events)
+                        except Exception as e:
+                            print(f"기본 공정 이벤트 생성 실패: {e}")
+
                         st.success(f"프로젝트 '{project_name}' 생성 완료!")
                         st.success(f"✅ 공정별 기본 발주 {len(process_list)}건이 자동 생성되었습니다!")
 
-                        # ✅ 캐시 초기화 추가
-                        try:
-                            _self.db.get_project_by_id.clear()
-                            _self.db.get_projects.clear()
-                            _self.db.get_orders.clear()
-                            _self.db.get_process_events.clear()
-                            _self.wip.get_projects_with_orders.clear()
-                            _self.wip.get_dashboard_stats.clear()
-                        except Exception:
-                            pass
+                        # ✅ 직접 UPDATE(납품요구일/계약정보) 반영 - 새 프로젝트/고객사 범위만 무효화
+                        _self.db.invalidate_project_cache(proj_id, customer_id=customer_id, cascade=True)
 
                         st.rerun()
                         
@@ -3941,6 +5487,8 @@ def main(allowed_tenants=None):
         else:
             selected_customer = None
             st.warning("접근 가능한 업체가 없습니다.")
+
+        render_offline_status()
         
         st.divider()
         
@@ -4077,14 +5625,82 @@ def main(allowed_tenants=None):
         render_sample_data_page(wip_manager)
 
 
+def _watch_live_changes(customer_id=None):
+    """변경 피드 버전 확인 - 이 고객사 데이터가 바뀐 경우에만 화면 재실행"""
+    if not st.session_state.get('wip_live_updates', True):
+        return
+    current = get_live_feed().version(customer_id)
+    seen = st.session_state.get('wip_live_version')
+    if seen is not None and current != seen:
+        st.session_state['wip_live_version'] = current
+        st.rerun()
+
+
+# 지원 버전에서는 fragment 로 주기 실행 (fragment 만 재실행되다가 변경 시에만 전체 재실행)
+_live_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+if _live_fragment is not None:
+    _watch_live_changes = _live_fragment(run_every=LIVE_CHECK_SECONDS)(_watch_live_changes)
+
+
+def render_live_updates(customer_id=None):
+    """실시간 갱신 토글 + 변경 감시 (대시보드 상단)"""
+    try:
+        feed = get_live_feed()
+    except Exception as e:
+        print(f"[WARN] 변경 피드 초기화 실패: {e}")
+        return
+
+    live = st.checkbox(
+        "🔴 실시간 갱신",
+        value=st.session_state.get('wip_live_updates', True),
+        help="다른 사용자의 공정/발주/프로젝트 변경을 자동 반영합니다 (편집 중에는 끄세요)",
+        key="wip_live_updates_toggle"
+    )
+    st.session_state['wip_live_updates'] = live
+    # 이번 렌더링이 반영한 버전 기록 → 이후 변경분만 재실행 대상
+    st.session_state['wip_live_version'] = feed.version(customer_id)
+    if live:
+        _watch_live_changes(customer_id)
+
+
+def render_offline_status():
+    """오프라인 우선 모드 동기화 상태 (사이드바) - 대기 중인 로컬 변경 수 + 즉시 동기화"""
+    try:
+        sync = get_offline_sync()
+    except Exception as e:
+        print(f"[WARN] 오프라인 동기화 시작 실패: {e}")
+        return
+    if sync is None:
+        return
+
+    stats = sync.stats()
+    if stats['online']:
+        st.caption(f"🟢 동기화됨 · 대기 {stats['pending']}건")
+    else:
+        st.caption(f"🟠 오프라인 - 로컬 저장 중 · 대기 {stats['pending']}건")
+    if stats['conflict'] or stats['failed']:
+        st.caption(f"⚠️ 충돌(원격 우선) {stats['conflict']}건 / 전송 실패 {stats['failed']}건")
+    if st.button("🔄 지금 동기화", key="wip_offline_sync_now", use_container_width=True):
+        sync.wake()
+
+
 def render_dashboard_page(ui, wip_manager, customer_id=None):
     """대시보드 페이지 - 3개 탭 구조"""
 
     st.markdown("---")
+    try:
+        get_dashboard_job()
+    except Exception as e:
+        print(f"[WARN] 대시보드 자정 작업 시작 실패: {e}")
+    try:
+        get_deadline_scanner()
+    except Exception as e:
+        print(f"[WARN] 납기 경고 스캐너 시작 실패: {e}")
+    render_live_updates(customer_id)
     # 상태 유지형 섹션 전환(탭 회귀 방지)
     section = st.radio(
         "보기",
-        ["발주 상세", "프로젝트 요약"],
+        ["발주 상세", "프로젝트 요약", "발주 목록"],
         index=0,
         horizontal=True,
         key="wip_dashboard_section",
@@ -4097,15 +5713,19 @@ def render_dashboard_page(ui, wip_manager, customer_id=None):
         return
     elif section == "프로젝트 요약":
         st.caption("프로젝트 주요 정보를 한눈에 확인")
-        projects_df = wip_manager.get_projects_with_orders(customer_id)
-        if not projects_df.empty:
-            filtered_projects = wip_manager.apply_filters_to_projects(projects_df)
-            filtered_project_ids = filtered_projects['project_id'].tolist() if not filtered_projects.empty else []
-            st.session_state['filtered_project_ids'] = filtered_project_ids
-        else:
-            st.session_state['filtered_project_ids'] = []
+        # 테이블은 현재 페이지만 조회 - 전체 프로젝트 목록은 일괄 갱신 버튼을 눌렀을 때만
+        if st.button("🔄 완료 상태 일괄 갱신", key="bulk_project_status_refresh"):
+            projects_df = wip_manager.db.get_projects(customer_id)
+            project_ids = projects_df['project_id'].tolist() if not projects_df.empty else []
+            changed = wip_manager.auto_update_project_statuses(project_ids)
+            st.success(f"✅ 완료 {len(changed['completed'])}건 / 진행중 전환 {len(changed['reopened'])}건")
+
         ui.render_project_summary_table_simple(customer_id)
         return
+    elif section == "발주 목록":
+        st.caption("발주별 진행 현황 및 관급/사급·상태 수정 (페이지 단위)")
+        wip_manager.render_orders_table_improved(customer_id)
+        return
     
     # 3개 탭 생성
     tab1, tab2, tab3 = st.tabs([
@@ -4218,12 +5838,6 @@ def render_customer_page(db_manager):
                 try:
                     db_manager.add_customer(customer_id, customer_name, contact)
 
-                    # ✅ 캐시 초기화 추가
-                    try:
-                        db_manager.get_customers.clear()
-                    except Exception:
-                        pass
-
                     st.success(f"✅ 고객사 '{customer_name}'이(가) 등록되었습니다!")
                     st.rerun()
                 except Exception as e:
@@ -4232,43 +5846,47 @@ def render_statistics_page(ui, wip_manager, customer_id=None):
     """통계 페이지 렌더링 (v0.5 - 회사별 분리)"""
     st.subheader("📊 매출 및 프로젝트 통계")
 
-    # 사용 가능한 연도 추출
-    import pandas as pd
-    trend_data = wip_manager.db.get_monthly_sales_trend(12, customer_id)
-    year_options = ["전체"]
+    # 집계 서버 함수 오류는 전체 행을 받는 대체 경로 대신 오류로 표시
+    try:
+        # 사용 가능한 연도 추출
+        import pandas as pd
+        trend_data = wip_manager.db.get_monthly_sales_trend(12, customer_id)
+        year_options = ["전체"]
 
-    if trend_data:
-        df_trend = pd.DataFrame(trend_data)
-        if not df_trend.empty:
-            df_trend['year'] = df_trend['month'].astype(str).str[:4]
-            year_options = ["전체"] + sorted(df_trend['year'].unique().tolist(), reverse=True)
+        if trend_data:
+            df_trend = pd.DataFrame(trend_data)
+            if not df_trend.empty:
+                df_trend['year'] = df_trend['month'].astype(str).str[:4]
+                year_options = ["전체"] + sorted(df_trend['year'].unique().tolist(), reverse=True)
 
-    # 기간 필터
-    col1, col2 = st.columns(2)
-    with col1:
-        selected_year = st.selectbox("연도 선택", year_options, key="stats_year")
+        # 기간 필터
+        col1, col2 = st.columns(2)
+        with col1:
+            selected_year = st.selectbox("연도 선택", year_options, key="stats_year")
 
-    with col2:
-        month_options = ["전체"] + [f"{m:02d}월" for m in range(1, 13)]
-        selected_month = st.selectbox("월 선택", month_options, key="stats_month")
+        with col2:
+            month_options = ["전체"] + [f"{m:02d}월" for m in range(1, 13)]
+            selected_month = st.selectbox("월 선택", month_options, key="stats_month")
 
-    year_filter = None if selected_year == "전체" else selected_year
-    month_filter = None if selected_month == "전체" else int(selected_month.replace("월", ""))
+        year_filter = None if selected_year == "전체" else selected_year
+        month_filter = None if selected_month == "전체" else int(selected_month.replace("월", ""))
 
-    st.markdown("---")
+        st.markdown("---")
 
-    # 1. 주요 지표 카드
-    render_key_metrics(wip_manager.db, year_filter, month_filter, customer_id)
+        # 1. 주요 지표 카드
+        render_key_metrics(wip_manager.db, year_filter, month_filter, customer_id)
 
-    st.markdown("---")
+        st.markdown("---")
 
-    # 2. 월별 매출 추이 (선택한 연도 적용)
-    render_monthly_trend(wip_manager.db, year_filter, customer_id)
+        # 2. 월별 매출 추이 (선택한 연도 적용)
+        render_monthly_trend(wip_manager.db, year_filter, customer_id)
 
-    st.markdown("---")
+        st.markdown("---")
 
-    # 3. 연도별 총 매출액 (선택한 연도 적용)
-    render_annual_total_sales(wip_manager.db, year_filter, customer_id)
+        # 3. 연도별 총 매출액 (선택한 연도 적용)
+        render_annual_total_sales(wip_manager.db, year_filter, customer_id)
+    except Exception as e:
+        st.error(f"❌ 통계 조회 실패: {e}")
 
 
 def render_key_metrics(db, year=None, month=None, customer_id=None):
@@ -4599,12 +6217,6 @@ def render_vendor_page(db_manager):
                         memo
                     )
 
-                    # ✅ 캐시 초기화 추가
-                    try:
-                        db_manager.get_vendors.clear()
-                    except Exception:
-                        pass
-
                     st.success(f"✅ 업체 '{vendor_name}'이(가) 등록되었습니다!")
                     st.rerun()
                 except Exception as e:
@@ -4630,12 +6242,6 @@ def render_vendor_page(db_manager):
                         vendor_row = vendors[vendors['vendor_name'] == vendor_to_delete].iloc[0]
                         db_manager.delete_vendor(vendor_row['vendor_id'])
 
-                        # ✅ 캐시 초기화 추가
-                        try:
-                            db_manager.get_vendors.clear()
-                        except Exception:
-                            pass
-
                         st.success(f"✅ 업체 '{vendor_to_delete}' 삭제 완료!")
                         st.rerun()
                     except Exception as e:
@@ -4683,12 +6289,28 @@ def render_sample_data_page(wip_manager):
             st.metric("발주", f"{len(orders)}건")
         
         with col3:
-            events = wip_manager.db.get_process_events()
-            st.metric("이벤트", f"{len(events)}건")
+            st.metric("이벤트", f"{wip_manager.db.count_process_events()}건")
     
     except Exception as e:
         st.error(f"상태 조회 실패: {e}")
 
+    # 발주/공정 최신 상태 재구성 (백필/복구)
+    if st.button("🔁 공정 상태 재구성", help="공정 이벤트 이력으로 발주/공정 최신 상태를 다시 계산합니다"):
+        try:
+            count = wip_manager.db.rebuild_order_stage_state()
+            st.success(f"✅ 공정 상태 재구성 완료: {count}건")
+        except Exception as e:
+            st.error(f"❌ 재구성 실패: {e}")
+
+    # 납기 경고 스캔 (주기 실행을 기다리지 않고 바로)
+    if st.button("⏰ 납기 경고 스캔", help="진행 중 프로젝트/발주의 납기 경고 레벨을 다시 계산하고 알림을 보냅니다"):
+        try:
+            summary = get_deadline_scanner().run()
+            st.success(f"✅ 지연 {summary['overdue']}건 / 임박 {summary['urgent']}건 / 주의 {summary['warning']}건 "
+                       f"(알림 {summary['notified']}건)")
+        except Exception as e:
+            st.error(f"❌ 스캔 실패: {e}")
+
 
 # ============================================================================
 # 앱 실행
@@ -0,0 +1,305 @@
+# wip_cache.py
+# 태그 기반 조회 캐시 (WIP)
+#
+# - 조회 결과마다 "엔티티:범위" 태그를 붙인다 (orders:customer=DOOHO, events:order=..., vendors:* ...)
+# - 쓰기는 바뀐 범위의 태그만 무효화 → 발주 하나를 고쳐도 다른 고객사/통계/업체 캐시는 유지
+# - 범위 태그를 무효화하면 같은 엔티티의 전체 조회(엔티티:*) 도 함께 무효화
+# - 엔티티 이름만 주면 (범위를 모를 때) 해당 엔티티 전체 무효화
+#
+# 프로세스 전역 저장소라 모든 세션이 공유한다 (st.cache_data 와 같음).
+# wip_app_v0.9.py 는 재실행마다 다시 로드되므로 저장소는 이 모듈에 둔다.
+
+from __future__ import annotations
+
+import copy
+import contextlib
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+ALL_SCOPE = '*'
+# 무효화 기록(_invalidated_at)이 이 크기를 넘으면 진행 중 계산과 무관한 기록을 정리
+MAX_INVALIDATION_MARKS = 1024
+
+TagsFn = Callable[..., Iterable[str]]
+
+
+def scope_tag(entity: str, **scope: Any) -> str:
+    """
+    태그 문자열 생성
+
+    예:
+        scope_tag('orders', customer='DOOHO') → 'orders:customer=DOOHO'
+        scope_tag('orders', customer=None)    → 'orders:*'   (범위 없음 = 전체 조회)
+    """
+    items = [(k, v) for k, v in scope.items() if v not in (None, '')]
+    if not items:
+        return f"{entity}:{ALL_SCOPE}"
+    return f"{entity}:" + ",".join(f"{k}={v}" for k, v in items)
+
+
+def _entity(tag: str) -> str:
+    return tag.split(':', 1)[0]
+
+
+def _copy_result(value: Any) -> Any:
+    """캐시 원본 보호 - 호출자가 결과를 수정해도 캐시가 바뀌지 않도록 복사본 반환"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return copy.deepcopy(value)
+
+
+def _freeze(value: Any) -> Any:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+class TaggedCache:
+    """
+    태그 기반 LRU 캐시
+
+    Args:
+        max_entries: 최대 항목 수 (초과 시 오래 안 쓴 항목부터 제거)
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._by_tag: Dict[str, Set[Tuple]] = {}
+        self._by_entity: Dict[str, Set[Tuple]] = {}
+        self._key_locks: Dict[Tuple, List] = {}             # key → [Lock, 대기/보유 중인 스레드 수]
+        # 계산 중 무효화 감지: 무효화마다 _seq 증가, 계산 중인 항목이 있을 때만
+        # 무효화된 태그/엔티티별 마지막 seq 기록 (계산 시작 seq 보다 크면 그 결과는 저장하지 않음)
+        self._seq = 0
+        self._inflight: Dict[int, int] = {}                  # 계산 시작 seq → 진행 중 개수
+        self._invalidated_at: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get_or_compute(self, key: Tuple, tags: Iterable[str], ttl: Optional[float],
+                       compute: Callable[[], Any]) -> Any:
+        """
+        캐시 조회, 없으면 compute() 결과 저장 (같은 키 동시 미스는 한 번만 계산)
+        """
+        found, value = self._get(key)
+        if found:
+            return _copy_result(value)
+
+        tags = tuple(tags)
+        with self._key_lock(key):
+            found, value = self._get(key)
+            if found:
+                return _copy_result(value)
+            with self._lock:
+                start = self._seq
+                self._inflight[start] = self._inflight.get(start, 0) + 1
+                self.misses += 1
+            try:
+                value = compute()
+                with self._lock:
+                    # 이 항목의 태그가 계산 중에 무효화됐으면 저장하지 않음 (오래된 결과 고정 방지)
+                    # 다른 태그의 무효화는 영향 없음
+                    if not self._invalidated_since(start, tags):
+                        self._put(key, tags, ttl, value)
+            finally:
+                with self._lock:
+                    self._finish(start)
+            return _copy_result(value)
+
+    def _invalidated_since(self, start: int, tags: Tuple[str, ...]) -> bool:
+        marks = self._invalidated_at
+        if not marks:
+            return False
+        if marks.get('', -1) > start:            # clear()
+            return True
+        return any(marks.get(tag, -1) > start or marks.get(_entity(tag), -1) > start for tag in tags)
+
+    def _finish(self, start: int) -> None:
+        """계산 종료 - 진행 중 계산이 없으면 무효화 기록 전부, 많으면 오래된 기록 정리"""
+        count = self._inflight.get(start, 0) - 1
+        if count > 0:
+            self._inflight[start] = count
+        else:
+            self._inflight.pop(start, None)
+        if not self._inflight:
+            self._invalidated_at.clear()
+        elif len(self._invalidated_at) > MAX_INVALIDATION_MARKS:
+            oldest = min(self._inflight)
+            self._invalidated_at = {m: seq for m, seq in self._invalidated_at.items() if seq > oldest}
+
+    def _get(self, key: Tuple) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, value, _ = entry
+            if expires and expires < time.time():
+                self._remove(key)
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    @contextlib.contextmanager
+    def _key_lock(self, key: Tuple) -> Iterator[None]:
+        """키별 계산 잠금 - 대기 중인 스레드가 남아 있는 동안은 같은 Lock 을 유지 (참조 카운트)"""
+        with self._lock:
+            holder = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            holder[1] += 1
+        try:
+            with holder[0]:
+                yield
+        finally:
+            with self._lock:
+                holder[1] -= 1
+                if holder[1] <= 0 and self._key_locks.get(key) is holder:
+                    del self._key_locks[key]
+
+    def _put(self, key: Tuple, tags: Tuple[str, ...], ttl: Optional[float], value: Any) -> None:
+        if key in self._entries:
+            self._remove(key)
+        expires = time.time() + ttl if ttl else 0.0
+        self._entries[key] = (expires, value, tags)
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+            self._by_entity.setdefault(_entity(tag), set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+            keys = self._by_entity.get(_entity(tag))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_entity[_entity(tag)]
+
+    # ------------------------------------------------------------------
+    # 무효화
+    # ------------------------------------------------------------------
+    def invalidate(self, *tags: str) -> int:
+        """
+        태그 무효화
+
+        Args:
+            tags: 'orders:customer=DOOHO' (해당 범위 + orders:*),
+                  'orders' (엔티티 전체), 'fn:DatabaseManager.get_orders' (함수 전체)
+
+        Returns:
+            제거된 항목 수
+        """
+        with self._lock:
+            self._seq += 1
+            targets: Set[Tuple] = set()
+            for tag in tags:
+                if not tag:
+                    continue
+                if ':' not in tag:
+                    targets |= self._by_entity.get(tag, set())
+                    self._mark(tag)
+                    continue
+                targets |= self._by_tag.get(tag, set())
+                self._mark(tag)
+                if not tag.endswith(':' + ALL_SCOPE):
+                    all_tag = f"{_entity(tag)}:{ALL_SCOPE}"
+                    targets |= self._by_tag.get(all_tag, set())
+                    self._mark(all_tag)
+            for key in targets:
+                self._remove(key)
+            self.invalidated += len(targets)
+            return len(targets)
+
+    def _mark(self, mark: str) -> None:
+        """무효화 기록 (계산 중인 항목이 있을 때만 필요)"""
+        if self._inflight:
+            self._invalidated_at[mark] = self._seq
+
+    def clear(self) -> None:
+        with self._lock:
+            self._seq += 1
+            self._entries.clear()
+            self._by_tag.clear()
+            self._by_entity.clear()
+            self._mark('')
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'tags': len(self._by_tag),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidated': self.invalidated,
+            }
+
+
+# 프로세스 공용 저장소
+_CACHE = TaggedCache()
+
+
+def get_cache() -> TaggedCache:
+    return _CACHE
+
+
+def invalidate_tags(*tags: str) -> int:
+    """쓰기 후 관련 태그 무효화 (프로세스 공용 캐시)"""
+    return _CACHE.invalidate(*tags)
+
+
+def tagged_cache(ttl: Optional[float] = None, tags: Optional[TagsFn] = None):
+    """
+    메서드 조회 캐시 데코레이터 (st.cache_data 대체)
+
+    첫 인자(_self)는 키에 넣지 않는다 (st.cache_data 의 _ 접두 인자 규칙과 동일).
+
+    Args:
+        ttl: 유효 시간(초), None 이면 무효화 전까지 유지
+        tags: 나머지 인자(키워드 포함, 기본값 채움) → 태그 목록
+
+    사용 예:
+        @tagged_cache(ttl=600, tags=lambda customer_id=None: [scope_tag('orders', customer=customer_id)])
+        def get_orders(_self, customer_id=None): ...
+
+        _self.get_orders.clear()   # 이 함수의 항목만 제거
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        name = func.__qualname__
+        fn_tag = f"fn:{name}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = list(bound.arguments.items())[1:]
+            key = (name,) + tuple((k, _freeze(v)) for k, v in params)
+            entry_tags = [fn_tag] + list(tags(**dict(params)) if tags else [])
+            return _CACHE.get_or_compute(key, entry_tags, ttl, lambda: func(*args, **kwargs))
+
+        wrapper.clear = lambda: _CACHE.invalidate(fn_tag)
+        return wrapper
+
+    return decorator
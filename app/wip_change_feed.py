@@ -0,0 +1,228 @@
+# wip_change_feed.py
+# WIP 변경 피드 (실시간 반영)
+#
+# - Supabase Realtime (postgres_changes) 로 process_events / orders / projects 변경을 구독
+# - 오프라인(SQLite)·테스트용으로 같은 형식의 프로세스 내 pub/sub(ChangeBus) 제공
+# - 변경 한 건마다 applier(DatabaseManager.apply_change) 로 캐시에 반영하고,
+#   영향받은 고객사의 버전을 올린다 → 해당 고객사 화면만 재실행 (targeted rerun)
+#
+# 세션은 버전 숫자만 비교하므로 DB 폴링이 없다.
+# wip_app_v0.9.py 는 재실행마다 다시 로드되므로 허브는 이 모듈에 둔다.
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+# 실시간 구독 대상 테이블
+REALTIME_TABLES = ('process_events', 'orders', 'projects')
+# 재연결 대기 (초) - 실패할 때마다 두 배, 최대값
+RECONNECT_DELAY = 2.0
+MAX_RECONNECT_DELAY = 60.0
+
+# change: {'table', 'type'(INSERT/UPDATE/DELETE), 'record', 'old_record', 'source'}
+Change = dict
+# applier: change → 영향받은 customer_id 집합 (알 수 없으면 None = 전체)
+Applier = Callable[[Change], Optional[Iterable[str]]]
+
+
+def normalize_payload(payload: dict) -> Optional[Change]:
+    """Realtime 콜백 payload → change dict (realtime-py 버전별 형식 차이 흡수)"""
+    data = payload.get('data', payload) if isinstance(payload, dict) else None
+    if not isinstance(data, dict):
+        return None
+    table = data.get('table')
+    change_type = data.get('type') or data.get('eventType')
+    if not table or not change_type:
+        return None
+    return {
+        'table': table,
+        'type': str(getattr(change_type, 'value', change_type)).upper(),
+        'record': data.get('record') or data.get('new') or {},
+        'old_record': data.get('old_record') or data.get('old') or {},
+        'source': 'realtime',
+    }
+
+
+class ChangeBus:
+    """프로세스 내 pub/sub - Realtime 대체(오프라인/테스트) 및 구독자 fan-out"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Change], None]] = []
+
+    def subscribe(self, callback: Callable[[Change], None]) -> Callable[[], None]:
+        """구독 등록 - 해제 함수 반환"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def publish(self, table: str, change_type: str, record: Optional[dict] = None,
+                old_record: Optional[dict] = None, source: str = 'local') -> None:
+        change = {
+            'table': table,
+            'type': change_type.upper(),
+            'record': dict(record or {}),
+            'old_record': dict(old_record or {}),
+            'source': source,
+        }
+        self.dispatch(change)
+
+    def dispatch(self, change: Change) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(change)
+            except Exception as e:
+                print(f"[WARN] change subscriber failed ({change.get('table')}): {e}")
+
+
+class ChangeFeed:
+    """
+    변경 피드 허브
+
+    - emit(): 이 프로세스의 쓰기 알림 (Realtime 연결 중이면 Realtime 이 같은 변경을 전달하므로 생략)
+    - version(customer_id): 세션이 마지막으로 본 값과 다르면 재실행
+    """
+
+    def __init__(self, bus: Optional[ChangeBus] = None):
+        self.bus = bus or ChangeBus()
+        self._lock = threading.Lock()
+        self._applier: Optional[Applier] = None
+        self._versions: Dict[str, int] = {}
+        self._epoch = 0                      # 고객사를 알 수 없는 변경 (전체 화면 대상)
+        self._thread: Optional[threading.Thread] = None
+        self.realtime_active = False
+        self.applied = 0
+        self.last_change_at = 0.0
+        self.bus.subscribe(self._on_change)
+
+    def set_applier(self, applier: Applier) -> None:
+        self._applier = applier
+
+    # ------------------------------------------------------------------
+    # 변경 수신
+    # ------------------------------------------------------------------
+    def emit(self, table: str, change_type: str, record: Optional[dict] = None,
+             old_record: Optional[dict] = None) -> None:
+        """로컬 쓰기 알림 - Realtime 미연결(SQLite/오프라인)일 때 로컬 버스로 전달"""
+        if self.realtime_active:
+            return
+        self.bus.publish(table, change_type, record, old_record)
+
+    def _on_change(self, change: Change) -> None:
+        customers: Optional[Set[str]] = None
+        if self._applier is not None:
+            try:
+                affected = self._applier(change)
+                customers = set(affected) if affected is not None else None
+            except Exception as e:
+                print(f"[WARN] change apply failed ({change.get('table')}): {e}")
+        with self._lock:
+            if customers is None:
+                self._epoch += 1
+            else:
+                for customer_id in customers:
+                    self._versions[customer_id] = self._versions.get(customer_id, 0) + 1
+            self.applied += 1
+            self.last_change_at = time.time()
+
+    def version(self, customer_id: Optional[str] = None) -> int:
+        """고객사 화면 버전 (customer_id 없으면 모든 변경 반영)"""
+        with self._lock:
+            if customer_id is None:
+                return self._epoch + sum(self._versions.values())
+            return self._epoch + self._versions.get(customer_id, 0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'realtime': self.realtime_active,
+                'applied': self.applied,
+                'customers': dict(self._versions),
+                'epoch': self._epoch,
+                'last_change_at': self.last_change_at,
+            }
+
+    # ------------------------------------------------------------------
+    # Supabase Realtime
+    # ------------------------------------------------------------------
+    def start_realtime(self, url: str, key: str, tables: Iterable[str] = REALTIME_TABLES) -> bool:
+        """
+        Realtime 구독 시작 (백그라운드 스레드, 중복 호출 안전)
+
+        Returns:
+            구독 스레드 시작 여부 (supabase async 클라이언트가 없으면 False → 로컬 버스만 사용)
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        try:
+            from supabase import acreate_client  # noqa: F401
+        except ImportError:
+            print("[WARN] supabase async client unavailable - realtime disabled, using local change bus")
+            return False
+
+        tables = tuple(tables)
+        self._thread = threading.Thread(
+            target=lambda: asyncio.run(self._realtime_loop(url, key, tables)),
+            name="wip-realtime", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    async def _realtime_loop(self, url: str, key: str, tables: tuple) -> None:
+        from supabase import acreate_client
+
+        delay = RECONNECT_DELAY
+        while True:
+            client = None
+            try:
+                client = await acreate_client(url, key)
+                channel = client.channel('wip-changes')
+                for table in tables:
+                    channel.on_postgres_changes('*', schema='public', table=table, callback=self._on_realtime)
+                await channel.subscribe()
+                self.realtime_active = True
+                delay = RECONNECT_DELAY
+                print(f"✅ WIP realtime 구독 시작: {', '.join(tables)}")
+                # 연결이 끊기면 listen 이 예외로 끝남 (listen 이 없는 버전은 수신 태스크가 자동 실행됨)
+                listen = getattr(client.realtime, 'listen', None)
+                if listen is not None:
+                    await listen()
+                else:
+                    await asyncio.Event().wait()
+            except Exception as e:
+                print(f"[WARN] WIP realtime 연결 끊김, {delay:.0f}초 후 재연결: {e}")
+            finally:
+                if self.realtime_active:
+                    self.realtime_active = False
+                    # 끊긴 동안 놓친 변경은 알 수 없으므로 전체 캐시/화면 갱신
+                    self.bus.dispatch({'table': '*', 'type': 'RESYNC', 'record': {}, 'old_record': {}, 'source': 'realtime'})
+                if client is not None:
+                    try:
+                        await client.realtime.close()
+                    except Exception:
+                        pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def _on_realtime(self, payload: dict) -> None:
+        change = normalize_payload(payload)
+        if change is not None:
+            self.bus.dispatch(change)
+
+
+# 프로세스 공용 허브
+_FEED = ChangeFeed()
+
+
+def get_change_feed() -> ChangeFeed:
+    return _FEED
@@ -0,0 +1,224 @@
+# wip_dashboard.py
+# WIP 대시보드 카드 스냅샷 (고객사별 1행)
+#
+# - 발주(납기, 완료 여부) / 프로젝트(최종 납기, 상태) 별 카드 기여분을 기억해 두고
+#   변경된 엔티티만 다시 읽어 카운터에 차이만 반영
+# - 쓰기 경로는 mark_orders / mark_projects 로 ID 만 기록 (DB 조회 없음) → 다음 row() 에서 한 번에 갱신
+# - 지연/이번주 마감/임박은 날짜에 따라 바뀌므로 자정 작업(start_midnight_job)이 전체 재계산
+#
+# 카드 렌더링은 row() 가 돌려주는 작은 dict 하나만 사용한다.
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+# 이번주 마감 / 프로젝트 임박 기준 (일)
+DUE_SOON_DAYS = 7
+
+ORDER_FIELDS = ('total', 'wip', 'completed', 'overdue', 'thisweek_due')
+PROJECT_FIELDS = ('projects_total', 'projects_wip', 'projects_urgent', 'projects_completed')
+SNAPSHOT_FIELDS = ORDER_FIELDS + PROJECT_FIELDS
+
+# (customer_id, order_ids, project_ids) → (발주 DataFrame [order_id, due_date, done],
+#                                          프로젝트 DataFrame [project_id, final_due_date, status])
+# ID 목록이 None 이면 전체, 빈 목록이면 조회하지 않음
+LoadFn = Callable[[Optional[str], Optional[List[str]], Optional[List[str]]], Tuple[pd.DataFrame, pd.DataFrame]]
+
+
+def _to_date(value) -> Optional[date]:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    parsed = pd.to_datetime(value, errors='coerce')
+    return None if pd.isna(parsed) else parsed.date()
+
+
+def order_counts(due_date: Optional[date], done: bool, today: date) -> Tuple[int, ...]:
+    """발주 1건의 카드 기여분 (ORDER_FIELDS 순서)"""
+    pending = not done
+    return (
+        1,
+        int(pending),
+        int(done),
+        int(pending and due_date is not None and due_date < today),
+        int(pending and due_date is not None and today <= due_date <= today + timedelta(days=DUE_SOON_DAYS)),
+    )
+
+
+def project_counts(final_due_date: Optional[date], status: Optional[str], today: date) -> Tuple[int, ...]:
+    """프로젝트 1건의 카드 기여분 (PROJECT_FIELDS 순서) - 임박: 지연 포함 D-7 이내"""
+    completed = status == '완료'
+    urgent = final_due_date is not None and (final_due_date - today).days <= DUE_SOON_DAYS
+    return (1, int(not completed), int(urgent), int(completed))
+
+
+class DashboardSnapshot:
+    """
+    고객사 대시보드 카드 스냅샷
+
+    Args:
+        load: 발주/프로젝트 상태 조회 함수 (LoadFn)
+        customer_id: 고객사 ID (None 이면 전체)
+    """
+
+    def __init__(self, load: LoadFn, customer_id: Optional[str] = None):
+        self._load = load
+        self.customer_id = customer_id
+        self._lock = threading.RLock()
+        self._dirty_lock = threading.Lock()          # 쓰기 경로는 이 잠금만 잡음 (재계산 중에도 대기 없음)
+        self._orders: Dict[str, Tuple[Optional[date], bool]] = {}
+        self._projects: Dict[str, Tuple[Optional[date], Optional[str]]] = {}
+        self._counts: Dict[str, int] = dict.fromkeys(SNAPSHOT_FIELDS, 0)
+        self._dirty_orders: set = set()
+        self._dirty_projects: set = set()
+        self._needs_reload = True
+        self.as_of: Optional[date] = None
+        self.updated_at: Optional[datetime] = None
+        self.version = 0
+
+    # ------------------------------------------------------------------
+    # 변경 기록 (쓰기 경로)
+    # ------------------------------------------------------------------
+    def mark_orders(self, order_ids: Iterable[str]) -> None:
+        with self._dirty_lock:
+            self._dirty_orders.update(order_ids)
+
+    def mark_projects(self, project_ids: Iterable[str]) -> None:
+        with self._dirty_lock:
+            self._dirty_projects.update(project_ids)
+
+    def mark_reload(self) -> None:
+        """범위를 알 수 없는 변경 - 다음 row() 에서 전체 재계산"""
+        with self._dirty_lock:
+            self._needs_reload = True
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def row(self, today: Optional[date] = None) -> dict:
+        """
+        카드 1행 - 날짜가 바뀌었거나 전체 재계산이 필요하면 reload, 아니면 변경분만 반영
+
+        Returns:
+            {SNAPSHOT_FIELDS..., 'customer_id', 'as_of', 'updated_at'}
+        """
+        today = today or date.today()
+        with self._lock:
+            if self._needs_reload or self.as_of != today:
+                self.reload(today)
+            elif self._dirty_orders or self._dirty_projects:
+                self._refresh()
+            return dict(self._counts, customer_id=self.customer_id, as_of=self.as_of, updated_at=self.updated_at)
+
+    def reload(self, today: Optional[date] = None) -> None:
+        """전체 재계산 (최초, 자정 날짜 변경, 범위 불명 변경)"""
+        today = today or date.today()
+        with self._lock:
+            with self._dirty_lock:
+                self._needs_reload = False
+                self._dirty_orders.clear()
+                self._dirty_projects.clear()
+            try:
+                orders, projects = self._load(self.customer_id, None, None)
+            except Exception:
+                self.mark_reload()
+                raise
+            self._orders.clear()
+            self._projects.clear()
+            self._counts = dict.fromkeys(SNAPSHOT_FIELDS, 0)
+            self.as_of = today
+            self._apply(orders, projects, [], [])
+            self.updated_at = datetime.now()
+            self.version += 1
+
+    def _refresh(self) -> None:
+        with self._dirty_lock:
+            order_ids, self._dirty_orders = self._dirty_orders, set()
+            project_ids, self._dirty_projects = self._dirty_projects, set()
+        try:
+            orders, projects = self._load(self.customer_id, sorted(order_ids), sorted(project_ids))
+        except Exception:
+            self.mark_orders(order_ids)
+            self.mark_projects(project_ids)
+            raise
+        self._apply(orders, projects, order_ids, project_ids)
+        self.updated_at = datetime.now()
+        self.version += 1
+
+    def _apply(self, orders: pd.DataFrame, projects: pd.DataFrame,
+               order_ids: Iterable[str], project_ids: Iterable[str]) -> None:
+        """조회된 행으로 갱신, 요청했는데 없는 ID(삭제/다른 고객사)는 제거"""
+        found = set()
+        if orders is not None and not orders.empty:
+            for order_id, due_date, done in zip(orders['order_id'], orders['due_date'], orders['done']):
+                self._set(self._orders, order_id, (_to_date(due_date), bool(done)), order_counts, ORDER_FIELDS)
+                found.add(order_id)
+        for order_id in set(order_ids) - found:
+            self._set(self._orders, order_id, None, order_counts, ORDER_FIELDS)
+
+        found = set()
+        if projects is not None and not projects.empty:
+            for project_id, final_due_date, status in zip(projects['project_id'], projects['final_due_date'],
+                                                          projects['status']):
+                self._set(self._projects, project_id, (_to_date(final_due_date), status), project_counts, PROJECT_FIELDS)
+                found.add(project_id)
+        for project_id in set(project_ids) - found:
+            self._set(self._projects, project_id, None, project_counts, PROJECT_FIELDS)
+
+    def _set(self, states: dict, key: str, state: Optional[tuple], counts_fn, fields) -> None:
+        """엔티티 상태 교체 - 이전 기여분을 빼고 새 기여분을 더함"""
+        old = states.pop(key, None)
+        if old is not None:
+            for field, value in zip(fields, counts_fn(*old, self.as_of)):
+                self._counts[field] -= value
+        if state is not None:
+            states[key] = state
+            for field, value in zip(fields, counts_fn(*state, self.as_of)):
+                self._counts[field] += value
+
+    def stats(self) -> dict:
+        return {
+            'customer_id': self.customer_id,
+            'orders': len(self._orders),
+            'projects': len(self._projects),
+            'as_of': self.as_of,
+            'version': self.version,
+        }
+
+
+# ============================================================================
+# 자정 재계산 작업
+# ============================================================================
+
+def seconds_until_midnight(now: Optional[datetime] = None) -> float:
+    """다음 자정(로컬 시간)까지 남은 초"""
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - now).total_seconds()
+
+
+def start_midnight_job(callback: Callable[[], None], name: str = 'wip-dashboard-midnight') -> threading.Thread:
+    """
+    매일 자정 직후 callback() 을 실행하는 데몬 스레드 시작
+
+    Args:
+        callback: 재계산 함수 (예외는 경고만 출력하고 다음 날 다시 실행)
+
+    Returns:
+        시작된 스레드
+    """
+    def run():
+        while True:
+            time.sleep(seconds_until_midnight() + 1)
+            try:
+                callback()
+            except Exception as e:
+                print(f"[WARN] 자정 대시보드 재계산 실패: {e}")
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,244 @@
+# wip_deadline_scanner.py
+# WIP 납기 경고 스캐너 (백그라운드)
+#
+# - 진행 중인 프로젝트(최종 납기) / 미완료 발주(납기)를 한 번에 벡터화 평가해 경고 레벨을 저장
+#   (레벨 규칙은 WIPManager.get_project_warning_level 과 동일: 지연 / D-7 임박 / D-14 주의 / 정상)
+# - 화면은 저장된 레벨을 읽는다 (오늘 스캔 + 같은 납기일일 때만 사용, 아니면 그 자리에서 계산)
+# - 이전 스캔보다 레벨이 올라간(알림한 레벨보다 심각해진) 건만 고객사별 요약 메일 1통으로 알림
+#   → 한 번의 실행에서 SMTP 연결 1회 (utils.email_service.send_email_batch)
+#
+# wip_app_v0.9.py 는 재실행마다 다시 로드되므로 작업 스레드는 이 모듈에 둔다.
+
+from __future__ import annotations
+
+import html
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from app.wip_dashboard import seconds_until_midnight
+except Exception:
+    from wip_dashboard import seconds_until_midnight
+
+# 경고 레벨 (심각도 오름차순)
+LEVELS = ('normal', 'warning', 'urgent', 'overdue')
+LEVEL_RANK = {level: rank for rank, level in enumerate(LEVELS)}
+LEVEL_LABELS = {'overdue': '🔴 지연', 'urgent': '🟠 임박', 'warning': '🟡 주의', 'normal': '✅ 정상'}
+# 임박 / 주의 기준 (남은 일수 이하)
+URGENT_DAYS = 7
+WARNING_DAYS = 14
+# 스캔 주기 (초) - 자정 직후에도 한 번 실행
+SCAN_INTERVAL = 1800
+
+WARNING_COLUMNS = ['entity_type', 'entity_id', 'customer_id', 'name', 'due_date',
+                   'level', 'd_day', 'notified_level', 'scanned_at']
+
+# () → (프로젝트 [project_id, project_name, customer_id, final_due_date, status],
+#       발주 [order_id, project, customer_id, due_date, done],
+#       이전 경고 [WARNING_COLUMNS])
+LoadFn = Callable[[], Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]
+# (경고 DataFrame, scanned_at) → 저장 (없어진 엔티티 행은 삭제)
+SaveFn = Callable[[pd.DataFrame, str], None]
+# ([(customer_id, 제목, HTML)]) → 발송 성공 여부
+SendFn = Callable[[List[Tuple[Optional[str], str, str]]], bool]
+
+
+def warning_levels(due_dates, today: Optional[date] = None):
+    """
+    납기 경고 레벨 일괄 계산 (벡터화)
+
+    Args:
+        due_dates: 납기일 목록/Series (빈 값 → 'normal', D-day '')
+        today: 기준일 (기본 오늘)
+
+    Returns:
+        (level ndarray, d_day ndarray)
+    """
+    import numpy as np
+
+    due = pd.to_datetime(pd.Series(due_dates).reset_index(drop=True), errors='coerce')
+    days = (due - pd.Timestamp(today or date.today())).dt.days
+    level = np.select([days < 0, days <= URGENT_DAYS, days <= WARNING_DAYS],
+                      ['overdue', 'urgent', 'warning'], default='normal')
+    level = np.where(days.isna(), 'normal', level)
+    d_day = np.where(days < 0, 'D+', 'D-').astype(object) + days.abs().fillna(0).astype(int).astype(str).to_numpy()
+    d_day = np.where(days.isna(), '', d_day)
+    return level, d_day
+
+
+def _iso_dates(values) -> pd.Series:
+    parsed = pd.to_datetime(pd.Series(values).reset_index(drop=True), errors='coerce')
+    return parsed.dt.strftime('%Y-%m-%d').where(parsed.notna(), None)
+
+
+def scan(projects: pd.DataFrame, orders: pd.DataFrame, today: Optional[date] = None) -> pd.DataFrame:
+    """
+    진행 중 프로젝트 / 미완료 발주 경고 레벨 (한 번에 계산)
+
+    Returns:
+        DataFrame [entity_type, entity_id, customer_id, name, due_date, level, d_day]
+    """
+    frames = []
+    if projects is not None and not projects.empty:
+        open_projects = projects[projects['status'] != '완료']
+        level, d_day = warning_levels(open_projects['final_due_date'], today)
+        frames.append(pd.DataFrame({
+            'entity_type': 'project',
+            'entity_id': open_projects['project_id'].to_numpy(),
+            'customer_id': open_projects['customer_id'].to_numpy(),
+            'name': open_projects['project_name'].to_numpy(),
+            'due_date': _iso_dates(open_projects['final_due_date']).to_numpy(),
+            'level': level,
+            'd_day': d_day,
+        }))
+    if orders is not None and not orders.empty:
+        open_orders = orders[~orders['done'].astype(bool)]
+        level, d_day = warning_levels(open_orders['due_date'], today)
+        frames.append(pd.DataFrame({
+            'entity_type': 'order',
+            'entity_id': open_orders['order_id'].to_numpy(),
+            'customer_id': open_orders['customer_id'].to_numpy(),
+            'name': open_orders['project'].to_numpy(),
+            'due_date': _iso_dates(open_orders['due_date']).to_numpy(),
+            'level': level,
+            'd_day': d_day,
+        }))
+    if not frames:
+        return pd.DataFrame(columns=WARNING_COLUMNS[:7])
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_digest(warnings: pd.DataFrame, customer_id: Optional[str], today: date) -> Tuple[str, str]:
+    """
+    고객사 1곳의 알림 요약 메일 (제목, HTML)
+
+    Args:
+        warnings: 이번에 알릴 경고 행 (scan 결과 형식)
+    """
+    order = warnings.assign(_rank=warnings['level'].map(LEVEL_RANK)) \
+        .sort_values(['_rank', 'due_date'], ascending=[False, True])
+    counts = order['level'].value_counts()
+    summary = ' / '.join(f"{LEVEL_LABELS[level]} {int(counts[level])}건"
+                         for level in reversed(LEVELS) if level in counts)
+
+    rows = ''.join(
+        f"<tr><td>{LEVEL_LABELS[row.level]}</td>"
+        f"<td>{'프로젝트' if row.entity_type == 'project' else '발주'}</td>"
+        f"<td>{html.escape(str(row.name or ''))}</td>"
+        f"<td>{html.escape(str(row.entity_id))}</td>"
+        f"<td>{row.due_date or '-'}</td><td>{row.d_day}</td></tr>"
+        for row in order.itertuples(index=False)
+    )
+    subject = f"[WIP] 납기 경고 {customer_id or '전체'} {today.isoformat()} - {summary}"
+    body = f"""
+    <p><b>{html.escape(customer_id or '전체')}</b> 납기 경고 ({today.isoformat()} 기준)</p>
+    <p>{summary}</p>
+    <table border="1" cellpadding="4" cellspacing="0" style="border-collapse: collapse; font-size: 13px;">
+        <tr><th>레벨</th><th>구분</th><th>프로젝트</th><th>ID</th><th>납기일</th><th>D-day</th></tr>
+        {rows}
+    </table>
+    """
+    return subject, body
+
+
+class DeadlineScanner:
+    """
+    납기 경고 스캔 + 저장 + 요약 알림
+
+    Args:
+        load: 입력 조회 함수 (LoadFn)
+        save: 경고 저장 함수 (SaveFn)
+        send: 요약 메일 발송 함수 (SendFn, None 이면 알림 없이 저장만)
+    """
+
+    def __init__(self, load: LoadFn, save: SaveFn, send: Optional[SendFn] = None):
+        self._load = load
+        self._save = save
+        self._send = send
+        self._lock = threading.Lock()
+        self.last_run: Optional[datetime] = None
+        self.last_summary: Dict[str, int] = {}
+
+    def run(self, today: Optional[date] = None) -> dict:
+        """
+        1회 스캔
+
+        알림 기준: 레벨이 이전에 알린 레벨(notified_level)보다 심각해진 건.
+        발송에 실패하면 notified_level 을 올리지 않아 다음 실행에서 다시 알린다.
+        레벨이 내려가면 notified_level 도 내려서 다시 악화될 때 알린다.
+
+        Returns:
+            {'projects', 'orders', 'overdue', 'urgent', 'warning', 'notified'}
+        """
+        today = today or date.today()
+        with self._lock:
+            projects, orders, previous = self._load()
+            warnings = scan(projects, orders, today)
+
+            notified = pd.Series(dtype=object)
+            if previous is not None and not previous.empty:
+                notified = previous.set_index(['entity_type', 'entity_id'])['notified_level']
+            keys = pd.MultiIndex.from_arrays([warnings['entity_type'], warnings['entity_id']])
+            previous_level = pd.Series(notified.reindex(keys).to_numpy(), index=warnings.index).fillna('normal')
+
+            rank = warnings['level'].map(LEVEL_RANK)
+            previous_rank = previous_level.map(LEVEL_RANK).fillna(0)
+            escalated = (rank > previous_rank) & (warnings['level'] != 'normal')
+            warnings['notified_level'] = previous_level.where(rank >= previous_rank, warnings['level'])
+
+            sent = 0
+            if escalated.any() and self._send is not None:
+                escalated_rows = warnings[escalated]
+                digests = []
+                for customer_id, group in escalated_rows.groupby(escalated_rows['customer_id'].fillna(''), sort=True):
+                    customer_id = customer_id or None
+                    digests.append((customer_id,) + build_digest(group, customer_id, today))
+                try:
+                    delivered = self._send(digests)
+                except Exception as e:
+                    print(f"[WARN] 납기 경고 알림 발송 실패: {e}")
+                    delivered = False
+                if delivered:
+                    warnings.loc[escalated, 'notified_level'] = warnings.loc[escalated, 'level']
+                    sent = int(escalated.sum())
+
+            scanned_at = datetime.now().isoformat(timespec='seconds')
+            warnings['scanned_at'] = scanned_at
+            self._save(warnings[WARNING_COLUMNS], scanned_at)
+
+            counts = warnings['level'].value_counts()
+            self.last_run = datetime.now()
+            self.last_summary = {
+                'projects': int((warnings['entity_type'] == 'project').sum()),
+                'orders': int((warnings['entity_type'] == 'order').sum()),
+                'overdue': int(counts.get('overdue', 0)),
+                'urgent': int(counts.get('urgent', 0)),
+                'warning': int(counts.get('warning', 0)),
+                'notified': sent,
+            }
+            return dict(self.last_summary)
+
+
+def start_scanner_job(callback: Callable[[], object], interval: float = SCAN_INTERVAL,
+                      name: str = 'wip-deadline-scanner') -> threading.Thread:
+    """
+    callback() 을 바로 한 번, 이후 interval 초마다(자정 직후 포함) 실행하는 데몬 스레드 시작
+
+    Returns:
+        시작된 스레드
+    """
+    def run():
+        while True:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[WARN] 납기 경고 스캔 실패: {e}")
+            time.sleep(min(interval, seconds_until_midnight() + 1))
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,878 @@
+# wip_offline.py
+# WIP 오프라인 우선 모드 (공장 태블릿) - 로컬 SQLite 복제본 + 동기화 큐
+#
+# - 앱(DatabaseManager)은 SQLite 모드로 복제본 파일만 읽고 쓴다 → 네트워크와 무관한 로컬 지연
+# - 복제본 테이블의 트리거가 로컬 쓰기와 같은 트랜잭션에서 sync_outbox 에 기록 (앱 종료/정전에도 유실 없음)
+# - 백그라운드 워커가 outbox 를 순서대로 Supabase 에 재생(push)하고, 원격 변경을 받아(pull) 복제본에 반영
+# - 충돌: 마지막 쓰기 우선 (last-writer-wins)
+#     행(projects/orders/vendors): 로컬 쓰기 시각 vs 원격 updated_at - 원격이 더 최신이면 원격 행으로 덮어씀
+#     새 행(로컬 INSERT): 원격에 insert 만 - 같은 키의 다른 행이 있으면 병합하지 않고 충돌로 기록
+# - 발주번호: 기기에서 만든 번호는 임시 - 재생 시 서버 시퀀스(wip_allocate_order_numbers)로 번호를 받아
+#   복제본의 발주/이벤트/outbox 를 새 번호로 바꾼다. 받아 온 발주 번호만큼 로컬 시퀀스도 올린다.
+#     공정 상태(order_id, stage): 이벤트 created_at 기준 (order_stage_state 조건부 upsert, 양쪽 동일 규칙)
+# - 원격 반영 중에는 sync_control.applying_remote = 1 → 트리거가 outbox 에 다시 넣지 않음
+#
+# 원격 스키마: database/sql/wip_offline_sync.sql (updated_at / synced_at), wip_process_events.sql (client_event_id)
+# wip_app_v0.9.py 는 재실행마다 다시 로드되므로 동기화 워커는 이 모듈에 둔다.
+
+from __future__ import annotations
+
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+# 동기화 대상 행 테이블 → 기본 키
+SYNC_TABLES = {'projects': 'project_id', 'orders': 'order_id', 'vendors': 'vendor_id'}
+# 고객사(tenant) 범위로 받는 테이블 (vendors 는 공용)
+TENANT_TABLES = ('projects', 'orders')
+# 원격 BOOLEAN 컬럼 (SQLite 는 0/1 로 저장)
+BOOLEAN_COLUMNS = {'projects': ('tax_invoice_issued', 'trade_statement_issued')}
+# 복제본에 받아 두는 공정 이벤트 기간 (일)
+EVENT_WINDOW_DAYS = 90
+# 동기화 주기 / 실패 시 재시도 대기 최대값 (초)
+SYNC_INTERVAL = 5.0
+MAX_RETRY_DELAY = 60.0
+# 전체 재동기화 주기 (초) - 원격 삭제 반영
+FULL_RESYNC_SECONDS = 3600
+# push 1회 처리량 / 원격 조회 페이지 크기 / in_ 필터 ID 수
+PUSH_BATCH = 200
+PULL_PAGE = 1000
+IN_CHUNK = 200
+# 한 항목의 최대 재시도 횟수 (초과 시 'failed' 로 두고 다음 항목 진행)
+MAX_ATTEMPTS = 20
+# 원격 변경이 이보다 많으면 행 단위 알림 대신 RESYNC 1건
+NOTIFY_ROWS = 200
+# 이벤트 pull 시 마지막 원격 event_id 보다 이만큼 앞에서부터 다시 조회
+# (동시에 커밋된 트랜잭션의 작은 event_id 가 늦게 보일 수 있음 - 중복은 remote_event_id 로 무시)
+SYNC_OVERLAP = 50
+# 행 테이블 pull 시 synced_at 워터마크보다 이만큼 앞에서부터 다시 조회 (초)
+# (synced_at 은 트랜잭션 시작 시각 - 먼저 시작해 늦게 커밋된 행이 워터마크보다 앞에 찍힘)
+SYNC_OVERLAP_SECONDS = 300
+# 발주 하위 테이블 (발주번호 변경 시 함께 변경)
+ORDER_CHILD_TABLES = ('order_items', 'process_events', 'order_stage_state')
+
+# 복제본에 SQLite 형식으로 저장하는 시각 컬럼
+TIMESTAMP_COLUMNS = ('created_at', 'updated_at')
+# UTC ISO 시각 (원격 TIMESTAMPTZ 와 비교 가능한 형식)
+NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+REPLICA_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sync_outbox (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        op TEXT NOT NULL,                       -- insert / upsert / delete / event
+        row_key TEXT NOT NULL,
+        payload TEXT,                           -- 행 전체 스냅샷 (JSON)
+        written_at TEXT NOT NULL,               -- 로컬 쓰기 시각 (UTC) - LWW 기준
+        status TEXT NOT NULL DEFAULT 'pending', -- pending / conflict / failed
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_sync_outbox_status ON sync_outbox(status, seq)",
+    "CREATE INDEX IF NOT EXISTS idx_sync_outbox_key ON sync_outbox(table_name, row_key)",
+    "CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)",
+    """
+    CREATE TABLE IF NOT EXISTS sync_control (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        applying_remote INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "INSERT OR IGNORE INTO sync_control (id, applying_remote) VALUES (1, 0)",
+)
+
+# 원격에서 받은 이벤트로 로컬 공정 상태 갱신 (규칙은 앱의 _stage_state_rows 와 동일, 더 최신이면만 교체)
+STAGE_STATE_FROM_EVENTS_SQL = """
+    INSERT INTO order_stage_state
+        (order_id, stage, status, progress, planned_date, done_date, vendor, event_id, updated_at)
+    SELECT order_id, stage,
+           CASE WHEN COALESCE(progress, 0) >= 100 OR done_date IS NOT NULL THEN '완료' ELSE '진행중' END,
+           COALESCE(progress, 0), planned_date, done_date, vendor, event_id,
+           COALESCE(created_at, CURRENT_TIMESTAMP)
+    FROM process_events
+    WHERE event_id IN ({ids})
+    ORDER BY created_at, event_id
+    ON CONFLICT(order_id, stage) DO UPDATE SET
+        status = excluded.status,
+        progress = excluded.progress,
+        planned_date = excluded.planned_date,
+        done_date = excluded.done_date,
+        vendor = excluded.vendor,
+        event_id = excluded.event_id,
+        updated_at = excluded.updated_at
+    WHERE (excluded.updated_at, excluded.event_id) > (order_stage_state.updated_at, order_stage_state.event_id)
+"""
+
+# (table, change_type, record) → 캐시/화면 반영 (ChangeBus.publish 와 같은 인자)
+NotifyFn = Callable[[str, str, Optional[dict]], None]
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _parse_ts(value) -> Optional[datetime]:
+    """원격/로컬 시각 문자열 → aware datetime (시간대 없으면 UTC)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00').replace(' ', 'T'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _local_row(row: dict, columns) -> dict:
+    """원격 행 → 복제본 컬럼만, 시각은 SQLite CURRENT_TIMESTAMP 형식(UTC 'YYYY-MM-DD HH:MM:SS')으로
+
+    로컬 쓰기와 같은 형식이어야 공정 상태의 문자열 시각 비교(LWW)가 맞다.
+    """
+    local = {}
+    for column, value in row.items():
+        if column not in columns:
+            continue
+        if column in TIMESTAMP_COLUMNS and value:
+            parsed = _parse_ts(value)
+            if parsed is not None:
+                value = parsed.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        local[column] = value
+    return local
+
+
+def _order_number(order_id, project_id) -> Optional[tuple]:
+    """'ORD-{프로젝트 코드}-{공정}-NN' → (공정 코드, NN), 형식이 다르면 None"""
+    if not order_id or not project_id:
+        return None
+    prefix = f"ORD-{str(project_id).replace('PRJ-', '')}-"
+    if not str(order_id).startswith(prefix):
+        return None
+    process_code, _, suffix = str(order_id)[len(prefix):].rpartition('-')
+    if not process_code or not suffix.isdigit():
+        return None
+    return process_code, int(suffix)
+
+
+def _is_missing_function(error) -> bool:
+    """서버 함수가 배포되지 않은 오류인지 (PGRST202)"""
+    text = str(error)
+    return str(getattr(error, 'code', '') or '') in ('PGRST202', '404') or \
+        'PGRST202' in text or 'Could not find the function' in text
+
+
+def _chunks(values: List, size: int) -> Iterable[List]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class OfflineSync:
+    """
+    로컬 복제본 ↔ Supabase 동기화
+
+    Args:
+        pool: 복제본 SQLitePool (DatabaseManager._pool - 앱과 같은 파일/연결 풀)
+        client_factory: Supabase 클라이언트 생성 함수 (연결 실패는 다음 주기에 재시도)
+        customer_id: 복제 대상 고객사 (None 이면 전체)
+        notify: 원격 변경 반영 후 호출 (table, change_type, record)
+    """
+
+    def __init__(self, pool, client_factory: Callable[[], object], customer_id: Optional[str] = None,
+                 notify: Optional[NotifyFn] = None):
+        self.pool = pool
+        self.client_factory = client_factory
+        self.customer_id = customer_id
+        self.notify = notify
+        self._client = None
+        self._lock = threading.Lock()           # push/pull 은 한 번에 하나
+        self._wake = threading.Event()
+        self._join_events = True                # process_events → orders 조인 사용 가능 여부
+        self._seen_rows: Dict[str, Dict[str, str]] = {}  # 겹침 구간에서 이미 반영한 행 {table: {key: synced_at}}
+        self._thread: Optional[threading.Thread] = None
+        self.online = False
+        self.last_sync_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.pushed = 0
+        self.pulled = 0
+        self.conflicts = 0
+
+    # ------------------------------------------------------------------
+    # 복제본 준비
+    # ------------------------------------------------------------------
+    def install(self) -> None:
+        """outbox/상태 테이블, 이벤트 식별 컬럼, 변경 기록 트리거 생성 (시작 시마다 - 컬럼 변경 반영)"""
+        with self.pool.connection() as conn:
+            for statement in REPLICA_SCHEMA:
+                conn.execute(statement)
+
+            event_columns = self._columns(conn, 'process_events')
+            for column, ddl in (('client_event_id', 'TEXT'), ('remote_event_id', 'INTEGER')):
+                if column not in event_columns:
+                    conn.execute(f"ALTER TABLE process_events ADD COLUMN {column} {ddl}")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_process_events_client ON process_events(client_event_id)")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_process_events_remote ON process_events(remote_event_id)")
+
+            for table, key in SYNC_TABLES.items():
+                columns = self._columns(conn, table)
+                for op in ('INSERT', 'UPDATE', 'DELETE'):
+                    conn.execute(f"DROP TRIGGER IF EXISTS sync_{table}_{op.lower()}")
+                    conn.execute(self._row_trigger_sql(table, key, columns, op))
+
+            conn.execute("DROP TRIGGER IF EXISTS sync_process_events_insert")
+            conn.execute(self._event_trigger_sql(self._columns(conn, 'process_events')))
+
+    @staticmethod
+    def _columns(conn, table: str) -> List[str]:
+        return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+    @staticmethod
+    def _row_trigger_sql(table: str, key: str, columns: List[str], op: str) -> str:
+        # 로컬 INSERT 는 'insert' (원격에 새 행으로만 반영), UPDATE 는 'upsert' (LWW)
+        row = 'OLD' if op == 'DELETE' else 'NEW'
+        if op == 'DELETE':
+            payload = 'NULL'
+        else:
+            payload = "json_object(" + ", ".join(f"'{c}', NEW.{c}" for c in columns) + ")"
+        outbox_op = {'INSERT': 'insert', 'UPDATE': 'upsert', 'DELETE': 'delete'}[op]
+        return f"""
+            CREATE TRIGGER sync_{table}_{op.lower()} AFTER {op} ON {table}
+            WHEN (SELECT applying_remote FROM sync_control WHERE id = 1) = 0
+            BEGIN
+                INSERT INTO sync_outbox (table_name, op, row_key, payload, written_at)
+                VALUES ('{table}', '{outbox_op}', {row}.{key}, {payload}, {NOW_SQL});
+            END
+        """
+
+    @staticmethod
+    def _event_trigger_sql(columns: List[str]) -> str:
+        # 로컬 event_id 는 원격과 별개 → 기기에서 만든 이벤트는 client_event_id 로 식별 (재전송해도 1건)
+        fields = [c for c in columns if c not in ('event_id', 'remote_event_id')]
+        payload = "json_object(" + ", ".join(f"'{c}', {c}" for c in fields) + ")"
+        return f"""
+            CREATE TRIGGER sync_process_events_insert AFTER INSERT ON process_events
+            WHEN (SELECT applying_remote FROM sync_control WHERE id = 1) = 0
+            BEGIN
+                UPDATE process_events SET client_event_id = lower(hex(randomblob(16)))
+                WHERE event_id = NEW.event_id AND client_event_id IS NULL;
+                INSERT INTO sync_outbox (table_name, op, row_key, payload, written_at)
+                SELECT 'process_events', 'event', client_event_id, {payload}, {NOW_SQL}
+                FROM process_events WHERE event_id = NEW.event_id;
+            END
+        """
+
+    @contextmanager
+    def _applying_remote(self):
+        """원격 반영 트랜잭션 - 트리거가 outbox 에 기록하지 않음 (같은 트랜잭션 안에서 켜고 끔)"""
+        with self.pool.connection() as conn:
+            conn.execute("UPDATE sync_control SET applying_remote = 1 WHERE id = 1")
+            try:
+                yield conn
+            finally:
+                conn.execute("UPDATE sync_control SET applying_remote = 0 WHERE id = 1")
+
+    def _get_state(self, key: str, conn=None) -> Optional[str]:
+        if conn is None:
+            with self.pool.connection() as conn:
+                return self._get_state(key, conn)
+        row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, conn, key: str, value) -> None:
+        conn.execute(
+            "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, None if value is None else str(value))
+        )
+
+    # ------------------------------------------------------------------
+    # 워커
+    # ------------------------------------------------------------------
+    def start(self, name: str = 'wip-offline-sync') -> threading.Thread:
+        """동기화 데몬 스레드 시작 (이미 실행 중이면 그대로)"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self.install()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def wake(self) -> None:
+        """다음 주기를 기다리지 않고 동기화"""
+        self._wake.set()
+
+    def _run(self) -> None:
+        delay = SYNC_INTERVAL
+        while True:
+            try:
+                self.sync()
+                delay = SYNC_INTERVAL
+            except Exception as e:
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+                print(f"[WARN] 오프라인 동기화 실패 ({delay:.0f}초 후 재시도): {e}")
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def sync(self, full: Optional[bool] = None) -> dict:
+        """
+        push → pull 1회
+
+        Args:
+            full: 전체 재동기화 여부 (None 이면 최초/주기 도래 시)
+
+        Returns:
+            {'pushed', 'pulled'}
+        """
+        with self._lock:
+            try:
+                if self._client is None:
+                    self._client = self.client_factory()
+                pushed = self.push()
+                if full is None:
+                    last_full = _parse_ts(self._get_state('last_full_pull'))
+                    full = last_full is None or \
+                        datetime.now(timezone.utc) - last_full > timedelta(seconds=FULL_RESYNC_SECONDS)
+                pulled = self.pull(full=full)
+            except Exception as e:
+                self.online = False
+                self.last_error = str(e)
+                raise
+            self.online = True
+            self.last_error = None
+            self.last_sync_at = datetime.now()
+            return {'pushed': pushed, 'pulled': pulled}
+
+    # ------------------------------------------------------------------
+    # push (outbox → Supabase)
+    # ------------------------------------------------------------------
+    def push(self) -> int:
+        """
+        대기 중인 로컬 쓰기를 순서대로 원격에 반영
+
+        같은 행의 연속 변경은 첫 위치에서 마지막 스냅샷 1건으로 보내고(삭제 전까지),
+        연속된 이벤트는 RPC 1회로 묶는다. 실패하면 그 위치에서 멈추고 다음 주기에 재시도
+        (순서 보장 - 발주보다 이벤트가 먼저 가지 않음). 새 발주의 번호가 바뀌면 뒤 항목의
+        order_id 도 바뀌므로 그 위치까지만 보내고 outbox 를 다시 읽는다.
+
+        Returns:
+            원격에 반영(또는 충돌 처리)된 outbox 항목 수
+        """
+        with self.pool.connection() as conn:
+            entries = [dict(zip(('seq', 'table_name', 'op', 'row_key', 'payload', 'written_at', 'attempts'), row))
+                       for row in conn.execute(
+                           "SELECT seq, table_name, op, row_key, payload, written_at, attempts "
+                           "FROM sync_outbox WHERE status = 'pending' ORDER BY seq LIMIT ?", (PUSH_BATCH,)
+                       ).fetchall()]
+        if not entries:
+            return 0
+
+        batches = self._coalesce(entries)
+        done = 0
+        for batch in batches:
+            head = batch[0]
+            seqs = [entry['seq'] for entry in batch if 'seq' in entry] + head.get('absorbed', [])
+            try:
+                if head['op'] == 'event':
+                    self._push_events(batch)
+                elif head['op'] == 'delete':
+                    key = SYNC_TABLES[head['table_name']]
+                    self._client.table(head['table_name']).delete().eq(key, head['row_key']).execute()
+                elif head['op'] == 'insert':
+                    conflict = self._push_insert(head)
+                    if conflict:
+                        self._finish(seqs, status='conflict', error=conflict)
+                        done += len(seqs)
+                        continue
+                else:
+                    conflict = self._push_row(head)
+                    if conflict:
+                        self._finish(seqs, status='conflict', error=conflict)
+                        done += len(seqs)
+                        continue
+            except Exception as e:
+                self._retry(batch, e)
+                raise
+            self._finish(seqs)
+            done += len(seqs)
+            if head.get('renamed'):
+                self._wake.set()
+                break
+        self.pushed += done
+        return done
+
+    @staticmethod
+    def _coalesce(entries: List[dict]) -> List[List[dict]]:
+        """outbox 항목 → 전송 단위 (행 변경은 스냅샷 병합 - insert 뒤 변경은 insert 에 합침, 연속 이벤트는 한 묶음)"""
+        batches: List[List[dict]] = []
+        open_rows: Dict[tuple, dict] = {}
+        for entry in entries:
+            key = (entry['table_name'], entry['row_key'])
+            if entry['op'] == 'event':
+                if batches and batches[-1][0]['op'] == 'event':
+                    batches[-1].append(entry)
+                else:
+                    batches.append([entry])
+            elif entry['op'] == 'upsert' and key in open_rows:
+                head = open_rows[key]
+                head['absorbed'].append(entry['seq'])
+                head['payload'], head['written_at'] = entry['payload'], entry['written_at']
+            else:
+                head = dict(entry, absorbed=[])
+                batches.append([head])
+                if entry['op'] in ('insert', 'upsert'):
+                    open_rows[key] = head
+                else:
+                    open_rows.pop(key, None)
+        return batches
+
+    @staticmethod
+    def _remote_payload(entry: dict) -> dict:
+        """outbox 스냅샷 → 원격 행 (BOOLEAN 변환, updated_at = 로컬 쓰기 시각)"""
+        row = json.loads(entry['payload'] or '{}')
+        for column in BOOLEAN_COLUMNS.get(entry['table_name'], ()):
+            if column in row and row[column] is not None:
+                row[column] = bool(row[column])
+        row['updated_at'] = entry['written_at']
+        return row
+
+    def _push_insert(self, entry: dict) -> Optional[str]:
+        """
+        로컬에서 새로 만든 행 → 원격 insert (같은 키의 원격 행과 병합하지 않음)
+
+        발주는 서버 시퀀스로 번호를 받아 확정하고, 로컬 번호와 다르면 복제본을 새 번호로 바꾼다
+        (다른 기기가 오프라인에서 같은 번호를 만들었어도 두 발주가 합쳐지지 않음).
+
+        Returns:
+            충돌 설명 (같은 키의 다른 원격 행 → 원격 행을 복제본에 반영), 적용됐으면 None
+        """
+        table, key = entry['table_name'], SYNC_TABLES[entry['table_name']]
+        row = self._remote_payload(entry)
+        existing = self._client.table(table).select('*').eq(key, entry['row_key']).execute().data
+        if existing and _parse_ts(existing[0].get('updated_at')) == _parse_ts(entry['written_at']):
+            # 이전 시도에서 이미 반영됨 (응답만 유실)
+            return None
+
+        if table == 'orders':
+            order_id = self._claim_order_id(row, bool(existing))
+            if order_id != entry['row_key']:
+                self._rename_local_order(entry['row_key'], order_id)
+                row[key] = entry['row_key'] = order_id
+                entry['renamed'] = True
+                existing = None
+
+        if existing:
+            remote = existing[0]
+            self.conflicts += 1
+            with self._applying_remote() as conn:
+                self._upsert_rows(conn, table, [remote], skip_pending=False)
+            self._notify(table, 'UPDATE', [remote])
+            return f"key collision ({key}={entry['row_key']}, remote updated_at={remote.get('updated_at')})"
+
+        self._client.table(table).insert(row).execute()
+        return None
+
+    def _claim_order_id(self, row: dict, taken: bool) -> str:
+        """
+        기기에서 만든 발주번호 → 서버에서 확정한 발주번호
+
+        wip_allocate_order_numbers 로 (프로젝트, 공정) 다음 번호를 받는다. 서버 함수가 없으면
+        원격 최댓값보다 큰 로컬 번호는 그대로, 아니면 최댓값 + 1. 형식이 다른 번호는 그대로.
+
+        Args:
+            row: 원격에 보낼 발주 행
+            taken: 같은 번호의 원격 발주가 이미 있는지
+
+        Returns:
+            원격에 쓸 발주번호
+        """
+        order_id, project_id = row['order_id'], row.get('project_id')
+        parsed = _order_number(order_id, project_id)
+        if parsed is None:
+            return order_id
+        process_code, number = parsed
+        prefix = order_id[:len(order_id) - len(str(order_id).rpartition('-')[2])]
+        try:
+            last_value = self._client.rpc('wip_allocate_order_numbers', {
+                'p_project_id': project_id,
+                'p_process_code': process_code,
+                'p_count': 1,
+            }).execute().data
+            if isinstance(last_value, list):
+                last_value = last_value[0] if last_value else None
+            if isinstance(last_value, dict):
+                last_value = next(iter(last_value.values()), None)
+            return f"{prefix}{int(last_value):02d}"
+        except Exception as e:
+            if not _is_missing_function(e):
+                raise
+        remote = self._fetch_all(lambda: self._client.table('orders').select('order_id')
+                                 .eq('project_id', project_id).like('order_id', f'{prefix}%').order('order_id'))
+        numbers = [n for code, n in filter(None, (_order_number(r['order_id'], project_id) for r in remote))
+                   if code == process_code]
+        current = max(numbers, default=0)
+        if not taken and number > current:
+            return order_id
+        return f"{prefix}{current + 1:02d}"
+
+    def _rename_local_order(self, old_id: str, new_id: str) -> None:
+        """
+        복제본 발주번호 변경 - 발주/하위 테이블/대기 중인 outbox 항목까지
+
+        새 번호를 이미 다른 로컬 발주(아직 보내지 않은 임시 번호)가 쓰고 있으면 두 번호를 맞바꾼다
+        (그 발주는 자기 차례에 다시 번호를 받는다).
+        """
+        with self._applying_remote() as conn:
+            occupied = conn.execute("SELECT 1 FROM orders WHERE order_id = ?", (new_id,)).fetchone()
+            if occupied:
+                swap = f"{new_id}~{old_id}"
+                self._rename_order_rows(conn, new_id, swap)
+                self._rename_order_rows(conn, old_id, new_id)
+                self._rename_order_rows(conn, swap, old_id)
+            else:
+                self._rename_order_rows(conn, old_id, new_id)
+            row = conn.execute("SELECT project_id FROM orders WHERE order_id = ?", (new_id,)).fetchone()
+            if row:
+                self._raise_order_sequences(conn, [{'order_id': new_id, 'project_id': row[0]}])
+        print(f"[INFO] 오프라인 발주번호 확정: {old_id} → {new_id}")
+        self._notify('orders', 'DELETE', [{'order_id': old_id}])
+        self._notify('orders', 'UPDATE', [{'order_id': new_id}])
+
+    @staticmethod
+    def _rename_order_rows(conn, old_id: str, new_id: str) -> None:
+        conn.execute("UPDATE orders SET order_id = ? WHERE order_id = ?", (new_id, old_id))
+        for table in ORDER_CHILD_TABLES:
+            conn.execute(f"UPDATE {table} SET order_id = ? WHERE order_id = ?", (new_id, old_id))
+        # 삭제 항목은 payload 가 NULL (json_set 결과도 NULL)
+        conn.execute(
+            "UPDATE sync_outbox SET row_key = ?, payload = json_set(payload, '$.order_id', ?) "
+            "WHERE table_name = 'orders' AND row_key = ?",
+            (new_id, new_id, old_id)
+        )
+        conn.execute(
+            "UPDATE sync_outbox SET payload = json_set(payload, '$.order_id', ?) "
+            "WHERE table_name = 'process_events' AND json_extract(payload, '$.order_id') = ?",
+            (new_id, old_id)
+        )
+
+    @staticmethod
+    def _raise_order_sequences(conn, rows: List[dict]) -> None:
+        """발주 행의 일련번호만큼 로컬 order_id_sequences 올리기 (다음 로컬 번호가 겹치지 않게)"""
+        latest: Dict[tuple, int] = {}
+        for row in rows:
+            parsed = _order_number(row.get('order_id'), row.get('project_id'))
+            if parsed:
+                sequence = (row['project_id'], parsed[0])
+                latest[sequence] = max(latest.get(sequence, 0), parsed[1])
+        conn.executemany(
+            "INSERT INTO order_id_sequences (project_id, process_code, last_value) VALUES (?, ?, ?) "
+            "ON CONFLICT(project_id, process_code) DO UPDATE SET "
+            "last_value = MAX(order_id_sequences.last_value, excluded.last_value)",
+            [(project_id, process_code, value) for (project_id, process_code), value in latest.items()]
+        )
+
+    def _push_row(self, entry: dict) -> Optional[str]:
+        """
+        행 스냅샷 upsert - 원격 updated_at 이 로컬 쓰기 시각보다 늦으면 적용하지 않음
+
+        Returns:
+            충돌 설명 (원격이 더 최신 → 원격 행을 복제본에 반영), 적용됐으면 None
+        """
+        table, key = entry['table_name'], SYNC_TABLES[entry['table_name']]
+        row = self._remote_payload(entry)
+
+        response = self._client.table(table).update(row).eq(key, entry['row_key'])\
+            .lte('updated_at', entry['written_at']).execute()
+        if response.data:
+            return None
+
+        existing = self._client.table(table).select('*').eq(key, entry['row_key']).execute().data
+        if not existing:
+            self._client.table(table).insert(row).execute()
+            return None
+
+        # 원격이 더 최신 - 원격 값으로 복제본 갱신
+        remote = existing[0]
+        self.conflicts += 1
+        with self._applying_remote() as conn:
+            self._upsert_rows(conn, table, [remote], skip_pending=False)
+        self._notify(table, 'UPDATE', [remote])
+        return f"remote newer (updated_at={remote.get('updated_at')})"
+
+    def _push_events(self, batch: List[dict]) -> None:
+        """이벤트 묶음 → wip_record_process_events (client_event_id 중복은 원격에서 무시)"""
+        events = [json.loads(entry['payload'] or '{}') for entry in batch]
+        response = self._client.rpc('wip_record_process_events', {'p_events': events}).execute()
+        linked = [(row['event_id'], row['client_event_id']) for row in (response.data or [])
+                  if row.get('client_event_id')]
+        if linked:
+            with self._applying_remote() as conn:
+                conn.executemany(
+                    "UPDATE process_events SET remote_event_id = ? WHERE client_event_id = ?", linked
+                )
+
+    def _finish(self, seqs: List[int], status: Optional[str] = None, error: Optional[str] = None) -> None:
+        """전송 완료 항목 정리 - 성공은 삭제, 충돌은 기록으로 남김"""
+        with self.pool.connection() as conn:
+            placeholders = ', '.join('?' * len(seqs))
+            if status is None:
+                conn.execute(f"DELETE FROM sync_outbox WHERE seq IN ({placeholders})", seqs)
+            else:
+                conn.execute(
+                    f"UPDATE sync_outbox SET status = ?, last_error = ? WHERE seq IN ({placeholders})",
+                    [status, error] + seqs
+                )
+
+    def _retry(self, batch: List[dict], error: Exception) -> None:
+        """실패 기록 - MAX_ATTEMPTS 를 넘으면 'failed' 로 두고 뒤 항목이 막히지 않게 함"""
+        head = batch[0]
+        seqs = [entry['seq'] for entry in batch] + head.get('absorbed', [])
+        failed = head['attempts'] + 1 >= MAX_ATTEMPTS
+        with self.pool.connection() as conn:
+            conn.execute(
+                f"UPDATE sync_outbox SET attempts = attempts + 1, last_error = ?, "
+                f"status = CASE WHEN ? THEN 'failed' ELSE status END "
+                f"WHERE seq IN ({', '.join('?' * len(seqs))})",
+                [str(error)[:500], int(failed)] + seqs
+            )
+        if failed:
+            print(f"[WARN] 오프라인 동기화 항목 포기 ({head['table_name']} {head['row_key']}): {error}")
+
+    # ------------------------------------------------------------------
+    # pull (Supabase → 복제본)
+    # ------------------------------------------------------------------
+    def pull(self, full: bool = False) -> int:
+        """
+        원격 변경 반영
+
+        - 행 테이블: synced_at(원격 서버 시각) 워터마크 - SYNC_OVERLAP_SECONDS 이후 변경분, full 이면 전체 + 원격에서 사라진 행 삭제
+        - 이벤트: 마지막으로 받은 원격 event_id 이후, full 이면 최근 EVENT_WINDOW_DAYS 일
+        - 아직 push 되지 않은 로컬 변경이 있는 행은 건너뜀 (push 때 LWW 로 판정)
+
+        Returns:
+            반영한 원격 행 수
+        """
+        pulled = 0
+        for table in SYNC_TABLES:
+            pulled += self._pull_table(table, full)
+        pulled += self._pull_events(full)
+        if full:
+            with self.pool.connection() as conn:
+                self._set_state(conn, 'last_full_pull', _utc_now())
+        self.pulled += pulled
+        return pulled
+
+    def _query(self, table: str, select: str = '*'):
+        query = self._client.table(table).select(select)
+        if self.customer_id and table in TENANT_TABLES:
+            query = query.eq('customer_id', self.customer_id)
+        return query
+
+    def _fetch_all(self, build) -> List[dict]:
+        """페이지 단위로 끝까지 조회 (build: 새 쿼리 생성 함수)"""
+        rows: List[dict] = []
+        while True:
+            page = build().range(len(rows), len(rows) + PULL_PAGE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < PULL_PAGE:
+                return rows
+
+    def _pull_table(self, table: str, full: bool) -> int:
+        key = SYNC_TABLES[table]
+        watermark = None if full else _parse_ts(self._get_state(f'{table}_synced_at'))
+        since = watermark - timedelta(seconds=SYNC_OVERLAP_SECONDS) if watermark else None
+
+        def build():
+            query = self._query(table)
+            if since:
+                query = query.gte('synced_at', since.isoformat())
+            return query.order('synced_at' if since else key)
+
+        fetched = self._fetch_all(build)
+        with self._applying_remote() as conn:
+            applied = self._upsert_rows(conn, table, self._recent_unseen(table, fetched))
+            deleted: List[str] = []
+            if full:
+                deleted = self._delete_missing(conn, table, {row[key] for row in fetched})
+            synced = [row['synced_at'] for row in fetched if row.get('synced_at')]
+            if synced:
+                self._set_state(conn, f'{table}_synced_at', max(synced, key=lambda v: _parse_ts(v)))
+
+        self._notify(table, 'UPDATE', applied)
+        self._notify(table, 'DELETE', [{key: value} for value in deleted])
+        return len(applied) + len(deleted)
+
+    def _recent_unseen(self, table: str, rows: List[dict]) -> List[dict]:
+        """
+        겹침 구간에서 이미 반영한 행(같은 synced_at) 제외 - 매 주기 같은 행을 다시 알리지 않도록
+
+        겹침 구간 안의 행만 기억하고 그보다 오래된 기록은 버린다.
+        """
+        key = SYNC_TABLES[table]
+        seen = self._seen_rows.setdefault(table, {})
+        unseen = [row for row in rows if seen.get(row[key]) != row.get('synced_at')]
+        stamps = [_parse_ts(row.get('synced_at')) for row in rows]
+        newest = max([stamp for stamp in stamps if stamp] + [_parse_ts(v) for v in seen.values()], default=None)
+        if newest is None:
+            return unseen
+        cutoff = newest - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        for row, stamp in zip(rows, stamps):
+            if stamp and stamp >= cutoff:
+                seen[row[key]] = row['synced_at']
+        for row_key in [k for k, v in seen.items() if (_parse_ts(v) or cutoff) < cutoff]:
+            del seen[row_key]
+        return unseen
+
+    def _pending_keys(self, conn, table: str) -> set:
+        return {row[0] for row in conn.execute(
+            "SELECT DISTINCT row_key FROM sync_outbox WHERE table_name = ? AND status = 'pending'", (table,)
+        ).fetchall()}
+
+    def _upsert_rows(self, conn, table: str, rows: List[dict], skip_pending: bool = True) -> List[dict]:
+        """원격 행 → 복제본 (로컬 컬럼만), 반영한 행 목록 반환"""
+        if not rows:
+            return []
+        key = SYNC_TABLES[table]
+        if table == 'orders':
+            self._raise_order_sequences(conn, rows)
+        local_columns = set(self._columns(conn, table))
+        pending = self._pending_keys(conn, table) if skip_pending else set()
+        applied = []
+        for row in rows:
+            if row.get(key) in pending:
+                continue
+            local = _local_row(row, local_columns)
+            columns = list(local)
+            updates = ', '.join(f"{c} = excluded.{c}" for c in columns if c != key)
+            conn.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT({key}) DO UPDATE SET {updates}",
+                list(local.values())
+            )
+            applied.append(row)
+        return applied
+
+    def _delete_missing(self, conn, table: str, remote_keys: set) -> List[str]:
+        """전체 재동기화 - 원격에 없는 행 삭제 (미전송 로컬 변경이 있는 행은 유지)"""
+        key = SYNC_TABLES[table]
+        query, params = f"SELECT {key} FROM {table}", []
+        if self.customer_id and table in TENANT_TABLES:
+            query += " WHERE customer_id = ?"
+            params.append(self.customer_id)
+        pending = self._pending_keys(conn, table)
+        missing = [row[0] for row in conn.execute(query, params).fetchall()
+                   if row[0] not in remote_keys and row[0] not in pending]
+        for chunk in _chunks(missing, IN_CHUNK):
+            placeholders = ', '.join('?' * len(chunk))
+            conn.execute(f"DELETE FROM {table} WHERE {key} IN ({placeholders})", chunk)
+            if table == 'orders':
+                conn.execute(f"DELETE FROM process_events WHERE order_id IN ({placeholders})", chunk)
+                conn.execute(f"DELETE FROM order_stage_state WHERE order_id IN ({placeholders})", chunk)
+        return missing
+
+    def _pull_events(self, full: bool) -> int:
+        last_event_id = None if full else self._get_state('process_events_remote_id')
+        since = (datetime.now(timezone.utc) - timedelta(days=EVENT_WINDOW_DAYS)).isoformat()
+
+        def filtered(query):
+            if last_event_id:
+                # 겹치게 다시 조회 (이미 받은 이벤트는 _insert_events 에서 건너뜀)
+                return query.gt('event_id', max(int(last_event_id) - SYNC_OVERLAP, 0))
+            return query.gte('created_at', since)
+
+        table = self._client.table
+        if not self.customer_id:
+            rows = self._fetch_all(lambda: filtered(table('process_events').select('*')).order('event_id'))
+        elif self._join_events:
+            try:
+                rows = self._fetch_all(lambda: filtered(
+                    table('process_events').select('*,orders!inner(customer_id)')
+                    .eq('orders.customer_id', self.customer_id)
+                ).order('event_id'))
+            except Exception as e:
+                # FK 관계가 없어 조인이 안 되면 이후로는 복제본의 발주 ID 로 나눠 조회
+                print(f"[WARN] process_events-orders join failed, fetching by order ids: {e}")
+                self._join_events = False
+                return self._pull_events(full)
+        else:
+            with self.pool.connection() as conn:
+                order_ids = [row[0] for row in conn.execute(
+                    "SELECT order_id FROM orders WHERE customer_id = ?", (self.customer_id,)
+                ).fetchall()]
+            rows = []
+            for chunk in _chunks(order_ids, IN_CHUNK):
+                rows.extend(self._fetch_all(lambda: filtered(
+                    table('process_events').select('*').in_('order_id', chunk)
+                ).order('event_id')))
+
+        # 페이지/청크 경계에서 겹친 행 제거
+        rows = list({int(row['event_id']): row for row in rows}.values())
+        with self._applying_remote() as conn:
+            inserted = self._insert_events(conn, rows)
+            if rows:
+                known = int(self._get_state('process_events_remote_id', conn) or 0)
+                self._set_state(conn, 'process_events_remote_id', max([known] + [int(r['event_id']) for r in rows]))
+
+        self._notify('process_events', 'INSERT', inserted)
+        return len(inserted)
+
+    def _insert_events(self, conn, rows: List[dict]) -> List[dict]:
+        """
+        원격 이벤트 → 복제본 (이미 있으면 건너뜀) + 로컬 공정 상태 갱신
+
+        이 기기가 보낸 이벤트는 client_event_id 로 찾아 remote_event_id 만 연결한다.
+        """
+        if not rows:
+            return []
+        local_columns = set(self._columns(conn, 'process_events')) - {'event_id', 'remote_event_id'}
+        inserted, new_ids = [], []
+        for row in rows:
+            client_event_id = row.get('client_event_id')
+            if client_event_id and conn.execute(
+                "UPDATE process_events SET remote_event_id = ? WHERE client_event_id = ?",
+                (row['event_id'], client_event_id)
+            ).rowcount:
+                continue
+            local = _local_row(row, local_columns)
+            cursor = conn.execute(
+                f"INSERT INTO process_events ({', '.join(list(local) + ['remote_event_id'])}) "
+                f"VALUES ({', '.join('?' * (len(local) + 1))}) ON CONFLICT(remote_event_id) DO NOTHING",
+                list(local.values()) + [row['event_id']]
+            )
+            if cursor.rowcount:
+                new_ids.append(cursor.lastrowid)
+                inserted.append(dict(local, event_id=cursor.lastrowid))
+        for chunk in _chunks(new_ids, IN_CHUNK):
+            conn.execute(STAGE_STATE_FROM_EVENTS_SQL.format(ids=', '.join('?' * len(chunk))), chunk)
+        return inserted
+
+    def _notify(self, table: str, change_type: str, rows: List[dict]) -> None:
+        """원격 변경 알림 - 많으면 RESYNC 1건 (캐시 전체 무효화)"""
+        if self.notify is None or not rows:
+            return
+        try:
+            if len(rows) > NOTIFY_ROWS:
+                self.notify(table, 'RESYNC', None)
+            else:
+                for row in rows:
+                    self.notify(table, change_type, row)
+        except Exception as e:
+            print(f"[WARN] 오프라인 동기화 알림 실패 ({table}): {e}")
+
+    # ------------------------------------------------------------------
+    # 상태
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:
+        with self.pool.connection() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM sync_outbox GROUP BY status").fetchall())
+        return {
+            'customer_id': self.customer_id,
+            'online': self.online,
+            'pending': counts.get('pending', 0),
+            'conflict': counts.get('conflict', 0),
+            'failed': counts.get('failed', 0),
+            'pushed': self.pushed,
+            'pulled': self.pulled,
+            'conflicts': self.conflicts,
+            'last_sync_at': self.last_sync_at,
+            'last_error': self.last_error,
+        }
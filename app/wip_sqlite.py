@@ -0,0 +1,165 @@
+# wip_sqlite.py
+# WIP 로컬(SQLite) 모드 연결 풀
+#
+# - 쿼리마다 connect/close 하지 않고 연결을 재사용 (준비된 문장 캐시 유지)
+# - WAL + busy_timeout: 읽기는 쓰기를 기다리지 않고, 동시 쓰기는 잠금 오류 대신 대기
+# - 같은 스레드의 중첩 사용은 같은 연결/트랜잭션 (안쪽은 SAVEPOINT, 바깥 트랜잭션은 명시적 BEGIN)
+# - PRAGMA user_version 기반 마이그레이션 (인덱스 추가 등)
+#
+# Streamlit 은 재실행마다 스크립트 스레드가 바뀌므로 스레드 고정 연결 대신 풀을 쓴다.
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+# 연결별 PRAGMA
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",      # WAL 에서는 NORMAL 로도 손상 없음 (마지막 커밋만 유실 가능)
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",       # 약 16MB
+    "PRAGMA mmap_size = 134217728",     # 128MB
+)
+# 연결당 준비된 문장 캐시 크기
+STATEMENT_CACHE_SIZE = 256
+# 유휴 연결 최대 보관 수 (초과분은 반납 시 닫음)
+MAX_IDLE_CONNECTIONS = 8
+
+# (user_version, 설명, SQL 목록) - 버전 순서대로 한 번씩 적용
+Migration = Tuple[int, str, Sequence[str]]
+
+
+class SQLitePool:
+    """
+    SQLite 연결 풀
+
+    Args:
+        db_path: DB 파일 경로
+        row_factory: 행 팩토리 (기본 sqlite3.Row)
+    """
+
+    def __init__(self, db_path: str, row_factory: Optional[Callable] = sqlite3.Row):
+        self.db_path = db_path
+        self.row_factory = row_factory
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._local = threading.local()
+        self.created = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=5.0,
+            check_same_thread=False,       # 풀에서 스레드 간 이동 (한 번에 한 스레드만 사용)
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = self.row_factory
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        self.created += 1
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        if self._idle.qsize() >= MAX_IDLE_CONNECTIONS:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        연결 컨텍스트 - 바깥 블록 종료 시 commit (예외 시 rollback)
+
+        같은 스레드에서 중첩되면 같은 연결을 쓰고, 안쪽 블록은 SAVEPOINT 로 감싼다.
+        바깥 트랜잭션이 아직 시작되지 않았으면 SAVEPOINT 전에 BEGIN 한다
+        (SAVEPOINT 가 트랜잭션을 시작하면 RELEASE 가 곧 commit 이 되어 바깥 rollback 이 안 됨).
+
+        Args:
+            immediate: 트랜잭션을 BEGIN IMMEDIATE 로 시작 (쓰기 잠금을 먼저 잡고 읽기)
+                       이미 열린 바깥 트랜잭션은 올릴 수 없으므로 호출자는 쓰기를 먼저 실행할 것
+        """
+        depth = getattr(self._local, 'depth', 0)
+        if depth == 0:
+            conn = self._acquire()
+            self._local.conn = conn
+        else:
+            conn = self._local.conn
+        savepoint = f"sp_{depth}" if depth else None
+        try:
+            if not conn.in_transaction and (immediate or savepoint):
+                conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            if savepoint:
+                conn.execute(f"SAVEPOINT {savepoint}")
+        except Exception:
+            if depth == 0:
+                self._local.conn = None
+                self._release(conn)
+            raise
+        self._local.depth = depth + 1
+        try:
+            yield conn
+            if savepoint:
+                # 안쪽에서 commit() 했으면 SAVEPOINT 는 이미 해제됨
+                if conn.in_transaction:
+                    conn.execute(f"RELEASE {savepoint}")
+            elif depth == 0 and conn.in_transaction:
+                conn.commit()
+        except Exception:
+            if savepoint:
+                if conn.in_transaction:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+            elif depth == 0 and conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self._local.conn = None
+                self._release(conn)
+
+    def migrate(self, migrations: List[Migration]) -> int:
+        """
+        user_version 보다 높은 마이그레이션 적용
+
+        Returns:
+            적용한 마이그레이션 수
+        """
+        applied = 0
+        with self.connection() as conn:
+            current = conn.execute("PRAGMA user_version").fetchone()[0]
+            for version, description, statements in sorted(migrations, key=lambda m: m[0]):
+                if version <= current:
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+                print(f"✅ SQLite 마이그레이션 v{version}: {description}")
+                applied += 1
+            if applied:
+                conn.execute("PRAGMA optimize")
+        return applied
+
+    def close(self) -> None:
+        """유휴 연결 모두 닫기"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def stats(self) -> dict:
+        return {'db_path': self.db_path, 'created': self.created, 'idle': self._idle.qsize()}
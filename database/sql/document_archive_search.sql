@@ -0,0 +1,44 @@
+-- ============================================================================
+-- document_archive 검색 인덱스 (PTOP 문서 관리)
+--
+-- app/archive_search.py 의 search_archive_server() 가 사용하는 조회 패턴:
+--   WHERE tenant_id = $1
+--     [AND document_type = $2]
+--     [AND search_text LIKE '%q%']        -- q: archive_search.search_query_text()
+--     [AND (created_at, id) < ($cursor_created_at, $cursor_id)]
+--   ORDER BY created_at DESC, id DESC
+--   LIMIT $page + 1
+--
+-- search_text: 프로젝트명 + 파일명 검색용 정규화 문자열
+--   (NFC + 소문자 + 공백/_/-/. 제거, 두 필드는 chr(31) 로 구분 - 로컬 인덱스
+--    normalize_archive_text 와 같은 규칙이라 'ABC-123' / 'ABC123' 이 같은 결과)
+--
+-- Supabase SQL Editor 에서 1회 실행 (재실행해도 안전)
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE public.document_archive
+    ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS (
+        regexp_replace(lower(normalize(coalesce(project_name, ''), NFC)), '[[:space:]_.-]+', '', 'g')
+        || chr(31) ||
+        regexp_replace(lower(normalize(coalesce(filename, ''), NFC)), '[[:space:]_.-]+', '', 'g')
+    ) STORED;
+
+-- 정규화 부분 일치(LIKE '%q%')용 trigram GIN 인덱스
+CREATE INDEX IF NOT EXISTS idx_document_archive_search_text_trgm
+    ON public.document_archive USING gin (search_text gin_trgm_ops);
+
+-- 이전 버전의 원본 컬럼 trigram 인덱스 (search_text 로 대체)
+DROP INDEX IF EXISTS public.idx_document_archive_project_name_trgm;
+DROP INDEX IF EXISTS public.idx_document_archive_filename_trgm;
+
+-- 테넌트 + 최신순 keyset 페이지네이션
+CREATE INDEX IF NOT EXISTS idx_document_archive_tenant_created
+    ON public.document_archive (tenant_id, created_at DESC, id DESC);
+
+-- 테넌트 + 문서타입 필터 + 최신순
+CREATE INDEX IF NOT EXISTS idx_document_archive_tenant_type_created
+    ON public.document_archive (tenant_id, document_type, created_at DESC, id DESC);
+
+ANALYZE public.document_archive;
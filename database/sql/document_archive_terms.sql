@@ -0,0 +1,74 @@
+-- ============================================================================
+-- document_archive 내용(full-text) 역색인
+--
+-- app/archive_content_index.py 의 ingest_documents() 가 문서 보관 시 (백그라운드) term 을 기록하고,
+-- search_document_contents() 가 RPC archive_search_document_terms 로 모든 term 을 포함하는
+-- 문서를 서버에서 찾는다. (term 행을 클라이언트로 가져오면 1000행 제한에 잘림)
+--
+-- Supabase SQL Editor 에서 1회 실행 (재실행해도 안전)
+-- ============================================================================
+
+-- document_id 는 document_archive.id 와 같은 타입으로 생성 (TEXT / uuid 어느 쪽이든 FK 가 걸리도록)
+DO $$
+DECLARE
+    v_id_type TEXT;
+BEGIN
+    SELECT format_type(a.atttypid, a.atttypmod) INTO v_id_type
+    FROM pg_attribute a
+    WHERE a.attrelid = 'public.document_archive'::regclass
+      AND a.attname = 'id'
+      AND NOT a.attisdropped;
+
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS public.document_archive_terms ('
+        '    tenant_id    TEXT NOT NULL,'
+        '    document_id  %s NOT NULL REFERENCES public.document_archive(id) ON DELETE CASCADE,'
+        '    term         TEXT NOT NULL,'
+        '    kind         TEXT NOT NULL DEFAULT ''word'','   -- kind: model / spec / word
+        '    PRIMARY KEY (document_id, term)'
+        ')', v_id_type
+    );
+END;
+$$;
+
+-- term → 문서 조회 (테넌트 범위)
+CREATE INDEX IF NOT EXISTS idx_document_archive_terms_tenant_term
+    ON public.document_archive_terms (tenant_id, term);
+
+-- 추출된 품목 행과 색인 시각 (재색인/백필 대상 판별용)
+ALTER TABLE public.document_archive
+    ADD COLUMN IF NOT EXISTS line_items JSONB,
+    ADD COLUMN IF NOT EXISTS content_indexed_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_document_archive_content_unindexed
+    ON public.document_archive (tenant_id)
+    WHERE content_indexed_at IS NULL;
+
+-- 모든 검색 term 을 포함하는 문서 (최신순 p_limit 건) + 전체 건수
+-- (document_id 는 id 타입과 무관하게 TEXT 로 반환)
+CREATE OR REPLACE FUNCTION public.archive_search_document_terms(
+    p_tenant_id     TEXT,
+    p_terms         TEXT[],
+    p_document_type TEXT DEFAULT NULL,
+    p_limit         INTEGER DEFAULT 50
+)
+RETURNS TABLE (document_id TEXT, total BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT m.document_id::TEXT, count(*) OVER () AS total
+    FROM (
+        SELECT t.document_id
+        FROM public.document_archive_terms t
+        WHERE t.tenant_id = p_tenant_id
+          AND t.term = ANY (p_terms)
+        GROUP BY t.document_id
+        HAVING count(DISTINCT t.term) = (SELECT count(DISTINCT u) FROM unnest(p_terms) AS u)
+    ) m
+    JOIN public.document_archive d ON d.id = m.document_id
+    WHERE p_document_type IS NULL OR d.document_type = p_document_type
+    ORDER BY d.created_at DESC, d.id DESC
+    LIMIT p_limit;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.archive_search_document_terms(TEXT, TEXT[], TEXT, INTEGER) TO anon, authenticated;
@@ -0,0 +1,31 @@
+-- ============================================================================
+-- WIP 납기 경고 (백그라운드 스캐너 결과)
+--
+-- app/wip_deadline_scanner.py (DeadlineScanner) 가 주기적으로 진행 중 프로젝트 /
+-- 미완료 발주의 경고 레벨을 한 번에 계산해 저장하고, 화면은 이 테이블을 읽는다.
+--   level          : normal / warning(D-14) / urgent(D-7) / overdue(지연)
+--   notified_level : 마지막으로 알림 메일을 보낸 레벨 - 이보다 심각해질 때만 다시 알림
+--   scanned_at     : 스캔 시각 (앱 로컬 시간) - 이번 스캔에 없는 행(완료/삭제)은 삭제
+--
+-- 수동 실행: 샘플 데이터 페이지 '납기 경고 스캔'
+--
+-- Supabase SQL Editor 에서 1회 실행 (재실행해도 안전)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS public.deadline_warnings (
+    entity_type    TEXT      NOT NULL CHECK (entity_type IN ('project', 'order')),
+    entity_id      TEXT      NOT NULL,
+    customer_id    TEXT,
+    name           TEXT,
+    due_date       DATE,
+    level          TEXT      NOT NULL,
+    d_day          TEXT,
+    notified_level TEXT      NOT NULL DEFAULT 'normal',
+    scanned_at     TIMESTAMP NOT NULL,
+    PRIMARY KEY (entity_type, entity_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_deadline_warnings_customer
+    ON public.deadline_warnings(customer_id, level);
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON public.deadline_warnings TO anon, authenticated;
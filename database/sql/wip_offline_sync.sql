@@ -0,0 +1,46 @@
+-- ============================================================================
+-- WIP 오프라인 우선 모드 동기화 컬럼
+--
+-- 태블릿의 로컬 복제본(app/wip_offline.py - OfflineSync)이 사용하는 원격 컬럼:
+--   updated_at : 마지막 쓰기 시각 - 마지막 쓰기 우선(LWW) 비교 기준
+--                오프라인 기기가 보낸 값(로컬 쓰기 시각)은 그대로 두고,
+--                값을 주지 않은 일반 UPDATE 는 now() 로 갱신
+--   synced_at  : 서버 반영 시각 (항상 now()) - 변경분 pull 기준
+--                (오프라인 쓰기는 updated_at 이 과거일 수 있어 updated_at 으로는 놓침)
+--
+-- 공정 이벤트 중복 방지(client_event_id)는 wip_process_events.sql 에서 처리한다.
+--
+-- Supabase SQL Editor 에서 1회 실행 (재실행해도 안전)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION public.wip_touch_sync_columns()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        NEW.updated_at := COALESCE(NEW.updated_at, now());
+    ELSIF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+        NEW.updated_at := now();
+    END IF;
+    NEW.synced_at := now();
+    RETURN NEW;
+END;
+$$;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['projects', 'orders', 'vendors'] LOOP
+        EXECUTE format('ALTER TABLE public.%I ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()', t);
+        EXECUTE format('ALTER TABLE public.%I ADD COLUMN IF NOT EXISTS synced_at  TIMESTAMPTZ NOT NULL DEFAULT now()', t);
+        EXECUTE format('CREATE INDEX IF NOT EXISTS idx_%s_synced_at ON public.%I(synced_at)', t, t);
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_sync_columns ON public.%I', t, t);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_sync_columns BEFORE INSERT OR UPDATE ON public.%I '
+            'FOR EACH ROW EXECUTE FUNCTION public.wip_touch_sync_columns()', t, t
+        );
+    END LOOP;
+END;
+$$;
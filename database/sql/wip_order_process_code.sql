@@ -0,0 +1,40 @@
+-- ============================================================================
+-- WIP 발주 공정코드 / 담당 공정 컬럼
+--
+-- 발주번호(ORD-{프로젝트코드}-{공정코드}-{순번}) 를 조회 때마다 파싱하지 않도록
+-- orders 에 process_code / stage 를 저장한다. 새 발주는 DatabaseManager.add_order 가
+-- 채우고, 기존 발주는 아래 UPDATE 로 백필한다.
+-- (세 번째 토큰이 공정코드가 아니면 뒤에서 두 번째 토큰 사용 - 앱의 _order_process_code 와 동일)
+--
+-- Supabase SQL Editor 에서 1회 실행 (재실행해도 안전)
+-- ============================================================================
+
+ALTER TABLE public.orders ADD COLUMN IF NOT EXISTS process_code TEXT;
+ALTER TABLE public.orders ADD COLUMN IF NOT EXISTS stage        TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_orders_project_stage ON public.orders(project_id, stage);
+
+WITH codes(process_code, stage) AS (
+    VALUES ('CUT',       '절단/절곡'),
+           ('PLASER',    'P레이저'),
+           ('LASER',     '레이저(판재)'),
+           ('BAND',      '벤딩'),
+           ('PAINT',     '페인트'),
+           ('STICKER',   '스티커'),
+           ('RECEIVING', '입고')
+),
+parsed AS (
+    SELECT o.order_id,
+           COALESCE(c3.process_code, c2.process_code) AS process_code,
+           COALESCE(c3.stage, c2.stage)               AS stage
+    FROM public.orders o
+    LEFT JOIN codes c3 ON c3.process_code = split_part(o.order_id, '-', 3)
+    LEFT JOIN codes c2 ON c2.process_code = substring(o.order_id from '-([^-]+)-[^-]*$')
+    WHERE o.process_code IS NULL
+)
+UPDATE public.orders o
+SET process_code = p.process_code,
+    stage        = p.stage
+FROM parsed p
+WHERE o.order_id = p.order_id
+  AND p.process_code IS NOT NULL;
@@ -0,0 +1,76 @@
+-- ============================================================================
+-- WIP 발주번호 시퀀스 (RPC)
+--
+-- DatabaseManager.allocate_order_numbers / generate_order_ids 가
+-- supabase.rpc('wip_allocate_order_numbers', ...) 로 호출한다.
+-- (프로젝트, 공정) 행 하나를 UPDATE 로 잠그고 증가시키므로 동시 생성에도
+-- 번호가 겹치지 않고, LIKE 스캔 없이 O(1) 로 할당된다.
+--
+-- 반환값: 할당된 마지막 번호 (p_count 개 → last - p_count + 1 .. last)
+--
+-- Supabase SQL Editor 에서 1회 실행 (재실행해도 안전)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS public.order_id_sequences (
+    project_id   TEXT    NOT NULL,
+    process_code TEXT    NOT NULL,
+    last_value   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, process_code)
+);
+
+-- 기존 발주번호(ORD-{코드}-{공정}-NN)로 시퀀스 시작값 채우기
+INSERT INTO public.order_id_sequences (project_id, process_code, last_value)
+SELECT
+    o.project_id,
+    substring(o.order_id from '^ORD-.*-([^-]+)-[0-9]+$')          AS process_code,
+    MAX(substring(o.order_id from '-([0-9]+)$')::INTEGER)          AS last_value
+FROM public.orders o
+WHERE o.project_id IS NOT NULL
+  AND o.order_id ~ '^ORD-.*-[^-]+-[0-9]+$'
+GROUP BY 1, 2
+ON CONFLICT (project_id, process_code)
+DO UPDATE SET last_value = GREATEST(public.order_id_sequences.last_value, EXCLUDED.last_value);
+
+
+CREATE OR REPLACE FUNCTION public.wip_allocate_order_numbers(
+    p_project_id   TEXT,
+    p_process_code TEXT,
+    p_count        INTEGER DEFAULT 1
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_last   INTEGER;
+    v_prefix TEXT := 'ORD-' || replace(p_project_id, 'PRJ-', '') || '-' || p_process_code || '-';
+BEGIN
+    IF p_count IS NULL OR p_count < 1 THEN
+        RAISE EXCEPTION 'p_count must be >= 1';
+    END IF;
+
+    -- 일반 경로: 행 잠금 + 증가 (O(1))
+    UPDATE public.order_id_sequences
+    SET last_value = last_value + p_count
+    WHERE project_id = p_project_id AND process_code = p_process_code
+    RETURNING last_value INTO v_last;
+
+    IF v_last IS NULL THEN
+        -- 최초 사용: 기존 발주번호 최댓값에서 시작 (동시 최초 사용은 ON CONFLICT 로 직렬화)
+        INSERT INTO public.order_id_sequences AS s (project_id, process_code, last_value)
+        SELECT p_project_id, p_process_code,
+               COALESCE(MAX(substring(o.order_id from '-([0-9]+)$')::INTEGER), 0) + p_count
+        FROM public.orders o
+        WHERE o.project_id = p_project_id
+          AND o.order_id LIKE v_prefix || '%'
+          AND substring(o.order_id from length(v_prefix) + 1) ~ '^[0-9]+$'
+        ON CONFLICT (project_id, process_code)
+        DO UPDATE SET last_value = s.last_value + p_count
+        RETURNING last_value INTO v_last;
+    END IF;
+
+    RETURN v_last;
+END;
+$$;
+
+GRANT SELECT, INSERT, UPDATE ON public.order_id_sequences TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.wip_allocate_order_numbers(TEXT, TEXT, INTEGER) TO anon, authenticated;
@@ -0,0 +1,66 @@
+-- ============================================================================
+-- WIP 발주/공정 최신 상태 프로젝션
+--
+-- process_events 이력을 읽을 때마다 정렬/중복제거하지 않도록 (order_id, stage) 별
+-- 최신 이벤트를 한 행으로 유지한다. 쓰기는 wip_record_process_events 가 이벤트
+-- INSERT 와 같은 트랜잭션에서 갱신하고 (wip_process_events.sql),
+-- 읽기(get_latest_events_by_stage / get_latest_events_for_orders)는 기본 키 조회만 한다.
+--
+-- 최신 판정: created_at, event_id 내림차순 (기존 조회 로직과 동일)
+-- status: progress >= 100 또는 done_date 있음 → '완료', 그 외 '진행중'
+--
+-- 백필/복구: SELECT public.wip_rebuild_order_stage_state();
+--   (앱: DatabaseManager.rebuild_order_stage_state / 샘플 데이터 페이지 '공정 상태 재구성')
+--
+-- Supabase SQL Editor 에서 wip_process_events.sql 보다 먼저 1회 실행 (재실행해도 안전)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS public.order_stage_state (
+    order_id     TEXT        NOT NULL REFERENCES public.orders(order_id) ON DELETE CASCADE,
+    stage        TEXT        NOT NULL,
+    status       TEXT        NOT NULL DEFAULT '진행중',
+    progress     NUMERIC     NOT NULL DEFAULT 0,
+    planned_date DATE,
+    done_date    DATE,
+    vendor       TEXT,
+    event_id     BIGINT      NOT NULL,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (order_id, stage)
+);
+
+
+CREATE OR REPLACE FUNCTION public.wip_rebuild_order_stage_state()
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    DELETE FROM public.order_stage_state;
+
+    INSERT INTO public.order_stage_state
+        (order_id, stage, status, progress, planned_date, done_date, vendor, event_id, updated_at)
+    SELECT DISTINCT ON (e.order_id, e.stage)
+        e.order_id,
+        e.stage,
+        CASE WHEN COALESCE(e.progress, 0) >= 100 OR e.done_date IS NOT NULL THEN '완료' ELSE '진행중' END,
+        COALESCE(e.progress, 0),
+        e.planned_date,
+        e.done_date,
+        e.vendor,
+        e.event_id,
+        COALESCE(e.created_at, now())
+    FROM public.process_events e
+    JOIN public.orders o ON o.order_id = e.order_id
+    ORDER BY e.order_id, e.stage, e.created_at DESC NULLS LAST, e.event_id DESC;
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$;
+
+-- 최초 백필
+SELECT public.wip_rebuild_order_stage_state();
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON public.order_stage_state TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.wip_rebuild_order_stage_state() TO anon, authenticated;
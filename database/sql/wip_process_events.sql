@@ -0,0 +1,91 @@
+-- ============================================================================
+-- WIP 공정 이벤트 일괄 기록 함수 (RPC)
+--
+-- DatabaseManager.add_process_events / add_process_event 가
+-- supabase.rpc('wip_record_process_events', {'p_events': [...]}) 로 호출한다.
+-- 이벤트 INSERT 와 발주 상태 UPDATE 를 한 트랜잭션에서 처리하므로
+-- 발주 N건의 공정 완료 처리가 HTTP 요청 1회로 끝난다.
+--
+-- 발주 상태 규칙 (기존 add_process_event 와 동일, 배열 순서대로 적용):
+--   progress >= 100 또는 done_date 있음 → current_stage = stage, status = '완료'
+--   그 외                                → status = '진행중'
+-- 같은 트랜잭션에서 order_stage_state (발주/공정 최신 상태) 도 갱신한다.
+--
+-- 오프라인 기기(app/wip_offline.py)가 재전송하는 이벤트:
+--   client_event_id 가 이미 있으면 건너뜀 (응답 유실 후 재시도해도 1건)
+--   created_at 은 기기에서 기록한 시각 → 공정 상태는 더 최신 이벤트일 때만 교체 (LWW),
+--   발주 상태도 공정 상태가 바뀐 경우에만 갱신 (늦게 도착한 과거 이벤트가 덮어쓰지 않음)
+--
+-- Supabase SQL Editor 에서 wip_order_stage_state.sql 다음에 1회 실행 (재실행해도 안전)
+-- ============================================================================
+
+ALTER TABLE public.process_events ADD COLUMN IF NOT EXISTS client_event_id TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_process_events_client_event_id
+    ON public.process_events(client_event_id);
+
+CREATE OR REPLACE FUNCTION public.wip_record_process_events(p_events JSONB)
+RETURNS SETOF public.process_events
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    ev       JSONB;
+    inserted public.process_events;
+    is_done  BOOLEAN;
+    v_rows   INTEGER;
+BEGIN
+    FOR ev IN SELECT value FROM jsonb_array_elements(COALESCE(p_events, '[]'::JSONB)) LOOP
+        INSERT INTO public.process_events
+            (order_id, stage, progress, planned_date, done_date, vendor, note, created_at, client_event_id)
+        VALUES (
+            ev->>'order_id',
+            ev->>'stage',
+            COALESCE((ev->>'progress')::NUMERIC, 0),
+            NULLIF(ev->>'planned_date', '')::DATE,
+            NULLIF(ev->>'done_date', '')::DATE,
+            ev->>'vendor',
+            COALESCE(ev->>'note', ''),
+            COALESCE(NULLIF(ev->>'created_at', '')::TIMESTAMPTZ, now()),
+            NULLIF(ev->>'client_event_id', '')
+        )
+        ON CONFLICT (client_event_id) DO NOTHING
+        RETURNING * INTO inserted;
+
+        IF NOT FOUND THEN
+            CONTINUE;  -- 이미 반영된 재전송
+        END IF;
+
+        is_done := inserted.progress >= 100 OR inserted.done_date IS NOT NULL;
+
+        -- 발주/공정 최신 상태 (더 최신 이벤트가 이미 반영돼 있으면 유지)
+        INSERT INTO public.order_stage_state AS s
+            (order_id, stage, status, progress, planned_date, done_date, vendor, event_id, updated_at)
+        VALUES (
+            inserted.order_id, inserted.stage,
+            CASE WHEN is_done THEN '완료' ELSE '진행중' END,
+            COALESCE(inserted.progress, 0), inserted.planned_date, inserted.done_date,
+            inserted.vendor, inserted.event_id, COALESCE(inserted.created_at, now())
+        )
+        ON CONFLICT (order_id, stage) DO UPDATE
+        SET status       = EXCLUDED.status,
+            progress     = EXCLUDED.progress,
+            planned_date = EXCLUDED.planned_date,
+            done_date    = EXCLUDED.done_date,
+            vendor       = EXCLUDED.vendor,
+            event_id     = EXCLUDED.event_id,
+            updated_at   = EXCLUDED.updated_at
+        WHERE (EXCLUDED.updated_at, EXCLUDED.event_id) > (s.updated_at, s.event_id);
+        GET DIAGNOSTICS v_rows = ROW_COUNT;
+
+        IF v_rows > 0 THEN
+            UPDATE public.orders
+            SET current_stage = CASE WHEN is_done THEN inserted.stage ELSE current_stage END,
+                status        = CASE WHEN is_done THEN '완료' ELSE '진행중' END
+            WHERE order_id = inserted.order_id;
+        END IF;
+
+        RETURN NEXT inserted;
+    END LOOP;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.wip_record_process_events(JSONB) TO anon, authenticated;
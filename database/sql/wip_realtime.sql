@@ -0,0 +1,27 @@
+-- ============================================================================
+-- WIP 실시간 변경 피드 (Supabase Realtime)
+--
+-- wip_change_feed.ChangeFeed.start_realtime 이 process_events / orders / projects 의
+-- postgres_changes 를 구독한다. 대상 테이블을 supabase_realtime publication 에 추가.
+--
+-- Supabase SQL Editor 에서 1회 실행 (재실행해도 안전)
+-- ============================================================================
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['process_events', 'orders', 'projects'] LOOP
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_publication_tables
+            WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = t
+        ) THEN
+            EXECUTE format('ALTER PUBLICATION supabase_realtime ADD TABLE public.%I', t);
+        END IF;
+    END LOOP;
+END $$;
+
+-- UPDATE/DELETE 시 old_record 에 customer_id/project_id 가 오도록 (없으면 기본 키만 전달되어
+-- 앱이 해당 엔티티 캐시 전체를 무효화한다)
+ALTER TABLE public.orders   REPLICA IDENTITY FULL;
+ALTER TABLE public.projects REPLICA IDENTITY FULL;
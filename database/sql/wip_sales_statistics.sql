@@ -0,0 +1,152 @@
+-- ============================================================================
+-- WIP 매출 통계 집계 함수 (RPC)
+--
+-- DatabaseManager.get_sales_statistics / get_monthly_sales_trend /
+-- get_contract_type_ratio / get_top_projects_by_amount 가
+-- supabase.rpc(...) 로 호출한다. 완료 프로젝트 전체를 내려받지 않고
+-- 결과 구간(연/월/계약유형, 상위 N) 만 반환한다.
+--
+-- Supabase SQL Editor 에서 1회 실행 (재실행해도 안전)
+-- ============================================================================
+
+-- 완료 프로젝트의 기간/고객사 필터용
+CREATE INDEX IF NOT EXISTS idx_projects_completed_due
+    ON public.projects (final_due_date)
+    WHERE status = '완료';
+
+CREATE INDEX IF NOT EXISTS idx_projects_completed_customer_due
+    ON public.projects (customer_id, final_due_date)
+    WHERE status = '완료';
+
+CREATE INDEX IF NOT EXISTS idx_projects_completed_amount
+    ON public.projects (contract_amount DESC)
+    WHERE status = '완료';
+
+
+-- 연/월/계약유형별 매출
+CREATE OR REPLACE FUNCTION public.wip_sales_statistics(
+    p_year        INTEGER DEFAULT NULL,
+    p_month       INTEGER DEFAULT NULL,
+    p_customer_id TEXT    DEFAULT NULL
+)
+RETURNS TABLE (
+    year          TEXT,
+    month         TEXT,
+    contract_type TEXT,
+    project_count BIGINT,
+    total_amount  NUMERIC,
+    avg_amount    NUMERIC
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        to_char(p.final_due_date, 'YYYY')       AS year,
+        to_char(p.final_due_date, 'MM')         AS month,
+        p.contract_type::TEXT                   AS contract_type,
+        COUNT(*)                                AS project_count,
+        COALESCE(SUM(p.contract_amount), 0)     AS total_amount,
+        COALESCE(AVG(p.contract_amount), 0)     AS avg_amount
+    FROM public.projects p
+    WHERE p.status = '완료'
+      AND p.final_due_date IS NOT NULL
+      AND (p_year IS NULL OR p.final_due_date >= make_date(p_year, COALESCE(p_month, 1), 1))
+      AND (p_year IS NULL OR p.final_due_date <  CASE
+              WHEN p_month IS NULL THEN make_date(p_year + 1, 1, 1)
+              ELSE (make_date(p_year, p_month, 1) + INTERVAL '1 month')::DATE
+          END)
+      AND (p_month IS NULL OR EXTRACT(MONTH FROM p.final_due_date) = p_month)
+      AND (p_customer_id IS NULL OR p.customer_id::TEXT = p_customer_id)
+    GROUP BY 1, 2, 3
+    ORDER BY 1 DESC, 2 DESC;
+$$;
+
+
+-- 최근 N개월 월별/계약유형별 매출
+CREATE OR REPLACE FUNCTION public.wip_monthly_sales_trend(
+    p_months      INTEGER DEFAULT 12,
+    p_customer_id TEXT    DEFAULT NULL
+)
+RETURNS TABLE (
+    month         TEXT,
+    contract_type TEXT,
+    total_amount  NUMERIC
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        to_char(p.final_due_date, 'YYYY-MM')    AS month,
+        p.contract_type::TEXT                   AS contract_type,
+        COALESCE(SUM(p.contract_amount), 0)     AS total_amount
+    FROM public.projects p
+    WHERE p.status = '완료'
+      AND p.final_due_date >= (CURRENT_DATE - make_interval(months => p_months))::DATE
+      AND (p_customer_id IS NULL OR p.customer_id::TEXT = p_customer_id)
+    GROUP BY 1, 2
+    ORDER BY 1 DESC;
+$$;
+
+
+-- 계약유형(관급/사급) 비율
+CREATE OR REPLACE FUNCTION public.wip_contract_type_ratio(
+    p_year        INTEGER DEFAULT NULL,
+    p_customer_id TEXT    DEFAULT NULL
+)
+RETURNS TABLE (
+    contract_type TEXT,
+    count         BIGINT,
+    total_amount  NUMERIC
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        p.contract_type::TEXT                   AS contract_type,
+        COUNT(*)                                AS count,
+        COALESCE(SUM(p.contract_amount), 0)     AS total_amount
+    FROM public.projects p
+    WHERE p.status = '완료'
+      AND (p_year IS NULL OR (p.final_due_date >= make_date(p_year, 1, 1)
+                              AND p.final_due_date < make_date(p_year + 1, 1, 1)))
+      AND (p_customer_id IS NULL OR p.customer_id::TEXT = p_customer_id)
+    GROUP BY 1;
+$$;
+
+
+-- 계약금액 상위 N 프로젝트
+CREATE OR REPLACE FUNCTION public.wip_top_projects_by_amount(
+    p_limit       INTEGER DEFAULT 10,
+    p_year        INTEGER DEFAULT NULL,
+    p_customer_id TEXT    DEFAULT NULL
+)
+RETURNS TABLE (
+    project_id                  TEXT,
+    project_name                TEXT,
+    contract_type               TEXT,
+    contract_amount             NUMERIC,
+    final_due_date              DATE,
+    installation_completed_date DATE
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        p.project_id::TEXT,
+        p.project_name::TEXT,
+        p.contract_type::TEXT,
+        p.contract_amount::NUMERIC,
+        p.final_due_date::DATE,
+        p.installation_completed_date::DATE
+    FROM public.projects p
+    WHERE p.status = '완료'
+      AND p.contract_amount > 0
+      AND (p_year IS NULL OR (p.final_due_date >= make_date(p_year, 1, 1)
+                              AND p.final_due_date < make_date(p_year + 1, 1, 1)))
+      AND (p_customer_id IS NULL OR p.customer_id::TEXT = p_customer_id)
+    ORDER BY p.contract_amount DESC
+    LIMIT GREATEST(p_limit, 0);
+$$;
+
+GRANT EXECUTE ON FUNCTION
+    public.wip_sales_statistics(INTEGER, INTEGER, TEXT),
+    public.wip_monthly_sales_trend(INTEGER, TEXT),
+    public.wip_contract_type_ratio(INTEGER, TEXT),
+    public.wip_top_projects_by_amount(INTEGER, INTEGER, TEXT)
+TO anon, authenticated;
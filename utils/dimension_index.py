@@ -0,0 +1,191 @@
+"""
+규격(model_standard) 치수 파싱 / 수치 범위 색인
+
+- parse_standard_dimensions("W2000xH1200") → {"w": 2000.0, "h": 1200.0}
+- parse_dimension_query("W1800-2200 H>=1200") → {"w": (1800, 2200), "h": (1200, None)}
+- DimensionIndex: 치수별 정렬 배열 + 이분 탐색(np.searchsorted)으로 범위 조회
+
+규격 문자열은 카탈로그 버전당 한 번만 파싱하고, 같은 문자열의 재파싱은 lru_cache 로 막는다.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 지원 치수: w(폭), h(높이), d(지름/깊이), l(길이), t(두께)
+DIMENSIONS = ('w', 'h', 'd', 'l', 't')
+
+_LABELS = {
+    'w': r'(?:w|width|폭|Ｗ)',
+    'h': r'(?:h|height|높이)',
+    'd': r'(?:ø|φ|Ø|dia|d)',
+    'l': r'(?:l|length|길이)',
+    't': r'(?:t|두께)',
+}
+
+_NUM = r'(\d+(?:\.\d+)?)'
+
+# 규격 내 라벨 치수: W2000, H 1200, Ø76.3, 폭1800  ("W2000xH1200" 처럼 x 뒤 라벨 허용)
+_LABELED_IN_STANDARD = {
+    dim: re.compile(r'(?<![a-wyz])' + label + r'\s*[-_=:]?\s*' + _NUM, re.IGNORECASE)
+    for dim, label in _LABELS.items()
+}
+# 라벨 없는 곱셈 표기: 2000x1200, 2000*1200*50
+_PRODUCT = re.compile(r'(\d+(?:\.\d+)?)\s*[x×*]\s*(\d+(?:\.\d+)?)', re.IGNORECASE)
+# 기존 parse_width_m_from_standard 와 동일한 폭 추출 규칙
+_LEGACY_WIDTH = re.compile(r'[WwＷ박]?\s*[-_×x]?\s*(\d{3,5})')
+_ANY_NUMBER = re.compile(r'(\d+(?:\.\d+)?)')
+
+# 검색어: W1800-2200, W1800~2200, W>=1200, H<900, 폭 1800..2200, W2000
+_QUERY_TERM = re.compile(
+    r'(?<![a-z가-힣])(?P<label>width|height|length|폭|높이|길이|두께|dia|ø|φ|w|h|d|l|t)\s*'
+    r'(?:(?P<op>>=|<=|≥|≤|>|<|=)\s*(?P<opnum>\d+(?:\.\d+)?)'
+    r'|(?P<lo>\d+(?:\.\d+)?)\s*(?:-|~|\.\.)\s*(?P<hi>\d+(?:\.\d+)?)'
+    r'|(?P<num>\d+(?:\.\d+)?))',
+    re.IGNORECASE,
+)
+_LABEL_TO_DIM = {
+    'w': 'w', 'width': 'w', '폭': 'w',
+    'h': 'h', 'height': 'h', '높이': 'h',
+    'd': 'd', 'dia': 'd', 'ø': 'd', 'φ': 'd',
+    'l': 'l', 'length': 'l', '길이': 'l',
+    't': 't', '두께': 't',
+}
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+@lru_cache(maxsize=65536)
+def parse_standard_dimensions(std: str) -> Dict[str, float]:
+    """
+    규격 문자열 → 치수(mm) dict
+
+    라벨(W/H/Ø/L/T) 우선, 라벨이 없으면 "가로x세로" 곱셈 표기의 앞/뒤를 w/h 로 본다.
+    반환 dict 는 캐시 공유 객체이므로 수정하지 말 것.
+    """
+    if not std:
+        return {}
+    s = str(std)
+    dims: Dict[str, float] = {}
+    for dim, pattern in _LABELED_IN_STANDARD.items():
+        m = pattern.search(s)
+        if m:
+            dims[dim] = float(m.group(1))
+    if 'w' not in dims and 'h' not in dims:
+        m = _PRODUCT.search(s)
+        if m:
+            dims['w'] = float(m.group(1))
+            dims['h'] = float(m.group(2))
+    return dims
+
+
+@lru_cache(maxsize=65536)
+def legacy_width_mm(std: str) -> Optional[float]:
+    """parse_width_m_from_standard 의 폭(mm) 추출 규칙 (첫 3~5자리 숫자) - 결과 캐시"""
+    if not std:
+        return None
+    s = str(std)
+    m = _LEGACY_WIDTH.search(s) or re.search(r'(\d{3,5})', s)
+    if not m:
+        return None
+    try:
+        return float(m.group(1))
+    except ValueError:
+        return None
+
+
+def parse_dimension_query(query: str) -> Dict[str, Range]:
+    """
+    치수 범위 검색어 파싱
+
+    예:
+        "W1800-2200 H>=1200" → {"w": (1800, 2200), "h": (1200, None)}
+        "폭2000"              → {"w": (2000, 2000)}
+        "H<900"               → {"h": (None, 900)}   (미만은 900 직전까지)
+    """
+    ranges: Dict[str, Range] = {}
+    for m in _QUERY_TERM.finditer(query or ""):
+        dim = _LABEL_TO_DIM[m.group('label').lower()]
+        if m.group('op'):
+            v = float(m.group('opnum'))
+            op = m.group('op')
+            if op in ('>=', '≥'):
+                rng = (v, None)
+            elif op == '>':
+                rng = (np.nextafter(v, np.inf), None)
+            elif op in ('<=', '≤'):
+                rng = (None, v)
+            elif op == '<':
+                rng = (None, np.nextafter(v, -np.inf))
+            else:
+                rng = (v, v)
+        elif m.group('lo'):
+            lo, hi = float(m.group('lo')), float(m.group('hi'))
+            rng = (min(lo, hi), max(lo, hi))
+        else:
+            v = float(m.group('num'))
+            rng = (v, v)
+        ranges[dim] = rng
+    return ranges
+
+
+class DimensionIndex:
+    """
+    치수별 정렬 배열 색인
+
+    dim → (정렬된 값 배열, 같은 순서의 행 위치 배열)
+    범위 조회는 np.searchsorted 두 번 (O(log n)) + 결과 슬라이스
+    """
+
+    def __init__(self, standards: List[str]):
+        self.size = len(standards)
+        columns: Dict[str, List[Tuple[float, int]]] = {d: [] for d in DIMENSIONS}
+        any_values: List[Tuple[float, int]] = []
+        for pos, std in enumerate(standards):
+            dims = parse_standard_dimensions(std)
+            for dim, value in dims.items():
+                columns[dim].append((value, pos))
+            seen = set(dims.values())
+            for token in _ANY_NUMBER.findall(str(std or "")):
+                v = float(token)
+                seen.add(v)
+            any_values.extend((v, pos) for v in seen)
+
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for dim, pairs in list(columns.items()) + [('any', any_values)]:
+            pairs.sort()
+            values = np.fromiter((v for v, _ in pairs), dtype=np.float64, count=len(pairs))
+            positions = np.fromiter((p for _, p in pairs), dtype=np.int64, count=len(pairs))
+            self._sorted[dim] = (values, positions)
+
+    def range(self, dim: str, lo: Optional[float] = None, hi: Optional[float] = None) -> np.ndarray:
+        """dim 값이 [lo, hi] 인 행 위치 (정렬·중복 제거)"""
+        values, positions = self._sorted.get(dim, (np.empty(0), np.empty(0, dtype=np.int64)))
+        left = 0 if lo is None else int(np.searchsorted(values, lo, side='left'))
+        right = len(values) if hi is None else int(np.searchsorted(values, hi, side='right'))
+        if dim == 'any':
+            return np.unique(positions[left:right])
+        # 라벨 치수는 행당 값이 하나라 정렬만 하면 됨
+        return np.sort(positions[left:right])
+
+    def query(self, **ranges: Range) -> np.ndarray:
+        """
+        여러 치수 조건의 교집합
+
+        예: index.query(w=(1800, 2200), h=(1200, None))
+        """
+        result: Optional[np.ndarray] = None
+        for dim, (lo, hi) in ranges.items():
+            hits = self.range(dim, lo, hi)
+            result = hits if result is None else np.intersect1d(result, hits, assume_unique=True)
+            if result.size == 0:
+                break
+        return result if result is not None else np.arange(self.size)
+
+    def equals_any(self, value: float) -> np.ndarray:
+        """어느 치수든 value 와 같은 행 위치 (라벨 없는 숫자 검색용)"""
+        return self.range('any', value, value)
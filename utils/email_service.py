@@ -4,7 +4,7 @@ Email sending service (scaffold)
 Default provider: Naver SMTP. Allows override via config dict.
 """
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 import smtplib
 from email.message import EmailMessage
@@ -20,11 +20,15 @@ class EmailConfig:
     from_name: Optional[str] = None
 
 
-def send_email_with_attachments(config: EmailConfig, to_addrs: List[str], subject: str, body_html: str, attachments: List[tuple[str, bytes, str]] = []) -> bool:
-    """
-    attachments: list of tuples (filename, file_bytes, mime_type)
-    returns True on success
-    """
+@dataclass
+class OutgoingEmail:
+    to_addrs: List[str]
+    subject: str
+    body_html: str
+    attachments: List[tuple[str, bytes, str]] = field(default_factory=list)
+
+
+def _build_message(config: EmailConfig, to_addrs: List[str], subject: str, body_html: str, attachments: List[tuple[str, bytes, str]]) -> EmailMessage:
     msg = EmailMessage()
     from_addr = config.user or ""
     msg["From"] = f"{config.from_name or ''} <{from_addr}>" if config.from_name else from_addr
@@ -35,12 +39,29 @@ def send_email_with_attachments(config: EmailConfig, to_addrs: List[str], subjec
     for fname, fbytes, mime_type in attachments:
         maintype, _, subtype = (mime_type.partition('/') if '/' in mime_type else ("application","/","octet-stream"))
         msg.add_attachment(fbytes, maintype=maintype, subtype=subtype, filename=fname)
+    return msg
 
+
+def send_email_with_attachments(config: EmailConfig, to_addrs: List[str], subject: str, body_html: str, attachments: List[tuple[str, bytes, str]] = []) -> bool:
+    """
+    attachments: list of tuples (filename, file_bytes, mime_type)
+    returns True on success
+    """
+    return send_email_batch(config, [OutgoingEmail(to_addrs, subject, body_html, list(attachments))]) == 1
+
+
+def send_email_batch(config: EmailConfig, emails: List[OutgoingEmail]) -> int:
+    """
+    Send several messages over a single SMTP session (one connect/STARTTLS/login).
+    returns number of messages sent
+    """
+    if not emails:
+        return 0
     context = ssl.create_default_context()
     with smtplib.SMTP(config.host, config.port) as server:
         server.starttls(context=context)
         if config.user and config.password:
             server.login(config.user, config.password)
-        server.send_message(msg)
-    return True
-
+        for email in emails:
+            server.send_message(_build_message(config, email.to_addrs, email.subject, email.body_html, email.attachments))
+    return len(emails)
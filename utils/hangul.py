@@ -0,0 +1,82 @@
+"""
+한글 검색 유틸리티 - 자모 분해 / 초성 추출
+
+- decompose_jamo("디자인형") → "ㄷㅣㅈㅏㅇㅣㄴㅎㅕㅇ"
+- choseong("디자인형 2000") → "ㄷㅈㅇㅎ 2000"
+- is_choseong_query("ㄷㅈㅇ") → True
+
+입력 중인 음절("딪" = 디+ㅈ)도 자모 단위로 비교하면 "디자인"과 일치한다.
+"""
+
+from __future__ import annotations
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSEONG = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+]
+JUNGSEONG = [
+    'ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ',
+    'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ',
+]
+JONGSEONG = [
+    '', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+    'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+]
+
+# 겹받침/겹모음은 입력 순서대로 풀어서 비교 ("닭" 입력 중 "달" + "ㄱ")
+_COMPOUND_SPLIT = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ',
+    'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+}
+
+_CONSONANTS = set(CHOSEONG) | {c for c in JONGSEONG if c}
+
+
+def is_hangul_syllable(ch: str) -> bool:
+    return HANGUL_BASE <= ord(ch) <= HANGUL_LAST
+
+
+def has_hangul(text: str) -> bool:
+    return any(is_hangul_syllable(c) or c in _CONSONANTS or c in JUNGSEONG for c in text or "")
+
+
+def decompose_jamo(text: str) -> str:
+    """완성형 음절을 호환 자모 열로 분해 (그 외 문자는 소문자로 유지, 공백 제거)"""
+    out = []
+    for ch in (text or "").lower():
+        if ch.isspace():
+            continue
+        if is_hangul_syllable(ch):
+            code = ord(ch) - HANGUL_BASE
+            cho, rest = divmod(code, 21 * 28)
+            jung, jong = divmod(rest, 28)
+            out.append(CHOSEONG[cho])
+            out.append(_COMPOUND_SPLIT.get(JUNGSEONG[jung], JUNGSEONG[jung]))
+            if jong:
+                out.append(_COMPOUND_SPLIT.get(JONGSEONG[jong], JONGSEONG[jong]))
+        else:
+            out.append(_COMPOUND_SPLIT.get(ch, ch))
+    return "".join(out)
+
+
+def choseong(text: str) -> str:
+    """초성 문자열 (한글 음절 → 초성, 그 외 문자는 소문자로 유지, 공백 제거)"""
+    out = []
+    for ch in (text or "").lower():
+        if ch.isspace():
+            continue
+        if is_hangul_syllable(ch):
+            out.append(CHOSEONG[(ord(ch) - HANGUL_BASE) // (21 * 28)])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_choseong_query(text: str) -> bool:
+    """자음만으로 된 검색어인지 (예: 'ㄷㅈㅇ')"""
+    chars = [c for c in (text or "") if not c.isspace()]
+    return bool(chars) and all(c in _CONSONANTS for c in chars)
@@ -0,0 +1,443 @@
+"""
+ModelSearchIndex - 모델 통합 검색용 역색인
+
+EnhancedModelSearch(ptop_app_v091)의 검색 엔진.
+카탈로그 버전(catalog_version)마다 한 번 색인을 만들고, 검색 시에는
+정규화 문자열 + bigram/trigram 역색인으로 후보를 좁힌 뒤 가벼운 점수 계산만 수행한다.
+
+점수 체계는 기존 EnhancedModelSearch 와 동일:
+    매칭유형(식별번호 100 / 치수 80 / 부분일치 50 / 자모 45 / 초성 40)
+  + 컬럼가중치(모델명 30, 카테고리 20, 규격 25, 식별번호 35, 설명 10)
+  + 유사도 × 50 (+20 포함 보너스)
+부분일치에서 SequenceMatcher ratio 는 2·len(q)/(len(q)+len(v)) 와 같으므로 그대로 계산한다.
+
+한글 컬럼은 초성("ㄷㅈㅇ" → 디자인형)과 자모("딪" → 디자…) 문자열도 함께 색인하며,
+공백으로 나뉜 복합 검색어("디자인 2000")는 모든 단어가 일치하는 행을 찾는다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import re
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.hangul import choseong, decompose_jamo, has_hangul, is_choseong_query
+from utils.dimension_index import DimensionIndex, parse_dimension_query
+
+SEARCH_COLUMNS = ['model_name', 'category', 'model_standard', '식별번호', 'description']
+
+COLUMN_WEIGHTS = {
+    'model_name': 30,
+    'category': 20,
+    'model_standard': 25,
+    '식별번호': 35,
+    'description': 10,
+}
+
+MATCH_TYPE_SCORES = {
+    'identifier': 100,
+    'dimension': 80,
+    'partial': 50,
+    'jamo': 45,
+    'choseong': 40,
+}
+
+# 초성/자모 색인 대상 (한글 이름이 들어가는 컬럼)
+HANGUL_COLUMNS = ['model_name', 'category', 'description']
+
+# 자재(main_materials / sub_materials) 검색용
+MATERIAL_SEARCH_COLUMNS = ['품목', '규격']
+MATERIAL_COLUMN_WEIGHTS = {'품목': 30, '규격': 25}
+MATERIAL_HANGUL_COLUMNS = ['품목']
+
+# 파생 필드 접미사: "model_name#cho", "model_name#jamo"
+_CHO = '#cho'
+_JAMO = '#jamo'
+
+# bigram: 2글자 한글 검색어(차양, 볼라 등)용, trigram: 숫자/영문 위주 검색어의 후보 축소용
+GRAM_SIZES = (2, 3)
+
+# 숫자 뒤 라벨 표기 (2000w, 1200h) - 앞 라벨(W2000, H>=1200)은 parse_dimension_query 가 처리
+_SUFFIX_DIMENSION = re.compile(r'(\d+(?:\.\d+)?)\s*(w|h)(?![a-z])')
+
+
+def normalize_search_string(s) -> str:
+    """검색 문자열 정규화: x 와 * 를 모두 * 로 통일 + 소문자"""
+    if s is None or (isinstance(s, float) and pd.isna(s)):
+        return ""
+    s = str(s)
+    return s.replace('x', '*').replace('X', '*').lower()
+
+
+def catalog_version(models_df: pd.DataFrame, columns: Iterable[str] = SEARCH_COLUMNS) -> str:
+    """
+    카탈로그 버전 (검색 대상 컬럼 내용 해시)
+
+    같은 내용이면 세션/테넌트가 달라도 같은 값이 나오므로 색인 재사용 키로 쓴다.
+    """
+    if models_df is None or models_df.empty:
+        return "empty"
+    cols = [c for c in columns if c in models_df.columns]
+    if 'model_id' in models_df.columns and 'model_id' not in cols:
+        cols = ['model_id'] + cols
+    hashed = pd.util.hash_pandas_object(models_df[cols].astype(str), index=False).values
+    return hashlib.sha1(hashed.tobytes()).hexdigest()[:16]
+
+
+def _grams(text: str, n: int) -> set:
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _all_grams(text: str) -> set:
+    grams = set()
+    for n in GRAM_SIZES:
+        grams |= _grams(text, n)
+    return grams
+
+
+def _substring_ratio(q: str, v: str) -> float:
+    """q 가 v 의 부분 문자열일 때 SequenceMatcher(None, q, v).ratio() 와 같은 값"""
+    total = len(q) + len(v)
+    return (2.0 * len(q) / total) if total else 0.0
+
+
+class ModelSearchIndex:
+    """
+    모델 카탈로그 역색인
+
+    - 컬럼별 정규화 문자열 (한 번만 계산)
+    - 컬럼별 bigram/trigram → 행 위치 posting (array('I'))
+    - 검색: 가장 희귀한 gram 의 posting 만 부분 문자열 검증 → NumPy 로 점수 계산
+    """
+
+    def __init__(self, models_df: pd.DataFrame, columns: Iterable[str] = SEARCH_COLUMNS,
+                 version: Optional[str] = None, weights: Optional[Dict[str, int]] = None,
+                 hangul_columns: Iterable[str] = HANGUL_COLUMNS):
+        self.models_df = models_df.reset_index(drop=True) if models_df is not None else pd.DataFrame()
+        self.columns = [c for c in columns if c in self.models_df.columns]
+        self.weights = dict(weights or COLUMN_WEIGHTS)
+        self.hangul_columns = [c for c in hangul_columns if c in self.columns]
+        self.version = version or catalog_version(self.models_df, self.columns)
+        self._norm: Dict[str, List[str]] = {}
+        self._lengths: Dict[str, np.ndarray] = {}
+        self._postings: Dict[str, Dict[str, array]] = {}
+        self.dimensions: Optional[DimensionIndex] = None
+        # 같은 검색어의 치수 조건은 한 번만 계산 (증분 검색에서 반복 조회)
+        self.dimension_positions = lru_cache(maxsize=256)(self._dimension_positions)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.models_df)
+
+    # ------------------------------------------------------------------
+    # 색인 생성
+    # ------------------------------------------------------------------
+    def _build(self) -> None:
+        for col in self.columns:
+            raw = self.models_df[col].tolist()
+            self._add_field(col, [normalize_search_string(v) for v in raw])
+            if col in self.hangul_columns:
+                text = ["" if (v is None or (isinstance(v, float) and pd.isna(v))) else str(v) for v in raw]
+                self._add_field(col + _CHO, [choseong(v) for v in text])
+                self._add_field(col + _JAMO, [decompose_jamo(v) for v in text])
+        if 'model_standard' in self.columns:
+            # 규격 치수는 카탈로그 버전당 한 번만 파싱
+            self.dimensions = DimensionIndex(self.models_df['model_standard'].tolist())
+
+    def _add_field(self, field: str, values: List[str]) -> None:
+        postings: Dict[str, list] = {}
+        for pos, value in enumerate(values):
+            for gram in _all_grams(value):
+                postings.setdefault(gram, []).append(pos)
+        self._norm[field] = values
+        self._lengths[field] = np.fromiter((len(v) for v in values), dtype=np.float64, count=len(values))
+        self._postings[field] = {g: array('I', p) for g, p in postings.items()}
+
+    # ------------------------------------------------------------------
+    # 후보 탐색
+    # ------------------------------------------------------------------
+    def match_column(self, column: str, needle: str, candidates: Optional[np.ndarray] = None) -> List[int]:
+        """
+        정규화된 needle 을 부분 문자열로 포함하는 행 위치 목록
+
+        candidates 가 주어지면 그 행들만 확인해도 되는 상황(증분 검색)이며,
+        posting 보다 작을 때만 후보를 직접 훑는다.
+        """
+        values = self._norm.get(column)
+        if not values or not needle:
+            return []
+        if candidates is not None and (len(needle) < GRAM_SIZES[0] or candidates.size < 256):
+            return [i for i in candidates.tolist() if needle in values[i]]
+        if len(needle) < GRAM_SIZES[0]:
+            # 1글자 검색어: 정규화 문자열 직접 확인
+            return [i for i, v in enumerate(values) if needle in v]
+
+        postings = self._postings[column]
+        rarest = None
+        n = max(k for k in GRAM_SIZES if k <= len(needle))
+        for gram in _grams(needle, n):
+            p = postings.get(gram)
+            if p is None:
+                return []
+            if rarest is None or len(p) < len(rarest):
+                rarest = p
+        if candidates is not None and candidates.size < len(rarest):
+            return [i for i in candidates.tolist() if needle in values[i]]
+        return [i for i in rarest if needle in values[i]]
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def score_matches(self, query: str, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        행 위치별 최고 관련도 점수 배열 (매칭 없음 = -inf)
+
+        검색어 전체 일치 점수와, 여러 단어일 때 "모든 단어 일치" 평균 점수 중 큰 값.
+        candidates: 일치 가능한 행을 모두 포함하는 위치 배열 (증분 검색에서 이전 결과)
+        """
+        scores = self._score_token(query.strip(), candidates)
+        tokens = query.split()
+        if len(tokens) > 1:
+            combined = np.zeros(len(self.models_df))
+            for token in tokens:
+                combined += self._score_token(token, candidates)   # 한 단어라도 불일치면 -inf
+            np.fmax(scores, combined / len(tokens), out=scores)
+        return scores
+
+    def _score_token(self, q: str, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        nq = normalize_search_string(q)
+        scores = np.full(len(self.models_df), -np.inf)
+
+        for col in self.columns:
+            weight = self.weights.get(col, 0)
+            if col == '식별번호' and q.isdigit():
+                base = MATCH_TYPE_SCORES['identifier'] + weight
+            else:
+                base = MATCH_TYPE_SCORES['partial'] + weight
+            self._score_field(col, nq, base, scores, candidates)
+
+        # 한글: 초성 검색어 → 초성 필드, 그 외 한글 검색어 → 자모 필드 (입력 중인 음절 포함)
+        if self.hangul_columns and is_choseong_query(q):
+            key = choseong(decompose_jamo(q))
+            for col in self.hangul_columns:
+                self._score_field(col + _CHO, key, MATCH_TYPE_SCORES['choseong'] + self.weights.get(col, 0), scores,
+                                  candidates)
+        elif self.hangul_columns and has_hangul(q):
+            key = decompose_jamo(q)
+            for col in self.hangul_columns:
+                self._score_field(col + _JAMO, key, MATCH_TYPE_SCORES['jamo'] + self.weights.get(col, 0), scores,
+                                  candidates)
+
+        if self.dimensions is not None:
+            self._score_dimension(q, nq, scores, candidates)
+
+        return scores
+
+    def _score_field(self, field: str, needle: str, base: float, scores: np.ndarray,
+                     candidates: Optional[np.ndarray] = None) -> None:
+        positions = self.match_column(field, needle, candidates)
+        if not positions:
+            return
+        idx = np.asarray(positions, dtype=np.int64)
+        # 부분일치 유사도 = 2·len(q) / (len(q) + len(v)), 포함 보너스 +20
+        field_scores = base + (2.0 * len(needle) / (len(needle) + self._lengths[field][idx])) * 50 + 20
+        np.maximum.at(scores, idx, field_scores)
+
+    def _dimension_positions(self, query: str) -> Optional[np.ndarray]:
+        """
+        치수 조건 → 행 위치 (정확/범위 수치 비교, 조건이 없으면 None)
+
+        dimension_positions 로 호출 (결과 캐시 - 반환 배열은 수정하지 말 것)
+
+        - "W2000", "폭1800-2200", "H>=1200"  → 라벨 치수 범위
+        - "2000w", "1200h"                  → 라벨 치수 일치
+        - "2000" (1000 이상 숫자만)          → 어느 치수든 일치
+        """
+        if self.dimensions is None:
+            return None
+        q = query.strip().lower()
+        ranges = dict(parse_dimension_query(q))
+        for number, label in _SUFFIX_DIMENSION.findall(q):
+            ranges.setdefault(label, (float(number), float(number)))
+        if ranges:
+            return self.dimensions.query(**ranges)
+        if q.isdigit() and int(q) >= 1000:
+            return self.dimensions.equals_any(float(q))
+        return None
+
+    def _score_dimension(self, q: str, nq: str, scores: np.ndarray,
+                         candidates: Optional[np.ndarray] = None) -> None:
+        idx = self.dimension_positions(q)
+        if idx is None or idx.size == 0:
+            return
+        base = MATCH_TYPE_SCORES['dimension'] + self.weights.get('model_standard', 0)
+        digits = (re.findall(r'\d+', nq) or [nq])[0]
+        # 유사도: 일치한 숫자 길이 기준 2·len(n)/(len(q)+len(v)) 근사, 규격이 검색어를 포함하면 +20
+        similarity = 2.0 * len(digits) / (len(nq) + self._lengths['model_standard'][idx])
+        contained = np.isin(idx, np.asarray(self.match_column('model_standard', nq, candidates), dtype=np.int64))
+        np.maximum.at(scores, idx, base + similarity * 50 + np.where(contained, 20, 0))
+
+    def rank(self, scores: np.ndarray, max_results: int = 50) -> List[int]:
+        """점수 내림차순 상위 max_results 개 행 위치 (동점은 카탈로그 순서)"""
+        matched = np.flatnonzero(np.isfinite(scores))
+        if matched.size == 0:
+            return []
+        if matched.size > max_results:
+            # 전체 정렬 대신 상위 k 개만 선택 후 정렬
+            part = np.argpartition(-scores[matched], max_results - 1)[:max_results]
+            kth = scores[matched[part]].min()
+            matched = matched[scores[matched] >= kth]
+        order = np.lexsort((matched, -scores[matched]))
+        return matched[order][:max_results].tolist()
+
+    def search(self, query: str, max_results: int = 50) -> pd.DataFrame:
+        """통합 검색 (빈 검색어면 처음 20개)"""
+        if not query or not query.strip():
+            return self.models_df.head(20)
+        positions = self.rank(self.score_matches(query), max_results)
+        if not positions:
+            return pd.DataFrame()
+        return self.models_df.iloc[positions].reset_index(drop=True)
+
+
+def top_k_positions(positions: np.ndarray, values: np.ndarray, k: int) -> List[int]:
+    """
+    점수 상위 k 개 행 위치 (힙, O(m log k)) - 동점은 카탈로그 순서
+
+    positions(오름차순)와 values(같은 순서의 점수)를 받아 rank() 와 같은 순서를
+    돌려주며 일치 행 전체를 정렬하지 않는다.
+    """
+    if positions.size == 0 or k <= 0:
+        return []
+    if positions.size > 8 * k:
+        # 힙에 넣기 전에 k 번째 점수 미만은 제외, 동점은 앞선 행만 필요한 만큼 남김
+        kth = np.partition(values, values.size - k)[values.size - k]
+        keep = values > kth
+        keep[np.flatnonzero(values == kth)[:k - int(keep.sum())]] = True
+        positions, values = positions[keep], values[keep]
+    neg = (-values).tolist()
+    return [p for _, p in heapq.nsmallest(k, zip(neg, positions.tolist()))]
+
+
+class IncrementalSearch:
+    """
+    입력 중(as-you-type) 증분 검색
+
+    최근 검색어별 일치 행 집합을 LRU 로 보관하고, 새 검색어가 이전 검색어를
+    이어 쓴 것이면 그 일치 집합 안에서만 다시 점수를 매긴다.
+    (부분 문자열 일치는 검색어가 길어질수록 좁아지므로 결과는 전체 검색과 같다.
+     치수 조건은 정렬 배열 조회라 매번 전체에서 구해 후보에 합친다.)
+
+    색인(ModelSearchIndex)은 공유·읽기 전용, 이 객체는 세션별로 둔다.
+    """
+
+    def __init__(self, index: ModelSearchIndex, cache_size: int = 32):
+        self.index = index
+        self.cache_size = cache_size
+        # query → (일치 행 위치 배열, 같은 순서의 점수) - 전체 길이 점수 배열은 보관하지 않음
+        self._cache: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self.full_searches = 0
+        self.narrowed_searches = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def _mode(token: str) -> str:
+        if is_choseong_query(token):
+            return 'cho'
+        return 'hangul' if has_hangul(token) else 'plain'
+
+    def _narrowable(self, prev: str, query: str) -> bool:
+        """prev 의 일치 집합이 query 의 일치 집합을 포함한다고 볼 수 있는지"""
+        if not query.startswith(prev) or not prev.strip():
+            return False
+        prev_tokens, tokens = prev.split(), query.split()
+        if len(tokens) < len(prev_tokens):
+            return False
+        # 초성/자모 검색 방식이 바뀌는 입력은 포함 관계가 보장되지 않음
+        pairs = list(zip(prev_tokens, tokens)) + [(prev.strip(), query.strip())]
+        return all(self._mode(a) == self._mode(b) for a, b in pairs)
+
+    def _base_candidates(self, query: str) -> Optional[np.ndarray]:
+        """캐시된 가장 긴 선행 검색어의 일치 집합 (+ 새 검색어의 치수 일치 행)"""
+        best = None
+        for prev in self._cache:
+            if (best is None or len(prev) > len(best)) and self._narrowable(prev, query):
+                best = prev
+        if best is None:
+            return None
+        candidates = self._cache[best][0]
+        dims = [self.index.dimension_positions(t) for t in query.split() + [query.strip()]]
+        dims = [d for d in dims if d is not None and d.size]
+        if dims:
+            mask = np.zeros(len(self.index), dtype=bool)
+            mask[candidates] = True
+            for d in dims:
+                mask[d] = True
+            candidates = np.flatnonzero(mask)
+        return candidates
+
+    def search(self, query: str, max_results: int = 50) -> pd.DataFrame:
+        """ModelSearchIndex.search 와 같은 결과 (이어 쓴 검색어는 이전 결과 안에서만 계산)"""
+        if not query or not query.strip():
+            return self.index.models_df.head(20)
+
+        cached = self._cache.get(query)
+        if cached is not None:
+            self._cache.move_to_end(query)
+            self.cache_hits += 1
+            matched, values = cached
+        else:
+            candidates = self._base_candidates(query)
+            if candidates is None:
+                self.full_searches += 1
+            else:
+                self.narrowed_searches += 1
+            scores = self.index.score_matches(query, candidates)
+            matched = np.flatnonzero(np.isfinite(scores))
+            values = scores[matched]
+            self._cache[query] = (matched, values)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        positions = top_k_positions(matched, values, max_results)
+        if not positions:
+            return pd.DataFrame()
+        return self.index.models_df.iloc[positions].reset_index(drop=True)
+
+    def stats(self) -> dict:
+        return {
+            "full": self.full_searches,
+            "narrowed": self.narrowed_searches,
+            "hits": self.cache_hits,
+            "cached_queries": len(self._cache),
+        }
+
+
+def build_material_frame(main_materials: pd.DataFrame, sub_materials: pd.DataFrame) -> pd.DataFrame:
+    """주자재/부자재를 하나의 검색 대상 프레임으로 결합 ('구분' 컬럼: 주자재/부자재)"""
+    frames = []
+    for label, df in (('주자재', main_materials), ('부자재', sub_materials)):
+        if df is not None and not df.empty and '품목' in df.columns:
+            frames.append(df.assign(구분=label))
+    if not frames:
+        return pd.DataFrame(columns=['구분'] + MATERIAL_SEARCH_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_material_index(materials_df: pd.DataFrame) -> ModelSearchIndex:
+    """자재명(품목)/규격 색인 - 초성·자모 검색 포함"""
+    return ModelSearchIndex(
+        materials_df,
+        columns=MATERIAL_SEARCH_COLUMNS,
+        weights=MATERIAL_COLUMN_WEIGHTS,
+        hangul_columns=MATERIAL_HANGUL_COLUMNS,
+    )
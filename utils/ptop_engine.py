@@ -34,6 +34,7 @@ class PtopEngine:
     # 상수
     PIPE_STANDARD_LENGTH_M = 6.0  # PIPE 발주 단위 (6m)
     VAT_RATE = 0.1  # 부가세율 10%
+    PAGE_SIZE = 1000  # PostgREST 응답 최대 행 수
 
     def __init__(self, supabase_client: Client, tenant_id: str):
         """
@@ -150,6 +151,36 @@ class PtopEngine:
             print(f"❌ get_bom 오류: {e}")
             return pd.DataFrame()
 
+    def get_bom_batch(self, model_ids: List[str]) -> pd.DataFrame:
+        """
+        여러 모델의 기본 BOM 일괄 조회 (1회 쿼리, 1000행 제한을 넘으면 .range() 로 페이지 조회)
+
+        Args:
+            model_ids: 모델 ID 목록
+
+        Returns:
+            BOM DataFrame (model_id 컬럼으로 구분)
+        """
+        ids = [str(m) for m in dict.fromkeys(model_ids or []) if m is not None and str(m) != '']
+        if not ids:
+            return pd.DataFrame()
+        try:
+            rows = []
+            while True:
+                page = self.db.schema('ptop').table('bom')\
+                    .select('*')\
+                    .eq('tenant_id', self.tenant)\
+                    .in_('model_id', ids)\
+                    .order('model_id').order('material_name')\
+                    .range(len(rows), len(rows) + self.PAGE_SIZE - 1)\
+                    .execute().data or []
+                rows.extend(page)
+                if len(page) < self.PAGE_SIZE:
+                    return pd.DataFrame(rows)
+        except Exception as e:
+            print(f"❌ get_bom_batch 오류: {e}")
+            return pd.DataFrame()
+
     def calculate_bom_for_span(self, model_id: str, span_count: int) -> pd.DataFrame:
         """
         경간 수에 따른 BOM 계산 (핵심 로직!)
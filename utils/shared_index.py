@@ -0,0 +1,174 @@
+"""
+프로세스 공용 검색 색인 레지스트리
+
+- (tenant, catalog_version) 당 읽기 전용 색인 1개를 프로세스 메모리에 두고 모든 세션이 공유
+- 세션은 IndexLease 를 보관 (참조 카운트) - 세션이 사라지면 lease 가 GC 되며 자동 반납
+- 카탈로그가 바뀌면 백그라운드 스레드에서 새 색인을 만들고, 완성되면 원자적으로 교체
+  (교체 전까지는 기존 색인으로 응답)
+- 아무도 쓰지 않는 이전 버전은 즉시 폐기 → 메모리는 열린 탭 수가 아니라 테넌트 수에 비례
+
+사용 예:
+    registry = SharedIndexRegistry(EnhancedModelSearch, version_fn=catalog_version)
+    lease = registry.acquire("dooho", models_df, version=data["catalog_versions"]["models"],
+                             current=st.session_state.get("lease"))
+    st.session_state["lease"] = lease
+    lease.index.search_models("DAL")
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+Key = Tuple[str, str]
+
+
+class _Entry:
+    __slots__ = ("index", "refs")
+
+    def __init__(self, index: Any):
+        self.index = index
+        self.refs = 0
+
+
+class IndexLease:
+    """공유 색인 사용권 - 객체가 사라지면(GC) 참조 카운트가 반납된다"""
+
+    def __init__(self, registry: "SharedIndexRegistry", tenant: str, version: str, index: Any):
+        self.tenant = tenant
+        self.version = version
+        self.index = index
+        self._finalizer = weakref.finalize(self, registry._release, tenant, version)
+
+    def release(self) -> None:
+        """명시적 반납 (두 번 호출해도 안전)"""
+        self._finalizer()
+
+    @property
+    def active(self) -> bool:
+        return self._finalizer.alive
+
+
+class SharedIndexRegistry:
+    """
+    테넌트별 공유 색인 관리
+
+    Args:
+        builder: DataFrame → 색인 객체 (읽기 전용으로 사용되어야 함)
+        version_fn: DataFrame → 카탈로그 버전 문자열
+        name: 로그 표시용 이름
+    """
+
+    def __init__(self, builder: Callable[[pd.DataFrame], Any],
+                 version_fn: Callable[[pd.DataFrame], str], name: str = "index"):
+        self._builder = builder
+        self._version_fn = version_fn
+        self.name = name
+        self._lock = threading.RLock()
+        self._entries: Dict[Key, _Entry] = {}
+        self._current: Dict[str, str] = {}        # tenant → 현재 버전
+        self._building: Dict[str, str] = {}       # tenant → 빌드 중인 버전
+        self._tenant_locks: Dict[str, threading.Lock] = {}
+        self.builds = 0
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def acquire(self, tenant: str, df: pd.DataFrame, version: Optional[str] = None,
+                current: Optional[IndexLease] = None) -> IndexLease:
+        """
+        최신 카탈로그의 색인 사용권 획득
+
+        Args:
+            tenant: 테넌트 ID
+            df: 현재 카탈로그 DataFrame
+            version: 카탈로그 버전 - 카탈로그를 로드할 때 1회 계산한 값을 넘긴다
+                     (None 이면 version_fn 으로 계산, 매 호출 전체 해시이므로 재실행 경로에서는 피할 것)
+            current: 세션이 들고 있던 lease - 같은 색인이면 그대로 돌려줌
+
+        Returns:
+            IndexLease (버전이 바뀐 직후에는 새 색인 완성 전까지 이전 버전 lease)
+        """
+        version = version or self._version_fn(df)
+        with self._lock:
+            live = self._current.get(tenant)
+            if live is not None and live != version and self._building.get(tenant) != version:
+                self._schedule_build(tenant, version, df)
+            if live is not None:
+                return self._lease(tenant, live, current)
+
+        # 테넌트 첫 사용: 동기 빌드 (같은 테넌트의 동시 요청은 한 번만 빌드)
+        with self._tenant_lock(tenant):
+            with self._lock:
+                live = self._current.get(tenant)
+                if live is not None:
+                    return self._lease(tenant, live, current)
+            index = self._builder(df)
+            with self._lock:
+                self._install(tenant, version, index)
+                return self._lease(tenant, version, current)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "tenants": len(self._current),
+                "indexes": len(self._entries),
+                "refs": {f"{t}@{v}": e.refs for (t, v), e in self._entries.items()},
+                "building": dict(self._building),
+                "builds": self.builds,
+            }
+
+    # ------------------------------------------------------------------
+    # 내부
+    # ------------------------------------------------------------------
+    def _tenant_lock(self, tenant: str) -> threading.Lock:
+        with self._lock:
+            return self._tenant_locks.setdefault(tenant, threading.Lock())
+
+    def _lease(self, tenant: str, version: str, current: Optional[IndexLease]) -> IndexLease:
+        if current is not None and current.active and current.tenant == tenant and current.version == version:
+            return current
+        entry = self._entries[(tenant, version)]
+        entry.refs += 1
+        return IndexLease(self, tenant, version, entry.index)
+
+    def _install(self, tenant: str, version: str, index: Any) -> None:
+        """새 색인을 현재 버전으로 교체 (self._lock 보유 상태에서 호출)"""
+        self._entries.setdefault((tenant, version), _Entry(index))
+        self._current[tenant] = version
+        self.builds += 1
+        for key in [k for k, e in self._entries.items() if k[0] == tenant and k[1] != version and e.refs <= 0]:
+            del self._entries[key]
+
+    def _release(self, tenant: str, version: str) -> None:
+        with self._lock:
+            entry = self._entries.get((tenant, version))
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs <= 0 and self._current.get(tenant) != version:
+                del self._entries[(tenant, version)]
+
+    def _schedule_build(self, tenant: str, version: str, df: pd.DataFrame) -> None:
+        """백그라운드 재색인 (self._lock 보유 상태에서 호출)"""
+        self._building[tenant] = version
+        snapshot = df.copy()
+
+        def run():
+            try:
+                index = self._builder(snapshot)
+                with self._lock:
+                    if self._building.get(tenant) == version:
+                        self._install(tenant, version, index)
+            except Exception as e:
+                print(f"[WARN] {self.name} rebuild failed ({tenant}@{version}): {e}")
+            finally:
+                with self._lock:
+                    if self._building.get(tenant) == version:
+                        del self._building[tenant]
+
+        threading.Thread(target=run, name=f"{self.name}-rebuild-{tenant}", daemon=True).start()